@@ -12,28 +12,39 @@ Scanned contexts:
   JSON item content files (e.g. copyjob-content.json, pipeline-content.json)
     - "workspaceId", "artifactId", "itemId", "lakehouseId", "connectionId" field values
 
+With ``--watch`` the scanner keeps the compiled rules and the GUIDs extracted
+from every file in memory, rescans only the files that change (inotify on
+Linux, polling elsewhere) and prints which findings appeared or were resolved.
+A change to parameter.yml or a parameter template re-checks the cached GUIDs
+against the reloaded rules without reading the item files again.
+
 Usage:
     python -m scripts.check_unmapped_ids --workspaces_directory workspaces
     python -m scripts.check_unmapped_ids --workspaces_directory workspaces \\
         --workspace_filter "Fabric Blueprint"
+    python -m scripts.check_unmapped_ids --workspaces_directory workspaces --watch
 """
 
 import argparse
 import re
 import sys
-from dataclasses import dataclass, field
+import time
+from dataclasses import dataclass
+from datetime import datetime
 from pathlib import Path
 
-import yaml
-
 from .common.logger import get_logger
 from .fabric.config import (
     CONFIG_FILE,
     EXIT_FAILURE,
     EXIT_SUCCESS,
+    PARAMETER_FILE,
     SEPARATOR_LONG,
     SEPARATOR_SHORT,
+    WATCH_POLL_INTERVAL_SECONDS,
 )
+from .fabric.parameters import FindReplaceRule, item_type_from_path, load_rules
+from .fabric.workspace_model import RepositoryModel, WorkspaceModel, load_workspace_model
 
 logger = get_logger(__name__)
 
@@ -79,26 +90,6 @@ INCLUDED_METADATA_FILENAMES = {"shortcuts.metadata.json"}
 # ---------------------------------------------------------------------------
 
 
-@dataclass
-class FindReplaceRule:
-    """Parsed representation of one find_replace entry in parameter.yml."""
-
-    find_value: str
-    is_regex: bool
-    item_types: list[str]  # empty list = applies to all types
-    file_paths: list[str]  # empty list = applies to all files
-    source_file: str = ""
-    _compiled: re.Pattern | None = field(default=None, init=False, repr=False)
-
-    def __post_init__(self) -> None:
-        if self.is_regex:
-            try:
-                self._compiled = re.compile(self.find_value)
-            except re.error as exc:
-                logger.warning(f"  [WARN] Could not compile regex in {self.source_file}: {exc}")
-                self._compiled = None
-
-
 @dataclass
 class UnmappedGuid:
     """A GUID found in an item file that has no covering rule."""
@@ -111,138 +102,6 @@ class UnmappedGuid:
     context: str  # the source line (trimmed) where the GUID was found
 
 
-# ---------------------------------------------------------------------------
-# Parameter file loading
-# ---------------------------------------------------------------------------
-
-
-def _normalise_to_list(value: object) -> list[str]:
-    """Return a list[str] regardless of whether value is str, list, or None."""
-    if value is None:
-        return []
-    if isinstance(value, str):
-        return [value]
-    if isinstance(value, list):
-        return [str(v) for v in value]
-    return []
-
-
-def load_rules(param_file: Path, _seen: set[Path] | None = None) -> list[FindReplaceRule]:
-    """Recursively load find_replace rules from a parameter.yml (and its extends)."""
-    if _seen is None:
-        _seen = set()
-
-    resolved = param_file.resolve()
-    if resolved in _seen or not param_file.exists():
-        return []
-    _seen.add(resolved)
-
-    try:
-        raw = yaml.safe_load(param_file.read_text(encoding="utf-8"))
-    except Exception as exc:
-        logger.warning(f"  [WARN] Could not parse {param_file}: {exc}")
-        return []
-
-    if not isinstance(raw, dict):
-        return []
-
-    rules: list[FindReplaceRule] = []
-
-    # Process extended template files first
-    for rel in _normalise_to_list(raw.get("extend")):
-        extended = (param_file.parent / rel).resolve()
-        rules.extend(load_rules(extended, _seen))
-
-    # Process find_replace entries in this file
-    for entry in raw.get("find_replace") or []:
-        if not isinstance(entry, dict):
-            continue
-        find_value = str(entry.get("find_value", "")).strip()
-        if not find_value:
-            continue
-
-        is_regex = str(entry.get("is_regex", "false")).lower() in ("true",)
-        item_types = _normalise_to_list(entry.get("item_type"))
-        file_paths = _normalise_to_list(entry.get("file_path"))
-
-        rules.append(
-            FindReplaceRule(
-                find_value=find_value,
-                is_regex=is_regex,
-                item_types=item_types,
-                file_paths=file_paths,
-                source_file=str(param_file),
-            )
-        )
-
-    return rules
-
-
-# ---------------------------------------------------------------------------
-# Path / item-type helpers
-# ---------------------------------------------------------------------------
-
-
-def item_type_from_path(path: Path) -> str:
-    """Derive the Fabric item type from its containing folder name.
-
-    Folder names follow the pattern  ``<DisplayName>.<ItemType>``.
-    Returns ``"Unknown"`` when the pattern cannot be matched.
-    """
-    for part in path.parts:
-        if "." in part:
-            candidate = part.rsplit(".", 1)[-1]
-            # Valid item types are CamelCase and at least 3 chars long
-            if len(candidate) >= 3 and candidate[0].isupper() and candidate.isalpha():
-                return candidate
-    return "Unknown"
-
-
-def _glob_to_regex(pattern: str) -> re.Pattern:
-    """Convert a glob pattern (supporting ``**``) to a compiled regex.
-
-    The match is checked against the forward-slash-normalised relative path
-    from the workspace root (e.g. ``2_Silver/transformation/nb.Notebook/notebook-content.py``).
-    """
-    pattern = pattern.replace("\\", "/").lstrip("/").lstrip("./")
-    buf: list[str] = []
-    i = 0
-    while i < len(pattern):
-        if pattern[i : i + 2] == "**":
-            buf.append(".*")
-            i += 2
-            # consume optional trailing slash
-            if i < len(pattern) and pattern[i] == "/":
-                i += 1
-        elif pattern[i] == "*":
-            buf.append("[^/]*")
-            i += 1
-        elif pattern[i] == "?":
-            buf.append("[^/]")
-            i += 1
-        elif pattern[i] in r"\.^$+{}[]|()":
-            buf.append(re.escape(pattern[i]))
-            i += 1
-        else:
-            buf.append(pattern[i])
-            i += 1
-    return re.compile("".join(buf) + "$")
-
-
-def _file_matches_path_filters(file_rel_from_workspace: Path, filter_patterns: list[str]) -> bool:
-    """Return True if the file matches at least one of the glob filter patterns."""
-    if not filter_patterns:
-        return True
-    norm = str(file_rel_from_workspace).replace("\\", "/")
-    for pat in filter_patterns:
-        try:
-            if _glob_to_regex(pat).search(norm):
-                return True
-        except re.error:
-            pass
-    return False
-
-
 # ---------------------------------------------------------------------------
 # Coverage check
 # ---------------------------------------------------------------------------
@@ -257,17 +116,14 @@ def is_covered(
 ) -> bool:
     """Return True if at least one rule covers this GUID occurrence."""
     for rule in rules:
-        # item_type filter
-        if rule.item_types and item_type not in rule.item_types:
-            continue
-        # file_path filter
-        if rule.file_paths and not _file_matches_path_filters(file_rel_from_workspace, rule.file_paths):
+        # item_type and file_path filters
+        if not rule.applies_to(item_type, file_rel_from_workspace):
             continue
 
         if rule.is_regex:
-            if rule._compiled is None:
+            if rule.compiled is None:
                 continue
-            m = rule._compiled.search(context_line)
+            m = rule.compiled.search(context_line)
             if m:
                 try:
                     if m.group(1) == guid:
@@ -362,69 +218,108 @@ def _extract_from_json(file_path: Path) -> list[tuple[str, str, str]]:
 
 
 # ---------------------------------------------------------------------------
-# Workspace scanner
+# Per-file scanning
 # ---------------------------------------------------------------------------
 
 
-def scan_workspace(workspace_folder: str, workspaces_dir: Path, repo_root: Path) -> list[UnmappedGuid]:
-    """Scan all item files in one workspace folder and return unmapped GUIDs."""
-    workspace_dir = workspaces_dir / workspace_folder
-    rules = load_rules(workspace_dir / "parameter.yml")
+def scanned_item_type(file_path: Path) -> str | None:
+    """Return the item type of a file the scanner inspects, or None for files it skips."""
+    if file_path.name in SKIP_FILENAMES:
+        return None
+    if any(file_path.name.endswith(s) for s in SKIP_SUFFIXES) and file_path.name not in INCLUDED_METADATA_FILENAMES:
+        return None
+    if file_path.name != "notebook-content.py" and file_path.suffix != ".json":
+        return None
+    item_type = item_type_from_path(file_path)
+    return None if item_type == "Unknown" else item_type
 
-    logger.debug(f"  Loaded {len(rules)} find_replace rule(s) from parameter.yml " f"(incl. templates)")
 
-    unmapped: list[UnmappedGuid] = []
+def extract_guids(file_path: Path) -> list[tuple[str, str, str]]:
+    """Return (field_name, guid, context_line) tuples using the extractor for the file's format."""
+    if file_path.name == "notebook-content.py":
+        return _extract_from_notebook(file_path)
+    return _extract_from_json(file_path)
 
-    for file_path in workspace_dir.rglob("*"):
-        if not file_path.is_file():
-            continue
-        if file_path.name in SKIP_FILENAMES:
-            continue
-        if (
-            any(file_path.name.endswith(s) for s in SKIP_SUFFIXES)
-            and file_path.name not in INCLUDED_METADATA_FILENAMES
-        ):
-            continue
 
-        item_type = item_type_from_path(file_path)
-        if item_type == "Unknown":
-            continue
+def check_file(
+    workspace_folder: str,
+    file_path: Path,
+    workspace_dir: Path,
+    repo_root: Path,
+    item_type: str,
+    guid_entries: list[tuple[str, str, str]],
+    rules: list[FindReplaceRule],
+) -> list[UnmappedGuid]:
+    """Return the extracted GUIDs of one file that no rule covers.
 
-        # Determine which extractor to use
-        if file_path.name == "notebook-content.py":
-            guid_entries = _extract_from_notebook(file_path)
-        elif file_path.suffix == ".json":
-            guid_entries = _extract_from_json(file_path)
-        else:
-            continue
+    Extraction and coverage are separate steps so that watch mode can re-check
+    cached extractions against reloaded rules without reading the file again.
+    """
+    if not guid_entries:
+        return []
 
-        if not guid_entries:
-            continue
+    # Path relative to workspace root for filter matching
+    try:
+        file_rel_ws = file_path.relative_to(workspace_dir)
+    except ValueError:
+        file_rel_ws = file_path
 
-        # Path relative to workspace root for filter matching
-        try:
-            file_rel_ws = file_path.relative_to(workspace_dir)
-        except ValueError:
-            file_rel_ws = file_path
+    # Path relative to repo root for reporting
+    try:
+        file_rel_repo = file_path.relative_to(repo_root)
+    except ValueError:
+        file_rel_repo = file_path
 
-        # Path relative to repo root for reporting
-        try:
-            file_rel_repo = file_path.relative_to(repo_root)
-        except ValueError:
-            file_rel_repo = file_path
-
-        for field_name, guid, context in guid_entries:
-            if not is_covered(guid, context, file_rel_ws, item_type, rules):
-                unmapped.append(
-                    UnmappedGuid(
-                        workspace_folder=workspace_folder,
-                        relative_file=str(file_rel_repo).replace("\\", "/"),
-                        item_type=item_type,
-                        field_name=field_name,
-                        guid=guid,
-                        context=context[:120],  # truncate for readability
-                    )
+    unmapped: list[UnmappedGuid] = []
+    for field_name, guid, context in guid_entries:
+        if not is_covered(guid, context, file_rel_ws, item_type, rules):
+            unmapped.append(
+                UnmappedGuid(
+                    workspace_folder=workspace_folder,
+                    relative_file=str(file_rel_repo).replace("\\", "/"),
+                    item_type=item_type,
+                    field_name=field_name,
+                    guid=guid,
+                    context=context[:120],  # truncate for readability
                 )
+            )
+    return unmapped
+
+
+# ---------------------------------------------------------------------------
+# Workspace scanner
+# ---------------------------------------------------------------------------
+
+
+def scan_workspace(
+    workspace_folder: str,
+    workspaces_dir: Path,
+    repo_root: Path,
+    workspace: WorkspaceModel | None = None,
+) -> list[UnmappedGuid]:
+    """Scan all item files in one workspace folder and return unmapped GUIDs.
+
+    When a workspace model is supplied its compiled rules and file list are reused
+    instead of re-parsing parameter.yml and re-walking the folder.
+    """
+    workspace_dir = workspaces_dir / workspace_folder
+    if workspace is not None:
+        rules = list(workspace.rules)
+        candidate_files = [workspace_dir / relative for relative in workspace.files]
+    else:
+        rules = load_rules(workspace_dir / PARAMETER_FILE)
+        candidate_files = [path for path in workspace_dir.rglob("*") if path.is_file()]
+
+    logger.debug(f"  Loaded {len(rules)} find_replace rule(s) from parameter.yml " f"(incl. templates)")
+
+    unmapped: list[UnmappedGuid] = []
+    for file_path in candidate_files:
+        item_type = scanned_item_type(file_path)
+        if item_type is not None:
+            guid_entries = extract_guids(file_path)
+            unmapped.extend(
+                check_file(workspace_folder, file_path, workspace_dir, repo_root, item_type, guid_entries, rules)
+            )
 
     return unmapped
 
@@ -434,8 +329,10 @@ def scan_workspace(workspace_folder: str, workspaces_dir: Path, repo_root: Path)
 # ---------------------------------------------------------------------------
 
 
-def discover_workspaces(workspaces_dir: Path) -> list[str]:
+def discover_workspaces(workspaces_dir: Path, model: RepositoryModel | None = None) -> list[str]:
     """Return workspace folder names that contain a config.yml."""
+    if model is not None:
+        return model.folders
     folders = []
     for child in sorted(workspaces_dir.iterdir()):
         if child.is_dir() and (child / CONFIG_FILE).exists():
@@ -518,6 +415,17 @@ def main(argv: list[str] | None = None) -> int:
         default=None,
         help="Only scan this workspace folder name (optional)",
     )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running and report new and resolved findings whenever files change",
+    )
+    parser.add_argument(
+        "--poll_interval",
+        type=float,
+        default=None,
+        help="With --watch: poll for changes every N seconds instead of using inotify",
+    )
     args = parser.parse_args(argv)
 
     workspaces_dir = Path(args.workspaces_directory).resolve()
@@ -525,6 +433,26 @@ def main(argv: list[str] | None = None) -> int:
         logger.error(f"ERROR: workspaces directory not found: {workspaces_dir}")
         return EXIT_FAILURE
 
+    if args.watch:
+        return run_watch(workspaces_dir, args.workspace_filter, args.poll_interval)
+    return run_scan(workspaces_dir, args.workspace_filter)
+
+
+def run_scan(
+    workspaces_dir: Path,
+    workspace_filter: str | None = None,
+    model: RepositoryModel | None = None,
+) -> int:
+    """Scan every (or one filtered) workspace and report unmapped GUIDs.
+
+    Args:
+        workspaces_dir: Resolved path to the workspaces directory
+        workspace_filter: Only scan this workspace folder name (optional)
+        model: Optional pre-built workspace model shared with other phases
+
+    Returns:
+        EXIT_SUCCESS (0) when all GUIDs are covered, EXIT_FAILURE (1) otherwise.
+    """
     repo_root = workspaces_dir.parent
 
     import os
@@ -535,12 +463,14 @@ def main(argv: list[str] | None = None) -> int:
     logger.info("Fabric CI/CD - Unmapped ID Scanner")
     logger.info(SEPARATOR_LONG)
 
-    # Discover workspaces
-    all_workspaces = discover_workspaces(workspaces_dir)
-    if args.workspace_filter:
-        all_workspaces = [w for w in all_workspaces if w == args.workspace_filter]
+    # Discover workspaces (one walk + parse shared by every workspace scan)
+    if model is None:
+        model = load_workspace_model(workspaces_dir)
+    all_workspaces = discover_workspaces(workspaces_dir, model)
+    if workspace_filter:
+        all_workspaces = [w for w in all_workspaces if w == workspace_filter]
         if not all_workspaces:
-            logger.error(f"ERROR: No workspace named '{args.workspace_filter}' found in {workspaces_dir}")
+            logger.error(f"ERROR: No workspace named '{workspace_filter}' found in {workspaces_dir}")
             return EXIT_FAILURE
 
     if not all_workspaces:
@@ -553,7 +483,7 @@ def main(argv: list[str] | None = None) -> int:
     for workspace_folder in all_workspaces:
         logger.info(f"{SEPARATOR_SHORT}")
         logger.info(f"Workspace: {workspace_folder}")
-        unmapped = scan_workspace(workspace_folder, workspaces_dir, repo_root)
+        unmapped = scan_workspace(workspace_folder, workspaces_dir, repo_root, model.get(workspace_folder))
         if unmapped:
             logger.info(f"  [FAIL] {len(unmapped)} unmapped GUID(s) detected")
         else:
@@ -566,5 +496,203 @@ def main(argv: list[str] | None = None) -> int:
     return EXIT_FAILURE if all_unmapped else EXIT_SUCCESS
 
 
+# ---------------------------------------------------------------------------
+# Watch mode
+# ---------------------------------------------------------------------------
+
+# (relative_file, field_name, guid, context) identifies a finding across rescans
+FindingKey = tuple[str, str, str, str]
+
+
+def _finding_key(unmapped: UnmappedGuid) -> FindingKey:
+    return (unmapped.relative_file, unmapped.field_name, unmapped.guid, unmapped.context)
+
+
+class WatchSession:
+    """Scanner state kept in memory between filesystem events in --watch mode."""
+
+    def __init__(self, workspaces_dir: Path, workspace_filter: str | None = None):
+        self.workspaces_dir = workspaces_dir
+        self.repo_root = workspaces_dir.parent
+        self.workspace_filter = workspace_filter
+        self.rules: dict[str, list[FindReplaceRule]] = {}
+        # file -> (workspace folder, item type, extracted GUID entries)
+        self._extracted: dict[Path, tuple[str, str, list[tuple[str, str, str]]]] = {}
+        self._findings: dict[Path, list[UnmappedGuid]] = {}
+
+    @property
+    def findings(self) -> list[UnmappedGuid]:
+        """Return the current unmapped GUIDs of every watched workspace."""
+        return [u for path in sorted(self._findings) for u in self._findings[path]]
+
+    def discover(self) -> list[str]:
+        """Return the watched workspace folders (after --workspace_filter)."""
+        folders = discover_workspaces(self.workspaces_dir)
+        return [f for f in folders if not self.workspace_filter or f == self.workspace_filter]
+
+    def scan_all(self) -> None:
+        """Load rules and scan every file of the watched workspaces from scratch."""
+        self.rules.clear()
+        self._extracted.clear()
+        self._findings.clear()
+        for folder in self.discover():
+            self._add_workspace(folder)
+
+    def apply(self, changed: set[Path]) -> tuple[list[UnmappedGuid], list[UnmappedGuid]]:
+        """Update the state for the changed paths and return the (new, resolved) findings."""
+        before = {_finding_key(u): u for u in self.findings}
+
+        if self.workspaces_dir in changed:
+            self.scan_all()
+        else:
+            reload_rules = False
+            for path in sorted(changed):
+                reload_rules |= self._apply_path(path)
+            if reload_rules:
+                self._reload_rules()
+
+        after = {_finding_key(u): u for u in self.findings}
+        new = [u for key, u in after.items() if key not in before]
+        resolved = [u for key, u in before.items() if key not in after]
+        return new, resolved
+
+    def _apply_path(self, path: Path) -> bool:
+        """Rescan one changed path; return True when it may change the rules."""
+        try:
+            relative = path.relative_to(self.workspaces_dir)
+        except ValueError:
+            return False
+        folder = relative.parts[0]
+        if self.workspace_filter and folder != self.workspace_filter:
+            return False
+
+        if len(relative.parts) == 1 or relative.parts[1:] == (CONFIG_FILE,):
+            # Workspace folder or its config.yml appeared, disappeared or was renamed
+            self._forget(self.workspaces_dir / folder)
+            self.rules.pop(folder, None)
+            if (self.workspaces_dir / folder / CONFIG_FILE).is_file():
+                self._add_workspace(folder)
+            return False
+        if folder not in self.rules:
+            return False
+
+        if path.suffix in (".yml", ".yaml") and item_type_from_path(relative) == "Unknown":
+            return True  # parameter.yml or a parameter template (templates may be extended across workspaces)
+
+        self._forget(path)
+        if path.is_dir():
+            for file_path in path.rglob("*"):
+                if file_path.is_file():
+                    self._scan_file(folder, file_path)
+        elif path.is_file():
+            self._scan_file(folder, path)
+        return False
+
+    def _add_workspace(self, folder: str) -> None:
+        workspace_dir = self.workspaces_dir / folder
+        self.rules[folder] = load_rules(workspace_dir / PARAMETER_FILE)
+        for file_path in workspace_dir.rglob("*"):
+            if file_path.is_file():
+                self._scan_file(folder, file_path)
+
+    def _forget(self, prefix: Path) -> None:
+        for path in [p for p in self._extracted if p == prefix or p.is_relative_to(prefix)]:
+            del self._extracted[path]
+            self._findings.pop(path, None)
+
+    def _scan_file(self, folder: str, file_path: Path) -> None:
+        item_type = scanned_item_type(file_path)
+        if item_type is None:
+            return
+        self._extracted[file_path] = (folder, item_type, extract_guids(file_path))
+        self._check(file_path)
+
+    def _check(self, file_path: Path) -> None:
+        folder, item_type, guid_entries = self._extracted[file_path]
+        unmapped = check_file(
+            folder, file_path, self.workspaces_dir / folder, self.repo_root, item_type, guid_entries, self.rules[folder]
+        )
+        if unmapped:
+            self._findings[file_path] = unmapped
+        else:
+            self._findings.pop(file_path, None)
+
+    def _reload_rules(self) -> None:
+        """Reload every workspace's rules and re-check the cached GUIDs of those whose rules changed."""
+        for folder in list(self.rules):
+            rules = load_rules(self.workspaces_dir / folder / PARAMETER_FILE)
+            if rules == self.rules[folder]:
+                continue
+            logger.debug(f"  Reloaded {len(rules)} find_replace rule(s) for {folder}")
+            self.rules[folder] = rules
+            for file_path, (file_folder, _, _) in self._extracted.items():
+                if file_folder == folder:
+                    self._check(file_path)
+
+
+def report_changes(
+    new: list[UnmappedGuid], resolved: list[UnmappedGuid], changed_paths: int, elapsed_ms: float, total: int
+) -> None:
+    """Print the findings that appeared or were resolved by one batch of file changes."""
+    timestamp = datetime.now().strftime("%H:%M:%S")
+    status = "[FAIL]" if total else "[OK]"
+    logger.info(
+        f"[{timestamp}] {status} {changed_paths} change(s) checked in {elapsed_ms:.1f} ms: "
+        f"{len(new)} new, {len(resolved)} resolved, {total} unmapped GUID(s) in total"
+    )
+    for u in sorted(new, key=_finding_key):
+        logger.info(f"  + {u.guid}  {u.field_name}  {u.relative_file}")
+    for u in sorted(resolved, key=_finding_key):
+        logger.info(f"  - {u.guid}  {u.field_name}  {u.relative_file}")
+
+
+def run_watch(workspaces_dir: Path, workspace_filter: str | None = None, poll_interval: float | None = None) -> int:
+    """Scan once, then rescan changed files until interrupted.
+
+    Args:
+        workspaces_dir: Resolved path to the workspaces directory
+        workspace_filter: Only watch this workspace folder name (optional)
+        poll_interval: Poll every N seconds instead of using inotify (optional)
+
+    Returns:
+        EXIT_SUCCESS (0) when all GUIDs were covered when watching stopped, EXIT_FAILURE (1) otherwise.
+    """
+    from .fabric.watcher import create_watcher  # deferred: only the watch mode needs ctypes/select
+
+    logger.info(SEPARATOR_LONG)
+    logger.info("Fabric CI/CD - Unmapped ID Scanner (watch mode)")
+    logger.info(SEPARATOR_LONG)
+
+    session = WatchSession(workspaces_dir, workspace_filter)
+    if workspace_filter and not session.discover():
+        logger.error(f"ERROR: No workspace named '{workspace_filter}' found in {workspaces_dir}")
+        return EXIT_FAILURE
+
+    started = time.perf_counter()
+    session.scan_all()
+    logger.info(f"Scanned {len(session.rules)} workspace(s) in {(time.perf_counter() - started) * 1000:.0f} ms\n")
+    report_results(session.findings, is_github_actions=False)
+
+    watcher = create_watcher(
+        workspaces_dir, poll_interval or WATCH_POLL_INTERVAL_SECONDS, polling=poll_interval is not None
+    )
+    logger.info(f"\nWatching {workspaces_dir} ({watcher.backend}) - press Ctrl+C to stop")
+    try:
+        while True:
+            changed = watcher.wait()
+            if not changed:
+                continue
+            started = time.perf_counter()
+            new, resolved = session.apply(changed)
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            report_changes(new, resolved, len(changed), elapsed_ms, len(session.findings))
+    except KeyboardInterrupt:
+        logger.info("Stopped watching.")
+    finally:
+        watcher.close()
+
+    return EXIT_FAILURE if session.findings else EXIT_SUCCESS
+
+
 if __name__ == "__main__":
     sys.exit(main())
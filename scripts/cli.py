@@ -0,0 +1,485 @@
+"""Single-process ``fabric`` CLI: unmapped-ID scan, rule analysis, deployment plan, deploy and results merge.
+
+All subcommands share one workspace model, so the tree is walked and
+config.yml / parameter.yml / .platform files are parsed once per invocation.
+This module only parses arguments and dispatches: each subcommand calls the
+``run_*`` function of the module that implements it (``run_scan`` in
+check_unmapped_ids, ``run_generate_silver`` in fabric/silver, ...).
+``all`` runs the unmapped-ID gate and the deployment in the same process and
+overlaps the gate with the slow, side-effect-free deploy preparation (importing
+fabric_cicd and creating the Azure credential). Nothing is deployed unless the
+gate passes.
+
+Usage:
+    python -m scripts.cli scan --workspaces_directory workspaces
+    python -m scripts.cli preflight --workspaces_directory workspaces
+    python -m scripts.cli profile-rules --workspaces_directory workspaces --budget_ms 50
+    python -m scripts.cli rule-coverage --workspaces_directory workspaces --output_directory consolidated
+    python -m scripts.cli analyze-pipelines --workspaces_directory workspaces --diagram mermaid --output_directory dags
+    python -m scripts.cli lint-copyjobs --workspaces_directory workspaces --output_directory tuning
+    python -m scripts.cli convert-copyjobs --workspaces_directory workspaces --config incremental.yml --check
+    python -m scripts.cli generate-maintenance --workspaces_directory workspaces --zorder dbo.fact_sale=InvoiceDateKey
+    python -m scripts.cli generate-shortcuts --workspaces_directory workspaces --table_sizes table_sizes.yml
+    python -m scripts.cli generate-aggregates --workspaces_directory workspaces --spec gold_aggregates.yml
+    python -m scripts.cli generate-silver --workspaces_directory workspaces --spec silver_tables.yml
+    python -m scripts.cli plan --workspaces_directory workspaces --environment test --output_directory rendered
+    python -m scripts.cli deploy --workspaces_directory workspaces --environment dev
+    python -m scripts.cli all --workspaces_directory workspaces --environment dev
+    python -m scripts.cli deploy --workspaces_directory workspaces --environment test,prod
+    python -m scripts.cli deploy --workspaces_directory workspaces --environment dev --shard 2/4
+    python -m scripts.cli merge-results shard-results/ --output deployment-results.json
+    python -m scripts.cli generate-data --output_directory synthetic --fact_rows 100M
+    python -m scripts.cli benchmark --data_directory synthetic --output benchmark-results.json
+"""
+
+import argparse
+import importlib
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from .check_unmapped_ids import run_scan
+from .common.logger import configure_logging, get_logger, log_context
+from .deploy_to_fabric import environment_list, positive_int, run_deployment, run_plan, shard_spec
+from .fabric.aggregates import run_generate_aggregates
+from .fabric.auth import CredentialType, create_azure_credential
+from .fabric.config import (
+    AGGREGATE_LAKEHOUSE,
+    AGGREGATE_LAYER_FOLDER,
+    AGGREGATE_SOURCE_LAKEHOUSE,
+    AGGREGATE_SPEC_FILE,
+    BENCHMARK_RESULTS_FILE,
+    DEFAULT_MAX_WORKERS,
+    ENV_LOG_JSON_FILE,
+    EXIT_FAILURE,
+    EXIT_SUCCESS,
+    GATE_SUCCESS,
+    MAINTENANCE_LAKEHOUSE,
+    MAINTENANCE_LAYER_FOLDER,
+    MAINTENANCE_NOTEBOOK,
+    MAINTENANCE_PIPELINE,
+    MAINTENANCE_RETENTION_HOURS,
+    PROMOTION_GATES,
+    RESULTS_FILENAME,
+    RULE_PROFILE_BUDGET_MS,
+    SHORTCUT_SOURCE_LAKEHOUSE,
+    SILVER_LAKEHOUSE,
+    SILVER_LAYER_FOLDER,
+    SILVER_SOURCE_LAKEHOUSE,
+    SILVER_SPEC_FILE,
+    SYNTHETIC_CHUNK_ROWS,
+    SYNTHETIC_FACT_ROWS,
+    SYNTHETIC_SEED,
+    VALID_ENVIRONMENTS,
+)
+from .fabric.copyjob_incremental import run_convert_copyjobs
+from .fabric.copyjob_lint import run_lint_copyjobs
+from .fabric.maintenance import run_generate_maintenance
+from .fabric.medallion_benchmark import run_medallion_benchmark
+from .fabric.pipeline_analysis import DIAGRAM_FORMATS, DIAGRAM_MERMAID, run_analyze_pipelines
+from .fabric.preflight import log_preflight_report, run_preflight
+from .fabric.reporting import run_merge_results
+from .fabric.rule_coverage import run_rule_coverage
+from .fabric.rule_profiler import run_profile_rules
+from .fabric.shortcuts import run_generate_shortcuts
+from .fabric.silver import run_generate_silver
+from .fabric.synthetic_data import row_count, run_generate_data
+from .fabric.workspace_model import RepositoryModel, load_workspace_model
+
+logger = get_logger(__name__)
+
+
+def prepare_deployment() -> CredentialType:
+    """Import fabric_cicd and create the Azure credential (no API calls, safe to run early)."""
+    importlib.import_module("fabric_cicd")
+    return create_azure_credential()
+
+
+def run_all(
+    workspaces_dir: Path,
+    environment: str,
+    model: RepositoryModel,
+    resume: bool = False,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    gate: str = GATE_SUCCESS,
+    shard: tuple[int, int] | None = None,
+) -> int:
+    """Run the unmapped-ID gate and, if it passes, deploy in the same process."""
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="deploy-prepare") as executor:
+        preparation = executor.submit(prepare_deployment)
+
+        with log_context(environment=environment, phase="scan"):
+            scan_exit_code = run_scan(workspaces_dir, model=model)
+        if scan_exit_code != EXIT_SUCCESS:
+            logger.error("\n[FAIL] Unmapped ID gate failed - deployment skipped.\n")
+            return scan_exit_code
+
+        try:
+            token_credential: CredentialType | None = preparation.result()
+        except Exception:
+            # run_deployment recreates the credential and reports the error in its usual format
+            token_credential = None
+
+    return run_deployment(
+        str(workspaces_dir),
+        environment,
+        model=model,
+        token_credential=token_credential,
+        resume=resume,
+        max_workers=max_workers,
+        gate=gate,
+        shard=shard,
+    )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser with the scan, rule analysis, plan, deploy, all and merge-results subcommands."""
+    parser = argparse.ArgumentParser(prog="fabric", description="Fabric CI/CD: scan, plan and deploy workspaces")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    def add_common(
+        subparser: argparse.ArgumentParser, with_environment: bool, multiple_environments: bool = False
+    ) -> None:
+        subparser.add_argument(
+            "--workspaces_directory", required=True, help="Root directory containing workspace folders"
+        )
+        if multiple_environments:
+            subparser.add_argument(
+                "--environment",
+                required=True,
+                type=environment_list,
+                help="Target environment (dev/test/prod) or a comma-separated list deployed in promotion order",
+            )
+        elif with_environment:
+            subparser.add_argument(
+                "--environment",
+                required=True,
+                choices=sorted(VALID_ENVIRONMENTS),
+                help="Target environment (dev/test/prod)",
+            )
+
+    scan = subparsers.add_parser("scan", help="Fail if item files contain GUIDs without a find_replace rule")
+    add_common(scan, with_environment=False)
+    scan.add_argument("--workspace_filter", default=None, help="Only scan this workspace folder name")
+
+    preflight = subparsers.add_parser("preflight", help="Validate item definitions and parameter files (no API calls)")
+    add_common(preflight, with_environment=False)
+
+    profile = subparsers.add_parser(
+        "profile-rules", help="Time find_replace rules and fail on backtracking-prone regexes"
+    )
+    add_common(profile, with_environment=False)
+    profile.add_argument("--workspace_filter", default=None, help="Only profile this workspace folder name")
+    profile.add_argument(
+        "--budget_ms",
+        type=float,
+        default=RULE_PROFILE_BUDGET_MS,
+        help=f"Fail when one search of a rule takes longer (default: {RULE_PROFILE_BUDGET_MS:g} ms)",
+    )
+
+    coverage = subparsers.add_parser(
+        "rule-coverage", help="Report dead/shadowed find_replace rules and consolidate duplicates"
+    )
+    add_common(coverage, with_environment=False)
+    coverage.add_argument("--workspace_filter", default=None, help="Only analyze this workspace folder name")
+    coverage.add_argument(
+        "--output_directory", default=None, help="Write consolidated <workspace>/parameter.yml files here"
+    )
+
+    pipelines = subparsers.add_parser(
+        "analyze-pipelines", help="Report critical path, concurrency and risky policies of DataPipelines"
+    )
+    add_common(pipelines, with_environment=False)
+    pipelines.add_argument("--workspace_filter", default=None, help="Only analyze this workspace folder name")
+    pipelines.add_argument(
+        "--durations",
+        default=None,
+        help="YAML/JSON file of measured activity durations (pipeline -> activity -> seconds or list of seconds)",
+    )
+    pipelines.add_argument(
+        "--diagram", choices=DIAGRAM_FORMATS, default=DIAGRAM_MERMAID, help="Diagram format (default: mermaid)"
+    )
+    pipelines.add_argument(
+        "--output_directory", default=None, help="Write a <workspace>/<pipeline> diagram per pipeline here"
+    )
+
+    copyjobs = subparsers.add_parser(
+        "lint-copyjobs", help="Flag throughput-relevant CopyJob settings and generate per-environment overlays"
+    )
+    add_common(copyjobs, with_environment=False)
+    copyjobs.add_argument("--workspace_filter", default=None, help="Only lint this workspace folder name")
+    copyjobs.add_argument(
+        "--table_sizes", default=None, help="YAML/JSON file of table sizes in MB (table -> MB or environment -> MB)"
+    )
+    copyjobs.add_argument(
+        "--output_directory", default=None, help="Write a key_value_replace <workspace>/cp_tuning_parameters.yml here"
+    )
+
+    convert = subparsers.add_parser(
+        "convert-copyjobs", help="Convert CopyJob tables to watermark-based incremental loads and validate them"
+    )
+    add_common(convert, with_environment=False)
+    convert.add_argument("--workspace_filter", default=None, help="Only convert this workspace folder name")
+    convert.add_argument(
+        "--config", default=None, help="YAML per-table config (CopyJob -> table -> watermark_column, ...)"
+    )
+    convert.add_argument(
+        "--check", action="store_true", help="Write nothing; fail if a configured table is not converted yet"
+    )
+
+    maintenance = subparsers.add_parser(
+        "generate-maintenance", help="Generate the OPTIMIZE/VACUUM notebook for CopyJob tables and schedule it"
+    )
+    add_common(maintenance, with_environment=False)
+    maintenance.add_argument("--workspace_filter", default=None, help="Only generate for this workspace folder name")
+    maintenance.add_argument("--layer_folder", default=MAINTENANCE_LAYER_FOLDER, help="Folder of the notebook item")
+    maintenance.add_argument("--lakehouse", default=MAINTENANCE_LAKEHOUSE, help="Lakehouse whose tables to maintain")
+    maintenance.add_argument("--pipeline", default=MAINTENANCE_PIPELINE, help="DataPipeline to schedule it in")
+    maintenance.add_argument("--notebook", default=MAINTENANCE_NOTEBOOK, help="Display name of the notebook")
+    maintenance.add_argument(
+        "--zorder", action="append", default=[], help="Z-Order columns as table=column[,column] (repeatable)"
+    )
+    maintenance.add_argument("--no_vorder", action="store_true", help="Do not apply V-Order when optimizing")
+    maintenance.add_argument(
+        "--retention_hours",
+        type=positive_int,
+        default=MAINTENANCE_RETENTION_HOURS,
+        help=f"VACUUM retention in hours (minimum and default: {MAINTENANCE_RETENTION_HOURS})",
+    )
+    maintenance.add_argument(
+        "--check", action="store_true", help="Write nothing; fail if the generated files are out of date"
+    )
+
+    shortcuts = subparsers.add_parser(
+        "generate-shortcuts", help="Expose bronze tables in other lakehouses as OneLake shortcuts instead of copies"
+    )
+    add_common(shortcuts, with_environment=False)
+    shortcuts.add_argument("--workspace_filter", default=None, help="Only generate for this workspace folder name")
+    shortcuts.add_argument(
+        "--source_lakehouse", default=SHORTCUT_SOURCE_LAKEHOUSE, help="Lakehouse whose CopyJob tables are exposed"
+    )
+    shortcuts.add_argument(
+        "--target",
+        action="append",
+        default=[],
+        help="Target lakehouse and table patterns as lakehouse=schema.table[,pattern] (repeatable; "
+        "default: untransformed dimensions in silver and gold)",
+    )
+    shortcuts.add_argument(
+        "--table_sizes", default=None, help="YAML/JSON file of table sizes in MB to report the avoided copies"
+    )
+    shortcuts.add_argument(
+        "--check", action="store_true", help="Write nothing; fail if a shortcuts file is out of date"
+    )
+
+    aggregates = subparsers.add_parser(
+        "generate-aggregates", help="Generate incrementally refreshed gold aggregate notebooks from a spec"
+    )
+    add_common(aggregates, with_environment=False)
+    aggregates.add_argument("--workspace_filter", default=None, help="Only generate for this workspace folder name")
+    aggregates.add_argument(
+        "--spec",
+        default=None,
+        help=f"YAML aggregate spec for every workspace (default: <workspace>/{AGGREGATE_SPEC_FILE})",
+    )
+    aggregates.add_argument("--layer_folder", default=AGGREGATE_LAYER_FOLDER, help="Folder of the notebook items")
+    aggregates.add_argument("--lakehouse", default=AGGREGATE_LAKEHOUSE, help="Lakehouse holding the aggregates")
+    aggregates.add_argument(
+        "--source_lakehouse", default=AGGREGATE_SOURCE_LAKEHOUSE, help="Lakehouse of the source tables"
+    )
+    aggregates.add_argument(
+        "--check", action="store_true", help="Write nothing; fail if the generated files are out of date"
+    )
+
+    silver = subparsers.add_parser(
+        "generate-silver", help="Generate silver notebooks that MERGE-upsert bronze tables incrementally"
+    )
+    add_common(silver, with_environment=False)
+    silver.add_argument("--workspace_filter", default=None, help="Only generate for this workspace folder name")
+    silver.add_argument(
+        "--spec", default=None, help=f"YAML table spec for every workspace (default: <workspace>/{SILVER_SPEC_FILE})"
+    )
+    silver.add_argument("--layer_folder", default=SILVER_LAYER_FOLDER, help="Folder of the notebook items")
+    silver.add_argument("--lakehouse", default=SILVER_LAKEHOUSE, help="Lakehouse the tables are upserted into")
+    silver.add_argument(
+        "--source_lakehouse", default=SILVER_SOURCE_LAKEHOUSE, help="Lakehouse of the bronze tables"
+    )
+    silver.add_argument(
+        "--check", action="store_true", help="Write nothing; fail if the generated files are out of date"
+    )
+
+    plan = subparsers.add_parser("plan", help="Show deployment targets and optionally render parameterized files")
+    add_common(plan, with_environment=True)
+    plan.add_argument("--output_directory", default=None, help="Write the rendered tree for the environment here")
+    plan.add_argument("--id_map", default=None, help="YAML/JSON file with deployed workspace and item IDs")
+
+    deploy = subparsers.add_parser("deploy", help="Deploy all workspaces")
+    run_all_parser = subparsers.add_parser("all", help="Run the unmapped-ID gate and deploy in one process")
+    for subparser in (deploy, run_all_parser):
+        add_common(subparser, with_environment=True, multiple_environments=True)
+        subparser.add_argument(
+            "--resume",
+            action="store_true",
+            help="Skip workspaces already deployed by an earlier attempt of the same commit and environment",
+        )
+        subparser.add_argument(
+            "--max_workers",
+            type=positive_int,
+            default=DEFAULT_MAX_WORKERS,
+            help="Workspaces deployed concurrently, longest predicted first (default: 1)",
+        )
+        subparser.add_argument(
+            "--gate",
+            choices=PROMOTION_GATES,
+            default=GATE_SUCCESS,
+            help="With several environments: deploy the next only after the previous succeeded (default: success)",
+        )
+        subparser.add_argument(
+            "--shard",
+            type=shard_spec,
+            default=None,
+            help="Deploy only shard i of N (e.g. 2/4) of a size-balanced split, for CI matrices",
+        )
+
+    merge = subparsers.add_parser("merge-results", help="Combine per-shard deployment results into one file")
+    merge.add_argument("paths", nargs="+", help="deployment-results.json files or directories containing them")
+    merge.add_argument("--output", default=RESULTS_FILENAME, help=f"Merged results file (default: {RESULTS_FILENAME})")
+
+    data = subparsers.add_parser(
+        "generate-data", help="Write synthetic star-schema parquet like the bronze sources (needs the benchmark extra)"
+    )
+    data.add_argument("--output_directory", required=True, help="Directory for the dbo.<table>.parquet files")
+    data.add_argument(
+        "--fact_rows",
+        type=row_count,
+        default=SYNTHETIC_FACT_ROWS,
+        help=f"fact_sale rows, with an optional K/M/B suffix (e.g. 10M, 1B; default: {SYNTHETIC_FACT_ROWS:,})",
+    )
+    data.add_argument(
+        "--chunk_rows",
+        type=row_count,
+        default=SYNTHETIC_CHUNK_ROWS,
+        help=f"Fact rows generated and written at a time (default: {SYNTHETIC_CHUNK_ROWS:,})",
+    )
+    data.add_argument("--seed", type=int, default=SYNTHETIC_SEED, help="Random seed (same seed, same data)")
+
+    benchmark = subparsers.add_parser(
+        "benchmark", help="Benchmark bronze -> silver -> gold locally on generated data (needs the benchmark extra)"
+    )
+    benchmark.add_argument("--data_directory", required=True, help="Directory written by generate-data")
+    benchmark.add_argument(
+        "--batch_rows",
+        type=row_count,
+        default=SYNTHETIC_CHUNK_ROWS,
+        help=f"Fact rows transformed at a time (default: {SYNTHETIC_CHUNK_ROWS:,})",
+    )
+    benchmark.add_argument(
+        "--output", default=None, help=f"Write the stage results as JSON (e.g. {BENCHMARK_RESULTS_FILE})"
+    )
+
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Entry point for the ``fabric`` CLI."""
+    args = build_parser().parse_args(argv)
+    configure_logging(os.getenv(ENV_LOG_JSON_FILE))
+
+    if args.command == "merge-results":
+        return run_merge_results(args.paths, args.output)
+    if args.command == "generate-data":
+        return run_generate_data(Path(args.output_directory), args.fact_rows, args.chunk_rows, args.seed)
+    if args.command == "benchmark":
+        return run_medallion_benchmark(Path(args.data_directory), args.batch_rows, args.output)
+
+    workspaces_dir = Path(args.workspaces_directory).resolve()
+    try:
+        model = load_workspace_model(workspaces_dir)
+    except FileNotFoundError as e:
+        logger.error(f"ERROR: {e!s}")
+        return EXIT_FAILURE
+
+    if args.command == "scan":
+        with log_context(phase="scan"):
+            return run_scan(workspaces_dir, args.workspace_filter, model)
+    if args.command == "preflight":
+        with log_context(phase="preflight"):
+            report = run_preflight(workspaces_dir, model)
+            log_preflight_report(report)
+        return EXIT_FAILURE if report.issues else EXIT_SUCCESS
+    if args.command == "profile-rules":
+        return run_profile_rules(workspaces_dir, model, args.budget_ms, args.workspace_filter)
+    if args.command == "rule-coverage":
+        return run_rule_coverage(workspaces_dir, model, args.output_directory, args.workspace_filter)
+    if args.command == "analyze-pipelines":
+        return run_analyze_pipelines(
+            workspaces_dir, model, args.durations, args.diagram, args.output_directory, args.workspace_filter
+        )
+    if args.command == "lint-copyjobs":
+        return run_lint_copyjobs(workspaces_dir, model, args.table_sizes, args.output_directory, args.workspace_filter)
+    if args.command == "convert-copyjobs":
+        return run_convert_copyjobs(workspaces_dir, model, args.config, args.check, args.workspace_filter)
+    if args.command == "generate-maintenance":
+        return run_generate_maintenance(
+            workspaces_dir,
+            model,
+            args.layer_folder,
+            args.lakehouse,
+            args.pipeline,
+            args.notebook,
+            args.zorder,
+            not args.no_vorder,
+            args.retention_hours,
+            args.check,
+            args.workspace_filter,
+        )
+    if args.command == "generate-shortcuts":
+        return run_generate_shortcuts(
+            workspaces_dir,
+            model,
+            args.source_lakehouse,
+            args.target,
+            args.table_sizes,
+            args.check,
+            args.workspace_filter,
+        )
+    if args.command == "generate-aggregates":
+        return run_generate_aggregates(
+            workspaces_dir,
+            model,
+            args.spec,
+            args.layer_folder,
+            args.lakehouse,
+            args.source_lakehouse,
+            args.check,
+            args.workspace_filter,
+        )
+    if args.command == "generate-silver":
+        return run_generate_silver(
+            workspaces_dir,
+            model,
+            args.spec,
+            args.layer_folder,
+            args.lakehouse,
+            args.source_lakehouse,
+            args.check,
+            args.workspace_filter,
+        )
+    if args.command == "plan":
+        return run_plan(workspaces_dir, args.environment, model, args.output_directory, args.id_map)
+    if args.command == "deploy":
+        return run_deployment(
+            str(workspaces_dir),
+            args.environment,
+            model=model,
+            resume=args.resume,
+            max_workers=args.max_workers,
+            gate=args.gate,
+            shard=args.shard,
+        )
+    return run_all(workspaces_dir, args.environment, model, args.resume, args.max_workers, args.gate, args.shard)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,119 @@
-
-"""Logging configuration for Fabric deployment scripts."""
-
+"""Logging configuration for Fabric deployment scripts.
+
+By default every logger writes plain ``%(message)s`` lines synchronously to
+stdout. Entry points call ``configure_logging()`` to switch all script loggers
+to a non-blocking backend: records are put on an in-memory queue by a
+``QueueHandler`` and written by a ``QueueListener`` thread, so log calls on the
+deploy path never block on stdout. The listener renders the same plain-text
+format to stdout and can additionally write a JSON-lines file that carries the
+workspace/environment/phase context set with ``log_context()``. The queue is
+drained on normal exit (atexit) and before an uncaught exception's traceback is
+printed.
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
 import logging
 import sys
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from pathlib import Path
+from types import TracebackType
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from logging.handlers import QueueHandler, QueueListener
+
+PLAIN_FORMAT = "%(message)s"
+
+# Context fields attached to every record (None when not set)
+CONTEXT_FIELDS = ("workspace", "environment", "phase")
+
+_context: ContextVar[dict[str, str]] = ContextVar("fabric_log_context", default={})
+
+# Loggers created through setup_logger(); their handlers are swapped by configure_logging()
+_managed_loggers: set[str] = set()
+_queue_handler: QueueHandler | None = None
+_listener: QueueListener | None = None
+_hooks_installed = False
+
+
+@contextmanager
+def log_context(**fields: str | None) -> Iterator[None]:
+    """Attach context fields (workspace, environment, phase) to records logged inside the block.
+
+    Args:
+        **fields: Context values; None leaves an outer value unchanged
+
+    Raises:
+        ValueError: If a field is not one of CONTEXT_FIELDS
+    """
+    unknown = set(fields) - set(CONTEXT_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown log context field(s): {', '.join(sorted(unknown))}")
+
+    token = _context.set({**_context.get(), **{k: v for k, v in fields.items() if v is not None}})
+    try:
+        yield
+    finally:
+        _context.reset(token)
+
+
+class ContextFilter(logging.Filter):
+    """Copy the current log context onto each record.
+
+    Attached to the QueueHandler, so it runs in the thread that emits the
+    record (before it is queued), which is where the context variables are set.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        context = _context.get()
+        for field in CONTEXT_FIELDS:
+            if not hasattr(record, field):
+                setattr(record, field, context.get(field))
+        return True
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Render a record as one JSON object per line.
+
+    Records arrive through the queue, where QueueHandler.prepare has already
+    merged any traceback into the message and cleared ``exc_info``.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload: dict[str, object] = {
+            "timestamp": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage().strip("\n"),
+        }
+        for field in CONTEXT_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                payload[field] = value
+        return json.dumps(payload, ensure_ascii=False)
+
+
+def _create_console_handler() -> logging.Handler:
+    """Create the plain-text stdout handler."""
+    # Create formatter without timestamps for GitHub Actions (Actions adds timestamps)
+    # Format: Simple message format for clean CI/CD logs
+    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler.setLevel(logging.DEBUG)
+    console_handler.setFormatter(logging.Formatter(PLAIN_FORMAT))
+    return console_handler
+
+
+def _set_handler(logger: logging.Logger, handler: logging.Handler) -> None:
+    """Replace all handlers of a managed logger with a single handler."""
+    for existing in list(logger.handlers):
+        logger.removeHandler(existing)
+    logger.addHandler(handler)
 
 
 def setup_logger(name: str, level: str | None = None) -> logging.Logger:
@@ -25,17 +136,8 @@ def setup_logger(name: str, level: str | None = None) -> logging.Logger:
 
     # Only add handler if logger doesn't have handlers (avoid duplicates)
     if not logger.handlers:
-        # Create console handler with formatter
-        console_handler = logging.StreamHandler(sys.stdout)
-        console_handler.setLevel(logging.DEBUG)
-
-        # Create formatter without timestamps for GitHub Actions (Actions adds timestamps)
-        # Format: Simple message format for clean CI/CD logs
-        formatter = logging.Formatter("%(message)s")
-        console_handler.setFormatter(formatter)
-
-        # Add handler to logger
-        logger.addHandler(console_handler)
+        logger.addHandler(_queue_handler if _queue_handler is not None else _create_console_handler())
+    _managed_loggers.add(name)
 
     # Prevent propagation to root logger to avoid duplicate messages
     logger.propagate = False
@@ -53,3 +155,81 @@ def get_logger(name: str) -> logging.Logger:
         Logger instance
     """
     return setup_logger(name)
+
+
+def configure_logging(json_file: str | Path | None = None) -> None:
+    """Switch all script loggers to the queue-based backend.
+
+    Calling it again restarts the backend with the new sinks.
+
+    Args:
+        json_file: Optional path of a JSON-lines log file (appended to)
+    """
+    global _queue_handler, _listener
+
+    # Deferred: logging.handlers pulls in socket/pickle, not needed on fast-fail paths
+    import queue
+    from logging.handlers import QueueHandler, QueueListener
+
+    shutdown_logging()
+
+    handlers = [_create_console_handler()]
+    if json_file:
+        json_path = Path(json_file)
+        json_path.parent.mkdir(parents=True, exist_ok=True)
+        json_handler = logging.FileHandler(json_path, mode="a", encoding="utf-8")
+        json_handler.setLevel(logging.DEBUG)
+        json_handler.setFormatter(JsonLinesFormatter())
+        handlers.append(json_handler)
+
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.addFilter(ContextFilter())
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+
+    _queue_handler, _listener = queue_handler, listener
+    for name in _managed_loggers:
+        _set_handler(logging.getLogger(name), queue_handler)
+
+    _install_exit_hooks()
+
+
+def shutdown_logging() -> None:
+    """Drain the queue, close the sinks and restore synchronous stdout logging.
+
+    Safe to call multiple times and when the queue backend was never configured.
+    """
+    global _queue_handler, _listener
+
+    if _listener is None:
+        return
+
+    listener, _listener, _queue_handler = _listener, None, None
+    for name in _managed_loggers:
+        _set_handler(logging.getLogger(name), _create_console_handler())
+
+    listener.stop()
+    for handler in listener.handlers:
+        handler.flush()
+        handler.close()
+
+
+def _excepthook(
+    exc_type: type[BaseException], exc_value: BaseException, exc_traceback: TracebackType | None
+) -> None:
+    """Flush queued log lines before the default hook prints the traceback."""
+    shutdown_logging()
+    sys.__excepthook__(exc_type, exc_value, exc_traceback)
+
+
+def _install_exit_hooks() -> None:
+    """Register the flush-on-exit and flush-on-crash hooks once per process."""
+    global _hooks_installed
+
+    if _hooks_installed:
+        return
+    atexit.register(shutdown_logging)
+    if sys.excepthook is sys.__excepthook__:
+        sys.excepthook = _excepthook
+    _hooks_installed = True
@@ -1,37 +1,97 @@
 
-"""Deploy workspaces to Fabric via GitHub Actions with continue-on-failure support"""
+"""Deploy workspaces to Fabric via GitHub Actions with continue-on-failure support
+
+fabric_cicd and azure.identity are imported on first use so that --help,
+argument errors and validation failures return without paying their import
+cost (see scripts/measure_startup.py and tests/test_startup_budget.py).
+"""
 
 import argparse
-import json
+import contextvars
 import os
 import sys
+import threading
 import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
 import yaml
-from fabric_cicd import append_feature_flag, change_log_level, deploy_with_config  # type: ignore[import-untyped]
 
 # Import local modules using relative imports
-from .common.logger import get_logger
+from .common.logger import configure_logging, get_logger, log_context
 from .fabric.auth import CredentialType, create_azure_credential
+from .fabric.checkpoint import DeploymentCheckpoint
 from .fabric.config import (
     CONFIG_FILE,
+    DEFAULT_MAX_WORKERS,
     ENV_ACTIONS_RUNNER_DEBUG,
+    ENV_LOG_JSON_FILE,
+    ENV_METRICS_TEXTFILE,
+    ENV_PUSHGATEWAY_URL,
     EXIT_FAILURE,
     EXIT_SUCCESS,
+    GATE_SUCCESS,
+    PROCESS_WIDE_CONFIG_SECTIONS,
+    PROMOTION_GATES,
     RESULTS_FILENAME,
+    RESULTS_STREAM_FILENAME,
     SEPARATOR_LONG,
     SEPARATOR_SHORT,
     VALID_ENVIRONMENTS,
 )
-from .fabric.reporting import build_deployment_results_json, print_deployment_summary
+from .fabric.environments import parse_environments
+from .fabric.metrics import export_metrics
+from .fabric.preflight import log_preflight_report, run_preflight
+from .fabric.rendering import EnvironmentIds
+from .fabric.reporting import (
+    build_deployment_results_json,
+    build_fanout_results_json,
+    print_deployment_summary,
+    print_fanout_summary,
+    write_json_atomic,
+)
+from .fabric.results_stream import ResultsStream
+from .fabric.retry import SKIPPED, RetryController, RetryOutcome, RetryPolicy, classify_error
+from .fabric.scheduling import (
+    WorkspacePrediction,
+    load_historical_durations,
+    lpt_order,
+    partition_workspaces,
+    predict_durations,
+    simulate_makespan,
+)
 from .fabric.types import DeploymentResult, DeploymentSummary
+from .fabric.workspace_model import RepositoryModel, WorkspaceModel, load_workspace_model
+from .render_parameters import load_id_map, render_workspace
 
 # Initialize logger
 logger = get_logger(__name__)
 
 
+def deploy_with_config(**kwargs: Any) -> Any:
+    """Import fabric_cicd on first use and call its deploy_with_config."""
+    from fabric_cicd import deploy_with_config as _deploy_with_config  # type: ignore[import-untyped]
+
+    return _deploy_with_config(**kwargs)
+
+
+def append_feature_flag(feature: str) -> None:
+    """Import fabric_cicd on first use and enable a feature flag."""
+    from fabric_cicd import append_feature_flag as _append_feature_flag  # type: ignore[import-untyped]
+
+    _append_feature_flag(feature)
+
+
+def change_log_level(level: str) -> None:
+    """Import fabric_cicd on first use and change its log level."""
+    from fabric_cicd import change_log_level as _change_log_level  # type: ignore[import-untyped]
+
+    _change_log_level(level)
+
+
 def load_workspace_config(workspace_folder: str, workspaces_dir: str) -> dict[str, Any]:
     """Load config.yml for a workspace.
 
@@ -79,11 +139,12 @@ def get_workspace_name_from_config(config: dict[str, Any], environment: str) ->
         ) from None
 
 
-def get_workspace_folders(workspaces_dir: str) -> list[str]:
+def get_workspace_folders(workspaces_dir: str, model: RepositoryModel | None = None) -> list[str]:
     """Get all workspace folders from the workspaces directory.
 
     Args:
         workspaces_dir: Root directory containing workspace folders
+        model: Optional pre-built workspace model (avoids another directory walk)
 
     Returns:
         Sorted list of workspace folder names that contain config.yml
@@ -91,13 +152,16 @@ def get_workspace_folders(workspaces_dir: str) -> list[str]:
     Raises:
         FileNotFoundError: If workspaces directory doesn't exist
     """
-    workspaces_path = Path(workspaces_dir)
-    if not workspaces_path.exists():
-        raise FileNotFoundError(f"Workspaces directory not found: {workspaces_dir}")
+    if model is not None:
+        workspace_folders = model.folders
+    else:
+        workspaces_path = Path(workspaces_dir)
+        if not workspaces_path.exists():
+            raise FileNotFoundError(f"Workspaces directory not found: {workspaces_dir}")
 
-    workspace_folders = [
-        folder.name for folder in workspaces_path.iterdir() if folder.is_dir() and (folder / CONFIG_FILE).exists()
-    ]
+        workspace_folders = [
+            folder.name for folder in workspaces_path.iterdir() if folder.is_dir() and (folder / CONFIG_FILE).exists()
+        ]
 
     if not workspace_folders:
         raise ValueError(
@@ -113,6 +177,8 @@ def deploy_workspace(
     workspaces_dir: str,
     environment: str,
     token_credential: CredentialType,
+    workspace: WorkspaceModel | None = None,
+    retry: RetryController | None = None,
 ) -> DeploymentResult:
     """Deploy a single workspace using config.yml.
 
@@ -124,18 +190,22 @@ def deploy_workspace(
         workspaces_dir: Root directory containing workspace folders
         environment: Target environment (dev/test/prod)
         token_credential: Azure credential for authentication
+        workspace: Optional workspace model with the already-parsed config.yml
+        retry: Optional run-wide retry controller; transient failures are retried with backoff
 
     Returns:
         DeploymentResult object with success status and error message if applicable.
     """
     workspace_name = ""  # Initialize for error handling
+    start_time = time.time()
+    outcome = RetryOutcome()
     try:
         logger.info(f"\n{SEPARATOR_SHORT}")
         logger.info(f"Deploying workspace: {workspace_folder}")
         logger.info(f"{SEPARATOR_SHORT}\n")
 
-        # Load workspace config
-        config = load_workspace_config(workspace_folder, workspaces_dir)
+        # Load workspace config (already parsed when a workspace model is supplied)
+        config = workspace.config if workspace is not None else load_workspace_config(workspace_folder, workspaces_dir)
         workspace_name = get_workspace_name_from_config(config, environment)
         config_file_path = str(Path(workspaces_dir) / workspace_folder / CONFIG_FILE)
 
@@ -145,12 +215,28 @@ def deploy_workspace(
 
         # Deploy using config.yml
         logger.info("-> Deploying items using config-based deployment...")
-        deploy_with_config(
-            config_file_path=config_file_path, environment=environment, token_credential=token_credential
-        )
+
+        def deploy() -> None:
+            deploy_with_config(
+                config_file_path=config_file_path, environment=environment, token_credential=token_credential
+            )
+
+        if retry is not None:
+            retry.call(deploy, outcome)
+        else:
+            outcome.attempts += 1
+            deploy()
 
         logger.info(f"\n[OK] Deployment to {workspace_name} completed successfully!\n")
-        return DeploymentResult(workspace_folder=workspace_folder, workspace_name=workspace_name, success=True)
+        return DeploymentResult(
+            workspace_folder=workspace_folder,
+            workspace_name=workspace_name,
+            success=True,
+            duration=time.time() - start_time,
+            attempts=outcome.attempts,
+            throttled=outcome.throttled,
+            items=len(workspace.items) if workspace is not None else 0,
+        )
 
     except Exception as e:
         error_message = str(e)
@@ -161,10 +247,14 @@ def deploy_workspace(
             workspace_name=workspace_name if workspace_name else workspace_folder,
             success=False,
             error_message=error_message,
+            duration=time.time() - start_time,
+            attempts=outcome.attempts,
+            throttled=outcome.throttled,
+            error_kind=outcome.error_kind or classify_error(e),
         )
 
 
-def discover_workspace_folders(workspaces_directory: str) -> list[str]:
+def discover_workspace_folders(workspaces_directory: str, model: RepositoryModel | None = None) -> list[str]:
     """Discover and return all workspace folders to deploy.
 
     Automatically discovers all workspace folders in the workspaces directory
@@ -172,6 +262,7 @@ def discover_workspace_folders(workspaces_directory: str) -> list[str]:
 
     Args:
         workspaces_directory: Root directory containing workspace folders
+        model: Optional pre-built workspace model (avoids another directory walk)
 
     Returns:
         Sorted list of workspace folder names to deploy
@@ -180,7 +271,7 @@ def discover_workspace_folders(workspaces_directory: str) -> list[str]:
         ValueError: If no workspace folders are found
         FileNotFoundError: If workspaces directory doesn't exist
     """
-    workspace_folders = get_workspace_folders(workspaces_directory)
+    workspace_folders = get_workspace_folders(workspaces_directory, model)
     logger.info(f"-> Discovered {len(workspace_folders)} workspace(s): {', '.join(workspace_folders)}\n")
     return workspace_folders
 
@@ -207,37 +298,149 @@ def deploy_all_workspaces(
     workspaces_directory: str,
     environment: str,
     token_credential: CredentialType,
+    model: RepositoryModel | None = None,
+    results_stream: ResultsStream | None = None,
+    checkpoint: DeploymentCheckpoint | None = None,
+    retry: RetryController | None = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
 ) -> list[DeploymentResult]:
     """Deploy all specified workspaces and return results.
 
     Workspaces are pre-provisioned by Terraform. This function only deploys items
-    into already-existing workspaces.
+    into already-existing workspaces. Workspaces are started in the given order;
+    with ``max_workers`` > 1 up to that many deploy concurrently. Callers must not
+    deploy concurrently workspaces whose config.yml sets process-wide sections;
+    run_deployment_pipeline limits the workers with worker_limit.
 
     Args:
         workspace_folders: List of workspace folder names to deploy
         workspaces_directory: Root directory containing workspace folders
         environment: Target environment (dev/test/prod)
         token_credential: Azure credential for authentication
+        model: Optional workspace model shared across all workspace deployments
+        results_stream: Optional stream that records each result as soon as it completes
+        checkpoint: Optional checkpoint; completed workspaces are skipped and new successes recorded
+        retry: Optional run-wide retry controller; once its circuit breaker opens the rest is skipped
+        max_workers: Number of workspaces deployed concurrently
 
     Returns:
-        List of DeploymentResult objects, one per workspace
+        List of DeploymentResult objects, one per workspace, in the given order
     """
-    results: list[DeploymentResult] = []
+    total = len(workspace_folders)
+    results: list[DeploymentResult | None] = [None] * total
+    # Guards the checkpoint file and the results stream, shared by the worker threads
+    lock = threading.Lock()
+
+    def process(index: int, workspace_folder: str) -> None:
+        position = f"[{index + 1}/{total}]"
+        if checkpoint is not None and checkpoint.is_completed(workspace_folder):
+            logger.info(f"{position} [SKIP] {workspace_folder}: deployed in a previous attempt")
+            result = checkpoint.resumed_result(workspace_folder)
+        elif retry is not None and retry.is_open:
+            logger.error(f"{position} [SKIP] {workspace_folder}: circuit breaker open")
+            result = DeploymentResult(
+                workspace_folder=workspace_folder,
+                workspace_name=workspace_folder,
+                success=False,
+                error_message=(
+                    f"Skipped: circuit breaker opened after {retry.consecutive_transient_failures} "
+                    "consecutive workspaces failed with transient errors"
+                ),
+                attempts=0,
+                error_kind=SKIPPED,
+            )
+        else:
+            logger.info(f"{position} Processing workspace: {workspace_folder}")
+
+            with log_context(workspace=workspace_folder, environment=environment, phase="deploy"):
+                result = deploy_workspace(
+                    workspace_folder=workspace_folder,
+                    workspaces_dir=workspaces_directory,
+                    environment=environment,
+                    token_credential=token_credential,
+                    workspace=model.get(workspace_folder) if model is not None else None,
+                    retry=retry,
+                )
+            if result.success and checkpoint is not None:
+                with lock:
+                    checkpoint.mark_completed(result)
+
+        results[index] = result
+        if results_stream is not None:
+            with lock:
+                results_stream.workspace_completed(result)
+
+    logger.info(f"Starting deployment of {total} workspace(s) with {max_workers} worker(s)...\n")
+    if max_workers <= 1 or total <= 1:
+        for index, workspace_folder in enumerate(workspace_folders):
+            process(index, workspace_folder)
+    else:
+        with ThreadPoolExecutor(max_workers=min(max_workers, total), thread_name_prefix="deploy") as executor:
+            # Each task runs in a copy of the caller's context so log_context() fields reach the workers
+            futures = [
+                executor.submit(contextvars.copy_context().run, process, index, workspace_folder)
+                for index, workspace_folder in enumerate(workspace_folders)
+            ]
+            for future in futures:
+                future.result()
+
+    return [result for result in results if result is not None]
+
+
+def worker_limit(model: RepositoryModel, max_workers: int) -> int:
+    """Return the number of workspaces that may deploy concurrently.
+
+    fabric_cicd applies the ``constants`` and ``features`` sections of a
+    config.yml to module globals (``fabric_cicd.constants``, ``FEATURE_FLAG``),
+    which concurrent deploys in one process would overwrite for each other.
+    Deployment stays sequential when any workspace sets one of them.
+    """
+    if max_workers <= 1:
+        return max_workers
+    shared = [
+        workspace.folder
+        for workspace in model.workspaces
+        if any(section in workspace.config for section in PROCESS_WIDE_CONFIG_SECTIONS)
+    ]
+    if shared:
+        logger.warning(
+            f"[WARN] Deploying sequentially instead of with {max_workers} workers: the config.yml of "
+            f"{', '.join(shared)} sets {' or '.join(PROCESS_WIDE_CONFIG_SECTIONS)}, which fabric_cicd applies "
+            "process-wide"
+        )
+        return 1
+    return max_workers
 
-    logger.info(f"Starting deployment of {len(workspace_folders)} workspace(s)...\n")
-    for i, workspace_folder in enumerate(workspace_folders, 1):
-        logger.info(f"[{i}/{len(workspace_folders)}] Processing workspace: {workspace_folder}")
 
-        result = deploy_workspace(
-            workspace_folder=workspace_folder,
-            workspaces_dir=workspaces_directory,
-            environment=environment,
-            token_credential=token_credential,
-        )
+def positive_int(value: str) -> int:
+    """argparse type for integers >= 1."""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"must be an integer, got '{value}'") from None
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be >= 1, got {number}")
+    return number
 
-        results.append(result)
 
-    return results
+def environment_list(value: str) -> str:
+    """argparse type for one environment or a comma-separated list (normalised to promotion order)."""
+    try:
+        return ",".join(parse_environments(value))
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e)) from None
+
+
+def shard_spec(value: str) -> tuple[int, int]:
+    """argparse type for ``i/N`` (1 <= i <= N): deploy only shard i of N."""
+    index_text, _, count_text = value.partition("/")
+    try:
+        index, count = int(index_text), int(count_text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"must look like i/N (e.g. 2/4), got '{value}'") from None
+    if not 1 <= index <= count:
+        raise argparse.ArgumentTypeError(f"shard index must be between 1 and {count}, got '{value}'")
+    return index, count
 
 
 def parse_cli_args() -> argparse.Namespace:
@@ -246,10 +449,32 @@ def parse_cli_args() -> argparse.Namespace:
     parser.add_argument("--workspaces_directory", type=str, required=True, help="Root directory containing workspace folders")
     parser.add_argument(
         "--environment",
-        type=str,
+        type=environment_list,
         required=True,
-        choices=list(VALID_ENVIRONMENTS),
-        help="Target environment (dev/test/prod)",
+        help="Target environment (dev/test/prod) or a comma-separated list deployed in promotion order",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Skip workspaces already deployed by an earlier attempt of the same commit and environment",
+    )
+    parser.add_argument(
+        "--max_workers",
+        type=positive_int,
+        default=DEFAULT_MAX_WORKERS,
+        help="Workspaces deployed concurrently, longest predicted first (default: 1)",
+    )
+    parser.add_argument(
+        "--gate",
+        choices=PROMOTION_GATES,
+        default=GATE_SUCCESS,
+        help="With several environments: deploy the next only after the previous succeeded (default: success)",
+    )
+    parser.add_argument(
+        "--shard",
+        type=shard_spec,
+        default=None,
+        help="Deploy only shard i of N (e.g. 2/4) of a size-balanced split, for CI matrices",
     )
     return parser.parse_args()
 
@@ -284,62 +509,321 @@ def log_deployment_header(environment: str, workspaces_directory: str) -> None:
     logger.info(f"{SEPARATOR_LONG}\n")
 
 
+def schedule_workspaces(
+    workspace_folders: list[str], environment: str, model: RepositoryModel | None
+) -> list[WorkspacePrediction]:
+    """Order workspaces longest predicted deploy first (LPT) and log the predictions."""
+    schedule = lpt_order(predict_durations(workspace_folders, model, load_historical_durations(environment)))
+    logger.info("-> Deployment order (longest predicted first):")
+    for prediction in schedule:
+        logger.info(f"   {prediction.folder}: ~{prediction.seconds:.0f}s ({prediction.source})")
+    return schedule
+
+
 def run_deployment_pipeline(
-    workspaces_directory: str, environment: str, token_credential: CredentialType
+    workspaces_directory: str,
+    environment: str,
+    token_credential: CredentialType,
+    model: RepositoryModel | None = None,
+    results_stream: ResultsStream | None = None,
+    resume: bool = False,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    shard: tuple[int, int] | None = None,
 ) -> DeploymentSummary:
-    """Execute workspace discovery + deployment and return a summary."""
-    workspace_folders = discover_workspace_folders(workspaces_directory)
+    """Execute workspace discovery + deployment and return a summary.
+
+    Progress is checkpointed per commit + environment; with ``resume`` workspaces
+    completed by an earlier attempt of the same commit are skipped. Workspaces are
+    deployed longest predicted first; the predicted and actual makespan are logged.
+    With ``shard`` (index, count) only that shard of the discovered workspaces is deployed.
+    """
+    if model is None:
+        model = load_workspace_model(workspaces_directory)
+    max_workers = worker_limit(model, max_workers)
+    workspace_folders = discover_workspace_folders(workspaces_directory, model)
+    if shard is not None:
+        index, count = shard
+        workspace_folders = sorted(partition_workspaces(workspace_folders, model, count)[index - 1])
+        logger.info(f"-> Shard {index}/{count}: {', '.join(workspace_folders) or 'no workspaces'}\n")
+    if results_stream is not None:
+        results_stream.workspaces_discovered(workspace_folders)
+    checkpoint = DeploymentCheckpoint.open(environment, model.fingerprint, resume)
+    retry = RetryController(RetryPolicy.from_env())
+    schedule = schedule_workspaces(workspace_folders, environment, model)
+    predicted_makespan = simulate_makespan(
+        (p.seconds for p in schedule if not checkpoint.is_completed(p.folder)), max_workers
+    )
 
     deployment_start_time = time.time()
     results = deploy_all_workspaces(
-        workspace_folders=workspace_folders,
+        workspace_folders=[prediction.folder for prediction in schedule],
         workspaces_directory=workspaces_directory,
         environment=environment,
         token_credential=token_credential,
+        model=model,
+        results_stream=results_stream,
+        checkpoint=checkpoint,
+        retry=retry,
+        max_workers=max_workers,
     )
     deployment_duration = time.time() - deployment_start_time
+    logger.info(
+        f"\n-> Makespan: predicted {predicted_makespan:.1f}s, actual {deployment_duration:.1f}s "
+        f"({max_workers} worker(s))"
+    )
 
-    return DeploymentSummary(environment=environment, duration=deployment_duration, results=results)
+    return DeploymentSummary(
+        environment=environment,
+        duration=deployment_duration,
+        results=results,
+        resumed=checkpoint.resumed,
+        circuit_open=retry.is_open,
+        commit_sha=checkpoint.commit_sha,
+        finished_at=datetime.now(timezone.utc).isoformat(),
+        shard=f"{shard[0]}/{shard[1]}" if shard is not None else "",
+    )
 
 
 def write_deployment_results(summary: DeploymentSummary) -> None:
-    """Write deployment result payload to disk for workflow summary scripts."""
-    deployment_results_json = build_deployment_results_json(summary)
-    with open(RESULTS_FILENAME, "w", encoding="utf-8") as f:
-        json.dump(deployment_results_json, f, indent=2)
+    """Write deployment result payload to disk for workflow summary scripts and export metrics."""
+    write_results_payload(build_deployment_results_json(summary))
+
+
+def write_results_payload(deployment_results_json: dict[str, Any]) -> None:
+    """Write a results payload atomically and export its metrics."""
+    write_json_atomic(RESULTS_FILENAME, deployment_results_json)
     logger.info(f"\n-> Deployment results written to {RESULTS_FILENAME}")
+    export_metrics(deployment_results_json, os.getenv(ENV_METRICS_TEXTFILE), os.getenv(ENV_PUSHGATEWAY_URL))
 
 
-def main():
-    """Main deployment orchestration."""
-    configure_runtime()
-    args = parse_cli_args()
+def deploy_environments(
+    workspaces_directory: str,
+    environments: list[str],
+    token_credential: CredentialType,
+    model: RepositoryModel,
+    results_stream: ResultsStream,
+    resume: bool = False,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    gate: str = GATE_SUCCESS,
+    shard: tuple[int, int] | None = None,
+) -> tuple[list[DeploymentSummary], list[str]]:
+    """Deploy the same workspace model to several environments in promotion order.
+
+    The workspace model and the credential are shared by all environments. With
+    the ``success`` gate an environment is only deployed when the previous one
+    deployed without failures; once the gate closes, every later environment is
+    skipped.
 
-    workspaces_directory = args.workspaces_directory
-    environment = args.environment
+    Returns:
+        Summaries of the deployed environments and the environments skipped by the gate
+    """
+    summaries: list[DeploymentSummary] = []
+    gated: list[str] = []
+    blocked_by = ""
+
+    for environment in environments:
+        if not blocked_by and gate == GATE_SUCCESS and summaries and summaries[-1].failed_count:
+            blocked_by = summaries[-1].environment
+        if blocked_by:
+            logger.error(f"\n[SKIP] {environment.upper()}: promotion gate closed - {blocked_by} had failures\n")
+            results_stream.environment_gated(environment, blocked_by)
+            gated.append(environment)
+            continue
+
+        with log_context(environment=environment):
+            logger.info(f"\n{SEPARATOR_LONG}")
+            logger.info(f"ENVIRONMENT: {environment.upper()}")
+            logger.info(SEPARATOR_LONG)
+            results_stream.environment_started(environment)
+            summary = run_deployment_pipeline(
+                workspaces_directory, environment, token_credential, model, results_stream, resume, max_workers, shard
+            )
+            results_stream.environment_completed(summary)
+            print_deployment_summary(summary)
+        summaries.append(summary)
+
+    return summaries, gated
+
+
+def run_plan(
+    workspaces_dir: Path,
+    environment: str,
+    model: RepositoryModel,
+    output_directory: str | None = None,
+    id_map_file: str | None = None,
+) -> int:
+    """Log what a deployment would do and optionally render the parameterized tree.
+
+    Returns:
+        EXIT_SUCCESS, or EXIT_FAILURE if a workspace has no name for the environment
+    """
+    id_map = load_id_map(Path(id_map_file) if id_map_file else None)
+    exit_code = EXIT_SUCCESS
 
-    log_deployment_header(environment, workspaces_directory)
+    logger.info(SEPARATOR_LONG)
+    logger.info(f"DEPLOYMENT PLAN - {environment.upper()}")
+    logger.info(SEPARATOR_LONG)
+
+    for workspace in model.workspaces:
+        with log_context(workspace=workspace.folder, environment=environment, phase="plan"):
+            if not _plan_workspace(workspaces_dir, environment, workspace, output_directory, id_map):
+                exit_code = EXIT_FAILURE
+
+    logger.info(f"\n{SEPARATOR_LONG}")
+    return exit_code
 
+
+def _plan_workspace(
+    workspaces_dir: Path,
+    environment: str,
+    workspace: WorkspaceModel,
+    output_directory: str | None,
+    id_map: dict[str, dict[str, EnvironmentIds]],
+) -> bool:
+    """Log the plan for one workspace; return False if it has no name for the environment."""
+    logger.info(SEPARATOR_SHORT)
     try:
-        validate_environment(environment)
-        token_credential = create_azure_credential()
-        summary = run_deployment_pipeline(workspaces_directory, environment, token_credential)
-        write_deployment_results(summary)
-        print_deployment_summary(summary)
-
-        if summary.failed_count > 0:
-            logger.warning(f"\nDeployment completed with {summary.failed_count} failure(s)\n")
-            sys.exit(EXIT_FAILURE)
-        else:
+        target = get_workspace_name_from_config(workspace.config, environment)
+    except KeyError as e:
+        logger.error(f"[FAIL] {workspace.folder}: {e.args[0]}")
+        return False
+
+    item_counts = Counter(item.item_type for item in workspace.items)
+    logger.info(f"Workspace: {workspace.folder} -> {target}")
+    logger.info(f"  Items: {len(workspace.items)} ({', '.join(f'{n} {t}' for t, n in sorted(item_counts.items()))})")
+    logger.info(f"  find_replace rules: {len(workspace.rules)}")
+
+    if output_directory:
+        stats = render_workspace(
+            workspace.folder, workspaces_dir, Path(output_directory).resolve(), [environment], id_map, workspace
+        )
+        logger.info(f"  Rendered {stats.files} file(s) with {stats.replacements[environment]} replacement(s)")
+        unresolved = stats.unresolved_tokens[environment]
+        if unresolved:
+            logger.warning(f"  [WARN] Unresolved token(s): {', '.join(sorted(unresolved))}")
+    return True
+
+
+def run_deployment(
+    workspaces_directory: str,
+    environment: str,
+    model: RepositoryModel | None = None,
+    token_credential: CredentialType | None = None,
+    resume: bool = False,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    gate: str = GATE_SUCCESS,
+    shard: tuple[int, int] | None = None,
+) -> int:
+    """Validate, deploy all workspaces, write results and return the process exit code.
+
+    Args:
+        workspaces_directory: Root directory containing workspace folders
+        environment: Target environment (dev/test/prod) or a comma-separated list (e.g. test,prod)
+        model: Optional workspace model shared with other phases (e.g. the unmapped-ID scan)
+        token_credential: Optional pre-created credential; created from the environment when omitted
+        resume: Skip workspaces already deployed by an earlier attempt of the same commit
+        max_workers: Number of workspaces deployed concurrently
+        gate: Promotion gate between environments of a multi-environment run (success/none)
+        shard: Optional (index, count): deploy only that shard of the workspaces (CI matrix)
+
+    Returns:
+        EXIT_SUCCESS when every workspace deployed to every environment, EXIT_FAILURE otherwise
+    """
+    with log_context(environment=environment, phase="prepare"):
+        log_deployment_header(environment, workspaces_directory)
+
+        results_stream: ResultsStream | None = None
+        try:
+            environments = parse_environments(environment)
+            results_stream = ResultsStream(RESULTS_STREAM_FILENAME, ",".join(environments))
+
+            # Fail on broken item definitions before importing fabric_cicd or calling any API
+            if model is None:
+                model = load_workspace_model(workspaces_directory)
+            preflight_start = time.time()
+            preflight = run_preflight(Path(model.workspaces_dir), model)
+            log_preflight_report(preflight)
+            results_stream.phase_completed("preflight", time.time() - preflight_start)
+            if preflight.issues:
+                raise ValueError(f"Pre-flight validation found {len(preflight.issues)} issue(s)")
+
+            prepare_start = time.time()
+            configure_runtime()
+            if token_credential is None:
+                token_credential = create_azure_credential()
+            results_stream.phase_completed("prepare", time.time() - prepare_start)
+
+            if len(environments) == 1:
+                summary = run_deployment_pipeline(
+                    workspaces_directory,
+                    environments[0],
+                    token_credential,
+                    model,
+                    results_stream,
+                    resume,
+                    max_workers,
+                    shard,
+                )
+                write_deployment_results(summary)
+                results_stream.run_completed(summary)
+                print_deployment_summary(summary)
+            else:
+                summaries, gated = deploy_environments(
+                    workspaces_directory,
+                    environments,
+                    token_credential,
+                    model,
+                    results_stream,
+                    resume=resume,
+                    max_workers=max_workers,
+                    gate=gate,
+                    shard=shard,
+                )
+                write_results_payload(build_fanout_results_json(environments, summaries, gated))
+                summary = DeploymentSummary(
+                    environment=",".join(environments),
+                    duration=sum(s.duration for s in summaries),
+                    results=[result for s in summaries for result in s.results],
+                )
+                results_stream.run_completed(summary)
+                print_fanout_summary(environments, summaries, gated)
+                if gated:
+                    logger.error(f"\nPromotion gate skipped: {', '.join(gated)}\n")
+                    return EXIT_FAILURE
+
+            if summary.failed_count > 0:
+                logger.warning(f"\nDeployment completed with {summary.failed_count} failure(s)\n")
+                return EXIT_FAILURE
             logger.info(f"\nAll {summary.successful_count} workspace(s) deployed successfully!\n")
-            sys.exit(EXIT_SUCCESS)
+            return EXIT_SUCCESS
 
-    except (ValueError, FileNotFoundError) as e:
-        logger.error(f"\n[FAIL] VALIDATION ERROR: {e!s}\n")
-        sys.exit(EXIT_FAILURE)
-    except Exception as e:
-        logger.error(f"\n[FAIL] CRITICAL ERROR: {e!s}\n")
-        sys.exit(EXIT_FAILURE)
+        except (ValueError, FileNotFoundError) as e:
+            logger.error(f"\n[FAIL] VALIDATION ERROR: {e!s}\n")
+            if results_stream is not None:
+                results_stream.run_failed(str(e))
+            return EXIT_FAILURE
+        except Exception as e:
+            logger.error(f"\n[FAIL] CRITICAL ERROR: {e!s}\n")
+            if results_stream is not None:
+                results_stream.run_failed(str(e))
+            return EXIT_FAILURE
+
+
+def main():
+    """Main deployment orchestration."""
+    # Parse and validate before configure_runtime() so fast-fail paths never import fabric_cicd
+    args = parse_cli_args()
+    configure_logging(os.getenv(ENV_LOG_JSON_FILE))
+    sys.exit(
+        run_deployment(
+            args.workspaces_directory,
+            args.environment,
+            resume=args.resume,
+            max_workers=args.max_workers,
+            gate=args.gate,
+            shard=args.shard,
+        )
+    )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,103 @@
+"""Deployment history: import run results into SQLite and flag duration regressions.
+
+Usage:
+    python -m scripts.deployment_history import deployment-results.json
+    python -m scripts.deployment_history import downloaded-artifacts/
+    python -m scripts.deployment_history report --environment dev [--fail_on_regression]
+
+``import`` accepts deployment-results.json files, directories and downloaded
+workflow artifact .zip files; importing the same run twice is a no-op.
+``report`` compares the latest run with the rolling baseline and writes a trend
+table to the GitHub step summary (or stdout outside GitHub Actions).
+"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+from .common.logger import get_logger
+from .fabric.config import (
+    ENV_GITHUB_STEP_SUMMARY,
+    EXIT_FAILURE,
+    EXIT_SUCCESS,
+    HISTORY_BASELINE_WINDOW,
+    HISTORY_DATABASE_FILE,
+    HISTORY_MIN_BASELINE_RUNS,
+    HISTORY_MIN_SLOWDOWN_RATIO,
+    HISTORY_Z_THRESHOLD,
+    VALID_ENVIRONMENTS,
+)
+from .fabric.history import HistoryStore, import_artifacts, render_trend_table
+
+logger = get_logger(__name__)
+
+
+def run_import(store: HistoryStore, paths: list[str]) -> int:
+    """Import artifacts into the history store."""
+    try:
+        imported, skipped = import_artifacts(store, [Path(p) for p in paths])
+    except (OSError, ValueError, KeyError) as e:
+        logger.error(f"[FAIL] Import failed: {e!s}")
+        return EXIT_FAILURE
+    logger.info(f"[OK] Imported {imported} run(s), {skipped} already present ({store.run_count()} total)")
+    return EXIT_SUCCESS
+
+
+def run_report(store: HistoryStore, args: argparse.Namespace) -> int:
+    """Write the trend table and return EXIT_FAILURE on regressions if requested."""
+    thresholds = {
+        "z_threshold": args.z_threshold,
+        "min_ratio": args.min_slowdown,
+        "min_baseline": args.min_baseline,
+    }
+    reports = store.analyze(args.environment, window=args.window)
+    if not reports:
+        logger.info(f"No deployment history for {args.environment}")
+        return EXIT_SUCCESS
+
+    table = render_trend_table(reports, args.environment, **thresholds)
+    summary_file = os.getenv(ENV_GITHUB_STEP_SUMMARY)
+    if summary_file:
+        with open(summary_file, "a", encoding="utf-8") as f:
+            f.write(table + "\n")
+    else:
+        sys.stdout.write(table)
+
+    regressions = [r for r in reports if r.is_regression(**thresholds)]
+    for report in regressions:
+        logger.warning(
+            f"[WARN] Slower {report.phase} for {report.workspace}: {report.latest:.1f}s vs "
+            f"baseline median {report.baseline_median:.1f}s (z={report.z_score:.1f})"
+        )
+    if not regressions:
+        logger.info(f"[OK] No duration regressions in {args.environment} ({len(reports)} series)")
+    return EXIT_FAILURE if regressions and args.fail_on_regression else EXIT_SUCCESS
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Entry point for the deployment history command."""
+    parser = argparse.ArgumentParser(description="Deployment history store and duration regression report.")
+    parser.add_argument("--database", default=HISTORY_DATABASE_FILE, help="SQLite history database")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = subparsers.add_parser("import", help="Import deployment-results.json files or artifact zips")
+    import_parser.add_argument("paths", nargs="+", help="Files, directories or .zip artifacts")
+
+    report = subparsers.add_parser("report", help="Flag slowdowns against the rolling baseline")
+    report.add_argument("--environment", required=True, choices=sorted(VALID_ENVIRONMENTS))
+    report.add_argument("--window", type=int, default=HISTORY_BASELINE_WINDOW, help="Baseline runs")
+    report.add_argument("--z_threshold", type=float, default=HISTORY_Z_THRESHOLD, help="Modified z-score limit")
+    report.add_argument("--min_slowdown", type=float, default=HISTORY_MIN_SLOWDOWN_RATIO, help="e.g. 0.2 = 20%%")
+    report.add_argument("--min_baseline", type=int, default=HISTORY_MIN_BASELINE_RUNS, help="Runs before flagging")
+    report.add_argument("--fail_on_regression", action="store_true", help="Exit 1 when a slowdown is flagged")
+    args = parser.parse_args(argv)
+
+    with HistoryStore(args.database) as store:
+        if args.command == "import":
+            return run_import(store, args.paths)
+        return run_report(store, args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
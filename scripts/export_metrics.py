@@ -0,0 +1,58 @@
+"""Export deployment metrics from a deployment-results.json file.
+
+Renders OpenMetrics text (node_exporter textfile collector) and/or pushes to a
+Prometheus Pushgateway, e.g. for results downloaded from a workflow artifact.
+Deployments export automatically when FABRIC_METRICS_TEXTFILE or
+FABRIC_PUSHGATEWAY_URL is set.
+
+Usage:
+    python -m scripts.export_metrics --results deployment-results.json
+    python -m scripts.export_metrics --results deployment-results.json --textfile /var/lib/node_exporter/fabric.prom
+    python -m scripts.export_metrics --results deployment-results.json --pushgateway http://pushgateway:9091
+"""
+
+import argparse
+import json
+import sys
+
+from .common.logger import get_logger
+from .fabric.config import EXIT_FAILURE, EXIT_SUCCESS, RESULTS_FILENAME
+from .fabric.metrics import push_to_gateway, render_metrics, write_textfile
+
+logger = get_logger(__name__)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Render or export metrics for one deployment results file."""
+    parser = argparse.ArgumentParser(description="Export Fabric deployment metrics (OpenMetrics/Pushgateway).")
+    parser.add_argument("--results", default=RESULTS_FILENAME, help="deployment-results.json to export")
+    parser.add_argument("--textfile", default=None, help="Write OpenMetrics text to this file (atomic)")
+    parser.add_argument("--pushgateway", default=None, help="Pushgateway base URL to PUT the metrics to")
+    args = parser.parse_args(argv)
+
+    try:
+        with open(args.results, encoding="utf-8") as f:
+            results = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.error(f"[FAIL] Cannot read {args.results}: {e!s}")
+        return EXIT_FAILURE
+
+    if not args.textfile and not args.pushgateway:
+        sys.stdout.write(render_metrics(results))
+        return EXIT_SUCCESS
+
+    try:
+        if args.textfile:
+            write_textfile(args.textfile, results)
+            logger.info(f"[OK] Metrics written to {args.textfile}")
+        if args.pushgateway:
+            push_to_gateway(args.pushgateway, results)
+            logger.info(f"[OK] Metrics pushed to {args.pushgateway}")
+    except OSError as e:
+        logger.error(f"[FAIL] Metrics export failed: {e!s}")
+        return EXIT_FAILURE
+    return EXIT_SUCCESS
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,364 @@
+"""Generation of incrementally refreshed gold aggregate tables from a declarative spec.
+
+Each entry of the spec (``gold_aggregates.yml`` in the workspace folder, or a
+YAML file with the same shape given with ``--spec``) names a gold table, the
+source table in the silver lakehouse, its grain and its measures::
+
+    agg_sales_by_month_city_stock_item:   # gold table
+      source: dbo.fact_sale               # "schema.table" in the source lakehouse
+      date_column: InvoiceDateKey
+      grain: month                        # day or month
+      keys: [CityKey, StockItemKey]
+      measures:                           # column -> function(source column)
+        Quantity: sum(Quantity)
+        Sales: count(*)
+
+Every aggregate gets its own notebook under ``<layer>/aggregates``, attached
+to the gold lakehouse through the usual ``# META`` header (parameterized by
+the gold default_lakehouse rule). The aggregate table is partitioned by month
+(``period``). A refresh reads the source's change data feed since the source
+version of the last refresh, recomputes only the months with changed rows and
+replaces just those partitions. It rebuilds the whole table on the first run,
+when the spec changed, when ``full_refresh`` is set, or when the feed is
+unavailable (not enabled on the source, or its versions already vacuumed).
+"""
+
+import json
+import re
+from collections.abc import Mapping
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+from ..common.logger import get_logger
+from .config import (
+    AGGREGATE_LAKEHOUSE,
+    AGGREGATE_LAYER_FOLDER,
+    AGGREGATE_SOURCE_LAKEHOUSE,
+    AGGREGATE_SPEC_FILE,
+    EXIT_FAILURE,
+)
+from .notebooks import (
+    DefaultLakehouse,
+    GeneratedFiles,
+    NotebookCell,
+    lakehouse_dev_id,
+    notebook_files,
+    run_generator,
+)
+from .workspace_model import PLATFORM_FILE, RepositoryModel, WorkspaceModel
+
+logger = get_logger(__name__)
+
+GRAIN_DAY = "day"
+GRAIN_MONTH = "month"
+GRAINS = (GRAIN_DAY, GRAIN_MONTH)
+FUNCTIONS = ("sum", "count", "min", "max", "avg")
+PERIOD_COLUMN = "period"  # month partition of every aggregate table
+AGGREGATES_FOLDER = "aggregates"
+NOTEBOOK_PREFIX = "nb_refresh_"
+
+_IDENTIFIER_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+_MEASURE_RE = re.compile(r"^\s*(\w+)\s*\(\s*(\*|[A-Za-z_][A-Za-z0-9_]*)\s*\)\s*$")
+
+REFRESH_CODE = '''
+import hashlib
+import json
+from datetime import timedelta
+from functools import reduce
+
+from pyspark.sql import functions as F
+from pyspark.sql.utils import AnalysisException
+
+VERSION_PROPERTY = "gold.aggregate.source_version"
+DEFINITION_PROPERTY = "gold.aggregate.definition"
+
+group_keys = json.loads(keys)
+aggregations = [
+    (F.count(F.lit(1)) if column == "*" else getattr(F, function)(F.col(column))).alias(name)
+    for name, (function, column) in json.loads(measures).items()
+]
+definition = hashlib.sha256(json.dumps([source_table, date_column, grain, keys, measures]).encode()).hexdigest()[:16]
+
+
+def aggregate(frame):
+    day = [F.to_date(F.col(date_column)).alias(date_column)] if grain == "day" else []
+    frame = frame.where(F.col(date_column).isNotNull())
+    frame = frame.withColumn("period", F.trunc(F.col(date_column), "month"))
+    return frame.groupBy("period", *day, *group_keys).agg(*aggregations)
+
+
+def in_months(months):
+    # Ranges on the date column itself, so file statistics skip unchanged data
+    def month(start):
+        end = (start.replace(day=28) + timedelta(days=4)).replace(day=1)
+        return (F.col(date_column) >= F.lit(start)) & (F.col(date_column) < F.lit(end))
+
+    return reduce(lambda left, right: left | right, [month(start) for start in months])
+
+
+def properties_of(table):
+    return {row["key"]: row["value"] for row in spark.sql(f"SHOW TBLPROPERTIES {table}").collect()}
+
+
+version = spark.sql(f"DESCRIBE HISTORY {source_table} LIMIT 1").first()["version"]
+source = spark.sql(f"SELECT * FROM {source_table} VERSION AS OF {version}")
+target = properties_of(target_table) if spark.catalog.tableExists(target_table) else {}
+
+months = None  # changed months; None rebuilds the whole table
+if full_refresh or VERSION_PROPERTY not in target or target.get(DEFINITION_PROPERTY) != definition:
+    print(f"Full refresh of {target_table}: first run, changed definition or full_refresh")
+elif properties_of(source_table).get("delta.enableChangeDataFeed", "false").lower() != "true":
+    print(f"Full refresh of {target_table}: change data feed is not enabled on {source_table}")
+elif int(target[VERSION_PROPERTY]) >= version:
+    months = []
+else:
+    try:
+        changes = (
+            spark.read.option("readChangeFeed", "true")
+            .option("startingVersion", int(target[VERSION_PROPERTY]) + 1)
+            .option("endingVersion", version)
+            .table(source_table)
+        )
+        changed = changes.select(F.trunc(F.col(date_column), "month").alias("period")).dropna().distinct()
+        months = sorted(row["period"] for row in changed.collect())
+    except AnalysisException as error:  # versions vacuumed, or the feed was enabled after the last refresh
+        print(f"Full refresh of {target_table}: {error}")
+
+if months is None:
+    (
+        aggregate(source).write.format("delta").mode("overwrite")
+        .option("overwriteSchema", "true").partitionBy("period").saveAsTable(target_table)
+    )
+elif months:
+    listed = ", ".join(f"DATE'{start.isoformat()}'" for start in months)
+    (
+        aggregate(source.where(in_months(months))).write.format("delta").mode("overwrite")
+        .option("replaceWhere", f"period IN ({listed})").saveAsTable(target_table)
+    )
+if months is None or months:
+    spark.sql(
+        f"ALTER TABLE {target_table} SET TBLPROPERTIES "
+        f"('{VERSION_PROPERTY}' = '{version}', '{DEFINITION_PROPERTY}' = '{definition}')"
+    )
+refreshed = "all months" if months is None else f"{len(months)} changed month(s)"
+print(f"{target_table}: {refreshed} refreshed from {source_table} version {version}")
+'''
+
+
+@dataclass(frozen=True)
+class Measure:
+    """One aggregated column."""
+
+    name: str
+    function: str  # one of FUNCTIONS
+    column: str  # source column, "*" for count(*)
+
+
+@dataclass(frozen=True)
+class AggregateSpec:
+    """One gold aggregate table."""
+
+    table: str  # gold table, "table" (default schema) or "schema.table"
+    source: str  # "schema.table" in the source lakehouse
+    date_column: str
+    grain: str  # GRAIN_DAY or GRAIN_MONTH
+    keys: tuple[str, ...]
+    measures: tuple[Measure, ...]
+
+    @property
+    def notebook(self) -> str:
+        """Display name of the refresh notebook."""
+        return f"{NOTEBOOK_PREFIX}{self.table.rpartition('.')[2]}"
+
+    def parameters(self, source_lakehouse: str) -> dict[str, Any]:
+        """Return notebook parameter name -> value."""
+        return {
+            "source_table": f"{source_lakehouse}.{self.source}",
+            "target_table": self.table,
+            "date_column": self.date_column,
+            "grain": self.grain,
+            "keys": json.dumps(list(self.keys)),
+            "measures": json.dumps({m.name: [m.function, m.column] for m in self.measures}),
+            "full_refresh": False,
+        }
+
+
+def column_name(value: Any, where: str) -> str:
+    """Return a validated column (or table) name.
+
+    Raises:
+        ValueError: If the value is not a plain identifier
+    """
+    if not isinstance(value, str) or not _IDENTIFIER_RE.match(value):
+        raise ValueError(f"{where}: expected a column or table name, got {value!r}")
+    return value
+
+
+def table_name(value: Any, where: str) -> str:
+    """Return a validated ``table`` or ``schema.table`` name.
+
+    Raises:
+        ValueError: If the value is not one or two dot-separated identifiers
+    """
+    if not isinstance(value, str) or not 1 <= len(value.split(".")) <= 2:
+        raise ValueError(f"{where}: expected 'table' or 'schema.table', got {value!r}")
+    for part in value.split("."):
+        column_name(part, where)
+    return value
+
+
+def parse_measure(name: str, value: Any, where: str) -> Measure:
+    """Parse a ``function(column)`` measure.
+
+    Raises:
+        ValueError: If the function is unknown or the expression malformed
+    """
+    match = _MEASURE_RE.match(value) if isinstance(value, str) else None
+    if not match or match.group(1).lower() not in FUNCTIONS:
+        raise ValueError(f"{where}: {name} must be one of {', '.join(f'{f}(column)' for f in FUNCTIONS)}")
+    function, column = match.group(1).lower(), match.group(2)
+    if column == "*" and function != "count":
+        raise ValueError(f"{where}: only count accepts '*'")
+    return Measure(column_name(name, where), function, column)
+
+
+def parse_aggregates(raw: Mapping[str, Any], where: str = "aggregates") -> list[AggregateSpec]:
+    """Parse an aggregate spec mapping of gold table -> settings.
+
+    Raises:
+        ValueError: If an entry is malformed or two entries share a notebook
+    """
+    specs = []
+    for table, settings in raw.items():
+        at = f"{where}: {table}"
+        if not isinstance(settings, Mapping):
+            raise ValueError(f"{at}: expected source, date_column, grain, keys and measures")
+        grain = settings.get("grain", GRAIN_MONTH)
+        if grain not in GRAINS:
+            raise ValueError(f"{at}: grain must be one of {', '.join(GRAINS)}")
+        keys = settings.get("keys") or []
+        measures = settings.get("measures")
+        if not isinstance(keys, list) or not isinstance(measures, Mapping) or not measures:
+            raise ValueError(f"{at}: keys must be a list and measures a non-empty mapping")
+        spec = AggregateSpec(
+            table=table_name(table, at),
+            source=table_name(settings.get("source"), f"{at} source"),
+            date_column=column_name(settings.get("date_column"), f"{at} date_column"),
+            grain=grain,
+            keys=tuple(column_name(key, f"{at} keys") for key in keys),
+            measures=tuple(parse_measure(str(name), value, at) for name, value in measures.items()),
+        )
+        columns = [PERIOD_COLUMN, *([spec.date_column] if grain == GRAIN_DAY else []), *spec.keys]
+        columns += [m.name for m in spec.measures]
+        duplicates = sorted({c for c in columns if columns.count(c) > 1})
+        if duplicates:
+            raise ValueError(f"{at}: column(s) {', '.join(duplicates)} appear more than once in the aggregate")
+        specs.append(spec)
+    notebooks = [s.notebook for s in specs]
+    clashes = sorted({n for n in notebooks if notebooks.count(n) > 1})
+    if clashes:
+        raise ValueError(f"{where}: tables share the notebook name(s) {', '.join(clashes)}")
+    return specs
+
+
+def load_aggregates(path: str | Path) -> list[AggregateSpec]:
+    """Load an aggregate spec from YAML.
+
+    Raises:
+        ValueError: If the file is not a mapping or an entry is malformed
+    """
+    raw = yaml.safe_load(Path(path).read_text(encoding="utf-8")) or {}
+    if not isinstance(raw, dict):
+        raise ValueError(f"{path}: expected a mapping of gold tables to aggregate settings")
+    return parse_aggregates(raw, str(path))
+
+
+def refresh_cells(spec: AggregateSpec, source_lakehouse: str) -> list[NotebookCell]:
+    """Return the parameters and code cells of an aggregate's refresh notebook."""
+    parameters = "\n".join(f"{name} = {value!r}" for name, value in spec.parameters(source_lakehouse).items())
+    return [NotebookCell(parameters, parameters=True), NotebookCell(REFRESH_CODE)]
+
+
+def generate_aggregates(
+    workspace: WorkspaceModel,
+    layer_folder: str,
+    lakehouse_name: str,
+    source_lakehouse: str,
+    specs: list[AggregateSpec],
+) -> tuple[dict[str, str], list[str]]:
+    """Build the refresh notebook items of every aggregate.
+
+    Returns:
+        {workspace-relative path: content} of the generated files, and the
+        notebook items in the aggregates folder no longer in the spec
+
+    Raises:
+        KeyError: If the workspace has no such lakehouse or source lakehouse
+    """
+    lakehouse = DefaultLakehouse(lakehouse_dev_id(workspace, lakehouse_name), lakehouse_name)
+    if not any(i.item_type == "Lakehouse" and i.display_name == source_lakehouse for i in workspace.items):
+        raise KeyError(f"No Lakehouse '{source_lakehouse}' in workspace '{workspace.folder}'")
+    folder = f"{layer_folder}/{AGGREGATES_FOLDER}"
+    files: dict[str, str] = {}
+    for spec in specs:
+        item_path = f"{folder}/{spec.notebook}.Notebook"
+        grain = " x ".join([spec.grain, *spec.keys])
+        description = f"Incremental refresh of {spec.table} ({grain}) from {source_lakehouse}.{spec.source} (generated)"
+        cells = refresh_cells(spec, source_lakehouse)
+        files.update(notebook_files(workspace.folder, item_path, cells, lakehouse, description))
+    stale = sorted(
+        item.path
+        for item in workspace.items
+        if item.item_type == "Notebook"
+        and item.path.startswith(f"{folder}/{NOTEBOOK_PREFIX}")
+        and f"{item.path}/{PLATFORM_FILE}" not in files
+    )
+    return files, stale
+
+
+def run_generate_aggregates(
+    workspaces_dir: Path,
+    model: RepositoryModel,
+    spec_file: str | None = None,
+    layer_folder: str = AGGREGATE_LAYER_FOLDER,
+    lakehouse: str = AGGREGATE_LAKEHOUSE,
+    source_lakehouse: str = AGGREGATE_SOURCE_LAKEHOUSE,
+    check: bool = False,
+    workspace_filter: str | None = None,
+) -> int:
+    """Generate the incremental refresh notebooks of the gold aggregate tables.
+
+    The spec defaults to AGGREGATE_SPEC_FILE in each workspace folder; a
+    workspace without one fails. Notebooks of aggregates removed from the spec
+    are reported, not deleted.
+
+    Returns:
+        EXIT_SUCCESS, or EXIT_FAILURE on an invalid spec, no matching workspace, or drift with ``check``
+    """
+    try:
+        shared_specs = load_aggregates(spec_file) if spec_file else None
+    except (OSError, ValueError) as e:
+        logger.error(f"ERROR: Invalid aggregate spec: {e!s}")
+        return EXIT_FAILURE
+
+    def build(workspace: WorkspaceModel) -> GeneratedFiles:
+        specs = shared_specs
+        if specs is None:
+            specs = load_aggregates(workspaces_dir / workspace.folder / AGGREGATE_SPEC_FILE)
+        files, stale = generate_aggregates(workspace, layer_folder, lakehouse, source_lakehouse, specs)
+        details = [f"{s.table}: {' x '.join([s.grain, *s.keys])} <- {source_lakehouse}.{s.source}" for s in specs]
+        return GeneratedFiles(files, details, stale)
+
+    return run_generator(
+        workspaces_dir,
+        model,
+        workspace_filter,
+        "GOLD AGGREGATE NOTEBOOKS",
+        "generate-aggregates",
+        lakehouse,
+        build,
+        check,
+    )
@@ -2,8 +2,7 @@
 """Authentication helpers for Fabric deployment scripts."""
 
 import os
-
-from azure.identity import ClientSecretCredential, DefaultAzureCredential
+from typing import TYPE_CHECKING, Any, TypeAlias
 
 from ..common.logger import get_logger
 from .config import (
@@ -17,7 +16,13 @@ from .config import (
 
 logger = get_logger(__name__)
 
-CredentialType = ClientSecretCredential | DefaultAzureCredential
+if TYPE_CHECKING:
+    from azure.identity import ClientSecretCredential, DefaultAzureCredential
+
+    CredentialType: TypeAlias = ClientSecretCredential | DefaultAzureCredential
+else:
+    # azure.identity is imported lazily in create_azure_credential()
+    CredentialType: TypeAlias = Any
 
 
 def create_azure_credential() -> CredentialType:
@@ -26,6 +31,8 @@ def create_azure_credential() -> CredentialType:
     Raises:
         ValueError: If running in GitHub Actions but Service Principal secrets are not configured.
     """
+    from azure.identity import ClientSecretCredential, DefaultAzureCredential
+
     credentials = {
         ENV_AZURE_CLIENT_ID: os.getenv(ENV_AZURE_CLIENT_ID),
         ENV_AZURE_TENANT_ID: os.getenv(ENV_AZURE_TENANT_ID),
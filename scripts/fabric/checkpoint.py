@@ -0,0 +1,158 @@
+"""Deployment checkpoints for resuming interrupted multi-workspace runs.
+
+A checkpoint file is keyed by commit SHA and environment and records every
+workspace that finished deploying. With ``--resume`` a rerun of the same commit
+skips those workspaces and deploys only the rest. The workspace model
+fingerprint is stored as well, so a checkpoint is ignored when the workspaces
+tree differs from the one it was written for (e.g. uncommitted local edits).
+
+Progress is recorded per workspace: fabric_cicd deploys all items of a
+workspace in a single ``deploy_with_config`` call and exposes no per-item
+completion hook, so a partly deployed workspace is redeployed in full.
+"""
+
+import json
+import os
+import subprocess
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from ..common.logger import get_logger
+from .config import CHECKPOINT_DIRECTORY, ENV_GITHUB_SHA
+from .reporting import write_json_atomic
+from .types import DeploymentResult
+
+logger = get_logger(__name__)
+
+# Bump when the checkpoint file layout changes so old checkpoints are ignored
+CHECKPOINT_VERSION = 1
+
+UNKNOWN_COMMIT = "unknown"
+
+
+def resolve_commit_sha() -> str:
+    """Return the commit being deployed (GITHUB_SHA, else git HEAD, else "unknown")."""
+    sha = os.getenv(ENV_GITHUB_SHA)
+    if sha:
+        return sha
+    try:
+        completed = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True, timeout=10
+        )
+    except (OSError, subprocess.SubprocessError):
+        return UNKNOWN_COMMIT
+    return completed.stdout.strip() or UNKNOWN_COMMIT
+
+
+def checkpoint_path(commit_sha: str, environment: str, directory: str | Path = CHECKPOINT_DIRECTORY) -> Path:
+    """Return the checkpoint file for a commit + environment pair."""
+    return Path(directory) / f"{environment}-{commit_sha}.json"
+
+
+@dataclass
+class DeploymentCheckpoint:
+    """Workspaces completed for one commit + environment, persisted after every change."""
+
+    path: Path
+    commit_sha: str
+    environment: str
+    fingerprint: str
+    completed: dict[str, dict[str, Any]] = field(default_factory=dict)
+    resumed: bool = False
+
+    @classmethod
+    def open(
+        cls,
+        environment: str,
+        fingerprint: str,
+        resume: bool,
+        commit_sha: str | None = None,
+        directory: str | Path = CHECKPOINT_DIRECTORY,
+    ) -> "DeploymentCheckpoint":
+        """Load the checkpoint to resume from, or start a fresh one.
+
+        A fresh checkpoint is started when ``resume`` is False, when no checkpoint
+        exists, or when the existing one is unreadable or was written for a
+        different workspaces tree.
+
+        Args:
+            environment: Target environment (dev/test/prod)
+            fingerprint: Fingerprint of the workspace model being deployed
+            resume: Whether to continue from an existing checkpoint
+            commit_sha: Commit being deployed (resolved from the environment/git when omitted)
+            directory: Directory holding checkpoint files
+
+        Returns:
+            DeploymentCheckpoint whose ``resumed`` flag tells whether earlier progress was loaded
+        """
+        sha = commit_sha or resolve_commit_sha()
+        path = checkpoint_path(sha, environment, directory)
+        checkpoint = cls(path=path, commit_sha=sha, environment=environment, fingerprint=fingerprint)
+
+        if not resume:
+            return checkpoint
+        if not path.exists():
+            logger.info(f"-> No checkpoint for {environment} @ {sha[:12]}; starting a fresh deployment")
+            return checkpoint
+
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            logger.warning(f"[WARN] Ignoring unreadable checkpoint {path}: {e!s}")
+            return checkpoint
+
+        if data.get("version") != CHECKPOINT_VERSION or data.get("fingerprint") != fingerprint:
+            logger.warning(f"[WARN] Ignoring checkpoint {path}: written for a different workspaces tree")
+            return checkpoint
+
+        checkpoint.completed = dict(data.get("workspaces", {}))
+        checkpoint.resumed = True
+        logger.info(
+            f"-> Resuming {environment} @ {sha[:12]}: {len(checkpoint.completed)} workspace(s) already deployed"
+        )
+        return checkpoint
+
+    def is_completed(self, workspace_folder: str) -> bool:
+        """Return True if the workspace finished deploying in an earlier attempt."""
+        return workspace_folder in self.completed
+
+    def resumed_result(self, workspace_folder: str) -> DeploymentResult:
+        """Build the result reported for a workspace skipped because it was already deployed."""
+        entry = self.completed[workspace_folder]
+        return DeploymentResult(
+            workspace_folder=workspace_folder,
+            workspace_name=entry.get("workspace_name", workspace_folder),
+            success=True,
+            duration=0.0,
+            resumed=True,
+            attempts=0,
+        )
+
+    def mark_completed(self, result: DeploymentResult) -> None:
+        """Record a successfully deployed workspace and persist the checkpoint.
+
+        Write errors are logged and ignored: a missing checkpoint only means a
+        rerun redeploys more than necessary.
+        """
+        self.completed[result.workspace_folder] = {
+            "workspace_name": result.workspace_name,
+            "completed_at": datetime.now(timezone.utc).isoformat(),
+            "duration": result.duration,
+        }
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            write_json_atomic(self.path, self.to_json())
+        except OSError as e:
+            logger.warning(f"[WARN] Cannot write checkpoint {self.path}: {e!s}")
+
+    def to_json(self) -> dict[str, Any]:
+        """Build the checkpoint file payload."""
+        return {
+            "version": CHECKPOINT_VERSION,
+            "commit_sha": self.commit_sha,
+            "environment": self.environment,
+            "fingerprint": self.fingerprint,
+            "workspaces": self.completed,
+        }
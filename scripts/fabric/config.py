@@ -4,24 +4,169 @@
 # Valid deployment environments
 VALID_ENVIRONMENTS = {"dev", "test", "prod"}
 
+# Promotion order used when several environments are processed together
+PROMOTION_ORDER = ("dev", "test", "prod")
+
 # Console output separators
 SEPARATOR_LONG = "=" * 70
 SEPARATOR_SHORT = "=" * 60
 
 # File names
 RESULTS_FILENAME = "deployment-results.json"
+RESULTS_STREAM_FILENAME = "deployment-results.jsonl"
 CONFIG_FILE = "config.yml"
+PARAMETER_FILE = "parameter.yml"
+RENDER_OUTPUT_DIRECTORY = "rendered"
+USER_CACHE_DIRECTORY = "fabric-cicd"  # under $XDG_CACHE_HOME or ~/.cache, outside the checkout
+WORKSPACE_MODEL_CACHE_PREFIX = "workspace-model-"  # + hash of the workspaces path + .json
+PREFLIGHT_CACHE_FILE = ".fabric-cache/preflight.json"  # per-file validation results keyed by content hash
+PREFLIGHT_MAX_WORKERS = 8
+CHECKPOINT_DIRECTORY = ".fabric-cache/checkpoints"
+HISTORY_DATABASE_FILE = ".fabric-cache/history/deployments.sqlite"
+
+# Startup budget for CLI entry points (measured with python -X importtime)
+STARTUP_IMPORT_BUDGET_MS = 300
+STARTUP_ENTRY_POINTS = (
+    "scripts.cli",
+    "scripts.deploy_to_fabric",
+    "scripts.check_unmapped_ids",
+    "scripts.render_parameters",
+)
+HEAVY_IMPORT_MODULES = ("fabric_cicd", "azure.identity")
 
 # Exit codes
 EXIT_SUCCESS = 0
 EXIT_FAILURE = 1
 
+# Retry policy and circuit breaker for workspace deployments
+RETRY_MAX_ATTEMPTS = 3  # attempts per workspace, including the first
+RETRY_BASE_DELAY_SECONDS = 10.0  # backoff before the first retry, doubled per retry
+RETRY_MAX_DELAY_SECONDS = 120.0
+RETRY_RUN_BUDGET = 6  # retries shared by all workspaces of one run
+CIRCUIT_BREAKER_THRESHOLD = 4  # consecutive workspaces failing transiently (retries exhausted) that stop the run
+TRANSIENT_STATUS_CODES = frozenset({408, 429, 500, 502, 503, 504})
+THROTTLE_STATUS_CODES = frozenset({429})
+
+# Deployment metrics (OpenMetrics textfile / Pushgateway)
+METRICS_PREFIX = "fabric"
+METRICS_JOB_NAME = "fabric_deploy"
+
+# Deployment history regression detection (modified z-score against a rolling baseline)
+HISTORY_BASELINE_WINDOW = 10  # earlier runs compared with the latest one
+HISTORY_MIN_BASELINE_RUNS = 5  # no verdict until the baseline has this many runs
+HISTORY_Z_THRESHOLD = 3.5
+HISTORY_MIN_SLOWDOWN_RATIO = 0.2  # latest must also be >= 20% slower than the baseline median
+
+# Promotion gates for multi-environment runs (--environment test,prod)
+GATE_SUCCESS = "success"  # deploy an environment only after the previous one deployed without failures
+GATE_NONE = "none"  # deploy every environment regardless of earlier failures
+PROMOTION_GATES = (GATE_SUCCESS, GATE_NONE)
+
+# Workspace scheduling (longest predicted duration first across a pool of deploy workers)
+DEFAULT_MAX_WORKERS = 1  # sequential unless --max_workers is given
+# config.yml sections fabric_cicd applies to module globals, shared by every concurrent deploy in the process
+PROCESS_WIDE_CONFIG_SECTIONS = ("constants", "features")
+SCHEDULE_BASE_SECONDS = 20.0  # fixed cost of one deploy_with_config call (auth, listing items)
+SCHEDULE_SECONDS_PER_ITEM = 5.0
+SCHEDULE_SECONDS_PER_MB = 2.0  # definition bytes uploaded
+
+# Watch mode of the unmapped-ID scanner (--watch)
+WATCH_POLL_INTERVAL_SECONDS = 0.5  # polling fallback when inotify is unavailable
+WATCH_DEBOUNCE_SECONDS = 0.05  # events arriving within this window are handled as one batch
+
+# find_replace rule profiling (fabric profile-rules)
+RULE_PROFILE_BUDGET_MS = 50.0  # slowest acceptable single search of one rule (corpus file or adversarial input)
+
+# DataPipeline DAG analysis (fabric analyze-pipelines)
+PIPELINE_ACTIVITY_SECONDS = {  # estimated duration per activity type when no measured duration is given
+    "InvokeCopyJob": 300.0,  # per table copied by the copy job
+    "Copy": 300.0,
+    "TridentNotebook": 300.0,
+    "RefreshDataflow": 300.0,
+    "ExecutePipeline": 600.0,
+}
+PIPELINE_DEFAULT_ACTIVITY_SECONDS = 60.0  # any other activity type
+PIPELINE_COPY_ACTIVITY_TYPES = ("InvokeCopyJob", "Copy")
+PIPELINE_LONG_ACTIVITY_SECONDS = 600.0  # copies at least this long should retry transient failures
+PIPELINE_TIMEOUT_FACTOR = 10.0  # timeouts above this multiple of the expected duration are flagged ...
+PIPELINE_TIMEOUT_MIN_SECONDS = 3600.0  # ... when they also exceed one hour
+PIPELINE_MAX_CONCURRENT_COPIES = 4  # more copies running at once contend for capacity
+
+# CopyJob throughput linting (fabric lint-copyjobs)
+COPYJOB_LARGE_TABLE_MB = 1024.0  # tables from this size benefit from explicit copy parallelism
+COPYJOB_TUNING_PROFILES = {  # per-environment settings written as key_value_replace overlays
+    "dev": {"applyVOrder": False, "parallelCopies": 4, "dataIntegrationUnits": 4},
+    "test": {"applyVOrder": False, "parallelCopies": 8, "dataIntegrationUnits": 8},
+    "prod": {"applyVOrder": True, "parallelCopies": 32, "dataIntegrationUnits": 32},
+}
+# Source types that copy through a staging store much faster than directly
+COPYJOB_STAGING_SOURCE_TYPES = ("SnowflakeTable", "AzureSqlDWTable", "AmazonRedshiftTable", "TeradataTable")
+COPYJOB_TUNING_TEMPLATE_FILE = "cp_tuning_parameters.yml"
+
+# Lakehouse table maintenance notebook (fabric generate-maintenance)
+MAINTENANCE_LAYER_FOLDER = "1_Bronze"
+MAINTENANCE_LAKEHOUSE = "lakehouse_bronze"
+MAINTENANCE_PIPELINE = "pl_ingest_bronze_data"  # the notebook runs after this pipeline's copies
+MAINTENANCE_NOTEBOOK = "nb_maintain_bronze_tables"
+MAINTENANCE_ACTIVITY = "Maintain bronze tables"
+MAINTENANCE_RETENTION_HOURS = 168  # Delta refuses shorter VACUUM retention unless its safety check is disabled
+
+# OneLake shortcuts to bronze tables (fabric generate-shortcuts)
+SHORTCUT_SOURCE_LAKEHOUSE = "lakehouse_bronze"
+# Target lakehouse -> "schema.table" patterns exposed untransformed (no copy into the layer)
+SHORTCUT_TABLES = {
+    "lakehouse_silver": ("dbo.dimension_*",),
+    "lakehouse_gold": ("dbo.dimension_*",),
+}
+SHORTCUT_COPY_MB_PER_SECOND = 50.0  # assumed throughput of the layer copy a shortcut replaces
+SHORTCUTS_FILE = "shortcuts.metadata.json"
+
+# Synthetic star-schema data and local medallion benchmark (fabric generate-data / benchmark)
+SYNTHETIC_FACT_ROWS = 1_000_000  # default scale factor
+SYNTHETIC_MAX_FACT_ROWS = 1_000_000_000
+SYNTHETIC_CHUNK_ROWS = 1_000_000  # fact rows generated, written and transformed per batch (bounds memory)
+SYNTHETIC_SEED = 42
+# Dimension sizes of the Wide World Importers sample the bronze CopyJobs ingest (independent of scale)
+SYNTHETIC_DIMENSION_ROWS = {
+    "dimension_city": 116_295,
+    "dimension_customer": 402,
+    "dimension_date": 1_461,
+    "dimension_employee": 213,
+    "dimension_stock_item": 672,
+}
+BENCHMARK_RESULTS_FILE = "benchmark-results.json"
+
+# Incrementally refreshed gold aggregates (fabric generate-aggregates)
+AGGREGATE_LAYER_FOLDER = "3_Gold"
+AGGREGATE_LAKEHOUSE = "lakehouse_gold"
+AGGREGATE_SOURCE_LAKEHOUSE = "lakehouse_silver"
+# Gold table -> source, date column, grain, keys and measures, per workspace folder (see fabric/aggregates.py)
+AGGREGATE_SPEC_FILE = "gold_aggregates.yml"
+
+# Silver MERGE upsert notebooks (fabric generate-silver)
+SILVER_LAYER_FOLDER = "2_Silver"
+SILVER_LAKEHOUSE = "lakehouse_silver"
+SILVER_SOURCE_LAKEHOUSE = "lakehouse_bronze"
+# Bronze table -> key_columns and MERGE options, per workspace folder (see fabric/silver.py)
+SILVER_SPEC_FILE = "silver_tables.yml"
+
 # Environment variable names
 ENV_AZURE_CLIENT_ID = "AZURE_CLIENT_ID"
 ENV_AZURE_TENANT_ID = "AZURE_TENANT_ID"
 ENV_AZURE_CLIENT_SECRET = "AZURE_CLIENT_SECRET"
 ENV_ACTIONS_RUNNER_DEBUG = "ACTIONS_RUNNER_DEBUG"
 ENV_GITHUB_ACTIONS = "GITHUB_ACTIONS"
+ENV_GITHUB_SHA = "GITHUB_SHA"
+ENV_GITHUB_STEP_SUMMARY = "GITHUB_STEP_SUMMARY"
+# Optional JSON-lines log file (workspace/environment/phase context per line)
+ENV_LOG_JSON_FILE = "FABRIC_LOG_JSON_FILE"
+# Retry policy overrides (integers)
+ENV_RETRY_MAX_ATTEMPTS = "FABRIC_RETRY_MAX_ATTEMPTS"
+ENV_RETRY_BUDGET = "FABRIC_RETRY_BUDGET"
+ENV_CIRCUIT_BREAKER_THRESHOLD = "FABRIC_CIRCUIT_BREAKER_THRESHOLD"
+# Metrics sinks (unset = disabled)
+ENV_METRICS_TEXTFILE = "FABRIC_METRICS_TEXTFILE"
+ENV_PUSHGATEWAY_URL = "FABRIC_PUSHGATEWAY_URL"
 
 # Wiki URLs
 WIKI_SETUP_GUIDE_URL = "https://github.com/dc-floriangaerner/dc-fabric-cicd/wiki/Setup-Guide"
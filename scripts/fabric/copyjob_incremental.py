@@ -0,0 +1,344 @@
+"""Conversion of CopyJob tables from full batch loads to watermark-based incremental loads.
+
+A per-table YAML config names, for each table of a CopyJob, the watermark
+column and how changed rows are written::
+
+    cp_import_fact_sale:              # CopyJob display name
+      dbo.fact_sale:                  # "schema.table" or "table"
+        watermark_column: LastEditedWhen
+        write_behavior: Upsert        # Upsert (default), Overwrite or Append
+        key_columns: [SaleKey]        # required for Upsert
+        partition_columns: [InvoiceDateKey]  # optional partitioned destination
+
+Converting sets ``source.watermarkColumn`` and the destination's
+``writeBehavior`` (plus ``upsertSettings.keys`` and ``partitionOption`` /
+``partitionNameList``) of each configured table, so a run copies only rows
+past the last watermark instead of re-appending the whole source. Every
+CopyJob definition, converted or not, is validated offline against
+COPYJOB_SCHEMA, a JSON Schema subset (type, required, properties, items, enum,
+minItems) describing the fields this repository reads and writes.
+"""
+
+import copy
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+from ..common.logger import get_logger, log_context
+from .config import EXIT_FAILURE, EXIT_SUCCESS, SEPARATOR_LONG, SEPARATOR_SHORT
+from .pipeline_analysis import COPY_JOB_CONTENT_FILE
+from .workspace_model import RepositoryModel, WorkspaceModel, select_workspaces
+
+logger = get_logger(__name__)
+
+# Write behaviors of an incremental table
+WRITE_UPSERT = "Upsert"
+WRITE_OVERWRITE = "Overwrite"
+WRITE_APPEND = "Append"
+WRITE_BEHAVIORS = (WRITE_UPSERT, WRITE_OVERWRITE, WRITE_APPEND)
+PARTITION_BY_KEY = "PartitionByKey"
+
+_STRING_LIST = {"type": "array", "items": {"type": "string"}, "minItems": 1}
+
+# The parts of copyjob-content.json this repository reads and writes
+COPYJOB_SCHEMA: dict[str, Any] = {
+    "type": "object",
+    "required": ["properties", "activities"],
+    "properties": {
+        "properties": {
+            "type": "object",
+            "required": ["jobMode", "source", "destination"],
+            "properties": {
+                "jobMode": {"enum": ["Batch", "CDC"]},
+                "source": {"type": "object", "required": ["type"]},
+                "destination": {"type": "object", "required": ["type"]},
+            },
+        },
+        "activities": {
+            "type": "array",
+            "minItems": 1,
+            "items": {
+                "type": "object",
+                "required": ["id", "properties"],
+                "properties": {
+                    "id": {"type": "string"},
+                    "properties": {
+                        "type": "object",
+                        "required": ["source", "destination"],
+                        "properties": {
+                            "source": {
+                                "type": "object",
+                                "properties": {"watermarkColumn": {"type": "string"}},
+                            },
+                            "destination": {
+                                "type": "object",
+                                "required": ["datasetSettings"],
+                                "properties": {
+                                    "writeBehavior": {"enum": list(WRITE_BEHAVIORS)},
+                                    "applyVOrder": {"type": "boolean"},
+                                    "upsertSettings": {
+                                        "type": "object",
+                                        "required": ["keys"],
+                                        "properties": {"keys": _STRING_LIST},
+                                    },
+                                    "partitionOption": {"enum": ["None", PARTITION_BY_KEY]},
+                                    "partitionNameList": _STRING_LIST,
+                                },
+                            },
+                            "enableStaging": {"type": "boolean"},
+                            "parallelCopies": {"type": "integer"},
+                            "dataIntegrationUnits": {"type": "integer"},
+                        },
+                    },
+                },
+            },
+        },
+    },
+}
+
+_JSON_TYPES: dict[str, type | tuple[type, ...]] = {
+    "object": dict,
+    "array": list,
+    "string": str,
+    "boolean": bool,
+    "integer": int,
+}
+
+
+@dataclass(frozen=True)
+class IncrementalTable:
+    """Incremental load settings of one table."""
+
+    watermark_column: str
+    write_behavior: str = WRITE_UPSERT
+    key_columns: tuple[str, ...] = ()
+    partition_columns: tuple[str, ...] = ()
+
+
+# CopyJob display name -> table -> settings
+IncrementalConfig = dict[str, dict[str, IncrementalTable]]
+
+
+@dataclass
+class CopyJobConversion:
+    """Outcome of converting (or validating) one CopyJob definition."""
+
+    item: str
+    path: str  # copyjob-content.json relative to the workspace folder
+    content: Any = None  # converted definition
+    changes: list[str] = field(default_factory=list)
+    errors: list[str] = field(default_factory=list)
+
+
+def validate_schema(node: Any, schema: dict[str, Any] = COPYJOB_SCHEMA, path: str = "$") -> list[str]:
+    """Validate a JSON value against a JSON Schema subset; return one message per violation."""
+    errors: list[str] = []
+    expected = schema.get("type")
+    # bool is a subclass of int in Python but not an integer in JSON
+    if expected and (not isinstance(node, _JSON_TYPES[expected]) or (expected == "integer" and isinstance(node, bool))):
+        return [f"{path}: expected {expected}"]
+    if "enum" in schema and node not in schema["enum"]:
+        return [f"{path}: {node!r} is not one of {', '.join(map(str, schema['enum']))}"]
+    if isinstance(node, dict):
+        errors.extend(f"{path}: missing {key}" for key in schema.get("required", []) if key not in node)
+        for key, sub_schema in schema.get("properties", {}).items():
+            if key in node:
+                errors.extend(validate_schema(node[key], sub_schema, f"{path}.{key}"))
+    if isinstance(node, list):
+        if len(node) < schema.get("minItems", 0):
+            errors.append(f"{path}: expected at least {schema['minItems']} item(s)")
+        if "items" in schema:
+            for index, value in enumerate(node):
+                errors.extend(validate_schema(value, schema["items"], f"{path}[{index}]"))
+    return errors
+
+
+def _string_tuple(value: Any, where: str) -> tuple[str, ...]:
+    if value is None:
+        return ()
+    values = [value] if isinstance(value, str) else value
+    if not isinstance(values, list) or not all(isinstance(v, str) and v for v in values):
+        raise ValueError(f"{where}: expected a column name or list of column names")
+    return tuple(values)
+
+
+def load_incremental_config(path: str | Path) -> IncrementalConfig:
+    """Load the per-table incremental config.
+
+    Raises:
+        ValueError: If an entry is malformed (missing watermark, unknown write behavior, Upsert without keys)
+    """
+    raw = yaml.safe_load(Path(path).read_text(encoding="utf-8")) or {}
+    if not isinstance(raw, dict):
+        raise ValueError(f"{path}: expected a mapping of CopyJob names to tables")
+    config: IncrementalConfig = {}
+    for item, tables in raw.items():
+        if not isinstance(tables, dict) or not tables:
+            raise ValueError(f"{path}: '{item}' must map table names to settings")
+        for table, settings in tables.items():
+            where = f"{path}: {item} {table}"
+            if not isinstance(settings, dict) or not isinstance(settings.get("watermark_column"), str):
+                raise ValueError(f"{where}: watermark_column is required")
+            write_behavior = settings.get("write_behavior", WRITE_UPSERT)
+            if write_behavior not in WRITE_BEHAVIORS:
+                raise ValueError(f"{where}: write_behavior must be one of {', '.join(WRITE_BEHAVIORS)}")
+            entry = IncrementalTable(
+                watermark_column=settings["watermark_column"],
+                write_behavior=write_behavior,
+                key_columns=_string_tuple(settings.get("key_columns"), f"{where} key_columns"),
+                partition_columns=_string_tuple(settings.get("partition_columns"), f"{where} partition_columns"),
+            )
+            if entry.write_behavior == WRITE_UPSERT and not entry.key_columns:
+                raise ValueError(f"{where}: Upsert needs key_columns")
+            config.setdefault(str(item), {})[str(table)] = entry
+    return config
+
+
+def _table_name(activity: Any) -> str:
+    dataset = activity.get("properties", {}).get("destination", {}).get("datasetSettings", {})
+    return ".".join(str(part) for part in (dataset.get("schema"), dataset.get("table")) if part)
+
+
+def _apply(destination: dict[str, Any], key: str, value: Any, changes: list[str], table: str) -> None:
+    """Set (or with None remove) a destination setting, recording the change."""
+    if destination.get(key) == value:
+        return
+    if value is None:
+        if key in destination:
+            del destination[key]
+            changes.append(f"{table}: removed destination.{key}")
+        return
+    destination[key] = value
+    changes.append(f"{table}: destination.{key} = {json.dumps(value)}")
+
+
+def convert_copy_job(item: str, relative: str, content: Any, tables: dict[str, IncrementalTable]) -> CopyJobConversion:
+    """Convert the configured tables of one parsed copyjob-content.json; the input is not modified."""
+    result = CopyJobConversion(item, relative, copy.deepcopy(content))
+    result.errors = validate_schema(content)
+    if result.errors:
+        return result
+
+    seen: set[str] = set()
+    for activity in result.content["activities"]:
+        table = _table_name(activity)
+        name = table if table in tables else table.split(".", 1)[-1]
+        settings = tables.get(name)
+        if settings is None:
+            continue
+        seen.add(name)
+        properties = activity["properties"]
+        source, destination = properties["source"], properties["destination"]
+        if source.get("watermarkColumn") != settings.watermark_column:
+            source["watermarkColumn"] = settings.watermark_column
+            result.changes.append(f"{table}: source.watermarkColumn = {json.dumps(settings.watermark_column)}")
+        _apply(destination, "writeBehavior", settings.write_behavior, result.changes, table)
+        upsert = {"keys": list(settings.key_columns)} if settings.write_behavior == WRITE_UPSERT else None
+        _apply(destination, "upsertSettings", upsert, result.changes, table)
+        if settings.partition_columns:
+            _apply(destination, "partitionOption", PARTITION_BY_KEY, result.changes, table)
+            _apply(destination, "partitionNameList", list(settings.partition_columns), result.changes, table)
+
+    result.errors.extend(f"table '{name}' is not copied by {item}" for name in sorted(set(tables) - seen))
+    result.errors.extend(validate_schema(result.content))
+    return result
+
+
+def convert_workspace(
+    workspace: WorkspaceModel, workspaces_dir: Path, config: IncrementalConfig
+) -> list[CopyJobConversion]:
+    """Convert every configured CopyJob of a workspace and validate all CopyJobs (nothing is written)."""
+    conversions = []
+    for item in workspace.items:
+        if item.item_type != "CopyJob":
+            continue
+        relative = f"{item.path}/{COPY_JOB_CONTENT_FILE}"
+        try:
+            content = json.loads((workspaces_dir / workspace.folder / relative).read_text(encoding="utf-8-sig"))
+        except (OSError, ValueError) as e:
+            conversions.append(CopyJobConversion(item.display_name, relative, errors=[f"cannot read: {e}"]))
+            continue
+        conversions.append(convert_copy_job(item.display_name, relative, content, config.get(item.display_name, {})))
+    return conversions
+
+
+def unknown_copy_jobs(workspaces: list[WorkspaceModel], config: IncrementalConfig) -> list[str]:
+    """Return configured CopyJob names that no workspace contains."""
+    known = {item.display_name for workspace in workspaces for item in workspace.items if item.item_type == "CopyJob"}
+    return sorted(set(config) - known)
+
+
+def write_conversion(workspaces_dir: Path, workspace_folder: str, conversion: CopyJobConversion) -> None:
+    """Write a converted definition in place, keeping the file's indentation and trailing newline."""
+    target = workspaces_dir / workspace_folder / conversion.path
+    original = target.read_text(encoding="utf-8-sig")
+    text = json.dumps(conversion.content, indent=2, ensure_ascii=False)
+    target.write_text(text + ("\n" if original.endswith("\n") else ""), encoding="utf-8")
+
+
+def run_convert_copyjobs(
+    workspaces_dir: Path,
+    model: RepositoryModel,
+    config_file: str | None = None,
+    check: bool = False,
+    workspace_filter: str | None = None,
+) -> int:
+    """Convert configured CopyJob tables to incremental loads and validate every CopyJob definition.
+
+    Without ``config_file`` the definitions are only validated. With ``check``
+    nothing is written and pending conversions fail the command (for CI).
+
+    Returns:
+        EXIT_SUCCESS, or EXIT_FAILURE on invalid definitions or config, or pending changes with ``check``
+    """
+    workspaces = select_workspaces(workspaces_dir, model, workspace_filter)
+    if workspaces is None:
+        return EXIT_FAILURE
+    try:
+        config = load_incremental_config(config_file) if config_file else {}
+    except (OSError, ValueError) as e:
+        logger.error(f"ERROR: Cannot load incremental config: {e!s}")
+        return EXIT_FAILURE
+    unknown = unknown_copy_jobs(workspaces, config)
+    if unknown:
+        logger.error(f"ERROR: CopyJob(s) not found in {workspaces_dir}: {', '.join(unknown)}")
+        return EXIT_FAILURE
+
+    logger.info(SEPARATOR_LONG)
+    logger.info("COPYJOB INCREMENTAL CONVERSION" + (" (check only)" if check else ""))
+    logger.info(SEPARATOR_LONG)
+
+    failed = pending = 0
+    for workspace in workspaces:
+        with log_context(workspace=workspace.folder, phase="convert-copyjobs"):
+            conversions = convert_workspace(workspace, workspaces_dir, config)
+        logger.info(SEPARATOR_SHORT)
+        logger.info(f"Workspace: {workspace.folder} ({len(conversions)} CopyJob(s))")
+        for conversion in conversions:
+            if conversion.errors:
+                failed += 1
+                logger.error(f"  [FAIL] {conversion.item}")
+                for error in conversion.errors:
+                    logger.error(f"    {error}")
+                continue
+            if not conversion.changes:
+                logger.info(f"  [OK] {conversion.item}")
+                continue
+            pending += 1
+            if not check:
+                write_conversion(workspaces_dir, workspace.folder, conversion)
+            logger.info(f"  {'[WARN] Pending' if check else '[OK] Converted'} {conversion.item}")
+            for change in conversion.changes:
+                logger.info(f"    {change}")
+
+    logger.info(f"\n{SEPARATOR_LONG}")
+    if failed:
+        logger.error(f"[FAIL] {failed} CopyJob definition(s) invalid")
+        return EXIT_FAILURE
+    if check and pending:
+        logger.error(f"[FAIL] {pending} CopyJob(s) not yet converted; run without --check")
+        return EXIT_FAILURE
+    return EXIT_SUCCESS
@@ -0,0 +1,360 @@
+"""Throughput linting of CopyJob definitions and per-environment tuning overlays.
+
+Every table copied by a CopyJob (one entry of ``activities`` in
+copyjob-content.json) is checked for settings that decide how fast it copies
+and how fast it is read afterwards:
+
+- ``writeBehavior: Append`` in a full batch load appends every row again on
+  each run;
+- V-Order off on a Lakehouse table: cheaper writes, slower downstream reads;
+- no explicit ``parallelCopies`` / ``dataIntegrationUnits`` for a large table;
+- sources that copy much faster through staging, with staging disabled;
+- folder sources read without partition discovery.
+
+Size-dependent rules use a YAML file of table sizes in MB, optionally per
+environment. The recommended settings differ per environment (dev stays cheap,
+prod gets V-Order and heavier parallelism), so they are written as a
+fabric-cicd ``key_value_replace`` template addressing each table by its
+activity id. key_value_replace only rewrites keys that already exist, so
+settings missing from a definition are reported to be added first.
+"""
+
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+from ..common.logger import get_logger, log_context
+from .config import (
+    COPYJOB_LARGE_TABLE_MB,
+    COPYJOB_STAGING_SOURCE_TYPES,
+    COPYJOB_TUNING_PROFILES,
+    COPYJOB_TUNING_TEMPLATE_FILE,
+    EXIT_FAILURE,
+    EXIT_SUCCESS,
+    PROMOTION_ORDER,
+    SEPARATOR_LONG,
+    SEPARATOR_SHORT,
+)
+from .parameters import ALL_ENVIRONMENTS_KEY
+from .pipeline_analysis import COPY_JOB_CONTENT_FILE
+from .workspace_model import RepositoryModel, WorkspaceModel, select_workspaces
+
+logger = get_logger(__name__)
+
+# Finding severities
+SEVERITY_WARNING = "warning"
+SEVERITY_INFO = "info"
+
+# Lint rules
+RULE_WRITE_BEHAVIOR = "write-behavior"
+RULE_V_ORDER = "v-order"
+RULE_PARALLELISM = "parallelism"
+RULE_STAGING = "staging"
+RULE_PARTITION_DISCOVERY = "partition-discovery"
+
+# Keys that mark a table as copied incrementally (only changed rows are read)
+INCREMENTAL_KEYS = ("watermarkColumn", "incrementalColumn")
+# Tuned settings and where they live inside one table's ``properties``
+TUNED_SETTINGS = {
+    "applyVOrder": ("destination", "applyVOrder"),
+    "parallelCopies": ("parallelCopies",),
+    "dataIntegrationUnits": ("dataIntegrationUnits",),
+}
+PARALLELISM_SETTINGS = ("parallelCopies", "dataIntegrationUnits")
+
+# Table sizes: table ("schema.table" or "table") -> environment (or _ALL_) -> MB
+TableSizes = dict[str, dict[str, float]]
+
+
+@dataclass(frozen=True)
+class CopyJobTable:
+    """One table copied by a CopyJob."""
+
+    item: str  # CopyJob display name
+    path: str  # copyjob-content.json relative to the workspace folder
+    activity_id: str
+    table: str  # "schema.table"
+    job_mode: str
+    source_type: str
+    properties: dict[str, Any] = field(compare=False)
+
+
+@dataclass(frozen=True)
+class CopyJobFinding:
+    """One throughput-relevant setting of a table and what to do about it."""
+
+    item: str
+    table: str
+    rule: str
+    severity: str
+    message: str
+
+
+@dataclass(frozen=True)
+class TuningOverlay:
+    """A per-environment value of one setting of one table (one key_value_replace entry)."""
+
+    item: str
+    table: str
+    setting: str
+    find_key: str  # JSONPath into copyjob-content.json
+    values: dict[str, Any]  # environment -> value
+    present: bool  # the key exists in the definition (key_value_replace cannot add it)
+
+
+@dataclass
+class CopyJobLint:
+    """Lint results and tuning overlays of one workspace."""
+
+    workspace_folder: str
+    tables: list[CopyJobTable] = field(default_factory=list)
+    findings: list[CopyJobFinding] = field(default_factory=list)
+    overlays: list[TuningOverlay] = field(default_factory=list)
+    errors: list[str] = field(default_factory=list)
+
+
+def load_table_sizes(path: str | Path) -> TableSizes:
+    """Load table sizes in MB.
+
+    Each table maps to one size or to sizes per environment::
+
+        dbo.fact_sale: {dev: 40, prod: 52000}
+        dimension_city: 12
+
+    Raises:
+        ValueError: If the file is not such a mapping
+    """
+    raw = yaml.safe_load(Path(path).read_text(encoding="utf-8")) or {}
+    if not isinstance(raw, dict):
+        raise ValueError(f"{path}: expected a mapping of table names to sizes in MB")
+    sizes: TableSizes = {}
+    for table, value in raw.items():
+        per_environment = value if isinstance(value, dict) else {ALL_ENVIRONMENTS_KEY: value}
+        for environment, size in per_environment.items():
+            if not isinstance(size, int | float) or isinstance(size, bool):
+                raise ValueError(f"{path}: size of '{table}' ({environment}) must be a number of MB")
+            sizes.setdefault(str(table), {})[str(environment)] = float(size)
+    return sizes
+
+
+def table_size(sizes: TableSizes, table: str, environment: str) -> float | None:
+    """Return a table's size in MB in an environment, or None when unknown."""
+    per_environment = sizes.get(table) or sizes.get(table.split(".", 1)[-1])
+    if not per_environment:
+        return None
+    return per_environment.get(environment, per_environment.get(ALL_ENVIRONMENTS_KEY))
+
+
+def _get(node: Any, *keys: str) -> Any:
+    for key in keys:
+        if not isinstance(node, dict):
+            return None
+        node = node.get(key)
+    return node
+
+
+def _contains_key(node: Any, keys: tuple[str, ...]) -> bool:
+    if isinstance(node, dict):
+        return any(key in node for key in keys) or any(_contains_key(value, keys) for value in node.values())
+    if isinstance(node, list):
+        return any(_contains_key(value, keys) for value in node)
+    return False
+
+
+def parse_copy_job(item: str, relative: str, content: Any) -> list[CopyJobTable]:
+    """Return the tables of one parsed copyjob-content.json."""
+    properties = _get(content, "properties") or {}
+    tables = []
+    for activity in _get(content, "activities") or []:
+        table_properties = _get(activity, "properties")
+        if not isinstance(table_properties, dict):
+            continue
+        dataset = _get(table_properties, "destination", "datasetSettings") or {}
+        table = ".".join(str(part) for part in (dataset.get("schema"), dataset.get("table")) if part)
+        tables.append(
+            CopyJobTable(
+                item=item,
+                path=relative,
+                activity_id=str(_get(activity, "id") or ""),
+                table=table or str(_get(activity, "id") or "?"),
+                job_mode=str(properties.get("jobMode", "")),
+                source_type=str(_get(properties, "source", "type") or ""),
+                properties=table_properties,
+            )
+        )
+    return tables
+
+
+def lint_table(table: CopyJobTable, sizes: TableSizes) -> list[CopyJobFinding]:
+    """Check one table's throughput-relevant settings."""
+    findings = []
+    props = table.properties
+
+    def add(rule: str, severity: str, message: str) -> None:
+        findings.append(CopyJobFinding(table.item, table.table, rule, severity, message))
+
+    incremental = _contains_key(props, INCREMENTAL_KEYS)
+    if table.job_mode == "Batch" and _get(props, "destination", "writeBehavior") == "Append" and not incremental:
+        add(
+            RULE_WRITE_BEHAVIOR,
+            SEVERITY_WARNING,
+            "Append on a full batch load re-appends every row each run; use Overwrite or copy incrementally",
+        )
+
+    known = {env: size for env in PROMOTION_ORDER if (size := table_size(sizes, table.table, env)) is not None}
+    large = [env for env, size in known.items() if size >= COPYJOB_LARGE_TABLE_MB]  # in promotion order
+
+    largest = f"{known[large[-1]]:,.0f} MB in {large[-1]}" if large else ""
+    if _get(props, "destination", "applyVOrder") is False:
+        if large:
+            add(RULE_V_ORDER, SEVERITY_WARNING, f"V-Order off on a table of {largest}: slower Direct Lake/SQL reads")
+        else:
+            message = "V-Order off: cheaper writes, slower reads (the overlay enables it in prod)"
+            add(RULE_V_ORDER, SEVERITY_INFO, message)
+
+    if not any(key in props for key in PARALLELISM_SETTINGS):
+        if large:
+            add(RULE_PARALLELISM, SEVERITY_WARNING, f"no explicit parallelCopies/dataIntegrationUnits for {largest}")
+        elif len(known) < len(PROMOTION_ORDER):
+            add(RULE_PARALLELISM, SEVERITY_INFO, "size unknown (see --table_sizes): parallelism is left to the default")
+
+    if table.source_type in COPYJOB_STAGING_SOURCE_TYPES and not props.get("enableStaging"):
+        add(RULE_STAGING, SEVERITY_WARNING, f"{table.source_type} sources copy much faster with enableStaging: true")
+
+    location = _get(props, "source", "datasetSettings", "location") or {}
+    store = _get(props, "source", "storeSettings") or {}
+    if location.get("folderPath") and not location.get("fileName") and not store.get("enablePartitionDiscovery"):
+        add(
+            RULE_PARTITION_DISCOVERY,
+            SEVERITY_WARNING,
+            "folder source without enablePartitionDiscovery: partition columns in paths are lost and not pruned",
+        )
+    return findings
+
+
+def tuning_overlays(table: CopyJobTable, sizes: TableSizes) -> list[TuningOverlay]:
+    """Return the per-environment settings of one table that differ between environments."""
+    overlays = []
+    sized = [table_size(sizes, table.table, env) for env in PROMOTION_ORDER]
+    # Parallelism only pays off for large tables; tables known to be small everywhere keep the default
+    wants_parallelism = any(size is None or size >= COPYJOB_LARGE_TABLE_MB for size in sized)
+    for setting, keys in TUNED_SETTINGS.items():
+        if setting in PARALLELISM_SETTINGS and not wants_parallelism:
+            continue
+        if setting == "applyVOrder" and _get(table.properties, "destination") is None:
+            continue
+        values = {env: COPYJOB_TUNING_PROFILES[env][setting] for env in PROMOTION_ORDER}
+        if len(set(values.values())) == 1:
+            continue
+        parent = _get(table.properties, *keys[:-1])
+        present = isinstance(parent, dict) and keys[-1] in parent
+        find_key = f'$.activities[?(@.id=="{table.activity_id}")].properties.{".".join(keys)}'
+        overlays.append(TuningOverlay(table.item, table.table, setting, find_key, values, present))
+    return overlays
+
+
+def lint_workspace(workspace: WorkspaceModel, workspaces_dir: Path, sizes: TableSizes | None = None) -> CopyJobLint:
+    """Lint every CopyJob of a workspace and compute its tuning overlays."""
+    result = CopyJobLint(workspace.folder)
+    for item in workspace.items:
+        if item.item_type != "CopyJob":
+            continue
+        relative = f"{item.path}/{COPY_JOB_CONTENT_FILE}"
+        try:
+            content = json.loads((workspaces_dir / workspace.folder / relative).read_text(encoding="utf-8-sig"))
+        except (OSError, ValueError) as e:
+            result.errors.append(f"{relative}: {e}")
+            continue
+        for table in parse_copy_job(item.display_name, relative, content):
+            result.tables.append(table)
+            result.findings.extend(lint_table(table, sizes or {}))
+            result.overlays.extend(tuning_overlays(table, sizes or {}))
+    return result
+
+
+def render_tuning_template(overlays: list[TuningOverlay], header: str = "") -> str:
+    """Serialize overlays as a parameter.yml ``key_value_replace`` section (to be added via ``extend``)."""
+    entries = [
+        {"find_key": o.find_key, "replace_value": dict(o.values), "item_type": "CopyJob", "item_name": o.item}
+        for o in overlays
+    ]
+    missing = sorted({(o.item, o.table, o.setting) for o in overlays if not o.present})
+    notes = header.splitlines()
+    if missing:
+        notes += ["", "key_value_replace only rewrites existing keys; add these to the definitions first:"]
+        notes += [f"  {item} {table}: {setting}" for item, table, setting in missing]
+    body = yaml.safe_dump({"key_value_replace": entries}, sort_keys=False, allow_unicode=True, width=1000)
+    return "".join(f"# {line}\n".replace("# \n", "#\n") for line in notes) + body
+
+
+def run_lint_copyjobs(
+    workspaces_dir: Path,
+    model: RepositoryModel,
+    table_sizes_file: str | None = None,
+    output_directory: str | None = None,
+    workspace_filter: str | None = None,
+) -> int:
+    """Flag throughput-relevant CopyJob settings and generate per-environment tuning overlays.
+
+    With ``output_directory`` the overlays of each workspace are written as a
+    key_value_replace template to ``<output_directory>/<workspace>/cp_tuning_parameters.yml``.
+
+    Returns:
+        EXIT_SUCCESS, or EXIT_FAILURE if a CopyJob definition cannot be read
+    """
+    workspaces = select_workspaces(workspaces_dir, model, workspace_filter)
+    if workspaces is None:
+        return EXIT_FAILURE
+    try:
+        sizes = load_table_sizes(table_sizes_file) if table_sizes_file else {}
+    except (OSError, ValueError) as e:
+        logger.error(f"ERROR: Cannot load table sizes: {e!s}")
+        return EXIT_FAILURE
+
+    logger.info(SEPARATOR_LONG)
+    logger.info("COPYJOB THROUGHPUT LINT")
+    logger.info(SEPARATOR_LONG)
+
+    exit_code = EXIT_SUCCESS
+    for workspace in workspaces:
+        with log_context(workspace=workspace.folder, phase="lint-copyjobs"):
+            result = lint_workspace(workspace, workspaces_dir, sizes)
+        _log_copyjob_lint(result)
+        if result.errors:
+            exit_code = EXIT_FAILURE
+        if output_directory and result.overlays:
+            target = Path(output_directory) / workspace.folder / COPYJOB_TUNING_TEMPLATE_FILE
+            target.parent.mkdir(parents=True, exist_ok=True)
+            header = (
+                f"CopyJob tuning overlays for {workspace.folder} (generated by fabric lint-copyjobs).\n"
+                "Add this file to the workspace parameter.yml extend list."
+            )
+            target.write_text(render_tuning_template(result.overlays, header), encoding="utf-8")
+            logger.info(f"  [OK] Wrote {target} ({len(result.overlays)} overlay(s))")
+
+    logger.info(f"\n{SEPARATOR_LONG}")
+    return exit_code
+
+
+def _log_copyjob_lint(result: CopyJobLint) -> None:
+    """Log one workspace's CopyJob findings grouped by table."""
+    logger.info(SEPARATOR_SHORT)
+    logger.info(f"Workspace: {result.workspace_folder} ({len(result.tables)} CopyJob table(s))")
+    for error in result.errors:
+        logger.error(f"  [FAIL] {error}")
+    for table in result.tables:
+        findings = [f for f in result.findings if (f.item, f.table) == (table.item, table.table)]
+        if not findings:
+            logger.info(f"  [OK] {table.item} {table.table}")
+            continue
+        logger.info(f"  {table.item} {table.table}")
+        for finding in findings:
+            if finding.severity == SEVERITY_WARNING:
+                logger.warning(f"    [WARN] {finding.rule}: {finding.message}")
+            else:
+                logger.info(f"    {finding.rule}: {finding.message}")
+    warnings = sum(1 for f in result.findings if f.severity == SEVERITY_WARNING)
+    logger.info(f"  {warnings} warning(s), {len(result.findings) - warnings} recommendation(s)")
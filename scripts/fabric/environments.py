@@ -0,0 +1,18 @@
+"""Target environment lists shared by the renderer and the deployer."""
+
+from .config import PROMOTION_ORDER, VALID_ENVIRONMENTS
+
+
+def parse_environments(value: str) -> list[str]:
+    """Parse a comma-separated environment list in promotion order.
+
+    Raises:
+        ValueError: If an environment is not valid
+    """
+    requested = {env.strip().lower() for env in value.split(",") if env.strip()}
+    invalid = requested - VALID_ENVIRONMENTS
+    if invalid or not requested:
+        raise ValueError(
+            f"Invalid environment(s) '{value}'. Must be one or more of: {', '.join(sorted(VALID_ENVIRONMENTS))}"
+        )
+    return [env for env in PROMOTION_ORDER if env in requested]
@@ -0,0 +1,383 @@
+"""SQLite history of deployment runs and duration regression detection.
+
+Every run is stored with its per-workspace deploy timings and run-level phase
+timings (from the deployment-results.jsonl stream when available). Runs are
+identified by a hash of their results payload, so recording a run at the end of
+a deployment and later importing the same workflow artifact does not create a
+duplicate.
+
+Regression detection compares the latest run of every series (run total, run
+phases, per-workspace deploy) with a rolling baseline of earlier runs using the
+modified z-score (median / median absolute deviation). It is robust to the odd
+outlier in the baseline and needs no distribution assumptions. A slowdown is
+flagged when the z-score exceeds the threshold and the latest duration is also
+meaningfully slower than the baseline median.
+"""
+
+import hashlib
+import json
+import sqlite3
+import statistics
+import zipfile
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from ..common.logger import get_logger
+from .config import (
+    HISTORY_BASELINE_WINDOW,
+    HISTORY_MIN_BASELINE_RUNS,
+    HISTORY_MIN_SLOWDOWN_RATIO,
+    HISTORY_Z_THRESHOLD,
+    RESULTS_FILENAME,
+    RESULTS_STREAM_FILENAME,
+)
+from .reporting import environment_sections
+
+logger = get_logger(__name__)
+
+RUN_SCOPE = "(run)"  # workspace value of run-level series
+
+# Consistency constant that makes the MAD comparable to a standard deviation
+MAD_SCALE = 1.4826
+
+SPARK_CHARS = "▁▂▃▄▅▆▇█"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    environment TEXT NOT NULL,
+    commit_sha TEXT NOT NULL DEFAULT '',
+    finished_at TEXT NOT NULL,
+    duration REAL NOT NULL,
+    total_workspaces INTEGER NOT NULL,
+    successful_count INTEGER NOT NULL,
+    failed_count INTEGER NOT NULL,
+    source TEXT NOT NULL DEFAULT ''
+);
+CREATE TABLE IF NOT EXISTS workspace_runs (
+    run_id TEXT NOT NULL REFERENCES runs(run_id) ON DELETE CASCADE,
+    workspace TEXT NOT NULL,
+    status TEXT NOT NULL,
+    duration REAL NOT NULL,
+    attempts INTEGER NOT NULL,
+    resumed INTEGER NOT NULL,
+    PRIMARY KEY (run_id, workspace)
+);
+CREATE TABLE IF NOT EXISTS phase_runs (
+    run_id TEXT NOT NULL REFERENCES runs(run_id) ON DELETE CASCADE,
+    workspace TEXT NOT NULL,
+    phase TEXT NOT NULL,
+    duration REAL NOT NULL,
+    PRIMARY KEY (run_id, workspace, phase)
+);
+CREATE INDEX IF NOT EXISTS runs_by_environment ON runs (environment, finished_at);
+"""
+
+
+@dataclass(frozen=True)
+class SeriesReport:
+    """Latest value of one timing series compared with its baseline."""
+
+    workspace: str
+    phase: str
+    latest: float
+    history: tuple[float, ...]  # baseline followed by latest, oldest first
+    baseline_median: float | None
+    z_score: float | None
+
+    @property
+    def baseline_size(self) -> int:
+        return len(self.history) - 1
+
+    @property
+    def change_ratio(self) -> float | None:
+        if not self.baseline_median:
+            return None
+        return self.latest / self.baseline_median - 1
+
+    def is_regression(
+        self,
+        z_threshold: float = HISTORY_Z_THRESHOLD,
+        min_ratio: float = HISTORY_MIN_SLOWDOWN_RATIO,
+        min_baseline: int = HISTORY_MIN_BASELINE_RUNS,
+    ) -> bool:
+        """Return True for a statistically significant and material slowdown."""
+        if self.baseline_size < min_baseline or self.z_score is None or self.change_ratio is None:
+            return False
+        return self.z_score > z_threshold and self.change_ratio >= min_ratio
+
+
+def modified_z_score(value: float, baseline: list[float]) -> float | None:
+    """Return the modified z-score of ``value`` against ``baseline``.
+
+    Falls back to the mean absolute deviation when more than half of the baseline
+    is identical (MAD == 0). Returns None for an empty or constant baseline.
+    """
+    if not baseline:
+        return None
+    median = statistics.median(baseline)
+    mad = statistics.median(abs(x - median) for x in baseline)
+    if mad > 0:
+        return (value - median) / (MAD_SCALE * mad)
+    mean_ad = statistics.fmean(abs(x - median) for x in baseline)
+    if mean_ad > 0:
+        # 1.2533 = sqrt(pi/2), the mean absolute deviation consistency constant
+        return (value - median) / (1.2533 * mean_ad)
+    return None
+
+
+def sparkline(values: Iterable[float]) -> str:
+    """Render values as a unicode sparkline (min..max scaled)."""
+    values = list(values)
+    if not values:
+        return ""
+    low, high = min(values), max(values)
+    span = high - low
+    if span == 0:
+        return SPARK_CHARS[0] * len(values)
+    return "".join(SPARK_CHARS[round((v - low) / span * (len(SPARK_CHARS) - 1))] for v in values)
+
+
+def compute_run_id(results: dict[str, Any]) -> str:
+    """Return a stable run id derived from the results payload."""
+    return hashlib.sha256(json.dumps(results, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
+def phases_from_stream(events: Iterable[dict[str, Any]]) -> list[tuple[str, str, float]]:
+    """Extract (workspace, phase, duration) timings from results stream events."""
+    timings: list[tuple[str, str, float]] = []
+    for event in events:
+        if event.get("event") == "phase_completed":
+            timings.append((RUN_SCOPE, event["phase"], float(event.get("duration", 0.0))))
+    return timings
+
+
+def parse_stream(text: str) -> list[dict[str, Any]]:
+    """Parse JSON-lines stream text, skipping unparseable (e.g. truncated) lines."""
+    events = []
+    for line in text.splitlines():
+        try:
+            events.append(json.loads(line))
+        except ValueError:
+            continue
+    return events
+
+
+class HistoryStore:
+    """SQLite-backed deployment history."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        if str(path) != ":memory:":
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(str(path))
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.connection.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def __enter__(self) -> "HistoryStore":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def record(
+        self,
+        results: dict[str, Any],
+        phases: Iterable[tuple[str, str, float]] = (),
+        finished_at: str | None = None,
+        source: str = "",
+    ) -> bool:
+        """Store one run; return False if it was already recorded.
+
+        Args:
+            results: Deployment results payload (deployment-results.json)
+            phases: Run-level (workspace, phase, duration) timings, e.g. from phases_from_stream()
+            finished_at: Fallback timestamp when the payload has none (older artifacts)
+            source: Where the run came from (file name / artifact), for reference
+        """
+        run_id = compute_run_id(results)
+        timestamp = results.get("finished_at") or finished_at or datetime.now(timezone.utc).isoformat()
+        workspaces = results.get("workspaces", [])
+        with self.connection:
+            cursor = self.connection.execute(
+                "INSERT OR IGNORE INTO runs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    run_id,
+                    results.get("environment", ""),
+                    results.get("commit_sha", ""),
+                    timestamp,
+                    float(results.get("duration", 0.0)),
+                    int(results.get("total_workspaces", len(workspaces))),
+                    int(results.get("successful_count", 0)),
+                    int(results.get("failed_count", 0)),
+                    source,
+                ),
+            )
+            if cursor.rowcount == 0:
+                return False
+            self.connection.executemany(
+                "INSERT INTO workspace_runs VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        run_id,
+                        ws["name"],
+                        ws.get("status", ""),
+                        float(ws.get("duration", 0.0)),
+                        int(ws.get("attempts", 1)),
+                        int(bool(ws.get("resumed", False))),
+                    )
+                    for ws in workspaces
+                ],
+            )
+            phase_rows = {(run_id, RUN_SCOPE, "total"): float(results.get("duration", 0.0))}
+            for ws in workspaces:
+                if ws.get("status") == "success" and not ws.get("resumed") and ws.get("attempts", 1) > 0:
+                    phase_rows[(run_id, ws["name"], "deploy")] = float(ws.get("duration", 0.0))
+            for workspace, phase, duration in phases:
+                phase_rows[(run_id, workspace, phase)] = duration
+            self.connection.executemany(
+                "INSERT INTO phase_runs VALUES (?, ?, ?, ?)", [(*key, value) for key, value in phase_rows.items()]
+            )
+        return True
+
+    def run_count(self, environment: str | None = None) -> int:
+        query = "SELECT COUNT(*) FROM runs" + (" WHERE environment = ?" if environment else "")
+        return int(self.connection.execute(query, (environment,) if environment else ()).fetchone()[0])
+
+    def series(self, environment: str, limit: int) -> dict[tuple[str, str], list[float]]:
+        """Return the last ``limit`` durations of every (workspace, phase) series, oldest first.
+
+        Only successful runs contribute to the run-level ``total`` series, so a
+        run that stopped early does not look like a speed-up.
+        """
+        rows = self.connection.execute(
+            """
+            SELECT p.workspace, p.phase, p.duration
+            FROM phase_runs p JOIN runs r ON r.run_id = p.run_id
+            WHERE r.environment = ? AND NOT (p.phase = 'total' AND r.failed_count > 0)
+            ORDER BY r.finished_at, r.run_id
+            """,
+            (environment,),
+        ).fetchall()
+        grouped: dict[tuple[str, str], list[float]] = {}
+        for workspace, phase, duration in rows:
+            grouped.setdefault((workspace, phase), []).append(duration)
+        return {key: values[-limit:] for key, values in grouped.items()}
+
+    def deploy_durations(self, environment: str, limit: int = HISTORY_BASELINE_WINDOW) -> dict[str, list[float]]:
+        """Return the last ``limit`` successful deploy durations of every workspace, oldest first."""
+        return {
+            workspace: values
+            for (workspace, phase), values in self.series(environment, limit).items()
+            if phase == "deploy" and workspace != RUN_SCOPE
+        }
+
+    def analyze(self, environment: str, window: int = HISTORY_BASELINE_WINDOW) -> list[SeriesReport]:
+        """Compare the latest value of every series with the ``window`` values before it."""
+        reports = []
+        for (workspace, phase), values in sorted(self.series(environment, window + 1).items()):
+            latest, baseline = values[-1], values[:-1]
+            reports.append(
+                SeriesReport(
+                    workspace=workspace,
+                    phase=phase,
+                    latest=latest,
+                    history=tuple(values),
+                    baseline_median=statistics.median(baseline) if baseline else None,
+                    z_score=modified_z_score(latest, baseline),
+                )
+            )
+        return reports
+
+
+def iter_artifact_payloads(path: Path) -> Iterator[tuple[str, dict[str, Any], list[dict[str, Any]], str]]:
+    """Yield (source, results, stream events, fallback timestamp) from an artifact.
+
+    ``path`` may be a deployment-results.json file, a directory (searched
+    recursively) or a downloaded workflow artifact .zip. A sibling
+    deployment-results.jsonl is used for phase timings when present.
+    """
+    if path.is_dir():
+        for results_file in sorted(path.rglob(RESULTS_FILENAME)):
+            yield from iter_artifact_payloads(results_file)
+        for archive_path in sorted(path.rglob("*.zip")):
+            yield from iter_artifact_payloads(archive_path)
+        return
+
+    if path.suffix == ".zip":
+        with zipfile.ZipFile(path) as archive:
+            names = set(archive.namelist())
+            for name in sorted(n for n in names if Path(n).name == RESULTS_FILENAME):
+                stream_name = str(Path(name).with_name(RESULTS_STREAM_FILENAME))
+                info = archive.getinfo(name)
+                stream = archive.read(stream_name).decode("utf-8") if stream_name in names else ""
+                yield (
+                    f"{path.name}:{name}",
+                    json.loads(archive.read(name)),
+                    parse_stream(stream),
+                    datetime(*info.date_time).replace(tzinfo=timezone.utc).isoformat(),
+                )
+        return
+
+    stream_file = path.with_name(RESULTS_STREAM_FILENAME)
+    stream = stream_file.read_text(encoding="utf-8") if stream_file.exists() else ""
+    yield (
+        str(path),
+        json.loads(path.read_text(encoding="utf-8")),
+        parse_stream(stream),
+        datetime.fromtimestamp(path.stat().st_mtime, tz=timezone.utc).isoformat(),
+    )
+
+
+def import_artifacts(store: HistoryStore, paths: Iterable[Path]) -> tuple[int, int]:
+    """Import results from artifacts; return (imported, already present) run counts.
+
+    Every environment of a multi-environment results file is stored as its own run.
+
+    Raises:
+        ValueError: If a results file is not valid JSON
+        OSError: If a path cannot be read
+    """
+    imported = skipped = 0
+    for path in paths:
+        for source, results, events, fallback_timestamp in iter_artifact_payloads(path):
+            sections = environment_sections(results)
+            # Run-level phases (e.g. prepare) are shared by all environments of a multi-environment run
+            phases = phases_from_stream(events) if len(sections) == 1 else []
+            for section in sections:
+                if store.record(section, phases, fallback_timestamp, source):
+                    imported += 1
+                else:
+                    skipped += 1
+    return imported, skipped
+
+
+def render_trend_table(reports: list[SeriesReport], environment: str, **thresholds: Any) -> str:
+    """Render the regression report as a GitHub-flavoured markdown table."""
+    lines = [
+        f"### Deployment duration trends - {environment}",
+        "",
+        "| Workspace | Phase | Runs | Baseline median | Latest | Change | z | Trend | Status |",
+        "|---|---|---:|---:|---:|---:|---:|---|---|",
+    ]
+    for report in reports:
+        change = f"{report.change_ratio:+.0%}" if report.change_ratio is not None else "n/a"
+        z_score = f"{report.z_score:.1f}" if report.z_score is not None else "n/a"
+        median = f"{report.baseline_median:.1f}s" if report.baseline_median is not None else "n/a"
+        if report.is_regression(**thresholds):
+            status = "⚠️ slower"
+        elif report.baseline_size < thresholds.get("min_baseline", HISTORY_MIN_BASELINE_RUNS):
+            status = "collecting baseline"
+        else:
+            status = "ok"
+        lines.append(
+            f"| {report.workspace} | {report.phase} | {len(report.history)} | {median} | {report.latest:.1f}s "
+            f"| {change} | {z_score} | {sparkline(report.history)} | {status} |"
+        )
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,259 @@
+"""Generation of the lakehouse table maintenance notebook and its pipeline activity.
+
+CopyJobs append to their Lakehouse tables on every run, so the tables
+accumulate small files and old versions and reads slow down. The generated
+notebook runs, per table, ``OPTIMIZE`` (bin-compaction, optional Z-Order
+columns, V-Order) and ``VACUUM`` with a retention period. Its table list comes
+from the CopyJob destinations writing to the lakehouse, so a new CopyJob is
+picked up by regenerating.
+
+The notebook is placed under the lakehouse's layer folder, attaches to the
+lakehouse through the usual ``# META`` header (parameterized by the existing
+notebook rules) and is scheduled by a TridentNotebook activity added to the
+ingestion pipeline, depending on every activity that nothing else depends on.
+Its settings are notebook parameters that the activity passes explicitly.
+"""
+
+import json
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from ..common.logger import get_logger
+from .config import (
+    EXIT_FAILURE,
+    MAINTENANCE_ACTIVITY,
+    MAINTENANCE_LAKEHOUSE,
+    MAINTENANCE_LAYER_FOLDER,
+    MAINTENANCE_NOTEBOOK,
+    MAINTENANCE_PIPELINE,
+    MAINTENANCE_RETENTION_HOURS,
+)
+from .copyjob_lint import parse_copy_job
+from .notebooks import (
+    PLACEHOLDER_WORKSPACE_ID,
+    DefaultLakehouse,
+    GeneratedFiles,
+    NotebookCell,
+    generated_logical_id,
+    lakehouse_dev_id,
+    notebook_files,
+    run_generator,
+)
+from .pipeline_analysis import COPY_JOB_CONTENT_FILE, PIPELINE_CONTENT_FILE
+from .workspace_model import RepositoryModel, WorkspaceModel
+
+logger = get_logger(__name__)
+
+MAINTENANCE_CODE = '''
+import json
+
+zorder = json.loads(zorder_columns)
+for table in [name.strip() for name in tables.split(",") if name.strip()]:
+    quoted = ".".join(f"`{part}`" for part in table.split("."))
+    optimize = f"OPTIMIZE {quoted}"
+    if zorder.get(table):
+        optimize += f" ZORDER BY ({', '.join(f'`{column}`' for column in zorder[table])})"
+    if vorder:
+        optimize += " VORDER"
+    vacuum = f"VACUUM {quoted} RETAIN {int(vacuum_retention_hours)} HOURS"
+    for statement in (optimize, vacuum):
+        print(statement)
+        spark.sql(statement)
+'''
+
+
+@dataclass(frozen=True)
+class MaintenancePlan:
+    """What the maintenance notebook does."""
+
+    tables: tuple[str, ...]  # "schema.table"
+    zorder: Mapping[str, tuple[str, ...]] = field(default_factory=dict)  # table -> Z-Order columns
+    vorder: bool = True
+    retention_hours: int = MAINTENANCE_RETENTION_HOURS
+
+    def parameters(self) -> dict[str, tuple[Any, str]]:
+        """Return notebook parameter name -> (value, pipeline parameter type)."""
+        zorder = {table: list(columns) for table, columns in sorted(self.zorder.items())}
+        return {
+            "tables": (",".join(self.tables), "string"),
+            "zorder_columns": (json.dumps(zorder), "string"),
+            "vorder": (self.vorder, "bool"),
+            "vacuum_retention_hours": (self.retention_hours, "int"),
+        }
+
+
+def parse_zorder(values: list[str]) -> dict[str, tuple[str, ...]]:
+    """Parse ``table=column,column`` options into table -> Z-Order columns.
+
+    Raises:
+        ValueError: If an option has no table or no columns
+    """
+    zorder: dict[str, tuple[str, ...]] = {}
+    for value in values:
+        table, _, columns = value.partition("=")
+        names = tuple(c.strip() for c in columns.split(",") if c.strip())
+        if not table.strip() or not names:
+            raise ValueError(f"expected table=column[,column...], got '{value}'")
+        zorder[table.strip()] = names
+    return zorder
+
+
+def lakehouse_tables(workspace: WorkspaceModel, workspaces_dir: Path, lakehouse_name: str) -> list[str]:
+    """Return the tables CopyJobs of a workspace write to a lakehouse, sorted and unique."""
+    lakehouse_ids = {
+        item.logical_id.lower()
+        for item in workspace.items
+        if item.item_type == "Lakehouse" and item.display_name == lakehouse_name
+    }
+    tables: set[str] = set()
+    for item in workspace.items:
+        if item.item_type != "CopyJob":
+            continue
+        relative = f"{item.path}/{COPY_JOB_CONTENT_FILE}"
+        try:
+            content = json.loads((workspaces_dir / workspace.folder / relative).read_text(encoding="utf-8-sig"))
+        except (OSError, ValueError):
+            continue  # pre-flight reports unreadable definitions
+        destination = content.get("properties", {}).get("destination", {}) if isinstance(content, dict) else {}
+        target = destination.get("connectionSettings", {}).get("typeProperties", {}).get("artifactId", "")
+        if destination.get("type") != "LakehouseTable" or str(target).lower() not in lakehouse_ids:
+            continue
+        copied = parse_copy_job(item.display_name, relative, content)
+        tables.update(table.table for table in copied if "." in table.table)
+    return sorted(tables)
+
+
+def maintenance_cells(plan: MaintenancePlan) -> list[NotebookCell]:
+    """Return the parameters and code cells of the maintenance notebook."""
+    parameters = "\n".join(f"{name} = {value!r}" for name, (value, _) in plan.parameters().items())
+    return [NotebookCell(parameters, parameters=True), NotebookCell(MAINTENANCE_CODE)]
+
+
+def maintenance_activity(notebook_id: str, depends_on: list[str], plan: MaintenancePlan) -> dict[str, Any]:
+    """Return the TridentNotebook activity running the maintenance notebook."""
+    return {
+        "type": "TridentNotebook",
+        "typeProperties": {
+            "notebookId": notebook_id,
+            "workspaceId": PLACEHOLDER_WORKSPACE_ID,
+            "parameters": {
+                name: {"value": value, "type": kind} for name, (value, kind) in plan.parameters().items()
+            },
+        },
+        "policy": {
+            "timeout": "0.01:00:00",
+            "retry": 1,
+            "retryIntervalInSeconds": 300,
+            "secureInput": False,
+            "secureOutput": False,
+        },
+        "name": MAINTENANCE_ACTIVITY,
+        "dependsOn": [{"activity": name, "dependencyConditions": ["Succeeded"]} for name in depends_on],
+    }
+
+
+def schedule_after_pipeline(content: dict[str, Any], notebook_id: str, plan: MaintenancePlan) -> dict[str, Any]:
+    """Return pipeline content with the maintenance activity after all other work (replacing an earlier one)."""
+    updated = json.loads(json.dumps(content))
+    activities = [a for a in updated["properties"]["activities"] if a.get("name") != MAINTENANCE_ACTIVITY]
+    upstream = {d.get("activity") for a in activities for d in a.get("dependsOn") or []}
+    sinks = [a["name"] for a in activities if a.get("name") not in upstream]
+    updated["properties"]["activities"] = [*activities, maintenance_activity(notebook_id, sinks, plan)]
+    return updated
+
+
+def generate_maintenance(
+    workspace: WorkspaceModel,
+    workspaces_dir: Path,
+    layer_folder: str,
+    lakehouse_name: str,
+    pipeline_name: str,
+    notebook_name: str,
+    zorder: Mapping[str, tuple[str, ...]] | None = None,
+    vorder: bool = True,
+    retention_hours: int = MAINTENANCE_RETENTION_HOURS,
+) -> tuple[MaintenancePlan, dict[str, str]]:
+    """Build the maintenance notebook item and the updated pipeline definition.
+
+    Returns:
+        The plan and {workspace-relative path: content} of every generated or updated file
+
+    Raises:
+        ValueError: If the retention is too short, a Z-Order table is not maintained, or the pipeline is missing
+        KeyError: If the workspace has no such lakehouse
+    """
+    if retention_hours < MAINTENANCE_RETENTION_HOURS:
+        raise ValueError(f"VACUUM retention must be at least {MAINTENANCE_RETENTION_HOURS} hours")
+    tables = lakehouse_tables(workspace, workspaces_dir, lakehouse_name)
+    unknown = sorted(set(zorder or {}) - set(tables))
+    if unknown:
+        raise ValueError(f"Z-Order table(s) not written by a CopyJob to {lakehouse_name}: {', '.join(unknown)}")
+    pipelines = [i for i in workspace.items if i.item_type == "DataPipeline" and i.display_name == pipeline_name]
+    if not pipelines:
+        raise ValueError(f"No DataPipeline '{pipeline_name}' in workspace '{workspace.folder}'")
+
+    plan = MaintenancePlan(tuple(tables), dict(zorder or {}), vorder, retention_hours)
+    item_path = f"{layer_folder}/maintenance/{notebook_name}.Notebook"
+    lakehouse = DefaultLakehouse(lakehouse_dev_id(workspace, lakehouse_name), lakehouse_name)
+    description = f"OPTIMIZE / VACUUM of the {lakehouse_name} tables written by CopyJobs (generated)"
+    files = notebook_files(workspace.folder, item_path, maintenance_cells(plan), lakehouse, description)
+
+    pipeline_file = f"{pipelines[0].path}/{PIPELINE_CONTENT_FILE}"
+    pipeline_path = workspaces_dir / workspace.folder / pipeline_file
+    content = json.loads(pipeline_path.read_text(encoding="utf-8-sig"))
+    notebook_id = generated_logical_id(workspace.folder, item_path)
+    updated = schedule_after_pipeline(content, notebook_id, plan)
+    files[pipeline_file] = json.dumps(updated, indent=2) + ("\n" if pipeline_path.read_text().endswith("\n") else "")
+    return plan, files
+
+
+def run_generate_maintenance(
+    workspaces_dir: Path,
+    model: RepositoryModel,
+    layer_folder: str = MAINTENANCE_LAYER_FOLDER,
+    lakehouse: str = MAINTENANCE_LAKEHOUSE,
+    pipeline: str = MAINTENANCE_PIPELINE,
+    notebook: str = MAINTENANCE_NOTEBOOK,
+    zorder: list[str] | None = None,
+    vorder: bool = True,
+    retention_hours: int = MAINTENANCE_RETENTION_HOURS,
+    check: bool = False,
+    workspace_filter: str | None = None,
+) -> int:
+    """Generate the table maintenance notebook and schedule it in the ingestion pipeline.
+
+    Returns:
+        EXIT_SUCCESS, or EXIT_FAILURE on invalid options, no matching workspace, or drift with ``check``
+    """
+    try:
+        zorder_columns = parse_zorder(zorder or [])
+    except ValueError as e:
+        logger.error(f"ERROR: Invalid --zorder: {e!s}")
+        return EXIT_FAILURE
+
+    def build(workspace: WorkspaceModel) -> GeneratedFiles:
+        plan, files = generate_maintenance(
+            workspace,
+            workspaces_dir,
+            layer_folder,
+            lakehouse,
+            pipeline,
+            notebook,
+            zorder_columns,
+            vorder,
+            retention_hours,
+        )
+        return GeneratedFiles(files, [f"{len(plan.tables)} table(s): {', '.join(plan.tables) or '-'}"])
+
+    return run_generator(
+        workspaces_dir,
+        model,
+        workspace_filter,
+        "LAKEHOUSE MAINTENANCE NOTEBOOK",
+        "generate-maintenance",
+        lakehouse,
+        build,
+        check,
+    )
@@ -0,0 +1,234 @@
+"""Local bronze -> silver -> gold benchmark on synthetic star-schema parquet.
+
+Runs the medallion transformations on files written by ``generate-data``
+(see synthetic_data) with Arrow, without Fabric, and measures each stage:
+
+- bronze: read the source files as the CopyJobs land them, checking every
+  table's schema against the star schema
+- silver: keep the current version of each dimension row and the fact rows
+  with a positive quantity and a known stock item, recompute
+  TotalIncludingTax, and write the silver fact table
+- gold: join the silver facts to date and city and aggregate quantity,
+  revenue, profit and sales per calendar month and sales territory
+
+The fact table is streamed in batches of SYNTHETIC_CHUNK_ROWS rows and gold
+is aggregated per batch and then combined, so memory stays bounded at any
+scale. Each stage reports rows per second and the process's peak resident
+memory; the silver files go to a temporary folder inside the data directory
+(it is sized for the data) and are removed afterwards.
+"""
+
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from ..common.logger import get_logger
+from .config import EXIT_FAILURE, EXIT_SUCCESS, SEPARATOR_LONG, SYNTHETIC_CHUNK_ROWS
+from .pipeline_analysis import format_seconds
+from .reporting import write_json_atomic
+from .shortcuts import format_bytes
+from .synthetic_data import FACT_TABLE, STAR_SCHEMA, VALID_TO, arrow_schema, source_file
+
+logger = get_logger(__name__)
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+STAGE_BRONZE = "bronze"
+STAGE_SILVER = "silver"
+STAGE_GOLD = "gold"
+GOLD_KEYS = ("CalendarYear", "CalendarMonthNumber", "SalesTerritory")
+GOLD_MEASURES = ("Quantity", "TotalExcludingTax", "Profit")
+GOLD_SALES = "Sales"
+# Pre-buffered readers keep every column chunk read so far, so memory would grow with the file
+PRE_BUFFER = False
+
+
+@dataclass(frozen=True)
+class StageResult:
+    """Throughput and memory of one benchmark stage."""
+
+    stage: str
+    rows_in: int
+    rows_out: int
+    seconds: float
+    peak_memory_bytes: int  # process high-water mark at the end of the stage (0 if unavailable)
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows_in / self.seconds if self.seconds > 0 else 0.0
+
+
+@dataclass
+class MedallionBenchmark:
+    """Outcome of a benchmark run."""
+
+    stages: list[StageResult]
+    gold: Any  # pa.Table of the gold aggregate
+
+    def to_payload(self) -> dict[str, Any]:
+        """Return the stage results as JSON-serializable data."""
+        return {"stages": [{**asdict(s), "rows_per_second": round(s.rows_per_second, 1)} for s in self.stages]}
+
+
+def peak_memory_bytes() -> int:
+    """Return the process's peak resident memory so far, or 0 where the platform does not report it."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024  # bytes on macOS, KiB elsewhere
+
+
+def _measure(stage: str, run: Callable[[], tuple[int, int]]) -> StageResult:
+    started = time.perf_counter()
+    rows_in, rows_out = run()
+    return StageResult(stage, rows_in, rows_out, time.perf_counter() - started, peak_memory_bytes())
+
+
+def _source(data_dir: Path, table: str) -> Any:
+    """Open a source file and check its schema.
+
+    Raises:
+        FileNotFoundError: If the file is missing
+        ValueError: If its schema differs from the star schema
+    """
+    import pyarrow.parquet as pq
+
+    path = data_dir / source_file(table)
+    if not path.is_file():
+        raise FileNotFoundError(f"{path} not found; run generate-data first")
+    parquet = pq.ParquetFile(path, pre_buffer=PRE_BUFFER)
+    if not parquet.schema_arrow.equals(arrow_schema(table)):
+        raise ValueError(f"{path.name}: schema differs from the {table} star schema")
+    return parquet
+
+
+def _silver_dimension(table: "pa.Table") -> "pa.Table":
+    """Keep the current version of each row of a slowly changing dimension."""
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    if "ValidTo" not in table.column_names:
+        return table
+    return table.filter(pc.equal(table["ValidTo"], pa.scalar(VALID_TO, table.schema.field("ValidTo").type)))
+
+
+def _silver_facts(batch: "pa.RecordBatch", stock_items: "pa.Array") -> "pa.Table":
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    facts = pa.Table.from_batches([batch])
+    facts = facts.filter(pc.and_(pc.greater(facts["Quantity"], 0), pc.is_in(facts["StockItemKey"], stock_items)))
+    total_type = facts.schema.field("TotalIncludingTax").type
+    total = pc.add(facts["TotalExcludingTax"], facts["TaxAmount"]).cast(total_type)
+    return facts.set_column(facts.schema.get_field_index("TotalIncludingTax"), "TotalIncludingTax", total)
+
+
+def _gold_partial(facts: "pa.Table", dates: "pa.Table", cities: "pa.Table") -> "pa.Table":
+    joined = facts.select(["InvoiceDateKey", "CityKey", *GOLD_MEASURES])
+    joined = joined.join(dates, "InvoiceDateKey", "Date").join(cities, "CityKey")
+    aggregations = [(measure, "sum") for measure in GOLD_MEASURES] + [("CityKey", "count")]
+    return joined.group_by(list(GOLD_KEYS)).aggregate(aggregations)
+
+
+def benchmark_medallion(data_dir: Path, batch_rows: int = SYNTHETIC_CHUNK_ROWS) -> MedallionBenchmark:
+    """Run and measure the bronze, silver and gold stages on generated data.
+
+    Raises:
+        FileNotFoundError: If a source file is missing
+        ValueError: If a source file's schema differs from the star schema
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    dimensions: dict[str, pa.Table] = {}
+    fact_rows = 0
+
+    def bronze() -> tuple[int, int]:
+        nonlocal fact_rows
+        for table in STAR_SCHEMA:
+            parquet = _source(data_dir, table)
+            if table != FACT_TABLE:
+                dimensions[table] = parquet.read()
+                continue
+            fact_rows = sum(batch.num_rows for batch in parquet.iter_batches(batch_size=batch_rows))
+        rows = fact_rows + sum(table.num_rows for table in dimensions.values())
+        return rows, rows
+
+    stages = [_measure(STAGE_BRONZE, bronze)]
+
+    with tempfile.TemporaryDirectory(prefix=".benchmark-", dir=data_dir) as work_dir:
+        silver_file = Path(work_dir) / source_file(FACT_TABLE)
+        silver: dict[str, pa.Table] = {}
+
+        def silver_stage() -> tuple[int, int]:
+            silver.update({table: _silver_dimension(rows) for table, rows in dimensions.items()})
+            stock_items = silver["dimension_stock_item"]["StockItemKey"].combine_chunks()
+            written = 0
+            source = _source(data_dir, FACT_TABLE)
+            with pq.ParquetWriter(silver_file, source.schema_arrow, compression="snappy") as writer:
+                for batch in source.iter_batches(batch_size=batch_rows):
+                    facts = _silver_facts(batch, stock_items)
+                    writer.write_table(facts)
+                    written += facts.num_rows
+            return fact_rows, written
+
+        stages.append(_measure(STAGE_SILVER, silver_stage))
+        gold = pa.table({})
+
+        def gold_stage() -> tuple[int, int]:
+            nonlocal gold
+            dates = silver["dimension_date"].select(["Date", "CalendarYear", "CalendarMonthNumber"])
+            cities = silver["dimension_city"].select(["CityKey", "SalesTerritory"])
+            partials, rows_in = [], 0
+            for batch in pq.ParquetFile(silver_file, pre_buffer=PRE_BUFFER).iter_batches(batch_size=batch_rows):
+                facts = pa.Table.from_batches([batch])
+                partials.append(_gold_partial(facts, dates, cities))
+                rows_in += facts.num_rows
+            # Partial sums and counts of the batches add up to the totals
+            names = {f"{measure}_sum_sum": measure for measure in GOLD_MEASURES} | {"CityKey_count_sum": GOLD_SALES}
+            combined = pa.concat_tables(partials).group_by(list(GOLD_KEYS))
+            gold = combined.aggregate([(name.removesuffix("_sum"), "sum") for name in names])
+            gold = gold.rename_columns([names.get(name, name) for name in gold.column_names])
+            gold = gold.select([*GOLD_KEYS, *GOLD_MEASURES, GOLD_SALES])
+            gold = gold.sort_by([(key, "ascending") for key in GOLD_KEYS])
+            return rows_in, gold.num_rows
+
+        stages.append(_measure(STAGE_GOLD, gold_stage))
+    return MedallionBenchmark(stages, gold)
+
+
+def run_medallion_benchmark(data_dir: Path, batch_rows: int, output: str | None = None) -> int:
+    """Run the bronze -> silver -> gold transformations on generated data and report throughput and memory.
+
+    Returns:
+        EXIT_SUCCESS, or EXIT_FAILURE on missing or mismatching data or missing benchmark dependencies
+    """
+    logger.info(SEPARATOR_LONG)
+    logger.info(f"LOCAL MEDALLION BENCHMARK ({data_dir})")
+    logger.info(SEPARATOR_LONG)
+    try:
+        result = benchmark_medallion(data_dir, batch_rows)
+    except ImportError as e:
+        logger.error(f"ERROR: benchmark needs the benchmark extra (pip install '.[benchmark]'): {e!s}")
+        return EXIT_FAILURE
+    except (OSError, ValueError) as e:
+        logger.error(f"[FAIL] {e!s}")
+        return EXIT_FAILURE
+
+    logger.info(f"  {'Stage':<8} {'Rows in':>15} {'Rows out':>15} {'Time':>9} {'Rows/s':>13} {'Peak memory':>12}")
+    for stage in result.stages:
+        logger.info(
+            f"  {stage.stage:<8} {stage.rows_in:>15,} {stage.rows_out:>15,} {format_seconds(stage.seconds):>9} "
+            f"{stage.rows_per_second:>13,.0f} {format_bytes(stage.peak_memory_bytes):>12}"
+        )
+    if output:
+        write_json_atomic(output, result.to_payload())
+        logger.info(f"[OK] Wrote stage results to {output}")
+    return EXIT_SUCCESS
@@ -0,0 +1,185 @@
+"""OpenMetrics / Prometheus exporter for deployment runs.
+
+Metrics are rendered from the deployment results payload (the content of
+deployment-results.json), so they can be produced at the end of a run or later
+from a downloaded artifact. Two sinks are supported:
+
+- node_exporter textfile collector: the file is written atomically (temp file +
+  rename) as the collector requires.
+- Prometheus Pushgateway: the text exposition format is PUT to
+  ``<url>/metrics/job/<job>/environment/<env>``, replacing the previous push.
+
+Every push or write replaces the previous run's values, so all series are
+gauges describing the last run (``*_last_run_*``) rather than counters or
+histograms, whose rate()/increase() would be meaningless. Alert on staleness
+with ``*_last_success_timestamp_seconds``, which is only exported for
+workspaces (and environments) that deployed successfully in the run.
+
+All per-workspace series are labelled by ``environment`` and ``workspace``.
+Multi-environment payloads are exported per environment section.
+"""
+
+from collections.abc import Iterable
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from ..common.logger import get_logger
+from .config import METRICS_JOB_NAME, METRICS_PREFIX
+from .reporting import environment_sections, write_text_atomic
+
+logger = get_logger(__name__)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(**labels: str) -> str:
+    return "{" + ",".join(f'{key}="{_escape_label(str(value))}"' for key, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _timestamp(value: Any) -> float | None:
+    """Return an ISO 8601 timestamp as Unix seconds, or None when missing or invalid."""
+    try:
+        return datetime.fromisoformat(str(value)).timestamp() if value else None
+    except ValueError:
+        return None
+
+
+class _Gauge:
+    """One gauge family (HELP/TYPE header plus samples)."""
+
+    def __init__(self, name: str, help_text: str):
+        self.name = f"{METRICS_PREFIX}_{name}"
+        self.help_text = help_text
+        self.samples: list[tuple[str, float]] = []
+
+    def add(self, value: float, **labels: str) -> None:
+        self.samples.append((_labels(**labels), value))
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.help_text}"
+        yield f"# TYPE {self.name} gauge"
+        for labels, value in self.samples:
+            yield f"{self.name}{labels} {_format_value(value)}"
+
+
+def render_metrics(results: dict[str, Any], openmetrics: bool = True) -> str:
+    """Render a deployment results payload as OpenMetrics or Prometheus 0.0.4 text.
+
+    Args:
+        results: Deployment results payload (see build_deployment_results_json)
+        openmetrics: True for OpenMetrics 1.0 (textfile), False for the 0.0.4 format (Pushgateway)
+
+    Returns:
+        Exposition text ending with a newline
+    """
+    success = _Gauge("workspace_last_run_success", "1 if the workspace deployed successfully in the last run")
+    duration = _Gauge("workspace_last_run_duration_seconds", "Workspace deploy duration in the last run")
+    retries = _Gauge("workspace_last_run_retries", "Retried workspace deploy attempts in the last run")
+    throttles = _Gauge("workspace_last_run_throttles", "Throttled workspace deploy attempts in the last run")
+    items = _Gauge("workspace_last_run_items_deployed", "Items deployed by the last run")
+    workspace_success_time = _Gauge(
+        "workspace_last_success_timestamp_seconds", "Unix time of the workspace's last successful deployment"
+    )
+    run_duration = _Gauge("deployment_last_run_duration_seconds", "Duration of the last run")
+    run_failed = _Gauge("deployment_last_run_failed_workspaces", "Failed workspaces in the last run")
+    circuit = _Gauge("deployment_last_run_circuit_open", "1 if the circuit breaker opened in the last run")
+    run_success_time = _Gauge(
+        "deployment_last_success_timestamp_seconds", "Unix time of the last run with no failed workspace"
+    )
+
+    for section in environment_sections(results):
+        environment = section.get("environment", "")
+        finished_at = _timestamp(section.get("finished_at"))
+        for workspace in section.get("workspaces", []):
+            labels = {"environment": environment, "workspace": workspace["name"]}
+            attempts = workspace.get("attempts", 1)
+            succeeded = workspace["status"] == "success"
+
+            success.add(1 if succeeded else 0, **labels)
+            retries.add(max(attempts - 1, 0), **labels)
+            throttles.add(workspace.get("throttled", 0), **labels)
+            items.add(workspace.get("items", 0) if succeeded else 0, **labels)
+
+            # Resumed/skipped workspaces did not deploy in this run: no duration or success time
+            if workspace.get("resumed") or attempts == 0:
+                continue
+            duration.add(float(workspace.get("duration", 0.0)), **labels)
+            if succeeded and finished_at is not None:
+                workspace_success_time.add(finished_at, **labels)
+
+        run_duration.add(float(section.get("duration", 0.0)), environment=environment)
+        run_failed.add(section.get("failed_count", 0), environment=environment)
+        circuit.add(1 if section.get("circuit_open") else 0, environment=environment)
+        if not section.get("failed_count") and finished_at is not None:
+            run_success_time.add(finished_at, environment=environment)
+
+    lines: list[str] = []
+    for gauge in (
+        success,
+        duration,
+        retries,
+        throttles,
+        items,
+        workspace_success_time,
+        run_duration,
+        run_failed,
+        circuit,
+        run_success_time,
+    ):
+        lines.extend(gauge.render())
+    if openmetrics:
+        lines.append("# EOF")
+    return "\n".join(lines) + "\n"
+
+
+def write_textfile(path: str | Path, results: dict[str, Any]) -> None:
+    """Write OpenMetrics text for the node_exporter textfile collector (atomic rename)."""
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    write_text_atomic(target, render_metrics(results, openmetrics=True))
+
+
+def push_to_gateway(url: str, results: dict[str, Any], job: str = METRICS_JOB_NAME, timeout: float = 10.0) -> None:
+    """PUT the metrics to a Prometheus Pushgateway, grouped by job and environment.
+
+    Raises:
+        OSError: If the Pushgateway cannot be reached or rejects the push
+    """
+    import urllib.request  # deferred: only needed when pushing
+
+    for section in environment_sections(results):
+        environment = section.get("environment", "unknown")
+        endpoint = f"{url.rstrip('/')}/metrics/job/{job}/environment/{environment}"
+        request = urllib.request.Request(
+            endpoint,
+            data=render_metrics(section, openmetrics=False).encode("utf-8"),
+            method="PUT",
+            headers={"Content-Type": PROMETHEUS_CONTENT_TYPE},
+        )
+        with urllib.request.urlopen(request, timeout=timeout):
+            pass
+
+
+def export_metrics(results: dict[str, Any], textfile: str | None, pushgateway_url: str | None) -> None:
+    """Export metrics to the configured sinks; failures are logged, never raised."""
+    if textfile:
+        try:
+            write_textfile(textfile, results)
+            logger.info(f"-> Metrics written to {textfile}")
+        except OSError as e:
+            logger.warning(f"[WARN] Cannot write metrics textfile {textfile}: {e!s}")
+    if pushgateway_url:
+        try:
+            push_to_gateway(pushgateway_url, results)
+            logger.info(f"-> Metrics pushed to {pushgateway_url}")
+        except OSError as e:
+            logger.warning(f"[WARN] Cannot push metrics to {pushgateway_url}: {e!s}")
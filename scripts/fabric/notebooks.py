@@ -0,0 +1,222 @@
+"""Rendering of generated Fabric items in the Git integration format.
+
+Generated Notebook items consist of a ``.platform`` file and a
+``notebook-content.py`` source in the Fabric notebook format: a ``# META``
+header block naming the default lakehouse, then cells separated by
+``# CELL`` / ``# PARAMETERS CELL`` markers, each followed by its ``# META``
+block. The header uses the same field layout as notebooks saved from Fabric,
+so the notebook find_replace rules (regex rules on ``"default_lakehouse"`` per
+layer folder, literal rules per dev lakehouse GUID) parameterize generated
+notebooks like hand-written ones.
+
+Generated items get deterministic logicalIds (UUIDv5 of workspace folder and
+item path), so regenerating an item does not change its identity and
+references to it from pipelines stay valid.
+"""
+
+import json
+import re
+import uuid
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from ..common.logger import get_logger, log_context
+from .config import EXIT_FAILURE, EXIT_SUCCESS, SEPARATOR_LONG, SEPARATOR_SHORT
+from .workspace_model import PLATFORM_FILE, RepositoryModel, WorkspaceModel, select_workspaces
+
+logger = get_logger(__name__)
+
+NOTEBOOK_CONTENT_FILE = "notebook-content.py"
+PLATFORM_SCHEMA_URL = (
+    "https://developer.microsoft.com/json-schemas/fabric/gitIntegration/platformProperties/2.0.0/schema.json"
+)
+# Workspace GUID written into generated definitions; find_replace rules rewrite it to $workspace.id
+PLACEHOLDER_WORKSPACE_ID = "00000000-0000-0000-0000-000000000000"
+# Namespace of generated logicalIds (never change: it would give every generated item a new identity)
+GENERATED_ID_NAMESPACE = uuid.UUID("5b0f1c3e-8a4d-4f7e-9c2a-6d1e3b7a9f40")
+
+_LAKEHOUSE_REFERENCE_RE = re.compile(r"^\$items\.Lakehouse\.([^.]+)\.\$?id$")
+
+
+@dataclass(frozen=True)
+class NotebookCell:
+    """One code cell of a generated notebook."""
+
+    source: str
+    parameters: bool = False  # the notebook's parameters cell (overridden by pipeline activities)
+
+
+@dataclass(frozen=True)
+class DefaultLakehouse:
+    """The lakehouse a notebook attaches to by default."""
+
+    id: str  # dev lakehouse GUID, rewritten per environment by find_replace rules
+    name: str
+    workspace_id: str = PLACEHOLDER_WORKSPACE_ID
+
+
+def generated_logical_id(workspace_folder: str, item_path: str) -> str:
+    """Return the deterministic logicalId of a generated item."""
+    return str(uuid.uuid5(GENERATED_ID_NAMESPACE, f"{workspace_folder}/{item_path}"))
+
+
+def lakehouse_dev_id(workspace: WorkspaceModel, lakehouse_name: str) -> str:
+    """Return the GUID notebooks of this workspace use for a lakehouse.
+
+    Prefers the dev GUID of a literal Notebook rule that rewrites to the
+    lakehouse (the ID notebooks saved in dev contain), else the lakehouse's logicalId.
+
+    Raises:
+        KeyError: If the workspace has no such lakehouse
+    """
+    for rule in workspace.rules:
+        if rule.is_regex or (rule.item_types and "Notebook" not in rule.item_types):
+            continue
+        for value in rule.replace_values.values():
+            match = _LAKEHOUSE_REFERENCE_RE.match(value)
+            if match and match.group(1) == lakehouse_name:
+                return rule.find_value
+    for item in workspace.items:
+        if item.item_type == "Lakehouse" and item.display_name == lakehouse_name:
+            return item.logical_id
+    raise KeyError(f"No Lakehouse '{lakehouse_name}' in workspace '{workspace.folder}'")
+
+
+def _meta_block(payload: dict) -> list[str]:
+    return ["# METADATA ********************", ""] + [
+        f"# META {line}" for line in json.dumps(payload, indent=2).splitlines()
+    ]
+
+
+def render_notebook(cells: Iterable[NotebookCell], lakehouse: DefaultLakehouse | None = None) -> str:
+    """Render notebook-content.py for PySpark cells."""
+    header: dict = {"kernel_info": {"name": "synapse_pyspark"}, "dependencies": {}}
+    if lakehouse is not None:
+        header["dependencies"]["lakehouse"] = {
+            "default_lakehouse": lakehouse.id,
+            "default_lakehouse_name": lakehouse.name,
+            "default_lakehouse_workspace_id": lakehouse.workspace_id,
+        }
+    lines = ["# Fabric notebook source", "", *_meta_block(header), ""]
+    for cell in cells:
+        lines += ["# PARAMETERS CELL ********************" if cell.parameters else "# CELL ********************", ""]
+        lines += [*cell.source.strip("\n").splitlines(), ""]
+        lines += [*_meta_block({"language": "python", "language_group": "synapse_pyspark"}), ""]
+    return "\n".join(lines)
+
+
+def render_platform(item_type: str, display_name: str, logical_id: str, description: str = "") -> str:
+    """Render an item's .platform file."""
+    metadata = {"type": item_type, "displayName": display_name}
+    if description:
+        metadata["description"] = description
+    config = {"version": "2.0", "logicalId": logical_id}
+    return json.dumps({"$schema": PLATFORM_SCHEMA_URL, "metadata": metadata, "config": config}, indent=2)
+
+
+def notebook_files(
+    workspace_folder: str, item_path: str, cells: Iterable[NotebookCell], lakehouse: DefaultLakehouse, description: str
+) -> dict[str, str]:
+    """Return {workspace-relative path: content} of a generated Notebook item."""
+    display_name = Path(item_path).name.rsplit(".", 1)[0]
+    logical_id = generated_logical_id(workspace_folder, item_path)
+    return {
+        f"{item_path}/{PLATFORM_FILE}": render_platform("Notebook", display_name, logical_id, description),
+        f"{item_path}/{NOTEBOOK_CONTENT_FILE}": render_notebook(cells, lakehouse),
+    }
+
+
+def write_generated_files(workspace_dir: Path, files: dict[str, str], check: bool = False) -> list[str]:
+    """Write generated files whose content differs from disk; return their paths.
+
+    With ``check`` nothing is written (the returned paths are out of date).
+    """
+    changed = []
+    for relative, content in files.items():
+        target = workspace_dir / relative
+        try:
+            current = target.read_text(encoding="utf-8")
+        except OSError:
+            current = None
+        if current == content:
+            continue
+        changed.append(relative)
+        if not check:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            target.write_text(content, encoding="utf-8")
+    return changed
+
+
+@dataclass
+class GeneratedFiles:
+    """Files a generator built for one workspace and what to report about them."""
+
+    files: dict[str, str]  # workspace-relative path -> content
+    details: list[str] = field(default_factory=list)  # logged before the written / out-of-date files
+    stale: list[str] = field(default_factory=list)  # generated items no longer in the spec
+
+
+def run_generator(
+    workspaces_dir: Path,
+    model: RepositoryModel,
+    workspace_filter: str | None,
+    title: str,
+    phase: str,
+    lakehouse: str,
+    build: Callable[[WorkspaceModel], GeneratedFiles],
+    check: bool,
+) -> int:
+    """Drive a file generator over every workspace containing ``lakehouse``.
+
+    Workspaces without the lakehouse are skipped. ``build`` errors (KeyError,
+    OSError, ValueError) fail that workspace. With ``check`` nothing is written
+    and out-of-date generated files fail the command (for CI).
+
+    Returns:
+        EXIT_SUCCESS, or EXIT_FAILURE on no matching workspace, a failed workspace, or drift with ``check``
+    """
+    workspaces = select_workspaces(workspaces_dir, model, workspace_filter)
+    if workspaces is None:
+        return EXIT_FAILURE
+
+    logger.info(SEPARATOR_LONG)
+    logger.info(title + (" (check only)" if check else ""))
+    logger.info(SEPARATOR_LONG)
+
+    generated = failed = drifted = 0
+    for workspace in workspaces:
+        if not any(i.item_type == "Lakehouse" and i.display_name == lakehouse for i in workspace.items):
+            continue
+        logger.info(SEPARATOR_SHORT)
+        logger.info(f"Workspace: {workspace.folder}")
+        with log_context(workspace=workspace.folder, phase=phase):
+            try:
+                result = build(workspace)
+            except (KeyError, OSError, ValueError) as e:
+                failed += 1
+                logger.error(f"  [FAIL] {e!s}")
+                continue
+            changed = write_generated_files(workspaces_dir / workspace.folder, result.files, check)
+        generated += 1
+        for detail in result.details:
+            logger.info(f"  {detail}")
+        for relative in changed:
+            logger.info(f"  {'[WARN] Out of date' if check else '[OK] Wrote'} {relative}")
+        if not changed:
+            logger.info("  [OK] Up to date")
+        for path in result.stale:
+            logger.warning(f"  [WARN] {path} is no longer in the spec; delete it")
+        drifted += len(changed)
+
+    logger.info(f"\n{SEPARATOR_LONG}")
+    if failed:
+        logger.error(f"[FAIL] {failed} workspace(s) could not be generated")
+        return EXIT_FAILURE
+    if not generated:
+        logger.error(f"[FAIL] No workspace contains Lakehouse '{lakehouse}'")
+        return EXIT_FAILURE
+    if check and drifted:
+        logger.error(f"[FAIL] {drifted} generated file(s) out of date; run without --check")
+        return EXIT_FAILURE
+    return EXIT_SUCCESS
@@ -0,0 +1,238 @@
+"""parameter.yml parsing helpers shared by the scanner and the local renderer."""
+
+import re
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import yaml
+
+from ..common.logger import get_logger
+
+logger = get_logger(__name__)
+
+# replace_value key that applies to every environment
+ALL_ENVIRONMENTS_KEY = "_ALL_"
+
+
+@dataclass
+class FindReplaceRule:
+    """Parsed representation of one find_replace entry in parameter.yml."""
+
+    find_value: str
+    is_regex: bool
+    item_types: list[str]  # empty list = applies to all types
+    file_paths: list[str]  # empty list = applies to all files
+    source_file: str = ""
+    replace_values: dict[str, str] = field(default_factory=dict)  # environment (or _ALL_) -> value
+    _compiled: re.Pattern | None = field(default=None, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.is_regex:
+            try:
+                self._compiled = re.compile(self.find_value)
+            except re.error as exc:
+                logger.warning(f"  [WARN] Could not compile regex in {self.source_file}: {exc}")
+                self._compiled = None
+
+    @property
+    def compiled(self) -> re.Pattern | None:
+        """Compiled find_value of a regex rule; None for literal rules and regexes that do not compile."""
+        return self._compiled
+
+    def applies_to(self, item_type: str, file_rel_from_workspace: Path) -> bool:
+        """Return True if the item_type and file_path filters select this file."""
+        if self.item_types and item_type not in self.item_types:
+            return False
+        return not self.file_paths or file_matches_path_filters(file_rel_from_workspace, self.file_paths)
+
+    def replacement_for(self, environment: str) -> str | None:
+        """Return the replace_value for an environment, falling back to ``_ALL_``."""
+        for key, value in self.replace_values.items():
+            if key.lower() == environment.lower():
+                return value
+        for key, value in self.replace_values.items():
+            if key.upper() == ALL_ENVIRONMENTS_KEY:
+                return value
+        return None
+
+
+def _normalise_to_list(value: object) -> list[str]:
+    """Return a list[str] regardless of whether value is str, list, or None."""
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return [value]
+    if isinstance(value, list):
+        return [str(v) for v in value]
+    return []
+
+
+def _normalise_replace_values(value: object) -> dict[str, str]:
+    """Return replace_value as an environment -> value mapping."""
+    if isinstance(value, dict):
+        return {str(k): str(v) for k, v in value.items() if v is not None}
+    if isinstance(value, str):
+        return {ALL_ENVIRONMENTS_KEY: value}
+    return {}
+
+
+def load_rules(param_file: Path, _seen: set[Path] | None = None) -> list[FindReplaceRule]:
+    """Recursively load find_replace rules from a parameter.yml (and its extends)."""
+    if _seen is None:
+        _seen = set()
+
+    resolved = param_file.resolve()
+    if resolved in _seen or not param_file.exists():
+        return []
+    _seen.add(resolved)
+
+    try:
+        raw = yaml.safe_load(param_file.read_text(encoding="utf-8"))
+    except Exception as exc:
+        logger.warning(f"  [WARN] Could not parse {param_file}: {exc}")
+        return []
+
+    if not isinstance(raw, dict):
+        return []
+
+    rules: list[FindReplaceRule] = []
+
+    # Process extended template files first
+    for rel in _normalise_to_list(raw.get("extend")):
+        extended = (param_file.parent / rel).resolve()
+        rules.extend(load_rules(extended, _seen))
+
+    # Process find_replace entries in this file
+    for entry in raw.get("find_replace") or []:
+        if not isinstance(entry, dict):
+            continue
+        find_value = str(entry.get("find_value", "")).strip()
+        if not find_value:
+            continue
+
+        is_regex = str(entry.get("is_regex", "false")).lower() in ("true",)
+        item_types = _normalise_to_list(entry.get("item_type"))
+        file_paths = _normalise_to_list(entry.get("file_path"))
+
+        rules.append(
+            FindReplaceRule(
+                find_value=find_value,
+                is_regex=is_regex,
+                item_types=item_types,
+                file_paths=file_paths,
+                source_file=str(param_file),
+                replace_values=_normalise_replace_values(entry.get("replace_value")),
+            )
+        )
+
+    return rules
+
+
+def parameter_chain_errors(param_file: Path, _chain: tuple[Path, ...] = ()) -> list[str]:
+    """Return problems that make a parameter.yml and its extends unusable.
+
+    load_rules skips missing or unparseable files silently; this reports them
+    (and extend cycles) so they can fail validation instead of dropping rules.
+    """
+    resolved = param_file.resolve()
+    if resolved in _chain:
+        cycle = " -> ".join(p.name for p in (*_chain, resolved))
+        return [f"extend cycle: {cycle}"]
+    if not param_file.is_file():
+        referrer = f" (extended by {_chain[-1].name})" if _chain else ""
+        return [f"{param_file} not found{referrer}"]
+
+    try:
+        raw = yaml.safe_load(param_file.read_text(encoding="utf-8"))
+    except (OSError, yaml.YAMLError) as exc:
+        return [f"{param_file.name}: invalid YAML: {exc}"]
+    if raw is None:
+        return []
+    if not isinstance(raw, dict):
+        return [f"{param_file.name}: top level must be a mapping"]
+
+    errors = []
+    find_replace = raw.get("find_replace")
+    if find_replace is not None and not isinstance(find_replace, list):
+        errors.append(f"{param_file.name}: find_replace must be a list")
+    for entry in find_replace if isinstance(find_replace, list) else []:
+        if isinstance(entry, dict) and str(entry.get("is_regex", "false")).lower() == "true":
+            try:
+                re.compile(str(entry.get("find_value", "")))
+            except re.error as exc:
+                errors.append(f"{param_file.name}: regex {entry.get('find_value')!r} does not compile: {exc}")
+    for rel in _normalise_to_list(raw.get("extend")):
+        errors.extend(parameter_chain_errors(param_file.parent / rel, (*_chain, resolved)))
+    return errors
+
+
+def rule_labels(rules: Iterable[FindReplaceRule]) -> list[str]:
+    """Return a ``<parameter file>#<n>`` label for each rule (n counts from 1 within its file)."""
+    counts: dict[str, int] = {}
+    labels = []
+    for rule in rules:
+        source = Path(rule.source_file).name
+        counts[source] = counts.get(source, 0) + 1
+        labels.append(f"{source}#{counts[source]}")
+    return labels
+
+
+def item_type_from_path(path: Path) -> str:
+    """Derive the Fabric item type from its containing folder name.
+
+    Folder names follow the pattern  ``<DisplayName>.<ItemType>``.
+    Returns ``"Unknown"`` when the pattern cannot be matched.
+    """
+    for part in path.parts:
+        if "." in part:
+            candidate = part.rsplit(".", 1)[-1]
+            # Valid item types are CamelCase and at least 3 chars long
+            if len(candidate) >= 3 and candidate[0].isupper() and candidate.isalpha():
+                return candidate
+    return "Unknown"
+
+
+def glob_to_regex(pattern: str) -> re.Pattern:
+    """Convert a glob pattern (supporting ``**``) to a compiled regex.
+
+    The match is checked against the forward-slash-normalised relative path
+    from the workspace root (e.g. ``2_Silver/transformation/nb.Notebook/notebook-content.py``).
+    """
+    pattern = pattern.replace("\\", "/").lstrip("/").lstrip("./")
+    buf: list[str] = []
+    i = 0
+    while i < len(pattern):
+        if pattern[i : i + 2] == "**":
+            buf.append(".*")
+            i += 2
+            # consume optional trailing slash
+            if i < len(pattern) and pattern[i] == "/":
+                i += 1
+        elif pattern[i] == "*":
+            buf.append("[^/]*")
+            i += 1
+        elif pattern[i] == "?":
+            buf.append("[^/]")
+            i += 1
+        elif pattern[i] in r"\.^$+{}[]|()":
+            buf.append(re.escape(pattern[i]))
+            i += 1
+        else:
+            buf.append(pattern[i])
+            i += 1
+    return re.compile("".join(buf) + "$")
+
+
+def file_matches_path_filters(file_rel_from_workspace: Path, filter_patterns: list[str]) -> bool:
+    """Return True if the file matches at least one of the glob filter patterns."""
+    if not filter_patterns:
+        return True
+    norm = str(file_rel_from_workspace).replace("\\", "/")
+    for pat in filter_patterns:
+        try:
+            if glob_to_regex(pat).search(norm):
+                return True
+        except re.error:
+            pass
+    return False
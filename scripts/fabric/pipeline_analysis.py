@@ -0,0 +1,542 @@
+"""Critical-path and concurrency analysis of DataPipeline definitions.
+
+Every ``pipeline-content.json`` is turned into its activity DAG (``dependsOn``
+edges) and scheduled as early as possible with each activity's expected
+duration, which gives:
+
+- stages: activities grouped by dependency depth, and the concurrency width of
+  each stage;
+- the critical path (the chain of activities that determines the run time),
+  the expected run time and every activity's slack;
+- peak concurrency of the schedule, in particular of copy activities, which
+  run on the same capacity and contend for it;
+- risky policies: long copies without retries, and timeouts far above the
+  expected duration (a hung activity keeps its capacity until the timeout).
+
+Durations come from a YAML/JSON file of measured durations per pipeline and
+activity (a number, or a list of historical durations whose median is used).
+Activities without a measurement are estimated per activity type; an
+InvokeCopyJob is estimated per table its copy job copies. Container activities
+(ForEach, IfCondition, Switch, Until) take the duration of their longest inner
+branch, and their inner activities are checked for risky policies as well.
+"""
+
+import heapq
+import json
+import re
+import statistics
+from collections import Counter
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+from ..common.logger import get_logger, log_context
+from .config import (
+    EXIT_FAILURE,
+    EXIT_SUCCESS,
+    PIPELINE_ACTIVITY_SECONDS,
+    PIPELINE_COPY_ACTIVITY_TYPES,
+    PIPELINE_DEFAULT_ACTIVITY_SECONDS,
+    PIPELINE_LONG_ACTIVITY_SECONDS,
+    PIPELINE_MAX_CONCURRENT_COPIES,
+    PIPELINE_TIMEOUT_FACTOR,
+    PIPELINE_TIMEOUT_MIN_SECONDS,
+    SEPARATOR_LONG,
+    SEPARATOR_SHORT,
+)
+from .workspace_model import RepositoryModel, WorkspaceModel, select_workspaces
+
+logger = get_logger(__name__)
+
+PIPELINE_CONTENT_FILE = "pipeline-content.json"
+COPY_JOB_CONTENT_FILE = "copyjob-content.json"
+
+# Duration sources
+FROM_MEASURED = "measured"
+FROM_ESTIMATE = "estimate"
+
+# Diagram formats
+DIAGRAM_MERMAID = "mermaid"
+DIAGRAM_DOT = "dot"
+DIAGRAM_FORMATS = (DIAGRAM_MERMAID, DIAGRAM_DOT)
+DIAGRAM_SUFFIXES = {DIAGRAM_MERMAID: ".mmd", DIAGRAM_DOT: ".dot"}
+
+# "[d.]hh:mm:ss" activity timeouts
+TIMEOUT_RE = re.compile(r"^(?:(\d+)\.)?(\d{1,2}):(\d{2}):(\d{2})$")
+# Keys of container activities holding inner activity lists (Switch cases are handled separately)
+INNER_ACTIVITY_KEYS = ("activities", "ifTrueActivities", "ifFalseActivities", "defaultActivities")
+
+# Measured durations: pipeline display name -> activity name -> seconds
+Durations = Mapping[str, Mapping[str, float]]
+
+
+@dataclass
+class PipelineActivity:
+    """One activity of a pipeline with its expected duration and place in the schedule."""
+
+    name: str  # nested activities are named "<container>/<activity>"
+    activity_type: str
+    depends_on: list[tuple[str, tuple[str, ...]]]  # (activity name, dependency conditions)
+    timeout_seconds: float | None
+    retry: int
+    branches: list[list["PipelineActivity"]] = field(default_factory=list)  # inner activities of containers
+    reference: str = ""  # copyJobId of an InvokeCopyJob
+    seconds: float = 0.0
+    source: str = FROM_ESTIMATE
+    stage: int = 0
+    start: float = 0.0  # earliest start on an unconstrained schedule
+    slack: float = 0.0  # how much later the activity may finish without delaying the run
+
+    @property
+    def finish(self) -> float:
+        """Earliest finish on an unconstrained schedule."""
+        return self.start + self.seconds
+
+
+@dataclass(frozen=True)
+class PolicyRisk:
+    """A risky activity policy or scheduling property of a pipeline."""
+
+    activity: str  # empty for pipeline-level findings
+    message: str
+
+
+@dataclass
+class PipelineAnalysis:
+    """DAG analysis of one DataPipeline."""
+
+    workspace_folder: str
+    pipeline: str  # display name
+    path: str  # pipeline-content.json relative to the workspace folder
+    activities: list[PipelineActivity] = field(default_factory=list)
+    stages: list[list[str]] = field(default_factory=list)
+    critical_path: list[str] = field(default_factory=list)
+    makespan: float = 0.0
+    peak_concurrency: int = 0
+    peak_copies: int = 0
+    risks: list[PolicyRisk] = field(default_factory=list)
+    errors: list[str] = field(default_factory=list)
+
+
+def parse_timeout(value: Any) -> float | None:
+    """Return an activity timeout in seconds, or None if it is not a literal ``[d.]hh:mm:ss``."""
+    match = TIMEOUT_RE.match(value) if isinstance(value, str) else None
+    if not match:
+        return None
+    days, hours, minutes, seconds = (int(group or 0) for group in match.groups())
+    return float(((days * 24 + hours) * 60 + minutes) * 60 + seconds)
+
+
+def format_seconds(seconds: float) -> str:
+    """Format a duration compactly (``45s``, ``12m``, ``1h30m``, ``2d``)."""
+    if seconds < 60:
+        return f"{seconds:.0f}s"
+    if seconds < 3600:
+        return f"{seconds / 60:.0f}m"
+    if seconds < 86400:
+        hours, minutes = divmod(round(seconds / 60), 60)
+        return f"{hours}h{minutes:02d}m" if minutes else f"{hours}h"
+    return f"{seconds / 86400:.1f}d".replace(".0d", "d")
+
+
+def load_durations(path: str | Path) -> dict[str, dict[str, float]]:
+    """Load measured activity durations.
+
+    The file maps pipeline display names to activity names to seconds, either
+    one number or a list of historical durations (the median is used)::
+
+        pl_ingest_bronze_data:
+          Dim City: 95
+          Fact Sale: [1810, 1750, 2040]
+
+    Raises:
+        ValueError: If the file is not such a mapping
+    """
+    raw = yaml.safe_load(Path(path).read_text(encoding="utf-8")) or {}
+    if not isinstance(raw, dict):
+        raise ValueError(f"{path}: expected a mapping of pipeline names to activity durations")
+    durations: dict[str, dict[str, float]] = {}
+    for pipeline, activities in raw.items():
+        if not isinstance(activities, dict):
+            raise ValueError(f"{path}: durations of pipeline '{pipeline}' must be a mapping")
+        for activity, value in activities.items():
+            values = value if isinstance(value, list) else [value]
+            if not values or not all(isinstance(v, int | float) and not isinstance(v, bool) for v in values):
+                raise ValueError(f"{path}: duration of '{pipeline}/{activity}' must be a number or list of numbers")
+            durations.setdefault(str(pipeline), {})[str(activity)] = float(statistics.median(values))
+    return durations
+
+
+def copy_job_table_counts(workspace: WorkspaceModel, workspaces_dir: Path) -> dict[str, int]:
+    """Return the number of tables each CopyJob of a workspace copies, keyed by logicalId."""
+    counts: dict[str, int] = {}
+    for item in workspace.items:
+        if item.item_type != "CopyJob" or not item.logical_id:
+            continue
+        content = workspaces_dir / workspace.folder / item.path / COPY_JOB_CONTENT_FILE
+        try:
+            raw = json.loads(content.read_text(encoding="utf-8-sig"))
+        except (OSError, ValueError):
+            continue
+        tables = raw.get("activities") if isinstance(raw, dict) else None
+        counts[item.logical_id.lower()] = max(len(tables), 1) if isinstance(tables, list) else 1
+    return counts
+
+
+def _parse_activities(raw: Any, prefix: str = "") -> list[PipelineActivity]:
+    """Build activities from a pipeline's (or container's) ``activities`` list."""
+    activities = []
+    for entry in raw if isinstance(raw, list) else []:
+        if not isinstance(entry, dict):
+            continue
+        name = f"{prefix}{entry.get('name', '?')}"
+        policy = entry.get("policy")
+        policy = policy if isinstance(policy, dict) else {}
+        type_properties = entry.get("typeProperties")
+        type_properties = type_properties if isinstance(type_properties, dict) else {}
+        depends_on = [
+            (f"{prefix}{dependency.get('activity', '?')}", tuple(dependency.get("dependencyConditions") or ()))
+            for dependency in entry.get("dependsOn") or []
+            if isinstance(dependency, dict)
+        ]
+        retry = policy.get("retry", 0)
+        activity = PipelineActivity(
+            name=name,
+            activity_type=str(entry.get("type", "Unknown")),
+            depends_on=depends_on,
+            timeout_seconds=parse_timeout(policy.get("timeout")),
+            retry=retry if isinstance(retry, int) else 0,
+            reference=str(type_properties.get("copyJobId", "")).lower(),
+        )
+        inner = [type_properties.get(key) for key in INNER_ACTIVITY_KEYS if key in type_properties]
+        inner += [case.get("activities") for case in type_properties.get("cases") or [] if isinstance(case, dict)]
+        activity.branches = [_parse_activities(branch, f"{name}/") for branch in inner]
+        activities.append(activity)
+    return activities
+
+
+def _schedule(activities: list[PipelineActivity]) -> tuple[list[str], list[list[str]], list[str], float]:
+    """Schedule activities as early as possible.
+
+    Sets stage, start and slack of every activity.
+
+    Returns:
+        (errors, stages, critical path, expected run time)
+    """
+    by_name = {activity.name: activity for activity in activities}
+    names = Counter(activity.name for activity in activities)
+    errors = [f"duplicate activity name '{name}'" for name, count in sorted(names.items()) if count > 1]
+    successors: dict[str, list[str]] = {name: [] for name in by_name}
+    pending = {name: 0 for name in by_name}
+    for activity in by_name.values():
+        for dependency, _ in activity.depends_on:
+            if dependency not in by_name:
+                errors.append(f"'{activity.name}' depends on unknown activity '{dependency}'")
+                continue
+            successors[dependency].append(activity.name)
+            pending[activity.name] += 1
+    if errors:
+        return errors, [], [], 0.0
+
+    # Kahn's algorithm; the heap keeps the order deterministic (definition order)
+    position = {name: index for index, name in enumerate(by_name)}
+    ready = [(position[name], name) for name, count in pending.items() if count == 0]
+    heapq.heapify(ready)
+    order: list[str] = []
+    while ready:
+        _, name = heapq.heappop(ready)
+        order.append(name)
+        for successor in successors[name]:
+            pending[successor] -= 1
+            if pending[successor] == 0:
+                heapq.heappush(ready, (position[successor], successor))
+    if len(order) < len(by_name):
+        cycle = sorted(name for name, count in pending.items() if count > 0)
+        return [f"dependency cycle among: {', '.join(cycle)}"], [], [], 0.0
+
+    for name in order:
+        activity = by_name[name]
+        dependencies = [by_name[dependency] for dependency, _ in activity.depends_on]
+        activity.stage = max((d.stage + 1 for d in dependencies), default=0)
+        activity.start = max((d.finish for d in dependencies), default=0.0)
+    makespan = max((activity.finish for activity in activities), default=0.0)
+
+    latest_finish = {name: makespan for name in by_name}
+    for name in reversed(order):
+        activity = by_name[name]
+        latest_start = latest_finish[name] - activity.seconds
+        activity.slack = latest_finish[name] - activity.finish
+        for dependency, _ in activity.depends_on:
+            latest_finish[dependency] = min(latest_finish[dependency], latest_start)
+
+    stages: list[list[str]] = [[] for _ in range(max((a.stage for a in activities), default=-1) + 1)]
+    for name in order:
+        stages[by_name[name].stage].append(name)
+
+    critical: list[str] = []
+    current = max(activities, key=lambda a: (a.finish, -position[a.name]), default=None)
+    while current is not None:
+        critical.append(current.name)
+        dependencies = [by_name[dependency] for dependency, _ in current.depends_on]
+        current = max(dependencies, key=lambda a: (a.finish, -position[a.name]), default=None)
+    return [], stages, critical[::-1], makespan
+
+
+def _assign_durations(
+    activities: list[PipelineActivity], measured: Mapping[str, float], copy_job_tables: Mapping[str, int]
+) -> list[str]:
+    """Set every activity's expected duration (containers from their inner branches); return errors."""
+    errors: list[str] = []
+    for activity in activities:
+        branch_makespans = []
+        for branch in activity.branches:
+            errors.extend(_assign_durations(branch, measured, copy_job_tables))
+            branch_errors, _, _, makespan = _schedule(branch)
+            errors.extend(branch_errors)
+            branch_makespans.append(makespan)
+
+        if activity.name in measured:
+            activity.seconds, activity.source = measured[activity.name], FROM_MEASURED
+            continue
+        if activity.branches:
+            activity.seconds = max(branch_makespans)
+        else:
+            activity.seconds = PIPELINE_ACTIVITY_SECONDS.get(activity.activity_type, PIPELINE_DEFAULT_ACTIVITY_SECONDS)
+            if activity.activity_type == "InvokeCopyJob":
+                activity.seconds *= copy_job_tables.get(activity.reference, 1)
+        activity.source = FROM_ESTIMATE
+    return errors
+
+
+def _policy_risks(activities: list[PipelineActivity]) -> list[PolicyRisk]:
+    """Flag long copies without retries and timeouts far above the expected duration."""
+    risks = []
+    for activity in activities:
+        expected = format_seconds(activity.seconds)
+        if (
+            activity.activity_type in PIPELINE_COPY_ACTIVITY_TYPES
+            and activity.retry == 0
+            and activity.seconds >= PIPELINE_LONG_ACTIVITY_SECONDS
+        ):
+            message = f"no retries on a {expected} copy: one transient failure fails the run"
+            risks.append(PolicyRisk(activity.name, message))
+        timeout = activity.timeout_seconds
+        if (
+            timeout is not None
+            and timeout > PIPELINE_TIMEOUT_MIN_SECONDS
+            and timeout > PIPELINE_TIMEOUT_FACTOR * activity.seconds
+        ):
+            message = (
+                f"timeout {format_seconds(timeout)} is {timeout / max(activity.seconds, 1.0):.0f}x the expected "
+                f"{expected}: a hung run holds capacity for {format_seconds(timeout)}"
+            )
+            risks.append(PolicyRisk(activity.name, message))
+        for branch in activity.branches:
+            risks.extend(_policy_risks(branch))
+    return risks
+
+
+def _peak_concurrency(activities: list[PipelineActivity]) -> int:
+    """Return the most activities running at the same time on the schedule."""
+    # Finishes sort before starts at the same instant, so back-to-back activities do not overlap
+    events = sorted(
+        [(a.start, 1) for a in activities if a.seconds > 0] + [(a.finish, -1) for a in activities if a.seconds > 0]
+    )
+    running = peak = 0
+    for _, delta in events:
+        running += delta
+        peak = max(peak, running)
+    return peak
+
+
+def analyze_pipeline(
+    workspace_folder: str,
+    relative: str,
+    content: Any,
+    measured: Durations | None = None,
+    copy_job_tables: Mapping[str, int] | None = None,
+) -> PipelineAnalysis:
+    """Analyze one parsed pipeline-content.json.
+
+    Args:
+        workspace_folder: Workspace the pipeline belongs to
+        relative: pipeline-content.json path relative to the workspace folder
+        content: Parsed pipeline-content.json
+        measured: Measured durations (see load_durations)
+        copy_job_tables: Tables per CopyJob logicalId, for estimating InvokeCopyJob activities
+    """
+    item_folder = Path(relative).parent.name
+    pipeline = item_folder.rsplit(".", 1)[0]
+    analysis = PipelineAnalysis(workspace_folder, pipeline, relative)
+    properties = content.get("properties") if isinstance(content, dict) else None
+    if not isinstance(properties, dict) or not isinstance(properties.get("activities"), list):
+        analysis.errors.append("no properties.activities list")
+        return analysis
+
+    analysis.activities = _parse_activities(properties["activities"])
+    analysis.errors = _assign_durations(
+        analysis.activities, (measured or {}).get(pipeline, {}), copy_job_tables or {}
+    )
+    errors, analysis.stages, analysis.critical_path, analysis.makespan = _schedule(analysis.activities)
+    analysis.errors.extend(errors)
+    if analysis.errors:
+        return analysis
+
+    analysis.peak_concurrency = _peak_concurrency(analysis.activities)
+    copies = [a for a in analysis.activities if a.activity_type in PIPELINE_COPY_ACTIVITY_TYPES]
+    analysis.peak_copies = _peak_concurrency(copies)
+    analysis.risks = _policy_risks(analysis.activities)
+    if analysis.peak_copies > PIPELINE_MAX_CONCURRENT_COPIES:
+        message = (
+            f"{analysis.peak_copies} copy activities run at once (more than {PIPELINE_MAX_CONCURRENT_COPIES}) "
+            "and contend for the same capacity"
+        )
+        analysis.risks.append(PolicyRisk("", message))
+    return analysis
+
+
+def analyze_workspace(
+    workspace: WorkspaceModel, workspaces_dir: Path, measured: Durations | None = None
+) -> list[PipelineAnalysis]:
+    """Analyze every DataPipeline of a workspace."""
+    copy_job_tables = copy_job_table_counts(workspace, workspaces_dir)
+    analyses = []
+    for item in workspace.items:
+        if item.item_type != "DataPipeline":
+            continue
+        relative = f"{item.path}/{PIPELINE_CONTENT_FILE}"
+        try:
+            content = json.loads((workspaces_dir / workspace.folder / relative).read_text(encoding="utf-8-sig"))
+        except (OSError, ValueError) as e:
+            analysis = PipelineAnalysis(workspace.folder, item.display_name, relative)
+            analysis.errors.append(f"cannot read {PIPELINE_CONTENT_FILE}: {e}")
+            analyses.append(analysis)
+            continue
+        analyses.append(analyze_pipeline(workspace.folder, relative, content, measured, copy_job_tables))
+    return analyses
+
+
+def _node_label(activity: PipelineActivity) -> str:
+    estimate = "~" if activity.source == FROM_ESTIMATE else ""
+    return f"{activity.name}\n{activity.activity_type} {estimate}{format_seconds(activity.seconds)}"
+
+
+def _edges(analysis: PipelineAnalysis) -> list[tuple[int, int, str]]:
+    """Return (from index, to index, label) for every dependency; the label lists non-Succeeded conditions."""
+    index = {activity.name: position for position, activity in enumerate(analysis.activities)}
+    edges = []
+    for activity in analysis.activities:
+        for dependency, conditions in activity.depends_on:
+            label = "" if conditions in ((), ("Succeeded",)) else ", ".join(conditions)
+            edges.append((index[dependency], index[activity.name], label))
+    return edges
+
+
+def render_diagram(analysis: PipelineAnalysis, diagram_format: str) -> str:
+    """Render the activity DAG as a Mermaid flowchart or Graphviz digraph, critical path highlighted."""
+    critical = set(analysis.critical_path)
+    title = f"{analysis.pipeline}: expected {format_seconds(analysis.makespan)}"
+    if diagram_format == DIAGRAM_DOT:
+        lines = [
+            f"digraph {json.dumps(analysis.pipeline)} {{",
+            "  rankdir=LR;",
+            f"  label={json.dumps(title)};",
+            "  node [shape=box, style=rounded];",
+        ]
+        for position, activity in enumerate(analysis.activities):
+            highlight = ", color=red, penwidth=2" if activity.name in critical else ""
+            lines.append(f"  a{position} [label={json.dumps(_node_label(activity))}{highlight}];")
+        for source, target, label in _edges(analysis):
+            lines.append(f"  a{source} -> a{target}" + (f" [label={json.dumps(label)}]" if label else "") + ";")
+        return "\n".join([*lines, "}", ""])
+
+    lines = ["---", f"title: {json.dumps(title)}", "---", "flowchart LR"]
+    for position, activity in enumerate(analysis.activities):
+        label = _node_label(activity).replace('"', "#quot;").replace("\n", "<br/>")
+        lines.append(f'    a{position}["{label}"]')
+    for source, target, label in _edges(analysis):
+        lines.append(f"    a{source} -- {label} --> a{target}" if label else f"    a{source} --> a{target}")
+    critical_nodes = [f"a{p}" for p, activity in enumerate(analysis.activities) if activity.name in critical]
+    if critical_nodes:
+        lines.append("    classDef critical stroke:#d33,stroke-width:3px")
+        lines.append(f"    class {','.join(critical_nodes)} critical")
+    return "\n".join(lines) + "\n"
+
+
+def run_analyze_pipelines(
+    workspaces_dir: Path,
+    model: RepositoryModel,
+    durations_file: str | None = None,
+    diagram_format: str = DIAGRAM_MERMAID,
+    output_directory: str | None = None,
+    workspace_filter: str | None = None,
+) -> int:
+    """Report stages, critical path, peak concurrency and risky policies of every DataPipeline.
+
+    With ``output_directory`` a diagram of each pipeline is written to
+    ``<output_directory>/<workspace>/<pipeline>.mmd`` (or ``.dot``).
+
+    Returns:
+        EXIT_SUCCESS, or EXIT_FAILURE if a pipeline's activity graph is invalid
+    """
+    workspaces = select_workspaces(workspaces_dir, model, workspace_filter)
+    if workspaces is None:
+        return EXIT_FAILURE
+    try:
+        measured = load_durations(durations_file) if durations_file else {}
+    except (OSError, ValueError) as e:
+        logger.error(f"ERROR: Cannot load durations: {e!s}")
+        return EXIT_FAILURE
+
+    logger.info(SEPARATOR_LONG)
+    logger.info("PIPELINE DAG ANALYSIS")
+    logger.info(SEPARATOR_LONG)
+
+    exit_code = EXIT_SUCCESS
+    for workspace in workspaces:
+        with log_context(workspace=workspace.folder, phase="analyze-pipelines"):
+            analyses = analyze_workspace(workspace, workspaces_dir, measured)
+        for analysis in analyses:
+            _log_pipeline_analysis(analysis)
+            if analysis.errors:
+                exit_code = EXIT_FAILURE
+                continue
+            if output_directory:
+                diagram_name = analysis.pipeline + DIAGRAM_SUFFIXES[diagram_format]
+                target = Path(output_directory) / workspace.folder / diagram_name
+                target.parent.mkdir(parents=True, exist_ok=True)
+                target.write_text(render_diagram(analysis, diagram_format), encoding="utf-8")
+                logger.info(f"  [OK] Wrote {target}")
+
+    logger.info(f"\n{SEPARATOR_LONG}")
+    return exit_code
+
+
+def _log_pipeline_analysis(analysis: PipelineAnalysis) -> None:
+    """Log one pipeline's stages, critical path and risks."""
+    logger.info(SEPARATOR_SHORT)
+    logger.info(f"Pipeline: {analysis.workspace_folder}/{analysis.pipeline} ({len(analysis.activities)} activities)")
+    if analysis.errors:
+        for error in analysis.errors:
+            logger.error(f"  [FAIL] {error}")
+        return
+
+    for number, stage in enumerate(analysis.stages, start=1):
+        logger.info(f"  Stage {number}: width {len(stage)} ({', '.join(stage)})")
+    logger.info(
+        f"  Expected run time {format_seconds(analysis.makespan)}, peak concurrency {analysis.peak_concurrency} "
+        f"({analysis.peak_copies} copies)"
+    )
+    logger.info(f"  Critical path: {' -> '.join(analysis.critical_path)}")
+    name_width = max(len(a.name) for a in analysis.activities)
+    logger.info(f"  {'Activity':<{name_width}}  Type             Expected  Source    Start  Slack")
+    for a in analysis.activities:
+        logger.info(
+            f"  {a.name:<{name_width}}  {a.activity_type:<15}  {format_seconds(a.seconds):>8}  {a.source:<8}  "
+            f"{format_seconds(a.start):>5}  {format_seconds(a.slack):>5}"
+        )
+    for risk in analysis.risks:
+        logger.warning(f"  [WARN] {risk.activity + ': ' if risk.activity else ''}{risk.message}")
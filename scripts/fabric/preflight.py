@@ -0,0 +1,288 @@
+"""Pre-flight validation of item definitions before anything is deployed.
+
+Problems such as malformed JSON, a ``.platform`` without a logicalId or a
+broken ``extend`` path otherwise only surface inside ``deploy_with_config``,
+after other items have already been published. This stage runs before the
+first API call and fails the deployment if any of these checks fail:
+
+- every ``*.json`` item file and every ``.platform`` parses as JSON;
+- ``.platform`` has ``metadata.type``, ``metadata.displayName`` and a GUID
+  ``config.logicalId``, and logicalIds are unique within a workspace;
+- item references in pipeline activities (``typeProperties.*Id``) point at
+  an item of the workspace or are parameterized by a find_replace rule;
+- parameter.yml and its ``extend`` chain exist, parse and contain no cycles.
+
+Files are checked in parallel. Per-file results only depend on the file's
+content, so they are cached by SHA-256 and unchanged files are not parsed again.
+"""
+
+import hashlib
+import json
+import re
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from ..common.logger import get_logger
+from .config import PARAMETER_FILE, PREFLIGHT_CACHE_FILE, PREFLIGHT_MAX_WORKERS
+from .parameters import FindReplaceRule, item_type_from_path, parameter_chain_errors
+from .reporting import write_json_atomic
+from .workspace_model import PLATFORM_FILE, RepositoryModel, WorkspaceModel
+
+logger = get_logger(__name__)
+
+# Bump when the per-file checks change so cached results are recomputed
+PREFLIGHT_CACHE_VERSION = 1
+
+GUID_RE = re.compile(r"^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$")
+PIPELINE_CONTENT_FILE = "pipeline-content.json"
+# typeProperties keys ending in "Id" that do not reference an item
+NON_ITEM_REFERENCE_FIELDS = {"workspaceId", "connectionId", "tenantId"}
+
+
+@dataclass(frozen=True)
+class PreflightIssue:
+    """One problem found by pre-flight validation."""
+
+    workspace_folder: str
+    file: str  # relative to the workspace folder
+    message: str
+
+
+@dataclass
+class FileCheck:
+    """Content-derived result of checking one file (what is cached)."""
+
+    errors: list[str] = field(default_factory=list)
+    logical_id: str = ""  # .platform only
+    references: list[tuple[str, str]] = field(default_factory=list)  # pipelines: (field, GUID)
+
+
+@dataclass
+class PreflightReport:
+    """Outcome of validating every workspace."""
+
+    issues: list[PreflightIssue]
+    files: int = 0
+    cached: int = 0
+
+
+def _check_kind(relative: str) -> str | None:
+    """Return which checks apply to a file, or None when it is not validated."""
+    name = relative.rsplit("/", 1)[-1]
+    if name == PLATFORM_FILE:
+        return "platform"
+    if name == PIPELINE_CONTENT_FILE:
+        return "pipeline"
+    if name.endswith(".json") and item_type_from_path(Path(relative)) != "Unknown":
+        return "json"
+    return None
+
+
+def _iter_references(node: Any) -> Iterator[tuple[str, str]]:
+    """Yield (field, GUID) for item references in pipeline activities, including nested activities."""
+    if isinstance(node, dict):
+        type_properties = node.get("typeProperties")
+        if isinstance(type_properties, dict):
+            for key, value in type_properties.items():
+                if (
+                    key.endswith("Id")
+                    and key not in NON_ITEM_REFERENCE_FIELDS
+                    and isinstance(value, str)
+                    and GUID_RE.match(value)
+                ):
+                    yield key, value
+        for value in node.values():
+            yield from _iter_references(value)
+    elif isinstance(node, list):
+        for value in node:
+            yield from _iter_references(value)
+
+
+def check_content(kind: str, content: bytes) -> FileCheck:
+    """Run the per-file checks of ``kind`` on a file's content."""
+    result = FileCheck()
+    try:
+        raw = json.loads(content.decode("utf-8-sig"))
+    except UnicodeDecodeError as e:
+        result.errors.append(f"not UTF-8: {e}")
+        return result
+    except ValueError as e:
+        result.errors.append(f"invalid JSON: {e}")
+        return result
+
+    if kind == "platform":
+        metadata = raw.get("metadata") if isinstance(raw, dict) else None
+        config = raw.get("config") if isinstance(raw, dict) else None
+        for section, key in (("metadata", "type"), ("metadata", "displayName")):
+            value = (metadata or {}).get(key) if isinstance(metadata, dict) else None
+            if not isinstance(value, str) or not value:
+                result.errors.append(f"missing {section}.{key}")
+        logical_id = config.get("logicalId") if isinstance(config, dict) else None
+        if not isinstance(logical_id, str) or not logical_id:
+            result.errors.append("missing config.logicalId")
+        elif not GUID_RE.match(logical_id):
+            result.errors.append(f"config.logicalId {logical_id!r} is not a GUID")
+        else:
+            result.logical_id = logical_id.lower()
+    elif kind == "pipeline":
+        result.references = sorted(set(_iter_references(raw)))
+    return result
+
+
+class PreflightCache:
+    """JSON cache of FileCheck results keyed by check kind and content hash."""
+
+    def __init__(self, path: str | Path | None):
+        self.path = Path(path) if path else None
+        self._entries: dict[str, dict[str, Any]] = {}
+        self._used: set[str] = set()
+        if self.path is not None:
+            try:
+                raw = json.loads(self.path.read_text(encoding="utf-8"))
+                if raw.get("version") == PREFLIGHT_CACHE_VERSION:
+                    self._entries = raw.get("files", {})
+            except (OSError, ValueError, AttributeError):
+                pass
+
+    def get(self, key: str) -> FileCheck | None:
+        """Return the cached result for a key, if any."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self._used.add(key)
+        return FileCheck(entry["errors"], entry["logical_id"], [tuple(r) for r in entry["references"]])
+
+    def put(self, key: str, result: FileCheck) -> None:
+        """Store a result."""
+        self._entries[key] = {
+            "errors": result.errors,
+            "logical_id": result.logical_id,
+            "references": [list(r) for r in result.references],
+        }
+        self._used.add(key)
+
+    def save(self) -> None:
+        """Write the entries used in this run (older ones are dropped)."""
+        if self.path is None:
+            return
+        files = {key: self._entries[key] for key in sorted(self._used)}
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            write_json_atomic(self.path, {"version": PREFLIGHT_CACHE_VERSION, "files": files})
+        except OSError as e:
+            logger.debug(f"Could not write pre-flight cache {self.path}: {e}")
+
+
+def _check_file(path: Path, kind: str, cache: PreflightCache) -> tuple[FileCheck, bool]:
+    """Check one file, using the cache when its content was seen before; return (result, from cache)."""
+    try:
+        content = path.read_bytes()
+    except OSError as e:
+        return FileCheck(errors=[f"cannot read: {e}"]), False
+    key = f"{kind}:{hashlib.sha256(content).hexdigest()}"
+    cached = cache.get(key)
+    if cached is not None:
+        return cached, True
+    result = check_content(kind, content)
+    cache.put(key, result)
+    return result, False
+
+
+def _is_parameterized(guid: str, field_name: str, relative: str, rules: tuple[FindReplaceRule, ...]) -> bool:
+    """Return True if a find_replace rule rewrites this reference at deploy time."""
+    file_rel = Path(relative)
+    fragment = f'"{field_name}": "{guid}"'
+    for rule in rules:
+        if not rule.applies_to(item_type_from_path(file_rel), file_rel):
+            continue
+        if rule.is_regex:
+            if rule.compiled is not None and rule.compiled.search(fragment):
+                return True
+        elif rule.find_value.lower() == guid.lower():
+            return True
+    return False
+
+
+def _workspace_issues(
+    workspace: WorkspaceModel, workspaces_dir: Path, checks: dict[str, FileCheck]
+) -> list[PreflightIssue]:
+    """Return the issues of one workspace from its per-file results plus the cross-file checks."""
+    folder = workspace.folder
+    issues = [
+        PreflightIssue(folder, relative, error) for relative, check in sorted(checks.items()) for error in check.errors
+    ]
+
+    owners: dict[str, list[str]] = {}
+    for relative, check in checks.items():
+        if check.logical_id:
+            owners.setdefault(check.logical_id, []).append(relative)
+    for logical_id, files in sorted(owners.items()):
+        if len(files) > 1:
+            for relative in sorted(files):
+                message = f"logicalId {logical_id} is not unique in the workspace"
+                issues.append(PreflightIssue(folder, relative, message))
+
+    for relative, check in sorted(checks.items()):
+        for field_name, guid in check.references:
+            if guid.lower() not in owners and not _is_parameterized(guid, field_name, relative, workspace.rules):
+                issues.append(
+                    PreflightIssue(folder, relative, f"{field_name} {guid} is not a logicalId in this workspace")
+                )
+
+    for error in parameter_chain_errors(workspaces_dir / folder / PARAMETER_FILE):
+        issues.append(PreflightIssue(folder, PARAMETER_FILE, error))
+    return issues
+
+
+def run_preflight(
+    workspaces_dir: Path,
+    model: RepositoryModel,
+    cache_file: str | Path | None = PREFLIGHT_CACHE_FILE,
+    max_workers: int = PREFLIGHT_MAX_WORKERS,
+) -> PreflightReport:
+    """Validate every item file of every workspace in parallel.
+
+    Args:
+        workspaces_dir: Root directory containing workspace folders
+        model: Workspace model (file lists and rules)
+        cache_file: JSON cache of per-file results (None disables caching)
+        max_workers: Threads reading, hashing and parsing files
+    """
+    cache = PreflightCache(cache_file)
+    tasks = [
+        (workspace.folder, relative, kind)
+        for workspace in model.workspaces
+        for relative in workspace.files
+        if (kind := _check_kind(relative)) is not None
+    ]
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="preflight") as executor:
+        results = list(
+            executor.map(
+                lambda task: _check_file(workspaces_dir / task[0] / task[1], task[2], cache),
+                tasks,
+            )
+        )
+    cache.save()
+
+    checks: dict[str, dict[str, FileCheck]] = {workspace.folder: {} for workspace in model.workspaces}
+    for (folder, relative, _), (check, _) in zip(tasks, results, strict=True):
+        checks[folder][relative] = check
+
+    issues = []
+    for workspace in model.workspaces:
+        issues.extend(_workspace_issues(workspace, workspaces_dir, checks[workspace.folder]))
+    return PreflightReport(issues=issues, files=len(tasks), cached=sum(1 for _, from_cache in results if from_cache))
+
+
+def log_preflight_report(report: PreflightReport) -> None:
+    """Log pre-flight issues (or a one-line success)."""
+    if not report.issues:
+        logger.info(f"[OK] Pre-flight: {report.files} file(s) valid ({report.cached} from the content-hash cache)")
+        return
+    logger.error(f"[FAIL] Pre-flight found {len(report.issues)} issue(s) in {report.files} file(s):")
+    for issue in report.issues:
+        logger.error(f"  {issue.workspace_folder}/{issue.file}: {issue.message}")
@@ -0,0 +1,227 @@
+"""Offline find_replace engine used to preview parameterized item files.
+
+Literal find_values are matched with a single Aho-Corasick automaton and regex
+rules are evaluated alongside it, so each file is scanned once no matter how
+many environments are rendered. The resulting match list is then spliced once
+per environment with that environment's (token-resolved) replace values.
+
+Rules are applied with fabric-cicd semantics: literal rules replace every
+occurrence, regex rules replace capture group 1 (or the whole match when the
+pattern has no group). When two rules claim overlapping text, the match that
+starts first wins, then the rule declared first in parameter.yml.
+"""
+
+import re
+from collections import deque
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from .parameters import FindReplaceRule
+
+# $workspace.id / $workspace.$id
+WORKSPACE_TOKEN_RE = re.compile(r"\$workspace\.\$?id\b")
+# $items.<ItemType>.<ItemName>.id / $items.<ItemType>.<ItemName>.$id
+ITEM_TOKEN_RE = re.compile(r"\$items\.([A-Za-z]+)\.([^.\s\"']+)\.\$?id\b")
+
+
+class AhoCorasick:
+    """Multi-pattern literal matcher (Aho-Corasick automaton)."""
+
+    def __init__(self, patterns: Sequence[str]) -> None:
+        self.patterns = list(patterns)
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._output: list[list[int]] = [[]]
+
+        for index, pattern in enumerate(self.patterns):
+            if not pattern:
+                continue
+            state = 0
+            for char in pattern:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                state = next_state
+            self._output[state].append(index)
+
+        # Breadth-first construction of failure links
+        queue: deque[int] = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0) if state else 0
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def finditer(self, text: str) -> Iterator[tuple[int, int, int]]:
+        """Yield ``(start, end, pattern_index)`` for every (possibly overlapping) occurrence."""
+        state = 0
+        for position, char in enumerate(text):
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            for index in self._output[state]:
+                yield position - len(self.patterns[index]) + 1, position + 1, index
+
+
+@dataclass(frozen=True)
+class RuleMatch:
+    """A span of text that one find_replace rule will rewrite."""
+
+    start: int
+    end: int
+    rule_index: int
+
+
+@dataclass
+class EnvironmentIds:
+    """Deployed IDs used to resolve ``$workspace`` and ``$items`` tokens."""
+
+    workspace_id: str | None = None
+    items: dict[str, dict[str, str]] = field(default_factory=dict)  # item type -> item name -> id
+
+    @classmethod
+    def from_dict(cls, raw: dict[str, Any] | None) -> "EnvironmentIds":
+        """Build from one ``<environment>.<workspace>`` entry of an ID map file."""
+        if not raw:
+            return cls()
+        items = {
+            str(item_type): {str(name): str(item_id) for name, item_id in (names or {}).items()}
+            for item_type, names in (raw.get("items") or {}).items()
+        }
+        workspace_id = raw.get("workspace_id")
+        return cls(workspace_id=str(workspace_id) if workspace_id else None, items=items)
+
+
+def resolve_tokens(value: str, ids: EnvironmentIds) -> tuple[str, list[str]]:
+    """Resolve ``$workspace.id`` and ``$items.<type>.<name>.id`` tokens in a replace value.
+
+    Returns:
+        Tuple of the resolved value and the list of tokens that could not be resolved
+        (those are left in place verbatim).
+    """
+    unresolved: list[str] = []
+
+    def _workspace(match: re.Match) -> str:
+        if ids.workspace_id:
+            return ids.workspace_id
+        unresolved.append(match.group(0))
+        return match.group(0)
+
+    def _item(match: re.Match) -> str:
+        item_id = ids.items.get(match.group(1), {}).get(match.group(2))
+        if item_id:
+            return item_id
+        unresolved.append(match.group(0))
+        return match.group(0)
+
+    resolved = WORKSPACE_TOKEN_RE.sub(_workspace, value)
+    resolved = ITEM_TOKEN_RE.sub(_item, resolved)
+    return resolved, unresolved
+
+
+def resolve_overlaps(candidates: list[RuleMatch]) -> list[RuleMatch]:
+    """Keep the matches that win: earliest start first, then the rule declared first."""
+    matches: list[RuleMatch] = []
+    cursor = 0
+    for candidate in sorted(candidates, key=lambda m: (m.start, m.rule_index, -m.end)):
+        if candidate.start >= cursor:
+            matches.append(candidate)
+            cursor = candidate.end
+    return matches
+
+
+class ReplacementEngine:
+    """Find every rule match in a file once, then render it for any number of environments."""
+
+    def __init__(self, rules: list[FindReplaceRule]) -> None:
+        self.rules = rules
+        self._literal_values: list[str] = []
+        self._literal_rules: list[list[int]] = []  # literal value index -> rule indices in declaration order
+        self._regex_rules: list[int] = []
+
+        value_index: dict[str, int] = {}
+        for index, rule in enumerate(rules):
+            if rule.is_regex:
+                if rule.compiled is not None:
+                    self._regex_rules.append(index)
+                continue
+            if rule.find_value not in value_index:
+                value_index[rule.find_value] = len(self._literal_values)
+                self._literal_values.append(rule.find_value)
+                self._literal_rules.append([])
+            self._literal_rules[value_index[rule.find_value]].append(index)
+
+        self._automaton = AhoCorasick(self._literal_values)
+
+    def find_candidates(self, text: str, item_type: str, file_rel_from_workspace: Path) -> list[RuleMatch]:
+        """Return every occurrence each applicable rule could rewrite, overlaps included."""
+        applicable = {
+            index for index, rule in enumerate(self.rules) if rule.applies_to(item_type, file_rel_from_workspace)
+        }
+        if not applicable:
+            return []
+
+        candidates: list[RuleMatch] = []
+        for start, end, value_idx in self._automaton.finditer(text):
+            for rule_index in self._literal_rules[value_idx]:
+                if rule_index in applicable:
+                    candidates.append(RuleMatch(start, end, rule_index))
+
+        for rule_index in self._regex_rules:
+            if rule_index not in applicable:
+                continue
+            pattern = self.rules[rule_index].compiled
+            assert pattern is not None
+            for match in pattern.finditer(text):
+                start, end = match.span(1) if pattern.groups else match.span(0)
+                if start >= 0 and end > start:
+                    candidates.append(RuleMatch(start, end, rule_index))
+        return candidates
+
+    def find_matches(self, text: str, item_type: str, file_rel_from_workspace: Path) -> list[RuleMatch]:
+        """Return the non-overlapping rule matches for one file, ordered by position."""
+        return resolve_overlaps(self.find_candidates(text, item_type, file_rel_from_workspace))
+
+    def apply(self, text: str, matches: list[RuleMatch], replacements: list[str | None]) -> str:
+        """Splice replacement values (indexed by rule) into the matched spans."""
+        parts: list[str] = []
+        cursor = 0
+        for match in matches:
+            replacement = replacements[match.rule_index]
+            if replacement is None:
+                continue
+            parts.append(text[cursor : match.start])
+            parts.append(replacement)
+            cursor = match.end
+        parts.append(text[cursor:])
+        return "".join(parts)
+
+    def replacements_for(
+        self, environment: str, ids: EnvironmentIds
+    ) -> tuple[list[str | None], dict[int, list[str]]]:
+        """Return per-rule replace values for an environment with tokens resolved.
+
+        Returns:
+            Tuple of replace values indexed by rule (None when the rule has no value for the
+            environment) and a mapping of rule index -> tokens that could not be resolved.
+        """
+        replacements: list[str | None] = []
+        unresolved: dict[int, list[str]] = {}
+        for index, rule in enumerate(self.rules):
+            value = rule.replacement_for(environment)
+            if value is not None:
+                value, missing = resolve_tokens(value, ids)
+                if missing:
+                    unresolved[index] = missing
+            replacements.append(value)
+        return replacements, unresolved
@@ -1,40 +1,187 @@
 
 """Reporting helpers for Fabric deployment scripts."""
 
+import json
+import os
+import tempfile
+from pathlib import Path
 from typing import Any
 
 from ..common.logger import get_logger
-from .config import SEPARATOR_LONG
-from .types import DeploymentSummary
+from .config import EXIT_FAILURE, EXIT_SUCCESS, PROMOTION_ORDER, RESULTS_FILENAME, SEPARATOR_LONG
+from .types import DeploymentResult, DeploymentSummary
 
 logger = get_logger(__name__)
 
 
+def build_workspace_result_json(result: DeploymentResult) -> dict[str, Any]:
+    """Build the JSON entry for one workspace result (shared by the summary file and the stream)."""
+    return {
+        "name": result.workspace_folder,
+        "full_name": result.workspace_name,
+        "status": "success" if result.success else "failure",
+        "error": result.error_message,
+        "duration": result.duration,
+        "resumed": result.resumed,
+        "attempts": result.attempts,
+        "throttled": result.throttled,
+        "error_kind": result.error_kind,
+        "items": result.items,
+    }
+
+
 def build_deployment_results_json(summary: DeploymentSummary) -> dict[str, Any]:
     """Build the deployment results dictionary for JSON output."""
     workspaces_list = sorted(
-        (
-            {
-                "name": result.workspace_folder,
-                "full_name": result.workspace_name,
-                "status": "success" if result.success else "failure",
-                "error": result.error_message,
-            }
-            for result in summary.results
-        ),
+        (build_workspace_result_json(result) for result in summary.results),
         key=lambda workspace: workspace["name"],
     )
 
     return {
         "environment": summary.environment,
+        "commit_sha": summary.commit_sha,
+        "finished_at": summary.finished_at,
         "duration": summary.duration,
         "total_workspaces": summary.total_workspaces,
         "successful_count": summary.successful_count,
         "failed_count": summary.failed_count,
+        "resumed": summary.resumed,
+        "resumed_count": summary.resumed_count,
+        "retry_count": summary.retry_count,
+        "circuit_open": summary.circuit_open,
+        "shard": summary.shard,
         "workspaces": workspaces_list,
     }
 
 
+def build_fanout_results_json(
+    environments: list[str], summaries: list[DeploymentSummary], gated: list[str]
+) -> dict[str, Any]:
+    """Build the results dictionary of a multi-environment run.
+
+    Each deployed environment gets a full section (as for a single-environment
+    run) under ``environments``. The top level carries the combined counts and a
+    flat workspace list tagged with the environment, so consumers of the
+    single-environment layout keep working.
+
+    Args:
+        environments: Requested environments in promotion order
+        summaries: Summaries of the environments that were deployed
+        gated: Environments skipped because an earlier environment failed its gate
+    """
+    return _fanout_payload(environments, [build_deployment_results_json(summary) for summary in summaries], gated)
+
+
+def _fanout_payload(environments: list[str], sections: list[dict[str, Any]], gated: list[str]) -> dict[str, Any]:
+    """Wrap per-environment sections in the multi-environment results layout."""
+    return {
+        "environment": ",".join(environments),
+        "commit_sha": sections[0]["commit_sha"] if sections else "",
+        "finished_at": max((section["finished_at"] for section in sections), default=""),
+        "duration": sum(section["duration"] for section in sections),
+        "total_workspaces": sum(section["total_workspaces"] for section in sections),
+        "successful_count": sum(section["successful_count"] for section in sections),
+        "failed_count": sum(section["failed_count"] for section in sections),
+        "gated_environments": gated,
+        "environments": sections,
+        "workspaces": [
+            {**workspace, "environment": section["environment"]}
+            for section in sections
+            for workspace in section["workspaces"]
+        ],
+    }
+
+
+def environment_sections(results: dict[str, Any]) -> list[dict[str, Any]]:
+    """Return the single-environment payloads of a results payload (one per environment)."""
+    return list(results.get("environments") or [results])
+
+
+def _merge_environment(environment: str, sections: list[dict[str, Any]]) -> dict[str, Any]:
+    """Merge the shard sections of one environment into a single section."""
+    # Later results win when a workspace appears in several files (e.g. a re-run shard)
+    latest: dict[str, dict[str, Any]] = {}
+    for section in sorted(sections, key=lambda s: s.get("finished_at", "")):
+        for workspace in section.get("workspaces", []):
+            latest[workspace["name"]] = workspace
+    workspaces = sorted(latest.values(), key=lambda workspace: workspace["name"])
+    successful = sum(1 for workspace in workspaces if workspace["status"] == "success")
+
+    return {
+        "environment": environment,
+        "commit_sha": next((s["commit_sha"] for s in sections if s.get("commit_sha")), ""),
+        "finished_at": max((s.get("finished_at", "") for s in sections), default=""),
+        "duration": max((s.get("duration", 0.0) for s in sections), default=0.0),  # shards run in parallel
+        "total_workspaces": len(workspaces),
+        "successful_count": successful,
+        "failed_count": len(workspaces) - successful,
+        "resumed": any(s.get("resumed") for s in sections),
+        "resumed_count": sum(1 for workspace in workspaces if workspace.get("resumed")),
+        "retry_count": sum(max(workspace.get("attempts", 1) - 1, 0) for workspace in workspaces),
+        "circuit_open": any(s.get("circuit_open") for s in sections),
+        "shards": sorted({s["shard"] for s in sections if s.get("shard")}),
+        "workspaces": workspaces,
+    }
+
+
+def merge_results_payloads(payloads: list[dict[str, Any]]) -> dict[str, Any]:
+    """Combine the deployment results of CI shards into one results payload.
+
+    Sections are merged per environment: workspaces are combined, counts are
+    recomputed and the duration is that of the slowest shard. The result has the
+    single-environment layout when only one environment is involved, so
+    generate_deployment_summary.sh reads it like an unsharded run.
+    """
+    by_environment: dict[str, list[dict[str, Any]]] = {}
+    gated: set[str] = set()
+    for payload in payloads:
+        gated.update(payload.get("gated_environments", []))
+        for section in environment_sections(payload):
+            by_environment.setdefault(section.get("environment", ""), []).append(section)
+
+    def promotion_rank(environment: str) -> tuple[int, str]:
+        rank = PROMOTION_ORDER.index(environment) if environment in PROMOTION_ORDER else len(PROMOTION_ORDER)
+        return rank, environment
+
+    environments = sorted(by_environment, key=promotion_rank)
+    sections = [_merge_environment(environment, by_environment[environment]) for environment in environments]
+    if len(sections) == 1 and not gated:
+        return sections[0]
+    gated_environments = sorted(gated - set(environments), key=promotion_rank)
+    requested = sorted([*environments, *gated_environments], key=promotion_rank)
+    return _fanout_payload(requested, sections, gated_environments)
+
+
+def missing_shards(section: dict[str, Any]) -> list[str]:
+    """Return the "i/N" shards of a merged section that have no results."""
+    seen = set(section.get("shards", []))
+    counts = {int(shard.split("/")[1]) for shard in seen}
+    return [f"{i}/{n}" for n in sorted(counts) for i in range(1, n + 1) if f"{i}/{n}" not in seen]
+
+
+def write_text_atomic(path: str | Path, text: str) -> None:
+    """Write text to a temporary file next to ``path`` and rename it into place.
+
+    Readers never see a half-written file: they get the previous version or the new one.
+    """
+    target = Path(path)
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{target.name}.", suffix=".tmp", dir=target.parent)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_name, target)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+def write_json_atomic(path: str | Path, payload: dict[str, Any]) -> None:
+    """Write JSON atomically (see write_text_atomic)."""
+    write_text_atomic(path, json.dumps(payload, indent=2))
+
+
 def print_deployment_summary(summary: DeploymentSummary) -> None:
     """Print comprehensive deployment summary to console."""
     logger.info(f"\n{SEPARATOR_LONG}")
@@ -45,9 +192,19 @@ def print_deployment_summary(summary: DeploymentSummary) -> None:
     logger.info(f"Total workspaces: {summary.total_workspaces}")
     logger.info(f"Successful: {summary.successful_count}")
     logger.info(f"Failed: {summary.failed_count}")
+    if summary.retry_count:
+        logger.info(f"Retries: {summary.retry_count}")
+    if summary.circuit_open:
+        logger.warning("Circuit breaker: OPEN - remaining workspaces were skipped")
+    if summary.resumed:
+        logger.info(f"Resumed from checkpoint: {summary.resumed_count} skipped, {summary.fresh_count} deployed")
     logger.info(SEPARATOR_LONG)
 
-    successful = [result.workspace_name for result in summary.results if result.success]
+    successful = [
+        f"{result.workspace_name} (resumed)" if result.resumed else result.workspace_name
+        for result in summary.results
+        if result.success
+    ]
     failed = [(result.workspace_name, result.error_message) for result in summary.results if not result.success]
 
     if successful:
@@ -62,3 +219,68 @@ def print_deployment_summary(summary: DeploymentSummary) -> None:
             logger.error(f"    Error: {error}")
 
     logger.info(f"\n{SEPARATOR_LONG}")
+
+
+def print_fanout_summary(environments: list[str], summaries: list[DeploymentSummary], gated: list[str]) -> None:
+    """Print one line per environment of a multi-environment run."""
+    deployed = {summary.environment: summary for summary in summaries}
+    logger.info(f"\n{SEPARATOR_LONG}")
+    logger.info("PROMOTION SUMMARY")
+    logger.info(SEPARATOR_LONG)
+    for environment in environments:
+        summary = deployed.get(environment)
+        if summary is None:
+            reason = "promotion gate closed" if environment in gated else "not deployed"
+            logger.error(f"  [SKIP] {environment.upper()}: {reason}")
+        elif summary.failed_count:
+            logger.error(
+                f"  [FAIL] {environment.upper()}: {summary.failed_count} of {summary.total_workspaces} "
+                f"workspace(s) failed ({summary.duration:.2f}s)"
+            )
+        else:
+            logger.info(
+                f"  [OK] {environment.upper()}: {summary.successful_count} workspace(s) deployed "
+                f"({summary.duration:.2f}s)"
+            )
+    logger.info(SEPARATOR_LONG)
+
+
+def run_merge_results(paths: list[str], output: str) -> int:
+    """Merge per-shard deployment-results.json files into one results file.
+
+    Directories are searched recursively for deployment-results.json (the layout
+    of ``actions/download-artifact`` with several artifacts).
+
+    Returns:
+        EXIT_SUCCESS, or EXIT_FAILURE if no results were found, a shard is missing
+        or a workspace failed
+    """
+    files: list[Path] = []
+    for path in map(Path, paths):
+        files.extend(sorted(path.rglob(RESULTS_FILENAME)) if path.is_dir() else [path])
+    try:
+        payloads = [json.loads(file.read_text(encoding="utf-8")) for file in files]
+    except (OSError, ValueError) as e:
+        logger.error(f"[FAIL] Cannot read deployment results: {e!s}")
+        return EXIT_FAILURE
+    if not payloads:
+        logger.error(f"[FAIL] No {RESULTS_FILENAME} found in: {', '.join(paths)}")
+        return EXIT_FAILURE
+
+    merged = merge_results_payloads(payloads)
+    write_json_atomic(output, merged)
+    logger.info(f"[OK] Merged {len(payloads)} results file(s) into {output}")
+
+    exit_code = EXIT_SUCCESS
+    for section in environment_sections(merged):
+        missing = missing_shards(section)
+        if missing:
+            logger.error(f"[FAIL] {section['environment']}: no results for shard(s) {', '.join(missing)}")
+            exit_code = EXIT_FAILURE
+        logger.info(
+            f"  {section['environment']}: {section['successful_count']}/{section['total_workspaces']} "
+            f"workspace(s) succeeded"
+        )
+    if merged["failed_count"] or merged.get("gated_environments"):
+        exit_code = EXIT_FAILURE
+    return exit_code
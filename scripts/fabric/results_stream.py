@@ -0,0 +1,133 @@
+"""Incremental JSON-lines stream of deployment progress.
+
+Every event is appended (and fsynced) as soon as it happens, so a run that is
+killed mid-way, e.g. by the job timeout, still leaves a usable record of what
+completed. scripts/generate_deployment_summary.sh rebuilds the summary from this
+stream when the final deployment-results.json was never written.
+
+Events (one JSON object per line, all with ``event`` and ``elapsed`` seconds):
+    run_started            environment, started_at
+    workspaces_discovered  workspaces
+    phase_completed        phase, status, duration, error
+    workspace_completed    phase, environment, name, full_name, status, error, duration
+    environment_started    environment (multi-environment runs, before its workspaces)
+    environment_completed  environment, total_workspaces, successful_count, failed_count, duration
+    environment_gated      environment, blocked_by
+    run_completed          total_workspaces, successful_count, failed_count, duration
+    run_failed             error
+
+In a multi-environment run (``--environment test,prod``) ``run_started`` carries
+the comma-separated list and every environment is bracketed by
+``environment_started`` / ``environment_completed``.
+"""
+
+import json
+import os
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from ..common.logger import get_logger
+from .reporting import build_workspace_result_json
+from .types import DeploymentResult, DeploymentSummary
+
+logger = get_logger(__name__)
+
+
+class ResultsStream:
+    """Append-only JSON-lines writer for one deployment run.
+
+    Write errors are logged once and otherwise ignored: losing the progress
+    stream must never fail a deployment.
+    """
+
+    def __init__(self, path: str | Path, environment: str):
+        """Start a new stream, replacing the file of a previous run.
+
+        Args:
+            path: JSON-lines file to write
+            environment: Target environment of the run
+        """
+        self.path = Path(path)
+        self.environment = environment
+        self._start = time.time()
+        self._disabled = False
+        try:
+            self.path.write_text("", encoding="utf-8")
+        except OSError as e:
+            self._disable(e)
+        self._append("run_started", environment=environment, started_at=datetime.now(timezone.utc).isoformat())
+
+    def _disable(self, error: OSError) -> None:
+        logger.warning(f"[WARN] Cannot write deployment results stream {self.path}: {error!s}")
+        self._disabled = True
+
+    def _append(self, event: str, **fields: Any) -> None:
+        if self._disabled:
+            return
+        record = {"event": event, "elapsed": round(time.time() - self._start, 3), **fields}
+        try:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+        except OSError as e:
+            self._disable(e)
+
+    def workspaces_discovered(self, workspace_folders: list[str]) -> None:
+        """Record the workspaces the run is going to deploy."""
+        self._append("workspaces_discovered", workspaces=list(workspace_folders))
+
+    def phase_completed(self, phase: str, duration: float, error: str = "") -> None:
+        """Record a run-level phase (e.g. prepare) and whether it failed."""
+        self._append(
+            "phase_completed",
+            phase=phase,
+            status="failure" if error else "success",
+            duration=round(duration, 3),
+            error=error,
+        )
+
+    def workspace_completed(self, result: DeploymentResult) -> None:
+        """Record the deploy phase result of one workspace."""
+        self._append(
+            "workspace_completed",
+            phase="deploy",
+            environment=self.environment,
+            **build_workspace_result_json(result),
+        )
+
+    def environment_started(self, environment: str) -> None:
+        """Record the start of one environment of a multi-environment run."""
+        self.environment = environment
+        self._append("environment_started", environment=environment)
+
+    def environment_completed(self, summary: DeploymentSummary) -> None:
+        """Record the end of one environment of a multi-environment run."""
+        self._append(
+            "environment_completed",
+            environment=summary.environment,
+            total_workspaces=summary.total_workspaces,
+            successful_count=summary.successful_count,
+            failed_count=summary.failed_count,
+            duration=summary.duration,
+        )
+
+    def environment_gated(self, environment: str, blocked_by: str) -> None:
+        """Record an environment skipped because an earlier environment failed its promotion gate."""
+        self._append("environment_gated", environment=environment, blocked_by=blocked_by)
+
+    def run_completed(self, summary: DeploymentSummary) -> None:
+        """Record the end of the run."""
+        self._append(
+            "run_completed",
+            total_workspaces=summary.total_workspaces,
+            successful_count=summary.successful_count,
+            failed_count=summary.failed_count,
+            duration=summary.duration,
+        )
+
+    def run_failed(self, error: str) -> None:
+        """Record a run-level error that stopped the deployment."""
+        self._append("run_failed", error=error)
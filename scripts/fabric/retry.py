@@ -0,0 +1,285 @@
+"""Retry policy and circuit breaker for workspace deployments.
+
+fabric_cicd already retries 429/500 responses inside a single API call; this
+module retries a whole ``deploy_with_config`` call when it still fails with an
+error that is likely to go away (connection errors, gateway errors,
+throttling). Errors in the repository content (parsing, parameter files,
+missing files) are permanent and fail immediately, and so are authentication
+errors unless they were caused by the network or by Entra ID throttling.
+
+Retries use bounded exponential backoff with jitter and draw from a per-run
+budget, so a bad run cannot multiply its duration. A circuit breaker opens after
+N consecutive workspaces end in a transient failure (retries exhausted) and the
+remaining workspaces are skipped instead of hammering a service that is down.
+A permanent failure or a success resets the count.
+"""
+
+import os
+import random
+import re
+import threading
+import time
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from typing import TypeVar
+
+from ..common.logger import get_logger
+from .config import (
+    CIRCUIT_BREAKER_THRESHOLD,
+    ENV_CIRCUIT_BREAKER_THRESHOLD,
+    ENV_RETRY_BUDGET,
+    ENV_RETRY_MAX_ATTEMPTS,
+    RETRY_BASE_DELAY_SECONDS,
+    RETRY_MAX_ATTEMPTS,
+    RETRY_MAX_DELAY_SECONDS,
+    RETRY_RUN_BUDGET,
+    THROTTLE_STATUS_CODES,
+    TRANSIENT_STATUS_CODES,
+)
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+# Error classes
+TRANSIENT = "transient"
+THROTTLED = "throttled"  # transient, reported separately
+PERMANENT = "permanent"
+SKIPPED = "skipped"  # not attempted because the circuit breaker was open
+
+# Matched against class names in the exception MRO (avoids importing requests/azure/fabric_cicd)
+TRANSIENT_ERROR_TYPES = frozenset(
+    {
+        "ConnectionError",
+        "TimeoutError",
+        "Timeout",
+        "ChunkedEncodingError",
+        "ServiceRequestError",
+        "ServiceResponseError",
+        "TokenError",
+    }
+)
+PERMANENT_ERROR_TYPES = frozenset(
+    {
+        "ParsingError",
+        "InputError",
+        "ParameterFileError",
+        "FileTypeError",
+        "MissingFileError",
+        "ItemDependencyError",
+        "FileNotFoundError",
+        "KeyError",
+        "ValueError",
+    }
+)
+# Permanent unless their message or cause says otherwise (bad secret, missing role, expired federation token)
+AUTH_ERROR_TYPES = frozenset({"ClientAuthenticationError", "CredentialUnavailableError"})
+# AADSTS50196: request loop throttled; AADSTS90033: transient Entra ID error
+AUTH_THROTTLE_MESSAGE_RE = re.compile(r"\bAADSTS50196\b")
+AUTH_TRANSIENT_MESSAGE_RE = re.compile(r"\bAADSTS90033\b")
+THROTTLE_MESSAGE_RE = re.compile(r"\b429\b|too many requests|throttl", re.IGNORECASE)
+TRANSIENT_MESSAGE_RE = re.compile(
+    r"\b(408|500|502|503|504)\b|bad gateway|service unavailable|gateway time-?out|temporarily unavailable"
+    r"|timed out|connection (reset|aborted|refused)|maximum execution duration",
+    re.IGNORECASE,
+)
+
+
+def _exception_chain(error: BaseException) -> Iterator[BaseException]:
+    """Yield the error and its causes/contexts (outermost first, cycle-safe)."""
+    seen: set[int] = set()
+    current: BaseException | None = error
+    while current is not None and id(current) not in seen:
+        seen.add(id(current))
+        yield current
+        current = current.__cause__ or current.__context__
+
+
+def _status_code(error: BaseException) -> int | None:
+    """Return an HTTP status code carried by the error or its response, if any."""
+    for candidate in (error, getattr(error, "response", None)):
+        status = getattr(candidate, "status_code", None)
+        if isinstance(status, int):
+            return status
+    return None
+
+
+def _classify_auth_error(error: BaseException) -> str:
+    """Classify an authentication error: transient only for throttling or a network cause."""
+    message = str(error)
+    if AUTH_THROTTLE_MESSAGE_RE.search(message) or THROTTLE_MESSAGE_RE.search(message):
+        return THROTTLED
+    if AUTH_TRANSIENT_MESSAGE_RE.search(message) or TRANSIENT_MESSAGE_RE.search(message):
+        return TRANSIENT
+    cause = error.__cause__ or error.__context__
+    cause_kind = classify_error(cause) if cause is not None else PERMANENT
+    return cause_kind if cause_kind in (TRANSIENT, THROTTLED) else PERMANENT
+
+
+def classify_error(error: BaseException) -> str:
+    """Classify a deployment error as TRANSIENT, THROTTLED, PERMANENT or SKIPPED.
+
+    A CircuitOpenError is SKIPPED. Otherwise the exception chain is inspected
+    outermost first: HTTP status codes, then known exception types, then
+    well-known message fragments. Anything unrecognised is permanent so that
+    real bugs are not retried.
+    """
+    if isinstance(error, CircuitOpenError):
+        return SKIPPED
+    for exc in _exception_chain(error):
+        status = _status_code(exc)
+        if status is not None:
+            if status in THROTTLE_STATUS_CODES:
+                return THROTTLED
+            return TRANSIENT if status in TRANSIENT_STATUS_CODES else PERMANENT
+
+        type_names = {cls.__name__ for cls in type(exc).__mro__}
+        if type_names & PERMANENT_ERROR_TYPES:
+            return PERMANENT
+        if type_names & AUTH_ERROR_TYPES:
+            return _classify_auth_error(exc)
+        if type_names & TRANSIENT_ERROR_TYPES:
+            return TRANSIENT
+
+        message = str(exc)
+        if THROTTLE_MESSAGE_RE.search(message):
+            return THROTTLED
+        if TRANSIENT_MESSAGE_RE.search(message):
+            return TRANSIENT
+    return PERMANENT
+
+
+def _env_int(name: str, default: int, minimum: int) -> int:
+    """Read an integer override from the environment.
+
+    Raises:
+        ValueError: If the variable is set but not an integer >= minimum
+    """
+    raw = os.getenv(name)
+    if raw is None or raw.strip() == "":
+        return default
+    try:
+        value = int(raw)
+    except ValueError:
+        raise ValueError(f"{name} must be an integer, got '{raw}'") from None
+    if value < minimum:
+        raise ValueError(f"{name} must be >= {minimum}, got {value}")
+    return value
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Retry limits for one deployment run."""
+
+    max_attempts: int = RETRY_MAX_ATTEMPTS
+    base_delay: float = RETRY_BASE_DELAY_SECONDS
+    max_delay: float = RETRY_MAX_DELAY_SECONDS
+    run_budget: int = RETRY_RUN_BUDGET
+    breaker_threshold: int = CIRCUIT_BREAKER_THRESHOLD
+
+    @classmethod
+    def from_env(cls) -> "RetryPolicy":
+        """Build the default policy with FABRIC_RETRY_* / FABRIC_CIRCUIT_BREAKER_THRESHOLD overrides.
+
+        Raises:
+            ValueError: If an override is not a valid integer
+        """
+        return cls(
+            max_attempts=_env_int(ENV_RETRY_MAX_ATTEMPTS, RETRY_MAX_ATTEMPTS, minimum=1),
+            run_budget=_env_int(ENV_RETRY_BUDGET, RETRY_RUN_BUDGET, minimum=0),
+            breaker_threshold=_env_int(ENV_CIRCUIT_BREAKER_THRESHOLD, CIRCUIT_BREAKER_THRESHOLD, minimum=1),
+        )
+
+    def backoff(self, retry_number: int, rng: Callable[[], float] = random.random) -> float:
+        """Return the delay before retry ``retry_number`` (1-based): exponential, capped, half jittered."""
+        ceiling = min(self.max_delay, self.base_delay * 2 ** (retry_number - 1))
+        return ceiling / 2 + rng() * ceiling / 2
+
+
+@dataclass
+class RetryOutcome:
+    """Attempts made for one workspace (filled in while the call runs)."""
+
+    attempts: int = 0
+    throttled: int = 0
+    error_kind: str = ""
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling the service while the circuit breaker is open."""
+
+
+class RetryController:
+    """Apply a RetryPolicy across all workspaces of one run (shared budget and breaker).
+
+    Safe to share between deploy worker threads: the budget and breaker counters
+    are updated under a lock, the backoff sleep happens outside it. The breaker
+    counts workspaces, not attempts: a workspace adds one when it gives up on a
+    transient error, and a permanent error or a success resets the count.
+    """
+
+    def __init__(
+        self,
+        policy: RetryPolicy,
+        sleep: Callable[[float], None] = time.sleep,
+        rng: Callable[[], float] = random.random,
+    ):
+        self.policy = policy
+        self._sleep = sleep
+        self._rng = rng
+        self.retries_used = 0
+        self.consecutive_transient_failures = 0
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        """True once the circuit breaker has tripped; it stays open for the rest of the run."""
+        return self.consecutive_transient_failures >= self.policy.breaker_threshold
+
+    @property
+    def budget_remaining(self) -> int:
+        return max(self.policy.run_budget - self.retries_used, 0)
+
+    def call(self, operation: Callable[[], T], outcome: RetryOutcome) -> T:
+        """Run ``operation`` with retries, recording attempts in ``outcome``.
+
+        Raises:
+            CircuitOpenError: If the breaker is (or becomes) open before an attempt
+            Exception: The operation's last error once it is permanent or retries are exhausted
+        """
+        while True:
+            if self.is_open:
+                outcome.error_kind = SKIPPED
+                raise CircuitOpenError(
+                    f"Circuit breaker open after {self.consecutive_transient_failures} consecutive workspaces "
+                    "failed with transient errors"
+                )
+
+            outcome.attempts += 1
+            try:
+                result = operation()
+            except Exception as e:
+                kind = classify_error(e)
+                outcome.error_kind = kind
+                if kind == PERMANENT:
+                    with self._lock:
+                        self.consecutive_transient_failures = 0
+                    raise
+                if kind == THROTTLED:
+                    outcome.throttled += 1
+                with self._lock:
+                    if self.is_open or outcome.attempts >= self.policy.max_attempts or self.budget_remaining == 0:
+                        self.consecutive_transient_failures += 1
+                        raise
+                    self.retries_used += 1
+                delay = self.policy.backoff(outcome.attempts, self._rng)
+                logger.warning(
+                    f"[WARN] {kind.capitalize()} error on attempt {outcome.attempts}/{self.policy.max_attempts}: "
+                    f"{e!s} - retrying in {delay:.1f}s ({self.budget_remaining} retries left in run budget)"
+                )
+                self._sleep(delay)
+            else:
+                with self._lock:
+                    self.consecutive_transient_failures = 0
+                outcome.error_kind = ""
+                return result
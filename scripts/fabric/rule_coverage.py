@@ -0,0 +1,281 @@
+"""Rule coverage matrix and consolidation of duplicate find_replace rules.
+
+One pass over a workspace's item files collects, for every file, all the
+occurrences each applicable rule could rewrite and the ones it actually
+rewrites after overlap resolution (see rendering.py). From that:
+
+- dead rules match nothing in the current tree;
+- shadowed rules match text that an earlier (or earlier-starting) rule
+  always rewrites first;
+- the matrix counts the occurrences each rule rewrites per item type.
+
+Consolidation merges literal rules that differ only in ``item_type`` into
+one rule with an item_type list, so fabric-cicd makes fewer passes over every
+file. A rule is only merged into an earlier one when no rule in between could
+claim the same text; the consolidated rules are then checked to rewrite
+exactly the same spans with the same values across the corpus.
+"""
+
+import bisect
+import dataclasses
+from collections import Counter
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import yaml
+
+from ..common.logger import get_logger, log_context
+from .config import EXIT_FAILURE, EXIT_SUCCESS, PARAMETER_FILE, SEPARATOR_LONG, SEPARATOR_SHORT
+from .parameters import FindReplaceRule, item_type_from_path, rule_labels
+from .rendering import ReplacementEngine, RuleMatch, resolve_overlaps
+from .workspace_model import PLATFORM_FILE, RepositoryModel, select_workspaces
+
+logger = get_logger(__name__)
+
+# Coverage statuses
+STATUS_ACTIVE = "active"
+STATUS_PARTIAL = "partly shadowed"  # some occurrences are rewritten by other rules first
+STATUS_SHADOWED = "shadowed"  # every occurrence is rewritten by other rules first
+STATUS_DEAD = "dead"  # no occurrence in the tree
+
+# (path relative to the workspace, item type, text) of one parameterizable file
+CorpusFile = tuple[Path, str, str]
+
+
+@dataclass
+class RuleCoverage:
+    """Which occurrences one rule could rewrite and which it actually rewrites."""
+
+    index: int
+    label: str
+    rule: FindReplaceRule
+    candidates: int = 0
+    applied: int = 0
+    applied_by_item_type: Counter[str] = field(default_factory=Counter)
+    shadowed_by: Counter[int] = field(default_factory=Counter)  # rule index -> occurrences lost to it
+
+    @property
+    def status(self) -> str:
+        """Return STATUS_DEAD, STATUS_SHADOWED, STATUS_PARTIAL or STATUS_ACTIVE."""
+        if not self.candidates:
+            return STATUS_DEAD
+        if not self.applied:
+            return STATUS_SHADOWED
+        return STATUS_PARTIAL if self.shadowed_by else STATUS_ACTIVE
+
+
+def iter_corpus(workspace_dir: Path, files: Iterable[str]) -> Iterator[CorpusFile]:
+    """Yield the item files fabric-cicd parameterizes (text files inside items, no .platform)."""
+    for relative in files:
+        rel = Path(relative)
+        item_type = item_type_from_path(rel)
+        if item_type == "Unknown" or rel.name == PLATFORM_FILE:
+            continue
+        try:
+            text = (workspace_dir / rel).read_text(encoding="utf-8")
+        except (OSError, UnicodeDecodeError):
+            continue
+        yield rel, item_type, text
+
+
+def analyze_coverage(rules: list[FindReplaceRule], corpus: Iterable[CorpusFile]) -> list[RuleCoverage]:
+    """Compute the coverage of every rule in one pass over the corpus."""
+    engine = ReplacementEngine(rules)
+    labels = rule_labels(rules)
+    coverage = [RuleCoverage(index, labels[index], rule) for index, rule in enumerate(rules)]
+
+    for rel, item_type, text in corpus:
+        candidates = engine.find_candidates(text, item_type, rel)
+        winners = resolve_overlaps(candidates)
+        won = set(winners)
+        starts = [winner.start for winner in winners]
+
+        for candidate in candidates:
+            entry = coverage[candidate.rule_index]
+            entry.candidates += 1
+            if candidate in won:
+                entry.applied += 1
+                entry.applied_by_item_type[item_type] += 1
+            else:
+                entry.shadowed_by[_overlapping_winner(winners, starts, candidate).rule_index] += 1
+    return coverage
+
+
+def _overlapping_winner(winners: list[RuleMatch], starts: list[int], loser: RuleMatch) -> RuleMatch:
+    """Return the winning match that kept ``loser`` from being applied."""
+    # Winners do not overlap each other, so the last one starting before the loser ends is the one
+    position = bisect.bisect_left(starts, loser.end) - 1
+    return winners[max(position, 0)]
+
+
+def _literals_overlap(a: str, b: str) -> bool:
+    """Return True if the two literals can claim overlapping text."""
+    if a in b or b in a:
+        return True
+    return any(a.endswith(b[:k]) or b.endswith(a[:k]) for k in range(1, min(len(a), len(b))))
+
+
+def _claims_differently(between: FindReplaceRule, rule: FindReplaceRule) -> bool:
+    """Return True if ``between`` could rewrite text of ``rule`` with a different result."""
+    if between.is_regex:
+        return True
+    if between.find_value == rule.find_value:
+        return between.replace_values != rule.replace_values
+    return _literals_overlap(between.find_value, rule.find_value)
+
+
+def _union_item_types(a: list[str], b: list[str]) -> list[str]:
+    if not a or not b:
+        return []  # one of the rules applies to every item type
+    return a + [item_type for item_type in b if item_type not in a]
+
+
+def consolidate_rules(rules: list[FindReplaceRule]) -> tuple[list[FindReplaceRule], list[list[int]]]:
+    """Merge literal rules that differ only in item_type.
+
+    Returns:
+        The consolidated rules and, for each of them, the indices of the original rules it replaces
+    """
+    consolidated: list[FindReplaceRule] = []
+    sources: list[list[int]] = []
+    groups: dict[tuple, int] = {}  # (find_value, replace values, file paths) -> consolidated position
+    moved: set[int] = set()  # rules merged into an earlier one no longer sit at their own position
+
+    for index, rule in enumerate(rules):
+        if not rule.is_regex:
+            key = (rule.find_value, tuple(sorted(rule.replace_values.items())), tuple(rule.file_paths))
+            target = groups.get(key)
+            # Merging moves this rule up to the group's position: nothing in between may claim its text
+            if target is not None and not any(
+                _claims_differently(rules[between], rule)
+                for between in range(sources[target][0] + 1, index)
+                if between not in moved
+            ):
+                merged = consolidated[target]
+                consolidated[target] = dataclasses.replace(
+                    merged, item_types=_union_item_types(merged.item_types, rule.item_types)
+                )
+                sources[target].append(index)
+                moved.add(index)
+                continue
+            groups[key] = len(consolidated)
+        consolidated.append(rule)
+        sources.append([index])
+    return consolidated, sources
+
+
+def changed_files(
+    original: list[FindReplaceRule], consolidated: list[FindReplaceRule], corpus: Iterable[CorpusFile]
+) -> list[str]:
+    """Return the files whose rewritten spans or values differ between two rule lists."""
+    engines = (ReplacementEngine(original), ReplacementEngine(consolidated))
+    changed = []
+    for rel, item_type, text in corpus:
+        before, after = (
+            [(m.start, m.end, rules[m.rule_index].replace_values) for m in engine.find_matches(text, item_type, rel)]
+            for engine, rules in zip(engines, (original, consolidated), strict=True)
+        )
+        if before != after:
+            changed.append(str(rel))
+    return changed
+
+
+def _scalar_or_list(values: list[str]) -> str | list[str]:
+    return values[0] if len(values) == 1 else values
+
+
+def render_parameter_yaml(rules: list[FindReplaceRule], header: str = "") -> str:
+    """Serialize rules as a flat parameter.yml ``find_replace`` section."""
+    entries = []
+    for rule in rules:
+        entry: dict[str, object] = {"find_value": rule.find_value, "replace_value": dict(rule.replace_values)}
+        if rule.is_regex:
+            entry["is_regex"] = "true"
+        if rule.item_types:
+            entry["item_type"] = _scalar_or_list(rule.item_types)
+        if rule.file_paths:
+            entry["file_path"] = _scalar_or_list(rule.file_paths)
+        entries.append(entry)
+    body = yaml.safe_dump({"find_replace": entries}, sort_keys=False, allow_unicode=True, width=1000)
+    return "".join(f"# {line}\n".replace("# \n", "#\n") for line in header.splitlines()) + body
+
+
+def run_rule_coverage(
+    workspaces_dir: Path,
+    model: RepositoryModel,
+    output_directory: str | None = None,
+    workspace_filter: str | None = None,
+) -> int:
+    """Report which rules rewrite which occurrences and consolidate literal duplicates.
+
+    With ``output_directory`` the consolidated rules of each workspace are written
+    to ``<output_directory>/<workspace>/parameter.yml``.
+
+    Returns:
+        EXIT_SUCCESS, or EXIT_FAILURE if consolidation would change a rendered file
+    """
+    workspaces = select_workspaces(workspaces_dir, model, workspace_filter)
+    if workspaces is None:
+        return EXIT_FAILURE
+
+    logger.info(SEPARATOR_LONG)
+    logger.info("PARAMETER RULE COVERAGE")
+    logger.info(SEPARATOR_LONG)
+
+    exit_code = EXIT_SUCCESS
+    for workspace in workspaces:
+        rules = list(workspace.rules)
+        corpus = list(iter_corpus(workspaces_dir / workspace.folder, workspace.files))
+        with log_context(workspace=workspace.folder, phase="rule-coverage"):
+            coverage = analyze_coverage(rules, corpus)
+            consolidated, sources = consolidate_rules(rules)
+            changed = changed_files(rules, consolidated, corpus)
+        _log_rule_coverage(workspace.folder, len(corpus), coverage)
+
+        logger.info(f"  Consolidation: {len(rules)} -> {len(consolidated)} rule(s)")
+        for group in sources:
+            if len(group) > 1:
+                logger.info(f"    merged: {' + '.join(coverage[index].label for index in group)}")
+        if changed:
+            logger.error(f"  [FAIL] Consolidated rules would change {len(changed)} file(s): {', '.join(changed[:5])}")
+            exit_code = EXIT_FAILURE
+            continue
+        if output_directory:
+            target = Path(output_directory) / workspace.folder / PARAMETER_FILE
+            target.parent.mkdir(parents=True, exist_ok=True)
+            header = (
+                f"Consolidated find_replace rules for {workspace.folder} (generated by fabric rule-coverage).\n"
+                "Literal rules differing only in item_type are merged; rendered output is unchanged."
+            )
+            target.write_text(render_parameter_yaml(consolidated, header), encoding="utf-8")
+            logger.info(f"  [OK] Wrote {target}")
+
+    logger.info(f"\n{SEPARATOR_LONG}")
+    return exit_code
+
+
+def _log_rule_coverage(folder: str, files: int, coverage: list[RuleCoverage]) -> None:
+    """Log the rule x item type matrix of one workspace and flag dead and shadowed rules."""
+    logger.info(SEPARATOR_SHORT)
+    logger.info(f"Workspace: {folder} ({len(coverage)} rule(s), {files} file(s))")
+    if not coverage:
+        return
+    item_types = sorted({item_type for entry in coverage for item_type in entry.applied_by_item_type})
+    label_width = max(len(entry.label) for entry in coverage)
+    columns = "".join(f"  {item_type:>{max(len(item_type), 5)}}" for item_type in item_types)
+    logger.info(f"  {'Rule':<{label_width}}  Kind   {columns}  Status")
+    for entry in coverage:
+        kind = "regex" if entry.rule.is_regex else "literal"
+        counts = "".join(
+            f"  {entry.applied_by_item_type.get(item_type, 0):>{max(len(item_type), 5)}}" for item_type in item_types
+        )
+        status = entry.status
+        if entry.shadowed_by:
+            status += f" by {', '.join(coverage[index].label for index in sorted(entry.shadowed_by))}"
+        logger.info(f"  {entry.label:<{label_width}}  {kind:<7}{counts}  {status}")
+
+    for status, description in ((STATUS_DEAD, "match nothing"), (STATUS_SHADOWED, "are always overridden")):
+        labels = [entry.label for entry in coverage if entry.status == status]
+        if labels:
+            logger.warning(f"  [WARN] {len(labels)} {status} rule(s) {description}: {', '.join(labels)}")
@@ -0,0 +1,326 @@
+"""Performance profiling of find_replace rules.
+
+Regex rules run against every file they select, both in the unmapped-ID
+scanner and at deploy time, so one pattern that backtracks catastrophically can
+stall either. Each rule is profiled three ways:
+
+- corpus: every workspace file the rule applies to is searched once, giving the
+  rule's real cost and match count;
+- worst case: adversarial inputs built from the pattern's own characters (long
+  runs that almost match, followed by a character that does not) are searched
+  with growing lengths. Lengths grow in small steps first, so an exponential
+  pattern crosses the budget before an input becomes large enough to hang;
+- static checks: nested quantifiers and alternations inside unbounded
+  quantifiers, the usual shapes of catastrophic backtracking, and patterns
+  that do not compile.
+
+Static findings are deterministic and fail a run on any machine; timings
+depend on the machine and are only compared against the budget.
+"""
+
+import re
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+from re import _constants as sre_constants  # type: ignore[attr-defined]
+from re import _parser as sre_parser  # type: ignore[attr-defined]
+
+from ..common.logger import get_logger, log_context
+from .config import EXIT_FAILURE, EXIT_SUCCESS, RULE_PROFILE_BUDGET_MS, SEPARATOR_LONG, SEPARATOR_SHORT
+from .parameters import FindReplaceRule, rule_labels
+from .workspace_model import RepositoryModel, WorkspaceModel, select_workspaces
+
+logger = get_logger(__name__)
+
+# Adversarial input lengths: fine steps while exponential blow-up is possible, then doubling
+ADVERSARIAL_LENGTHS = (*range(2, 65, 2), 128, 256, 512, 1024, 2048, 4096, 8192, 16384)
+# Growth factor between the two largest doubling lengths that indicates super-linear matching
+SUPERLINEAR_GROWTH_FACTOR = 3.0
+SUPERLINEAR_MIN_MS = 1.0  # ignore growth measured on timings below this (noise)
+MISMATCH_CHAR = "\x00"  # appended to adversarial inputs so the match ultimately fails
+
+_REPEATS = (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT)
+_CATEGORY_CHARS = {
+    sre_constants.CATEGORY_DIGIT: "0",
+    sre_constants.CATEGORY_NOT_DIGIT: "a",
+    sre_constants.CATEGORY_SPACE: " ",
+    sre_constants.CATEGORY_NOT_SPACE: "a",
+    sre_constants.CATEGORY_WORD: "a",
+    sre_constants.CATEGORY_NOT_WORD: " ",
+}
+
+
+@dataclass
+class RuleProfile:
+    """Cost of one find_replace rule on the corpus and on adversarial inputs."""
+
+    workspace_folder: str
+    label: str  # "<parameter file>#<index>"
+    rule: FindReplaceRule
+    files: int = 0
+    matches: int = 0
+    corpus_ms: float = 0.0
+    slowest_file_ms: float = 0.0
+    worst_case_ms: float = 0.0  # slowest adversarial input (0 for literal rules)
+    worst_case_chars: int = 0
+    findings: list[str] = field(default_factory=list)  # static findings (pattern_warnings)
+    warnings: list[str] = field(default_factory=list)  # timing findings
+
+    @property
+    def max_ms(self) -> float:
+        """Slowest single search, on the corpus or an adversarial input."""
+        return max(self.slowest_file_ms, self.worst_case_ms)
+
+    def failed(self, budget_ms: float) -> bool:
+        """True if the rule has a static finding or a search exceeded the budget."""
+        return bool(self.findings) or self.max_ms > budget_ms
+
+
+def pattern_warnings(pattern: str) -> list[str]:
+    """Return static findings for regex shapes prone to catastrophic backtracking."""
+    try:
+        parsed = sre_parser.parse(pattern)
+    except re.error as e:
+        return [f"does not compile: {e}"]
+
+    warnings: set[str] = set()
+
+    def walk(items: Iterable, inside_unbounded: bool) -> None:
+        for op, av in items:
+            if op in _REPEATS:
+                low, high, sub = av
+                if inside_unbounded and low != high:
+                    warnings.add("nested quantifier")
+                walk(sub, inside_unbounded or high == sre_constants.MAXREPEAT)
+            elif op is sre_constants.BRANCH:
+                if inside_unbounded:
+                    warnings.add("alternation inside an unbounded quantifier")
+                for alternative in av[1]:
+                    walk(alternative, inside_unbounded)
+            elif op is sre_constants.SUBPATTERN:
+                walk(av[-1], inside_unbounded)
+            elif op in (sre_constants.ASSERT, sre_constants.ASSERT_NOT):
+                walk(av[1], inside_unbounded)
+            # Possessive quantifiers and atomic groups cannot backtrack and are not descended into
+
+    walk(parsed, inside_unbounded=False)
+    return sorted(warnings)
+
+
+def _representative_chars(pattern: str) -> tuple[str, list[str]]:
+    """Return the pattern's literal prefix and one character for each literal/class it contains."""
+    chars: list[str] = []
+    prefix: list[str] = []
+    prefix_open = True
+
+    def char_for(op: object, av: object) -> str | None:
+        if op is sre_constants.LITERAL:
+            return chr(av)  # type: ignore[arg-type]
+        if op is sre_constants.ANY:
+            return "a"
+        if op is sre_constants.IN:
+            for class_op, class_av in av:  # type: ignore[attr-defined]
+                if class_op is sre_constants.LITERAL:
+                    return chr(class_av)
+                if class_op is sre_constants.RANGE:
+                    return chr(class_av[0])
+                if class_op is sre_constants.CATEGORY and class_av in _CATEGORY_CHARS:
+                    return _CATEGORY_CHARS[class_av]
+        return None
+
+    def walk(items: Iterable, top_level: bool) -> None:
+        nonlocal prefix_open
+        for op, av in items:
+            char = char_for(op, av)
+            if char is not None:
+                if char not in chars:
+                    chars.append(char)
+                if top_level and prefix_open and op is sre_constants.LITERAL:
+                    prefix.append(char)
+                    continue
+            elif op in _REPEATS:
+                walk(av[2], False)
+            elif op is sre_constants.BRANCH:
+                for alternative in av[1]:
+                    walk(alternative, False)
+            elif op is sre_constants.SUBPATTERN:
+                walk(av[-1], False)
+            elif op in (sre_constants.ASSERT, sre_constants.ASSERT_NOT):
+                walk(av[1], False)
+            if top_level and op is not sre_constants.AT:
+                prefix_open = False
+
+    try:
+        walk(sre_parser.parse(pattern), top_level=True)
+    except re.error:
+        pass
+    return "".join(prefix), chars or ["a"]
+
+
+def adversarial_inputs(pattern: str, length: int) -> list[str]:
+    """Build near-miss inputs of about ``length`` characters for a regex pattern."""
+    prefix, chars = _representative_chars(pattern)
+    cycle = "".join(chars)
+    inputs = [(cycle * (length // len(cycle) + 1))[:length] + MISMATCH_CHAR]
+    for char in chars:
+        inputs.append(char * length + MISMATCH_CHAR)
+        if prefix:
+            inputs.append(prefix + char * length + MISMATCH_CHAR)
+    return inputs
+
+
+def time_search(rule: FindReplaceRule, text: str) -> tuple[float, int]:
+    """Return (milliseconds, match count) for applying a rule to the whole text."""
+    started = time.perf_counter()
+    if rule.is_regex:
+        matches = sum(1 for _ in rule.compiled.finditer(text)) if rule.compiled is not None else 0
+    else:
+        matches = text.count(rule.find_value)
+    return (time.perf_counter() - started) * 1000, matches
+
+
+def worst_case(rule: FindReplaceRule, budget_ms: float) -> tuple[float, int, bool]:
+    """Search adversarial inputs of growing length until the budget is exceeded.
+
+    Returns:
+        (slowest search in ms, length of that input, True if matching grew super-linearly)
+    """
+    if not rule.is_regex or rule.compiled is None:
+        return 0.0, 0, False
+
+    worst_ms, worst_chars = 0.0, 0
+    per_length: list[float] = []
+    for length in ADVERSARIAL_LENGTHS:
+        slowest = 0.0
+        for text in adversarial_inputs(rule.find_value, length):
+            elapsed, _ = time_search(rule, text)
+            slowest = max(slowest, elapsed)
+            if elapsed > worst_ms:
+                worst_ms, worst_chars = elapsed, len(text)
+        per_length.append(slowest)
+        if worst_ms > budget_ms:
+            break  # longer inputs would only take longer (and may never finish)
+
+    superlinear = (
+        len(per_length) >= 2
+        and per_length[-1] >= SUPERLINEAR_MIN_MS
+        and per_length[-1] > SUPERLINEAR_GROWTH_FACTOR * max(per_length[-2], 1e-6)
+    )
+    return worst_ms, worst_chars, superlinear
+
+
+def _read_corpus(workspace_dir: Path, files: Iterable[str]) -> dict[str, str]:
+    corpus: dict[str, str] = {}
+    for relative in files:
+        try:
+            corpus[relative] = (workspace_dir / relative).read_text(encoding="utf-8")
+        except (OSError, UnicodeDecodeError):
+            continue  # binary or unreadable files are never parameterized
+    return corpus
+
+
+def profile_workspace(
+    workspace: WorkspaceModel,
+    workspaces_dir: Path,
+    budget_ms: float,
+    _worst_cases: dict[str, tuple[float, int, bool]] | None = None,
+) -> list[RuleProfile]:
+    """Profile every rule of a workspace against its files and adversarial inputs.
+
+    Args:
+        workspace: Workspace model (rules and file list)
+        workspaces_dir: Root directory containing workspace folders
+        budget_ms: Slowest acceptable single search; adversarial lengths stop growing past it
+        _worst_cases: Memo of adversarial results per pattern, shared across workspaces
+    """
+    worst_cases = {} if _worst_cases is None else _worst_cases
+    corpus = _read_corpus(workspaces_dir / workspace.folder, workspace.files)
+    item_types = {relative: item.item_type for item in workspace.items for relative in item.files}
+    profiles: list[RuleProfile] = []
+    for rule, label in zip(workspace.rules, rule_labels(workspace.rules), strict=True):
+        profile = RuleProfile(workspace.folder, label, rule)
+
+        for relative, text in corpus.items():
+            if not rule.applies_to(item_types.get(relative, "Unknown"), Path(relative)):
+                continue
+            elapsed, matches = time_search(rule, text)
+            profile.files += 1
+            profile.matches += matches
+            profile.corpus_ms += elapsed
+            profile.slowest_file_ms = max(profile.slowest_file_ms, elapsed)
+
+        if rule.is_regex:
+            if rule.find_value not in worst_cases:
+                worst_cases[rule.find_value] = worst_case(rule, budget_ms)
+            profile.worst_case_ms, profile.worst_case_chars, superlinear = worst_cases[rule.find_value]
+            profile.findings = pattern_warnings(rule.find_value)
+            if superlinear:
+                profile.warnings.append("super-linear worst case")
+        if profile.max_ms > budget_ms:
+            profile.warnings.append(f"over budget ({profile.max_ms:.1f} ms > {budget_ms:g} ms)")
+        profiles.append(profile)
+    return profiles
+
+
+def run_profile_rules(
+    workspaces_dir: Path,
+    model: RepositoryModel,
+    budget_ms: float = RULE_PROFILE_BUDGET_MS,
+    workspace_filter: str | None = None,
+) -> int:
+    """Time every find_replace rule on the workspace files and on adversarial inputs.
+
+    Returns:
+        EXIT_SUCCESS, or EXIT_FAILURE if a rule has a static finding (nested quantifier,
+        alternation inside an unbounded quantifier, no compile) or its slowest search
+        exceeds the budget
+    """
+    workspaces = select_workspaces(workspaces_dir, model, workspace_filter)
+    if workspaces is None:
+        return EXIT_FAILURE
+
+    logger.info(SEPARATOR_LONG)
+    logger.info(f"PARAMETER RULE PROFILE (budget {budget_ms:g} ms per search)")
+    logger.info(SEPARATOR_LONG)
+
+    worst_cases: dict[str, tuple[float, int, bool]] = {}
+    failed: list[RuleProfile] = []
+    for workspace in workspaces:
+        with log_context(workspace=workspace.folder, phase="profile-rules"):
+            profiles = profile_workspace(workspace, workspaces_dir, budget_ms, worst_cases)
+        _log_rule_profiles(workspace.folder, profiles)
+        failed.extend(p for p in profiles if p.failed(budget_ms))
+
+    logger.info(f"\n{SEPARATOR_LONG}")
+    if failed:
+        for profile in failed:
+            reasons = [*profile.findings, *([f"{profile.max_ms:.1f} ms"] if profile.max_ms > budget_ms else [])]
+            logger.error(
+                f"[FAIL] {profile.workspace_folder} {profile.label}: {', '.join(reasons)} "
+                f"(pattern: {profile.rule.find_value})"
+            )
+        return EXIT_FAILURE
+    logger.info(f"[OK] Every rule is free of backtracking shapes and searches within {budget_ms:g} ms")
+    return EXIT_SUCCESS
+
+
+def _log_rule_profiles(folder: str, profiles: list[RuleProfile]) -> None:
+    """Log one workspace's rule profiles, most expensive first."""
+    logger.info(SEPARATOR_SHORT)
+    logger.info(f"Workspace: {folder} ({len(profiles)} rule(s))")
+    if not profiles:
+        return
+    label_width = max(len(p.label) for p in profiles)
+    logger.info(f"  {'Rule':<{label_width}}  Kind     Files  Matches  Corpus ms  Worst ms  Pattern")
+    for p in sorted(profiles, key=lambda p: (-p.max_ms, p.label)):
+        kind = "regex" if p.rule.is_regex else "literal"
+        pattern = p.rule.find_value if len(p.rule.find_value) <= 48 else p.rule.find_value[:45] + "..."
+        logger.info(
+            f"  {p.label:<{label_width}}  {kind:<7}  {p.files:>5}  {p.matches:>7}  "
+            f"{p.corpus_ms:>9.2f}  {p.max_ms:>8.2f}  {pattern}"
+        )
+        for finding in p.findings:
+            logger.error(f"    [FAIL] {finding}")
+        for warning in p.warnings:
+            logger.warning(f"    [WARN] {warning}")
@@ -0,0 +1,133 @@
+"""Longest-processing-time-first (LPT) ordering of workspace deployments.
+
+Workspaces are deployed in order of predicted duration, longest first, so that
+with a pool of workers the long deployments start early and the run does not
+end with one long workspace deploying alone. LPT keeps the makespan within
+4/3 of the optimum.
+
+Predictions use the median of a workspace's recent successful deploys from the
+deployment history (see history.py). Workspaces without history are estimated
+from their item count and definition bytes. When some workspaces have history,
+the estimates are scaled by the median ratio of actual to estimated duration
+of those workspaces, so the two kinds of prediction are comparable.
+
+For CI matrices, partition_workspaces() splits the workspaces into
+deterministic, size-balanced shards.
+"""
+
+import heapq
+import statistics
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from pathlib import Path
+
+from ..common.logger import get_logger
+from .config import (
+    HISTORY_BASELINE_WINDOW,
+    HISTORY_DATABASE_FILE,
+    SCHEDULE_BASE_SECONDS,
+    SCHEDULE_SECONDS_PER_ITEM,
+    SCHEDULE_SECONDS_PER_MB,
+)
+from .workspace_model import RepositoryModel, WorkspaceModel
+
+logger = get_logger(__name__)
+
+# Prediction sources
+FROM_HISTORY = "history"
+FROM_ESTIMATE = "estimate"
+
+
+@dataclass(frozen=True)
+class WorkspacePrediction:
+    """Predicted deploy duration of one workspace."""
+
+    folder: str
+    seconds: float
+    source: str  # FROM_HISTORY or FROM_ESTIMATE
+
+
+def estimate_seconds(workspace: WorkspaceModel | None) -> float:
+    """Estimate a deploy duration from item count and definition bytes."""
+    if workspace is None:
+        return SCHEDULE_BASE_SECONDS
+    definition_mb = sum(item.definition_bytes for item in workspace.items) / 1_000_000
+    items_cost = SCHEDULE_SECONDS_PER_ITEM * len(workspace.items)
+    return SCHEDULE_BASE_SECONDS + items_cost + SCHEDULE_SECONDS_PER_MB * definition_mb
+
+
+def load_historical_durations(
+    environment: str, database: str | Path = HISTORY_DATABASE_FILE, window: int = HISTORY_BASELINE_WINDOW
+) -> dict[str, list[float]]:
+    """Return recent deploy durations per workspace from the history store.
+
+    A missing or unreadable database yields no history; scheduling then falls
+    back to estimates.
+    """
+    if not Path(database).exists():
+        return {}
+
+    import sqlite3  # deferred with the history store: only needed when a database exists
+
+    from .history import HistoryStore
+
+    try:
+        with HistoryStore(database) as store:
+            return store.deploy_durations(environment, window)
+    except sqlite3.Error as e:
+        logger.warning(f"[WARN] Cannot read deployment history {database}: {e!s}")
+        return {}
+
+
+def predict_durations(
+    workspace_folders: Iterable[str],
+    model: RepositoryModel | None,
+    history: Mapping[str, list[float]],
+) -> list[WorkspacePrediction]:
+    """Predict the deploy duration of every workspace (history median, else calibrated estimate)."""
+    folders = list(workspace_folders)
+    workspaces = {workspace.folder: workspace for workspace in model.workspaces} if model is not None else {}
+    estimates = {folder: estimate_seconds(workspaces.get(folder)) for folder in folders}
+
+    # Calibrate estimates against workspaces whose actual durations are known
+    ratios = [statistics.median(history[f]) / estimates[f] for f in folders if history.get(f)]
+    scale = statistics.median(ratios) if ratios else 1.0
+
+    predictions = []
+    for folder in folders:
+        if history.get(folder):
+            predictions.append(WorkspacePrediction(folder, statistics.median(history[folder]), FROM_HISTORY))
+        else:
+            predictions.append(WorkspacePrediction(folder, estimates[folder] * scale, FROM_ESTIMATE))
+    return predictions
+
+
+def lpt_order(predictions: Iterable[WorkspacePrediction]) -> list[WorkspacePrediction]:
+    """Order predictions longest first (ties by folder name, so the order is deterministic)."""
+    return sorted(predictions, key=lambda p: (-p.seconds, p.folder))
+
+
+def simulate_makespan(durations: Iterable[float], max_workers: int) -> float:
+    """Return the makespan of list-scheduling ``durations`` in order onto ``max_workers`` workers."""
+    workers = [0.0] * max(max_workers, 1)
+    for duration in durations:
+        heapq.heapreplace(workers, workers[0] + duration)
+    return max(workers)
+
+
+def partition_workspaces(
+    workspace_folders: Iterable[str], model: RepositoryModel | None, shard_count: int
+) -> list[list[str]]:
+    """Split workspaces into ``shard_count`` size-balanced groups, each in LPT order.
+
+    Only model-based estimates are used, not the deployment history: every CI
+    shard must compute the same partition from the same commit, and each runner
+    may have restored a different history.
+    """
+    shards: list[list[str]] = [[] for _ in range(shard_count)]
+    loads = [(0.0, index) for index in range(shard_count)]
+    for prediction in lpt_order(predict_durations(workspace_folders, model, {})):
+        load, index = heapq.heappop(loads)
+        shards[index].append(prediction.folder)
+        heapq.heappush(loads, (load + prediction.seconds, index))
+    return shards
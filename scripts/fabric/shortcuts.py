@@ -0,0 +1,272 @@
+"""Generation of OneLake shortcuts from the bronze table inventory.
+
+Silver and gold expose dimensions that need no transformation as OneLake
+shortcuts to the bronze tables instead of copying them, so no data is
+duplicated and no copy runs. The inventory is the set of tables the CopyJobs
+write to the source lakehouse (CopyJob destination schema/table); the tables a
+target lakehouse exposes are chosen by ``schema.table`` patterns::
+
+    lakehouse_silver: [dbo.dimension_*]
+
+Shortcuts are written to the target's ``shortcuts.metadata.json`` with the
+source lakehouse's logicalId and the placeholder workspace GUID, which the
+Lakehouse find_replace rules rewrite per environment. Shortcuts to source
+tables matching the target's patterns are owned by the generator: they are
+rewritten in place and dropped once the table leaves the inventory. Every
+other shortcut in the file is kept as is, including hand-made shortcuts to
+source tables outside the patterns (gold's ``dbo.fact_sale``).
+"""
+
+import fnmatch
+import json
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from ..common.logger import get_logger
+from .config import (
+    EXIT_FAILURE,
+    PROMOTION_ORDER,
+    SHORTCUT_COPY_MB_PER_SECOND,
+    SHORTCUT_SOURCE_LAKEHOUSE,
+    SHORTCUT_TABLES,
+    SHORTCUTS_FILE,
+)
+from .copyjob_lint import TableSizes, load_table_sizes, table_size
+from .maintenance import lakehouse_tables
+from .notebooks import PLACEHOLDER_WORKSPACE_ID, GeneratedFiles, run_generator
+from .pipeline_analysis import format_seconds
+from .workspace_model import RepositoryModel, WorkspaceModel
+
+logger = get_logger(__name__)
+
+TABLES_FOLDER = "Tables"
+BYTES_PER_MB = 1024 * 1024
+
+
+@dataclass
+class ShortcutPlan:
+    """The shortcuts one target lakehouse gets."""
+
+    lakehouse: str
+    path: str  # shortcuts.metadata.json relative to the workspace folder
+    tables: list[str] = field(default_factory=list)  # "schema.table" exposed from the source
+    content: list[dict[str, Any]] = field(default_factory=list)  # full file content after generation
+    text: str = ""  # rendered file
+
+
+@dataclass(frozen=True)
+class AvoidedCopy:
+    """Storage and copy time the shortcuts avoid in one environment."""
+
+    environment: str
+    bytes: int
+    seconds: float
+    unsized: tuple[str, ...]  # tables without a known size (not counted)
+
+
+def parse_targets(values: list[str]) -> dict[str, tuple[str, ...]]:
+    """Parse ``lakehouse=pattern,pattern`` options into target lakehouse -> table patterns.
+
+    Raises:
+        ValueError: If an option has no lakehouse or no patterns
+    """
+    targets: dict[str, tuple[str, ...]] = {}
+    for value in values:
+        lakehouse, _, patterns = value.partition("=")
+        names = tuple(p.strip() for p in patterns.split(",") if p.strip())
+        if not lakehouse.strip() or not names:
+            raise ValueError(f"expected lakehouse=pattern[,pattern...], got '{value}'")
+        targets[lakehouse.strip()] = names
+    return targets
+
+
+def shortcut_definition(table: str, source_id: str) -> dict[str, Any]:
+    """Return the OneLake shortcut exposing a source lakehouse table under the same schema and name."""
+    schema, _, name = table.rpartition(".")
+    folder = f"{TABLES_FOLDER}/{schema}" if schema else TABLES_FOLDER
+    return {
+        "name": name,
+        "path": f"/{folder}",
+        "target": {
+            "type": "OneLake",
+            "oneLake": {
+                "path": f"{folder}/{name}",
+                "itemId": source_id,
+                "workspaceId": PLACEHOLDER_WORKSPACE_ID,
+                "artifactType": "Lakehouse",
+            },
+        },
+    }
+
+
+def _targets_source(shortcut: Any, source_id: str) -> bool:
+    target = shortcut.get("target", {}).get("oneLake", {}) if isinstance(shortcut, dict) else {}
+    path = str(target.get("path", ""))
+    return str(target.get("itemId", "")).lower() == source_id.lower() and path.startswith(f"{TABLES_FOLDER}/")
+
+
+def _shortcut_table(shortcut: Any) -> str | None:
+    """Return the ``schema.table`` a shortcut exposes under Tables/, or None for other shortcuts."""
+    if not isinstance(shortcut, dict) or not shortcut.get("name"):
+        return None
+    folder = str(shortcut.get("path", "")).strip("/")
+    if folder != TABLES_FOLDER and not folder.startswith(f"{TABLES_FOLDER}/"):
+        return None
+    schema = folder.removeprefix(TABLES_FOLDER).strip("/")
+    return f"{schema}.{shortcut['name']}" if schema else str(shortcut["name"])
+
+
+def _lakehouse_item(workspace: WorkspaceModel, name: str) -> Any:
+    for item in workspace.items:
+        if item.item_type == "Lakehouse" and item.display_name == name:
+            return item
+    raise KeyError(f"No Lakehouse '{name}' in workspace '{workspace.folder}'")
+
+
+def _read_shortcuts(workspace: WorkspaceModel, workspaces_dir: Path, lakehouse_name: str) -> tuple[str, str, list]:
+    """Return a lakehouse's shortcuts file (relative to the workspace folder), its text and its shortcuts."""
+    relative = f"{_lakehouse_item(workspace, lakehouse_name).path}/{SHORTCUTS_FILE}"
+    target = workspaces_dir / workspace.folder / relative
+    text = target.read_text(encoding="utf-8-sig") if target.is_file() else "[]"
+    existing = json.loads(text or "[]")
+    if not isinstance(existing, list):
+        raise ValueError(f"{relative}: expected a JSON list of shortcuts")
+    return relative, text, existing
+
+
+def plan_shortcuts(
+    workspace: WorkspaceModel,
+    workspaces_dir: Path,
+    source_lakehouse: str,
+    targets: Mapping[str, Iterable[str]],
+) -> list[ShortcutPlan]:
+    """Plan the shortcuts of every target lakehouse (nothing is written).
+
+    Raises:
+        KeyError: If the source or a target lakehouse is missing
+        ValueError: If a target's shortcuts.metadata.json is not a JSON list
+    """
+    source = _lakehouse_item(workspace, source_lakehouse)
+    inventory = lakehouse_tables(workspace, workspaces_dir, source_lakehouse)
+    plans = []
+    for name, patterns in targets.items():
+        relative, text, existing = _read_shortcuts(workspace, workspaces_dir, name)
+        selected = tuple(patterns)
+        generated = {
+            t: shortcut_definition(t, source.logical_id)
+            for t in inventory
+            if any(fnmatch.fnmatchcase(t, p) for p in selected)
+        }
+        content: list[Any] = []
+        exposed: list[str] = []
+        for shortcut in existing:
+            table = _shortcut_table(shortcut)
+            owned = table is not None and any(fnmatch.fnmatchcase(table, p) for p in selected)
+            if not (owned and _targets_source(shortcut, source.logical_id)):
+                content.append(shortcut)
+            elif table in generated and table not in exposed:  # rewritten in place, keeping the file order
+                content.append(generated[table])
+                exposed.append(table)
+        # New tables are appended; hand-made shortcuts with the same path and name win
+        taken = {(s.get("path"), s.get("name")) for s in content if isinstance(s, dict)}
+        for table, shortcut in generated.items():
+            if table not in exposed and (shortcut["path"], shortcut["name"]) not in taken:
+                content.append(shortcut)
+                exposed.append(table)
+        rendered = json.dumps(content, indent=2) if content else "[]"
+        plans.append(
+            ShortcutPlan(name, relative, exposed, content, rendered + ("\n" if text.endswith("\n") else ""))
+        )
+    return plans
+
+
+def shortcut_tables(workspace: WorkspaceModel, workspaces_dir: Path, lakehouse_name: str) -> list[str]:
+    """Return the tables a lakehouse exposes as shortcuts (``schema.table``), sorted.
+
+    Raises:
+        KeyError: If the lakehouse is missing
+        ValueError: If its shortcuts.metadata.json is not a JSON list
+    """
+    _, _, existing = _read_shortcuts(workspace, workspaces_dir, lakehouse_name)
+    return sorted({table for shortcut in existing if (table := _shortcut_table(shortcut)) is not None})
+
+
+def avoided_copies(tables: Iterable[str], sizes: TableSizes) -> list[AvoidedCopy]:
+    """Return per environment the bytes and copy time the shortcut tables would otherwise cost."""
+    tables = list(tables)
+    avoided = []
+    for environment in PROMOTION_ORDER:
+        known = {t: size for t in tables if (size := table_size(sizes, t, environment)) is not None}
+        megabytes = sum(known.values())
+        avoided.append(
+            AvoidedCopy(
+                environment=environment,
+                bytes=int(megabytes * BYTES_PER_MB),
+                seconds=megabytes / SHORTCUT_COPY_MB_PER_SECOND,
+                unsized=tuple(t for t in tables if t not in known),
+            )
+        )
+    return avoided
+
+
+def format_bytes(count: int) -> str:
+    """Format a byte count with a binary unit (``1.5 GiB``)."""
+    value = float(count)
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if value < 1024:
+            return f"{value:.0f} {unit}" if unit == "B" else f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.1f} TiB"
+
+
+def run_generate_shortcuts(
+    workspaces_dir: Path,
+    model: RepositoryModel,
+    source_lakehouse: str = SHORTCUT_SOURCE_LAKEHOUSE,
+    targets: list[str] | None = None,
+    sizes_file: str | None = None,
+    check: bool = False,
+    workspace_filter: str | None = None,
+) -> int:
+    """Write OneLake shortcuts to source lakehouse tables into the target lakehouses.
+
+    Targets default to SHORTCUT_TABLES. The storage and copy time the shortcuts
+    avoid is reported per environment for tables with a known size.
+
+    Returns:
+        EXIT_SUCCESS, or EXIT_FAILURE on invalid options, no matching workspace, or drift with ``check``
+    """
+    try:
+        patterns = parse_targets(targets) if targets else SHORTCUT_TABLES
+        sizes = load_table_sizes(sizes_file) if sizes_file else {}
+    except (OSError, ValueError) as e:
+        logger.error(f"ERROR: Invalid shortcut options: {e!s}")
+        return EXIT_FAILURE
+
+    def build(workspace: WorkspaceModel) -> GeneratedFiles:
+        plans = plan_shortcuts(workspace, workspaces_dir, source_lakehouse, patterns)
+        details = []
+        for plan in plans:
+            details.append(f"{plan.lakehouse}: {len(plan.tables)} shortcut(s) to {source_lakehouse}")
+            details.extend(f"  {table}" for table in plan.tables)
+        exposed = [table for plan in plans for table in plan.tables]  # every target would hold its own copy
+        for avoided in avoided_copies(exposed, sizes):
+            unsized = f" ({len(avoided.unsized)} shortcut(s) without a table size)" if avoided.unsized else ""
+            details.append(
+                f"Avoided in {avoided.environment}: {format_bytes(avoided.bytes)} duplicated storage, "
+                f"{format_seconds(avoided.seconds)} copy time per load{unsized}"
+            )
+        return GeneratedFiles({plan.path: plan.text for plan in plans}, details)
+
+    return run_generator(
+        workspaces_dir,
+        model,
+        workspace_filter,
+        "ONELAKE SHORTCUTS",
+        "generate-shortcuts",
+        source_lakehouse,
+        build,
+        check,
+    )
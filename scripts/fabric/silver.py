@@ -0,0 +1,369 @@
+"""Generation of silver MERGE notebooks that upsert bronze tables incrementally.
+
+A per-table spec (``silver_tables.yml`` in the workspace folder, or a YAML
+file with the same shape given with ``--spec``) names, for each bronze table
+written by a CopyJob, its business keys and optionally the columns whose
+change makes a row changed, the silver partition column and a column ordering
+duplicate keys::
+
+    dbo.fact_sale:                     # "schema.table" in the bronze lakehouse
+      key_columns: [SaleKey]
+      change_columns: [Quantity, UnitPrice]   # optional, default: every non-key column
+      partition_column: InvoiceDateKey        # optional, must not change for a key
+      order_column: LastEditedWhen            # optional, the latest row per key wins
+
+Every table gets its own notebook under ``<layer>/transformations``, attached
+to the silver lakehouse through the usual ``# META`` header (parameterized by
+the silver default_lakehouse rules). The CopyJobs do not enable the change
+data feed on bronze, so every refresh enables it on its source table when
+missing. A refresh then reads the bronze rows written since the bronze
+version of the last refresh from the feed. It falls back to the whole bronze
+snapshot on the first run, with ``full_refresh`` or a changed spec, on the
+run that enables the feed, and when the feed no longer covers the versions
+since the last refresh (vacuumed, or the table recreated). It keeps the latest
+row per key and hashes the change columns. Rows whose key and hash already
+exist in silver are dropped, reading only the partitions the batch touches.
+The remaining rows are upserted with a MERGE whose condition is pruned to
+those partitions, so the rewrite scales with the change volume rather than
+the table size. Silver tables enable the change data feed so downstream
+gold aggregates refresh incrementally. Rows deleted from bronze are kept.
+Any change to a table's spec triggers a full re-read of bronze, except a
+changed partition column: the refresh fails until the silver table is dropped.
+
+Tables the silver lakehouse already exposes as OneLake shortcuts are not
+copied, so they cannot get a notebook.
+"""
+
+import json
+from collections.abc import Mapping
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+from ..common.logger import get_logger
+from .aggregates import column_name, table_name
+from .config import (
+    EXIT_FAILURE,
+    SILVER_LAKEHOUSE,
+    SILVER_LAYER_FOLDER,
+    SILVER_SOURCE_LAKEHOUSE,
+    SILVER_SPEC_FILE,
+)
+from .maintenance import lakehouse_tables
+from .notebooks import (
+    DefaultLakehouse,
+    GeneratedFiles,
+    NotebookCell,
+    lakehouse_dev_id,
+    notebook_files,
+    run_generator,
+)
+from .shortcuts import shortcut_tables
+from .workspace_model import PLATFORM_FILE, RepositoryModel, WorkspaceModel
+
+logger = get_logger(__name__)
+
+TRANSFORMATIONS_FOLDER = "transformations"
+NOTEBOOK_PREFIX = "nb_merge_"
+
+MERGE_CODE = '''
+import hashlib
+import json
+from functools import reduce
+
+from delta.tables import DeltaTable
+from pyspark.sql import Window
+from pyspark.sql import functions as F
+from pyspark.sql.utils import AnalysisException
+
+VERSION_PROPERTY = "silver.source_version"
+DEFINITION_PROPERTY = "silver.definition"
+HASH_COLUMN = "_row_hash"
+FEED_COLUMNS = ("_change_type", "_commit_version", "_commit_timestamp")
+
+keys = json.loads(key_columns)
+spec = [source_table, key_columns, change_columns, partition_column, order_column]
+definition = hashlib.sha256(json.dumps(spec).encode()).hexdigest()[:16]
+
+
+def properties_of(table):
+    return {row["key"]: row["value"] for row in spark.sql(f"SHOW TBLPROPERTIES {table}").collect()}
+
+
+def all_of(conditions):
+    return reduce(lambda left, right: left & right, conditions)
+
+
+def in_partitions(column, values):
+    # Literal partition values let Delta prune files and partitions
+    present = [value for value in values if value is not None]
+    condition = F.col(column).isin(present)
+    return condition | F.col(column).isNull() if len(present) < len(values) else condition
+
+
+# The CopyJobs writing bronze do not enable the change data feed: enable it here, before reading the
+# version, so the feed covers every bronze commit after this refresh
+feed_enabled = properties_of(source_table).get("delta.enableChangeDataFeed", "false").lower() == "true"
+if not feed_enabled:
+    spark.sql(f"ALTER TABLE {source_table} SET TBLPROPERTIES ('delta.enableChangeDataFeed' = 'true')")
+    print(f"Enabled the change data feed on {source_table}")
+
+version = spark.sql(f"DESCRIBE HISTORY {source_table} LIMIT 1").first()["version"]
+exists = spark.catalog.tableExists(target_table)
+target = properties_of(target_table) if exists else {}
+if exists:
+    partitioning = list(spark.sql(f"DESCRIBE DETAIL {target_table}").first()["partitionColumns"])
+    if partitioning != ([partition_column] if partition_column else []):
+        raise ValueError(
+            f"{target_table} is partitioned by {partitioning or 'nothing'} but partition_column is "
+            f"{partition_column or 'empty'}: drop {target_table} to rebuild it with the new partitioning"
+        )
+
+incoming = None  # bronze rows to upsert; None reads the whole snapshot
+if not exists or full_refresh or VERSION_PROPERTY not in target or target.get(DEFINITION_PROPERTY) != definition:
+    print(f"Reading all of {source_table}: first run, changed definition or full_refresh")
+elif not feed_enabled:
+    print(f"Reading all of {source_table}: change data feed enabled on this run")
+elif int(target[VERSION_PROPERTY]) >= version:
+    incoming = spark.table(source_table).limit(0)
+else:
+    try:
+        incoming = (
+            spark.read.option("readChangeFeed", "true")
+            .option("startingVersion", int(target[VERSION_PROPERTY]) + 1)
+            .option("endingVersion", version)
+            .table(source_table)
+            .where(F.col("_change_type").isin("insert", "update_postimage"))
+        )
+    except AnalysisException as error:  # versions vacuumed, or the table was recreated without the feed
+        print(f"Reading all of {source_table}: {error}")
+if incoming is None:
+    incoming = spark.sql(f"SELECT * FROM {source_table} VERSION AS OF {version}")
+
+columns = [c for c in incoming.columns if c not in FEED_COLUMNS]
+compared = json.loads(change_columns) or [c for c in columns if c not in keys]
+order = [F.col("_commit_version").desc()] if "_commit_version" in incoming.columns else []
+order += [F.col(order_column).desc()] if order_column else []
+latest = Window.partitionBy(*keys).orderBy(*order, F.col(HASH_COLUMN).desc())
+rows = (
+    incoming.withColumn(HASH_COLUMN, F.sha2(F.to_json(F.struct(*compared)), 256))
+    .withColumn("_latest", F.row_number().over(latest))
+    .where("_latest = 1")
+    .select(*columns, HASH_COLUMN)
+)
+
+if not exists:
+    writer = rows.write.format("delta")
+    (writer.partitionBy(partition_column) if partition_column else writer).saveAsTable(target_table)
+    print(f"Created {target_table} from {source_table} version {version}")
+else:
+    silver = DeltaTable.forName(spark, target_table)
+    current = silver.toDF()
+    if partition_column:
+        touched = [row[0] for row in rows.select(partition_column).distinct().collect()]
+        current = current.where(in_partitions(partition_column, touched))
+    # Unchanged rows (same key and hash) never reach the MERGE
+    changed = rows.join(current.select(*keys, HASH_COLUMN), [*keys, HASH_COLUMN], "left_anti").persist()
+    condition = all_of([F.col(f"target.{key}") == F.col(f"source.{key}") for key in keys])
+    if partition_column:
+        values = [row[0] for row in changed.select(partition_column).distinct().collect()]
+        condition = condition & in_partitions(f"target.{partition_column}", values)
+    if changed.take(1):
+        merge = silver.alias("target").merge(changed.alias("source"), condition)
+        merge.whenMatchedUpdateAll().whenNotMatchedInsertAll().execute()
+        metrics = silver.history(1).first()["operationMetrics"]
+        print(
+            f"Merged {source_table} version {version} into {target_table}: "
+            f"{metrics.get('numTargetRowsUpdated')} updated, {metrics.get('numTargetRowsInserted')} inserted"
+        )
+    else:
+        print(f"{target_table} is up to date with {source_table} version {version}")
+    changed.unpersist()
+
+if target.get(VERSION_PROPERTY) != str(version) or target.get(DEFINITION_PROPERTY) != definition:
+    spark.sql(
+        f"ALTER TABLE {target_table} SET TBLPROPERTIES ('delta.enableChangeDataFeed' = 'true', "
+        f"'{VERSION_PROPERTY}' = '{version}', '{DEFINITION_PROPERTY}' = '{definition}')"
+    )
+'''
+
+
+@dataclass(frozen=True)
+class SilverTable:
+    """How one bronze table is upserted into silver."""
+
+    table: str  # "schema.table", the same in bronze and silver
+    key_columns: tuple[str, ...]
+    change_columns: tuple[str, ...] = ()  # empty: every non-key column
+    partition_column: str | None = None
+    order_column: str | None = None
+
+    @property
+    def notebook(self) -> str:
+        """Display name of the MERGE notebook."""
+        return f"{NOTEBOOK_PREFIX}{self.table.rpartition('.')[2]}"
+
+    def parameters(self, source_lakehouse: str) -> dict[str, Any]:
+        """Return notebook parameter name -> value."""
+        return {
+            "source_table": f"{source_lakehouse}.{self.table}",
+            "target_table": self.table,
+            "key_columns": json.dumps(list(self.key_columns)),
+            "change_columns": json.dumps(list(self.change_columns)),
+            "partition_column": self.partition_column or "",
+            "order_column": self.order_column or "",
+            "full_refresh": False,
+        }
+
+
+def _columns(value: Any, where: str) -> tuple[str, ...]:
+    values = [value] if isinstance(value, str) else value or []
+    if not isinstance(values, list):
+        raise ValueError(f"{where}: expected a column name or list of column names")
+    return tuple(column_name(v, where) for v in values)
+
+
+def parse_silver_tables(raw: Mapping[str, Any], where: str = "silver tables") -> list[SilverTable]:
+    """Parse a spec mapping of bronze table -> MERGE settings.
+
+    Raises:
+        ValueError: If an entry is malformed or two entries share a notebook
+    """
+    tables = []
+    for table, settings in raw.items():
+        at = f"{where}: {table}"
+        if not isinstance(settings, Mapping) or not settings.get("key_columns"):
+            raise ValueError(f"{at}: key_columns is required")
+        if "." not in str(table):
+            raise ValueError(f"{at}: expected 'schema.table'")
+        partition_column, order_column = settings.get("partition_column"), settings.get("order_column")
+        entry = SilverTable(
+            table=table_name(table, at),
+            key_columns=_columns(settings["key_columns"], f"{at} key_columns"),
+            change_columns=_columns(settings.get("change_columns"), f"{at} change_columns"),
+            partition_column=column_name(partition_column, f"{at} partition_column") if partition_column else None,
+            order_column=column_name(order_column, f"{at} order_column") if order_column else None,
+        )
+        overlap = sorted(set(entry.key_columns) & set(entry.change_columns))
+        if overlap:
+            raise ValueError(f"{at}: key column(s) {', '.join(overlap)} cannot also be change columns")
+        tables.append(entry)
+    notebooks = [t.notebook for t in tables]
+    clashes = sorted({n for n in notebooks if notebooks.count(n) > 1})
+    if clashes:
+        raise ValueError(f"{where}: tables share the notebook name(s) {', '.join(clashes)}")
+    return tables
+
+
+def load_silver_tables(path: str | Path) -> list[SilverTable]:
+    """Load the silver MERGE spec from YAML.
+
+    Raises:
+        ValueError: If the file is not a mapping or an entry is malformed
+    """
+    raw = yaml.safe_load(Path(path).read_text(encoding="utf-8")) or {}
+    if not isinstance(raw, dict):
+        raise ValueError(f"{path}: expected a mapping of bronze tables to MERGE settings")
+    return parse_silver_tables(raw, str(path))
+
+
+def merge_cells(table: SilverTable, source_lakehouse: str) -> list[NotebookCell]:
+    """Return the parameters and code cells of a table's MERGE notebook."""
+    parameters = "\n".join(f"{name} = {value!r}" for name, value in table.parameters(source_lakehouse).items())
+    return [NotebookCell(parameters, parameters=True), NotebookCell(MERGE_CODE)]
+
+
+def generate_silver(
+    workspace: WorkspaceModel,
+    workspaces_dir: Path,
+    layer_folder: str,
+    lakehouse_name: str,
+    source_lakehouse: str,
+    tables: list[SilverTable],
+) -> tuple[dict[str, str], list[str]]:
+    """Build the MERGE notebook items of every silver table.
+
+    Returns:
+        {workspace-relative path: content} of the generated files, and the
+        notebook items in the transformations folder no longer in the spec
+
+    Raises:
+        KeyError: If the workspace has no such lakehouse or source lakehouse
+        ValueError: If a table is not written by a CopyJob to the source or is a shortcut in the target
+    """
+    lakehouse = DefaultLakehouse(lakehouse_dev_id(workspace, lakehouse_name), lakehouse_name)
+    inventory = lakehouse_tables(workspace, workspaces_dir, source_lakehouse)
+    unknown = sorted(t.table for t in tables if t.table not in inventory)
+    if unknown:
+        raise ValueError(f"Table(s) not written by a CopyJob to {source_lakehouse}: {', '.join(unknown)}")
+    shortcuts = set(shortcut_tables(workspace, workspaces_dir, lakehouse_name))
+    exposed = sorted(t.table for t in tables if t.table in shortcuts)
+    if exposed:
+        raise ValueError(f"Table(s) already exposed in {lakehouse_name} as shortcuts: {', '.join(exposed)}")
+
+    folder = f"{layer_folder}/{TRANSFORMATIONS_FOLDER}"
+    files: dict[str, str] = {}
+    for table in tables:
+        item_path = f"{folder}/{table.notebook}.Notebook"
+        description = f"MERGE upsert of {source_lakehouse}.{table.table} into {lakehouse_name} (generated)"
+        cells = merge_cells(table, source_lakehouse)
+        files.update(notebook_files(workspace.folder, item_path, cells, lakehouse, description))
+    stale = sorted(
+        item.path
+        for item in workspace.items
+        if item.item_type == "Notebook"
+        and item.path.startswith(f"{folder}/{NOTEBOOK_PREFIX}")
+        and f"{item.path}/{PLATFORM_FILE}" not in files
+    )
+    return files, stale
+
+
+def run_generate_silver(
+    workspaces_dir: Path,
+    model: RepositoryModel,
+    spec_file: str | None = None,
+    layer_folder: str = SILVER_LAYER_FOLDER,
+    lakehouse: str = SILVER_LAKEHOUSE,
+    source_lakehouse: str = SILVER_SOURCE_LAKEHOUSE,
+    check: bool = False,
+    workspace_filter: str | None = None,
+) -> int:
+    """Generate the MERGE upsert notebooks of the silver tables.
+
+    The spec defaults to SILVER_SPEC_FILE in each workspace folder; a
+    workspace without one fails. Notebooks of tables removed from the spec are
+    reported, not deleted.
+
+    Returns:
+        EXIT_SUCCESS, or EXIT_FAILURE on an invalid spec, no matching workspace, or drift with ``check``
+    """
+    try:
+        shared_tables = load_silver_tables(spec_file) if spec_file else None
+    except (OSError, ValueError) as e:
+        logger.error(f"ERROR: Invalid silver spec: {e!s}")
+        return EXIT_FAILURE
+
+    def build(workspace: WorkspaceModel) -> GeneratedFiles:
+        tables = shared_tables
+        if tables is None:
+            tables = load_silver_tables(workspaces_dir / workspace.folder / SILVER_SPEC_FILE)
+        files, stale = generate_silver(workspace, workspaces_dir, layer_folder, lakehouse, source_lakehouse, tables)
+        details = [
+            f"{t.table}: keys {', '.join(t.key_columns)}"
+            + (f", partitioned by {t.partition_column}" if t.partition_column else "")
+            for t in tables
+        ]
+        return GeneratedFiles(files, details, stale)
+
+    return run_generator(
+        workspaces_dir,
+        model,
+        workspace_filter,
+        "SILVER MERGE NOTEBOOKS",
+        "generate-silver",
+        lakehouse,
+        build,
+        check,
+    )
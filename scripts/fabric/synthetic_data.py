@@ -0,0 +1,485 @@
+"""Synthetic Wide World Importers star-schema data for offline benchmarks.
+
+The bronze CopyJobs ingest ``dbo.<table>.parquet`` files of the Wide World
+Importers star schema (five dimensions and ``fact_sale``) from blob storage.
+This module writes files with the same names, columns and types, so the
+transformations of the later layers can be exercised at realistic scale
+without Fabric. Dimensions have the sample's fixed sizes; the fact table is
+scaled (1M to 1B rows by default) and generated, written and later read in
+chunks of SYNTHETIC_CHUNK_ROWS rows, so memory stays bounded at any scale.
+
+Fact rows reference existing dimension keys and carry their stock item's
+description, package, unit price and tax rate, so joins and aggregates behave
+like on the real data. The same seed and chunk size produce the same files.
+
+pyarrow and numpy are optional (``pip install .[benchmark]``) and imported
+only when data is generated; schemas and chunk plans need neither.
+"""
+
+import argparse
+import datetime
+import os
+import re
+import time
+from collections.abc import Mapping
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from ..common.logger import get_logger
+from .config import (
+    EXIT_FAILURE,
+    EXIT_SUCCESS,
+    SEPARATOR_LONG,
+    SYNTHETIC_CHUNK_ROWS,
+    SYNTHETIC_DIMENSION_ROWS,
+    SYNTHETIC_MAX_FACT_ROWS,
+    SYNTHETIC_SEED,
+)
+from .pipeline_analysis import format_seconds
+from .shortcuts import format_bytes
+
+logger = get_logger(__name__)
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+SOURCE_SCHEMA = "dbo"
+FACT_TABLE = "fact_sale"
+FIRST_DATE = datetime.date(2013, 1, 1)
+VALID_FROM = datetime.datetime(2013, 1, 1)
+VALID_TO = datetime.datetime(9999, 12, 31, 23, 59, 59)  # current row of a slowly changing dimension
+LINES_PER_INVOICE = 3
+
+_KEYS = (("ValidFrom", "timestamp"), ("ValidTo", "timestamp"), ("LineageKey", "int32"))
+
+# Table -> (column, type) in file order; types: int32, int64, string, bool, date32, timestamp, binary, decimal(p,s)
+STAR_SCHEMA: dict[str, tuple[tuple[str, str], ...]] = {
+    "dimension_city": (
+        ("CityKey", "int32"),
+        ("WWICityID", "int32"),
+        ("City", "string"),
+        ("StateProvince", "string"),
+        ("Country", "string"),
+        ("Continent", "string"),
+        ("SalesTerritory", "string"),
+        ("Region", "string"),
+        ("Subregion", "string"),
+        ("Location", "string"),
+        ("LatestRecordedPopulation", "int64"),
+        *_KEYS,
+    ),
+    "dimension_customer": (
+        ("CustomerKey", "int32"),
+        ("WWICustomerID", "int32"),
+        ("Customer", "string"),
+        ("BillToCustomer", "string"),
+        ("Category", "string"),
+        ("BuyingGroup", "string"),
+        ("PrimaryContact", "string"),
+        ("PostalCode", "string"),
+        *_KEYS,
+    ),
+    "dimension_date": (
+        ("Date", "date32"),
+        ("DayNumber", "int32"),
+        ("Day", "string"),
+        ("Month", "string"),
+        ("ShortMonth", "string"),
+        ("CalendarMonthNumber", "int32"),
+        ("CalendarMonthLabel", "string"),
+        ("CalendarYear", "int32"),
+        ("CalendarYearLabel", "string"),
+        ("FiscalMonthNumber", "int32"),
+        ("FiscalMonthLabel", "string"),
+        ("FiscalYear", "int32"),
+        ("FiscalYearLabel", "string"),
+        ("ISOWeekNumber", "int32"),
+    ),
+    "dimension_employee": (
+        ("EmployeeKey", "int32"),
+        ("WWIEmployeeID", "int32"),
+        ("Employee", "string"),
+        ("PreferredName", "string"),
+        ("IsSalesperson", "bool"),
+        ("Photo", "binary"),
+        *_KEYS,
+    ),
+    "dimension_stock_item": (
+        ("StockItemKey", "int32"),
+        ("WWIStockItemID", "int32"),
+        ("StockItem", "string"),
+        ("Color", "string"),
+        ("SellingPackage", "string"),
+        ("BuyingPackage", "string"),
+        ("Brand", "string"),
+        ("Size", "string"),
+        ("LeadTimeDays", "int32"),
+        ("QuantityPerOuter", "int32"),
+        ("IsChillerStock", "bool"),
+        ("Barcode", "string"),
+        ("TaxRate", "decimal(18,3)"),
+        ("UnitPrice", "decimal(18,2)"),
+        ("RecommendedRetailPrice", "decimal(18,2)"),
+        ("TypicalWeightPerUnit", "decimal(18,3)"),
+        ("Photo", "binary"),
+        *_KEYS,
+    ),
+    FACT_TABLE: (
+        ("SaleKey", "int64"),
+        ("CityKey", "int32"),
+        ("CustomerKey", "int32"),
+        ("BillToCustomerKey", "int32"),
+        ("StockItemKey", "int32"),
+        ("InvoiceDateKey", "date32"),
+        ("DeliveryDateKey", "date32"),
+        ("SalespersonKey", "int32"),
+        ("WWIInvoiceID", "int32"),
+        ("Description", "string"),
+        ("Package", "string"),
+        ("Quantity", "int32"),
+        ("UnitPrice", "decimal(18,2)"),
+        ("TaxRate", "decimal(18,3)"),
+        ("TotalExcludingTax", "decimal(18,2)"),
+        ("TaxAmount", "decimal(18,2)"),
+        ("Profit", "decimal(18,2)"),
+        ("TotalIncludingTax", "decimal(18,2)"),
+        ("TotalDryItems", "int32"),
+        ("TotalChillerItems", "int32"),
+        ("LineageKey", "int32"),
+    ),
+}
+
+_DECIMAL_RE = re.compile(r"^decimal\((\d+),(\d+)\)$")
+_ROWS_RE = re.compile(r"^(\d+(?:\.\d+)?)([KMB]?)$", re.IGNORECASE)
+_ROW_SUFFIXES = {"": 1, "K": 1_000, "M": 1_000_000, "B": 1_000_000_000}
+
+_TERRITORIES = (
+    "Far West", "Great Lakes", "Mideast", "New England", "Plains", "Rocky Mountain", "Southeast", "Southwest"
+)
+_STATES = ("California", "Texas", "New York", "Florida", "Illinois", "Ohio", "Washington", "Colorado", "Georgia")
+_TOWNS = ("Springfield", "Riverside", "Franklin", "Greenville", "Bristol", "Clinton", "Fairview", "Salem", "Madison")
+_FIRST_NAMES = ("Kayla", "Hudson", "Isabella", "Anthony", "Lily", "Taj", "Amy", "Jack", "Sophia", "Piotr", "Archer")
+_LAST_NAMES = ("Woodcock", "Onslow", "Hamilton", "Grosse", "Code", "Shand", "Trefz", "Potter", "Hodge", "Dhar")
+_CATEGORIES = ("Novelty Shop", "Supermarket", "Computer Store", "Gift Store", "Corporate")
+_BUYING_GROUPS = ("Tailspin Toys", "Wingtip Toys", "N/A")
+_PRODUCTS = ("USB food flash drive", "Developer joke mug", "Shipping carton", "Chocolate frogs", "Halloween skull mask")
+_COLORS = ("N/A", "Black", "Blue", "Red", "White", "Gray", "Yellow")
+_PACKAGES = ("Each", "Packet", "Bag", "Carton", "Pair")
+_SIZES = ("N/A", "S", "M", "L", "XL", "250g", "1/12 scale")
+
+
+def source_file(table: str) -> str:
+    """Return the parquet file name the bronze CopyJob reads for a table."""
+    return f"{SOURCE_SCHEMA}.{table}.parquet"
+
+
+def parse_rows(value: str) -> int:
+    """Parse a row count with an optional K/M/B suffix (``10M``, ``1B``, ``2500``).
+
+    Raises:
+        ValueError: If the value is not such a count
+    """
+    match = _ROWS_RE.match(value.strip().replace("_", ""))
+    if not match:
+        raise ValueError(f"expected a row count like 1000000, 10M or 1B, got '{value}'")
+    return int(float(match.group(1)) * _ROW_SUFFIXES[match.group(2).upper()])
+
+
+def plan_chunks(rows: int, chunk_rows: int = SYNTHETIC_CHUNK_ROWS) -> list[tuple[int, int]]:
+    """Return (first row offset, row count) of every chunk of a table.
+
+    Raises:
+        ValueError: If rows is outside 1..SYNTHETIC_MAX_FACT_ROWS or chunk_rows is not positive
+    """
+    if not 1 <= rows <= SYNTHETIC_MAX_FACT_ROWS:
+        raise ValueError(f"fact rows must be between 1 and {SYNTHETIC_MAX_FACT_ROWS:,}, got {rows:,}")
+    if chunk_rows < 1:
+        raise ValueError(f"chunk rows must be positive, got {chunk_rows}")
+    return [(start, min(chunk_rows, rows - start)) for start in range(0, rows, chunk_rows)]
+
+
+def arrow_schema(table: str) -> "pa.Schema":
+    """Return the Arrow schema of a star-schema table."""
+    import pyarrow as pa
+
+    simple = {
+        "int32": pa.int32(),
+        "int64": pa.int64(),
+        "string": pa.string(),
+        "bool": pa.bool_(),
+        "date32": pa.date32(),
+        "timestamp": pa.timestamp("us"),
+        "binary": pa.binary(),
+    }
+    fields = []
+    for name, kind in STAR_SCHEMA[table]:
+        decimal = _DECIMAL_RE.match(kind)
+        fields.append(pa.field(name, pa.decimal128(int(decimal[1]), int(decimal[2])) if decimal else simple[kind]))
+    return pa.schema(fields)
+
+
+def _rng(seed: int, table: str, chunk: int = 0) -> Any:
+    import numpy as np
+
+    return np.random.default_rng([seed, list(STAR_SCHEMA).index(table), chunk])
+
+
+def _build(table: str, columns: Mapping[str, Any], rows: int) -> "pa.Table":
+    """Assemble a table from per-column values (lists, numpy or Arrow arrays) in schema types."""
+    import numpy as np
+    import pyarrow as pa
+
+    schema = arrow_schema(table)
+    arrays = []
+    for field in schema:
+        values = columns.get(field.name)
+        if values is None:
+            arrays.append(pa.nulls(rows, field.type))
+        elif isinstance(values, pa.Array | pa.ChunkedArray):
+            arrays.append(values.cast(field.type))
+        elif pa.types.is_decimal(field.type):
+            # Rounded before the cast so values are exact at the column's scale
+            arrays.append(pa.array(np.round(np.asarray(values, dtype=float), field.type.scale)).cast(field.type))
+        else:
+            arrays.append(pa.array(values, field.type))
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+
+def _pick(rng: Any, pool: tuple[str, ...], rows: int) -> list[str]:
+    return [pool[i] for i in rng.integers(0, len(pool), rows)]
+
+
+def _people(rng: Any, rows: int) -> list[str]:
+    return [f"{first} {last}" for first, last in zip(_pick(rng, _FIRST_NAMES, rows), _pick(rng, _LAST_NAMES, rows))]
+
+
+def _scd(rows: int) -> dict[str, Any]:
+    return {"ValidFrom": [VALID_FROM] * rows, "ValidTo": [VALID_TO] * rows, "LineageKey": [1] * rows}
+
+
+def _date_columns(rows: int) -> dict[str, Any]:
+    dates = [FIRST_DATE + datetime.timedelta(days=offset) for offset in range(rows)]
+    # Fiscal years start in November: November 2013 is month 1 of FY2014
+    fiscal_months = [(d.month + 1) % 12 + 1 for d in dates]
+    fiscal_years = [d.year + (d.month >= 11) for d in dates]
+    return {
+        "Date": dates,
+        "DayNumber": [d.day for d in dates],
+        "Day": [str(d.day) for d in dates],
+        "Month": [d.strftime("%B") for d in dates],
+        "ShortMonth": [d.strftime("%b") for d in dates],
+        "CalendarMonthNumber": [d.month for d in dates],
+        "CalendarMonthLabel": [f"CY{d.year}-{d.strftime('%b')}" for d in dates],
+        "CalendarYear": [d.year for d in dates],
+        "CalendarYearLabel": [f"CY{d.year}" for d in dates],
+        "FiscalMonthNumber": fiscal_months,
+        "FiscalMonthLabel": [f"FY{y}-{d.strftime('%b')}" for d, y in zip(dates, fiscal_years)],
+        "FiscalYear": fiscal_years,
+        "FiscalYearLabel": [f"FY{y}" for y in fiscal_years],
+        "ISOWeekNumber": [d.isocalendar().week for d in dates],
+    }
+
+
+def dimension_table(table: str, rows: int, seed: int = SYNTHETIC_SEED) -> "pa.Table":
+    """Generate one dimension table with keys 1..rows (dimension_date: consecutive days from FIRST_DATE)."""
+    rng = _rng(seed, table)
+    keys = list(range(1, rows + 1))
+    if table == "dimension_date":
+        return _build(table, _date_columns(rows), rows)
+    if table == "dimension_city":
+        towns = _pick(rng, _TOWNS, rows)
+        longitudes, latitudes = rng.uniform(-124, -67, rows), rng.uniform(25, 49, rows)
+        columns = {
+            "CityKey": keys,
+            "WWICityID": keys,
+            "City": [f"{town} {key}" for town, key in zip(towns, keys)],
+            "StateProvince": _pick(rng, _STATES, rows),
+            "Country": ["United States"] * rows,
+            "Continent": ["North America"] * rows,
+            "SalesTerritory": _pick(rng, _TERRITORIES, rows),
+            "Region": ["Americas"] * rows,
+            "Subregion": ["Northern America"] * rows,
+            "Location": [f"POINT ({lon:.4f} {lat:.4f})" for lon, lat in zip(longitudes, latitudes)],
+            "LatestRecordedPopulation": rng.integers(100, 2_000_000, rows),
+        }
+    elif table == "dimension_customer":
+        groups = _pick(rng, _BUYING_GROUPS, rows)
+        names = [
+            f"{group} ({town})" if group != "N/A" else person
+            for group, town, person in zip(groups, _pick(rng, _TOWNS, rows), _people(rng, rows))
+        ]
+        columns = {
+            "CustomerKey": keys,
+            "WWICustomerID": keys,
+            "Customer": names,
+            "BillToCustomer": [
+                f"{group} (Head Office)" if group != "N/A" else name for group, name in zip(groups, names)
+            ],
+            "Category": _pick(rng, _CATEGORIES, rows),
+            "BuyingGroup": groups,
+            "PrimaryContact": _people(rng, rows),
+            "PostalCode": [f"{code:05d}" for code in rng.integers(10000, 99999, rows)],
+        }
+    elif table == "dimension_employee":
+        people = _people(rng, rows)
+        columns = {
+            "EmployeeKey": keys,
+            "WWIEmployeeID": keys,
+            "Employee": people,
+            "PreferredName": [person.split(" ")[0] for person in people],
+            "IsSalesperson": (rng.random(rows) < 0.5).tolist(),
+        }
+    elif table == "dimension_stock_item":
+        colors, sizes = _pick(rng, _COLORS, rows), _pick(rng, _SIZES, rows)
+        prices = rng.uniform(0.5, 250.0, rows).round(2)
+        columns = {
+            "StockItemKey": keys,
+            "WWIStockItemID": keys,
+            "StockItem": [
+                f"{product} ({color}) {size}"
+                for product, color, size in zip(_pick(rng, _PRODUCTS, rows), colors, sizes)
+            ],
+            "Color": colors,
+            "SellingPackage": _pick(rng, _PACKAGES, rows),
+            "BuyingPackage": _pick(rng, _PACKAGES, rows),
+            "Brand": _pick(rng, ("Northwind", "N/A"), rows),
+            "Size": sizes,
+            "LeadTimeDays": rng.integers(2, 21, rows),
+            "QuantityPerOuter": rng.choice([1, 6, 12, 24, 60, 100], rows),
+            "IsChillerStock": (rng.random(rows) < 0.1).tolist(),
+            "Barcode": [str(code) for code in rng.integers(10**12, 10**13, rows)],
+            "TaxRate": rng.choice([10.0, 15.0], rows),
+            "UnitPrice": prices,
+            "RecommendedRetailPrice": prices * 1.495,
+            "TypicalWeightPerUnit": rng.uniform(0.05, 20.0, rows),
+        }
+    else:
+        raise KeyError(f"'{table}' is not a dimension of the star schema")
+    return _build(table, {**columns, **_scd(rows)}, rows)
+
+
+def fact_batch(start: int, rows: int, dimensions: Mapping[str, "pa.Table"], seed: int = SYNTHETIC_SEED) -> "pa.Table":
+    """Generate fact_sale rows with SaleKey start+1..start+rows referencing the given dimensions."""
+    import numpy as np
+    import pyarrow as pa
+
+    rng = _rng(seed, FACT_TABLE, start)
+    stock = dimensions["dimension_stock_item"]
+    item = rng.integers(1, stock.num_rows + 1, rows)
+    customer = rng.integers(1, dimensions["dimension_customer"].num_rows + 1, rows)
+    first_day = (FIRST_DATE - datetime.date(1970, 1, 1)).days
+    invoice_day = first_day + rng.integers(0, dimensions["dimension_date"].num_rows, rows)
+    sale_key = np.arange(start + 1, start + rows + 1, dtype=np.int64)
+    quantity = rng.integers(1, 361, rows)
+
+    index = pa.array(item - 1)
+    unit_price = stock["UnitPrice"].cast(pa.float64()).to_numpy()[item - 1]
+    tax_rate = stock["TaxRate"].cast(pa.float64()).to_numpy()[item - 1]
+    chiller = stock["IsChillerStock"].to_numpy()[item - 1]
+    excluding_tax = (quantity * unit_price).round(2)
+    tax = (excluding_tax * tax_rate / 100).round(2)
+    columns = {
+        "SaleKey": pa.array(sale_key),
+        "CityKey": pa.array(rng.integers(1, dimensions["dimension_city"].num_rows + 1, rows)),
+        "CustomerKey": pa.array(customer),
+        "BillToCustomerKey": pa.array(customer),
+        "StockItemKey": pa.array(item),
+        "InvoiceDateKey": pa.array(invoice_day.astype(np.int32), pa.date32()),
+        "DeliveryDateKey": pa.array((invoice_day + 1).astype(np.int32), pa.date32()),
+        "SalespersonKey": pa.array(rng.integers(1, dimensions["dimension_employee"].num_rows + 1, rows)),
+        "WWIInvoiceID": pa.array((sale_key - 1) // LINES_PER_INVOICE + 1),
+        "Description": stock["StockItem"].take(index),
+        "Package": stock["SellingPackage"].take(index),
+        "Quantity": pa.array(quantity),
+        "UnitPrice": stock["UnitPrice"].take(index),
+        "TaxRate": stock["TaxRate"].take(index),
+        "TotalExcludingTax": excluding_tax,
+        "TaxAmount": tax,
+        "Profit": excluding_tax * rng.uniform(0.1, 0.5, rows),
+        "TotalIncludingTax": excluding_tax + tax,
+        "TotalDryItems": pa.array(np.where(chiller, 0, quantity)),
+        "TotalChillerItems": pa.array(np.where(chiller, quantity, 0)),
+        "LineageKey": pa.array(np.ones(rows, dtype=np.int32)),
+    }
+    return _build(FACT_TABLE, columns, rows)
+
+
+def generate_dataset(
+    output_dir: Path,
+    fact_rows: int,
+    chunk_rows: int = SYNTHETIC_CHUNK_ROWS,
+    seed: int = SYNTHETIC_SEED,
+    dimension_rows: Mapping[str, int] = SYNTHETIC_DIMENSION_ROWS,
+) -> dict[str, int]:
+    """Write every star-schema table as snappy parquet named like the bronze CopyJob sources.
+
+    The fact table is written one row group per chunk. Files are written under
+    a temporary name and renamed when complete, so an interrupted run leaves no
+    truncated table behind.
+
+    Returns:
+        Table -> rows written
+
+    Raises:
+        ValueError: If the row or chunk counts are out of range
+    """
+    import pyarrow.parquet as pq
+
+    chunks = plan_chunks(fact_rows, chunk_rows)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    written: dict[str, int] = {}
+    dimensions = {}
+    for table, rows in dimension_rows.items():
+        dimensions[table] = dimension_table(table, rows, seed)
+        partial = output_dir / f"{source_file(table)}.partial"
+        pq.write_table(dimensions[table], partial, compression="snappy")
+        os.replace(partial, output_dir / source_file(table))
+        written[table] = rows
+
+    partial = output_dir / f"{source_file(FACT_TABLE)}.partial"
+    with pq.ParquetWriter(partial, arrow_schema(FACT_TABLE), compression="snappy") as writer:
+        for start, rows in chunks:
+            writer.write_table(fact_batch(start, rows, dimensions, seed))
+    os.replace(partial, output_dir / source_file(FACT_TABLE))
+    written[FACT_TABLE] = fact_rows
+    return written
+
+
+def row_count(value: str) -> int:
+    """argparse type for positive row counts with an optional K/M/B suffix."""
+    try:
+        rows = parse_rows(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e)) from None
+    if rows < 1:
+        raise argparse.ArgumentTypeError(f"must be >= 1, got {value}")
+    return rows
+
+
+def run_generate_data(output_dir: Path, rows: int, chunk_rows: int, seed: int) -> int:
+    """Write synthetic star-schema parquet files named like the bronze CopyJob sources.
+
+    Returns:
+        EXIT_SUCCESS, or EXIT_FAILURE on an invalid scale or missing benchmark dependencies
+    """
+    logger.info(SEPARATOR_LONG)
+    logger.info(f"SYNTHETIC STAR-SCHEMA DATA ({rows:,} fact rows, chunks of {chunk_rows:,})")
+    logger.info(SEPARATOR_LONG)
+    started = time.perf_counter()
+    try:
+        written = generate_dataset(output_dir, rows, chunk_rows, seed)
+    except ImportError as e:
+        logger.error(f"ERROR: generate-data needs the benchmark extra (pip install '.[benchmark]'): {e!s}")
+        return EXIT_FAILURE
+    except (OSError, ValueError) as e:
+        logger.error(f"[FAIL] {e!s}")
+        return EXIT_FAILURE
+    elapsed = time.perf_counter() - started
+
+    for table, count in written.items():
+        size = (output_dir / source_file(table)).stat().st_size
+        logger.info(f"  [OK] {source_file(table)}: {count:,} rows, {format_bytes(size)}")
+    total = sum(written.values())
+    rate = total / elapsed if elapsed > 0 else 0.0
+    logger.info(f"[OK] Wrote {total:,} rows to {output_dir} in {format_seconds(elapsed)} ({rate:,.0f} rows/s)")
+    return EXIT_SUCCESS
@@ -12,6 +12,12 @@ class DeploymentResult:
     workspace_name: str
     success: bool
     error_message: str = ""
+    duration: float = 0.0
+    resumed: bool = False  # Deployed in an earlier attempt and skipped by --resume
+    attempts: int = 1  # deploy_with_config calls made (0 when skipped)
+    throttled: int = 0  # attempts that failed with throttling
+    error_kind: str = ""  # transient/throttled/permanent/skipped for failures
+    items: int = 0  # items in the workspace definition (deployed when success)
 
 
 @dataclass
@@ -21,6 +27,11 @@ class DeploymentSummary:
     environment: str
     duration: float
     results: list[DeploymentResult]
+    resumed: bool = False  # Continued from a checkpoint instead of starting fresh
+    circuit_open: bool = False  # Remaining workspaces were skipped by the circuit breaker
+    commit_sha: str = ""
+    finished_at: str = ""  # ISO-8601 UTC
+    shard: str = ""  # "i/N" when only CI shard i of N was deployed
 
     @property
     def total_workspaces(self) -> int:
@@ -33,3 +44,15 @@ class DeploymentSummary:
     @property
     def failed_count(self) -> int:
         return sum(1 for r in self.results if not r.success)
+
+    @property
+    def resumed_count(self) -> int:
+        return sum(1 for r in self.results if r.resumed)
+
+    @property
+    def fresh_count(self) -> int:
+        return sum(1 for r in self.results if not r.resumed)
+
+    @property
+    def retry_count(self) -> int:
+        return sum(max(r.attempts - 1, 0) for r in self.results)
@@ -0,0 +1,210 @@
+"""Filesystem change notification for long-running watch modes.
+
+On Linux the watcher uses inotify (through ctypes, no extra dependency) with
+one watch per directory, added recursively and extended as directories are
+created. Elsewhere, or when inotify is unavailable (e.g. the per-user watch
+limit is exhausted), it falls back to polling mtime/size snapshots.
+
+Both backends return the set of paths that changed since the last call. A
+changed directory (created, removed, moved, or the watch root after an inotify
+queue overflow) means "anything below this path may have changed".
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Protocol
+
+from ..common.logger import get_logger
+from .config import WATCH_DEBOUNCE_SECONDS, WATCH_POLL_INTERVAL_SECONDS
+
+logger = get_logger(__name__)
+
+# inotify(7) event masks
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+
+WATCH_MASK = IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, len (name follows, NUL padded)
+READ_BUFFER_BYTES = 64 * 1024
+
+
+class Watcher(Protocol):
+    """Common interface of the inotify and polling backends."""
+
+    backend: str
+
+    def wait(self, timeout: float | None = None) -> set[Path]:
+        """Block until something changes (or ``timeout`` seconds pass) and return the changed paths."""
+        ...
+
+    def close(self) -> None:
+        """Release the backend's resources."""
+        ...
+
+
+class InotifyWatcher:
+    """Recursive directory watcher on top of Linux inotify."""
+
+    backend = "inotify"
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, f"inotify_init1 failed: {os.strerror(err)}")
+        self._fd = fd
+        self._directories: dict[int, Path] = {}
+        try:
+            self._watch_tree(self.root)
+        except OSError:
+            self.close()
+            raise
+
+    def _watch_tree(self, top: Path) -> list[Path]:
+        """Add a watch for ``top`` and every directory below it; return the files found there."""
+        files: list[Path] = []
+        for dirpath, _, filenames in os.walk(top):
+            directory = Path(dirpath)
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), WATCH_MASK | IN_ONLYDIR)
+            if wd < 0:
+                err = ctypes.get_errno()
+                if err in (errno.ENOSPC, errno.EMFILE, errno.ENOMEM):
+                    raise OSError(err, f"inotify_add_watch failed for {directory}: {os.strerror(err)}")
+                continue  # removed again before the watch could be added
+            self._directories[wd] = directory
+            files.extend(directory / name for name in filenames)
+        return files
+
+    def wait(self, timeout: float | None = None) -> set[Path]:
+        """Block until events arrive and return the changed paths, batching bursts of events."""
+        changed: set[Path] = set()
+        if not select.select([self._fd], [], [], timeout)[0]:
+            return changed
+        while True:
+            changed |= self._read_events()
+            if not select.select([self._fd], [], [], WATCH_DEBOUNCE_SECONDS)[0]:
+                return changed
+
+    def _read_events(self) -> set[Path]:
+        try:
+            data = os.read(self._fd, READ_BUFFER_BYTES)
+        except BlockingIOError:
+            return set()
+
+        changed: set[Path] = set()
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = data[offset : offset + length].rstrip(b"\0")
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                changed.add(self.root)  # events were lost: everything may have changed
+                continue
+            directory = self._directories.get(wd)
+            if directory is None:
+                continue
+            if mask & IN_IGNORED:
+                del self._directories[wd]
+                continue
+
+            path = directory / os.fsdecode(name) if name else directory
+            changed.add(path)
+            if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                # Files written before the new watch was in place produce no events of their own
+                changed.update(self._watch_tree(path))
+        return changed
+
+    def close(self) -> None:
+        """Close the inotify descriptor (which drops every watch)."""
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    def __enter__(self) -> "InotifyWatcher":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+class PollingWatcher:
+    """Portable watcher comparing (mtime, size) snapshots of the tree."""
+
+    backend = "polling"
+
+    def __init__(self, root: Path, interval: float = WATCH_POLL_INTERVAL_SECONDS):
+        self.root = Path(root)
+        self.interval = interval
+        self._snapshot = self._take_snapshot()
+
+    def _take_snapshot(self) -> dict[Path, tuple[int, int]]:
+        snapshot: dict[Path, tuple[int, int]] = {}
+        for dirpath, _, filenames in os.walk(self.root):
+            for name in filenames:
+                path = Path(dirpath) / name
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def wait(self, timeout: float | None = None) -> set[Path]:
+        """Poll every ``interval`` seconds until something changed or ``timeout`` passed."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return set()
+            time.sleep(self.interval if remaining is None else min(self.interval, remaining))
+
+            snapshot = self._take_snapshot()
+            previous, self._snapshot = self._snapshot, snapshot
+            changed = {path for path in snapshot.keys() | previous.keys() if snapshot.get(path) != previous.get(path)}
+            if changed:
+                return changed
+
+    def close(self) -> None:
+        """Nothing to release for the polling backend."""
+
+    def __enter__(self) -> "PollingWatcher":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+def create_watcher(root: Path, poll_interval: float = WATCH_POLL_INTERVAL_SECONDS, polling: bool = False) -> Watcher:
+    """Return an inotify watcher on Linux, falling back to polling when it cannot be set up.
+
+    Args:
+        root: Directory tree to watch
+        poll_interval: Seconds between snapshots for the polling backend
+        polling: Force the polling backend (e.g. for network filesystems without inotify support)
+    """
+    if not polling and sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(root)
+        except (OSError, AttributeError) as e:
+            logger.warning(f"[WARN] inotify unavailable ({e!s}) - polling every {poll_interval}s instead")
+    return PollingWatcher(root, poll_interval)
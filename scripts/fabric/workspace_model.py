@@ -0,0 +1,368 @@
+"""Immutable in-memory model of the workspaces directory.
+
+The model is built from a single walk of the workspaces tree and holds
+everything the scanner, renderer and deployer need: workspace folders, parsed
+config.yml files, compiled find_replace rules (including ``extend`` templates),
+items with their type, display name and logicalId, and per-item file lists.
+
+Models are memoized per process and persisted to a JSON cache in the user's
+cache directory (never in the checkout, and not at all under GitHub Actions),
+so a cache file committed to the repository is never read. The cache key is a
+fingerprint of every file path and size plus the content hash of every file
+that is parsed (YAML and ``.platform``), so any edit that could change the
+model invalidates it. Content hashes are reused while a file's size and
+modification time are unchanged, so a warm load only stats the tree. The cache
+holds data only; delete it freely.
+"""
+
+import hashlib
+import json
+import os
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+from ..common.logger import get_logger
+from .config import (
+    CONFIG_FILE,
+    ENV_GITHUB_ACTIONS,
+    PARAMETER_FILE,
+    USER_CACHE_DIRECTORY,
+    WORKSPACE_MODEL_CACHE_PREFIX,
+)
+from .parameters import FindReplaceRule, item_type_from_path, load_rules
+
+logger = get_logger(__name__)
+
+# Bump when the cached model changes shape so stale caches are ignored
+MODEL_CACHE_VERSION = 2
+
+# Files whose content is parsed into the model (hashed for cache invalidation)
+PARSED_SUFFIXES = {".yml", ".yaml", ".platform"}
+
+PLATFORM_FILE = ".platform"
+
+# relative path -> (size, mtime_ns, sha256) of a parsed file
+FileHashes = dict[str, tuple[int, int, str]]
+# (relative posix path, size, mtime_ns) of every file under the workspaces directory
+FileEntries = list[tuple[str, int, int]]
+
+_memo: dict[str, tuple["RepositoryModel", FileHashes]] = {}
+
+
+@dataclass(frozen=True)
+class ItemModel:
+    """One Fabric item folder (``<DisplayName>.<ItemType>`` containing a .platform file)."""
+
+    item_type: str
+    display_name: str
+    logical_id: str
+    path: str  # item folder relative to the workspace folder (posix)
+    files: tuple[str, ...]  # item files relative to the workspace folder (posix)
+    definition_bytes: int = 0
+
+
+@dataclass(frozen=True)
+class WorkspaceModel:
+    """One workspace folder containing a config.yml."""
+
+    folder: str
+    config: dict[str, Any] = field(compare=False)
+    rules: tuple[FindReplaceRule, ...]
+    items: tuple[ItemModel, ...]
+    files: tuple[str, ...]  # every file relative to the workspace folder (posix)
+
+    def item_for_file(self, relative_file: str) -> ItemModel | None:
+        """Return the item that owns a workspace-relative file, if any."""
+        for item in self.items:
+            if relative_file.startswith(item.path + "/"):
+                return item
+        return None
+
+
+@dataclass(frozen=True)
+class RepositoryModel:
+    """All workspaces discovered under one workspaces directory."""
+
+    workspaces_dir: str
+    fingerprint: str
+    workspaces: tuple[WorkspaceModel, ...]
+
+    @property
+    def folders(self) -> list[str]:
+        """Sorted workspace folder names."""
+        return [workspace.folder for workspace in self.workspaces]
+
+    def get(self, folder: str) -> WorkspaceModel:
+        """Return the workspace model for a folder.
+
+        Raises:
+            KeyError: If the folder is not a discovered workspace
+        """
+        for workspace in self.workspaces:
+            if workspace.folder == folder:
+                return workspace
+        raise KeyError(f"Workspace '{folder}' not found in {self.workspaces_dir}")
+
+
+def _walk_files(workspaces_path: Path) -> FileEntries:
+    """Return ``(relative posix path, size, mtime_ns)`` for every file under the workspaces directory."""
+    entries: FileEntries = []
+    for root, dirs, files in os.walk(workspaces_path):
+        dirs.sort()
+        root_path = Path(root)
+        for name in sorted(files):
+            file_path = root_path / name
+            stat = file_path.stat()
+            entries.append((file_path.relative_to(workspaces_path).as_posix(), stat.st_size, stat.st_mtime_ns))
+    return entries
+
+
+def compute_fingerprint(
+    workspaces_path: Path, entries: FileEntries, known: FileHashes | None = None
+) -> tuple[str, FileHashes]:
+    """Hash file paths and sizes plus the content of every parsed file.
+
+    Content hashes in ``known`` are reused for files whose size and mtime still match.
+
+    Returns:
+        The fingerprint and the content hashes of the parsed files
+    """
+    known = known or {}
+    hashes: FileHashes = {}
+    digest = hashlib.sha256(f"v{MODEL_CACHE_VERSION}".encode())
+    for relative, size, mtime_ns in entries:
+        digest.update(f"{relative}\0{size}\0".encode())
+        if Path(relative).suffix in PARSED_SUFFIXES or relative.endswith(PLATFORM_FILE):
+            previous = known.get(relative)
+            if previous and previous[:2] == (size, mtime_ns):
+                content_hash = previous[2]
+            else:
+                content_hash = hashlib.sha256((workspaces_path / relative).read_bytes()).hexdigest()
+            hashes[relative] = (size, mtime_ns, content_hash)
+            digest.update(bytes.fromhex(content_hash))
+    return digest.hexdigest(), hashes
+
+
+def _read_platform(platform_file: Path) -> tuple[str, str, str]:
+    """Return ``(type, displayName, logicalId)`` from a .platform file (empty strings when unreadable)."""
+    try:
+        raw = json.loads(platform_file.read_text(encoding="utf-8"))
+    except (OSError, ValueError) as exc:
+        logger.warning(f"  [WARN] Could not parse {platform_file}: {exc}")
+        return "", "", ""
+    metadata = raw.get("metadata") or {} if isinstance(raw, dict) else {}
+    config = raw.get("config") or {} if isinstance(raw, dict) else {}
+    return str(metadata.get("type", "")), str(metadata.get("displayName", "")), str(config.get("logicalId", ""))
+
+
+def _build_workspace(workspaces_path: Path, folder: str, entries: list[tuple[str, int]]) -> WorkspaceModel:
+    """Build one workspace model from the pre-walked file entries of its folder."""
+    workspace_dir = workspaces_path / folder
+    with open(workspace_dir / CONFIG_FILE, encoding="utf-8") as f:
+        config = yaml.safe_load(f) or {}
+
+    files = tuple(relative for relative, _ in entries)
+    sizes = dict(entries)
+
+    items: list[ItemModel] = []
+    for relative in files:
+        if not relative.endswith("/" + PLATFORM_FILE):
+            continue
+        item_path = relative[: -len(PLATFORM_FILE) - 1]
+        item_type, display_name, logical_id = _read_platform(workspace_dir / relative)
+        item_files = tuple(f for f in files if f.startswith(item_path + "/"))
+        items.append(
+            ItemModel(
+                item_type=item_type or item_type_from_path(Path(item_path)),
+                display_name=display_name or Path(item_path).name.rsplit(".", 1)[0],
+                logical_id=logical_id,
+                path=item_path,
+                files=item_files,
+                definition_bytes=sum(sizes[f] for f in item_files),
+            )
+        )
+
+    return WorkspaceModel(
+        folder=folder,
+        config=config,
+        rules=tuple(load_rules(workspace_dir / PARAMETER_FILE)),
+        items=tuple(items),
+        files=files,
+    )
+
+
+def build_workspace_model(workspaces_dir: str | Path) -> RepositoryModel:
+    """Walk the workspaces directory once and build the repository model (no caching).
+
+    Raises:
+        FileNotFoundError: If the workspaces directory doesn't exist
+    """
+    workspaces_path = Path(workspaces_dir).resolve()
+    if not workspaces_path.is_dir():
+        raise FileNotFoundError(f"Workspaces directory not found: {workspaces_dir}")
+    entries = _walk_files(workspaces_path)
+    return _build_from_entries(workspaces_path, entries, compute_fingerprint(workspaces_path, entries)[0])
+
+
+def _build_from_entries(workspaces_path: Path, entries: FileEntries, fingerprint: str) -> RepositoryModel:
+    by_folder: dict[str, list[tuple[str, int]]] = {}
+    for relative, size, _ in entries:
+        folder, sep, rest = relative.partition("/")
+        if sep:
+            by_folder.setdefault(folder, []).append((rest, size))
+
+    workspaces = tuple(
+        _build_workspace(workspaces_path, folder, folder_entries)
+        for folder, folder_entries in sorted(by_folder.items())
+        if any(relative == CONFIG_FILE for relative, _ in folder_entries)
+    )
+    return RepositoryModel(workspaces_dir=str(workspaces_path), fingerprint=fingerprint, workspaces=workspaces)
+
+
+def default_cache_file(workspaces_path: Path) -> Path | None:
+    """Return the per-user cache file for a workspaces directory, or None under GitHub Actions.
+
+    CI checks out untrusted pull request content and gains nothing from a cache
+    that does not survive the job, so the disk cache is disabled there.
+    """
+    if os.getenv(ENV_GITHUB_ACTIONS, "").lower() == "true":
+        return None
+    cache_root = Path(os.getenv("XDG_CACHE_HOME") or Path.home() / ".cache") / USER_CACHE_DIRECTORY
+    key = hashlib.sha256(str(workspaces_path).encode()).hexdigest()[:16]
+    return cache_root / f"{WORKSPACE_MODEL_CACHE_PREFIX}{key}.json"
+
+
+def load_workspace_model(workspaces_dir: str | Path, cache_file: str | Path | bool | None = True) -> RepositoryModel:
+    """Return the repository model, reusing the in-process memo or the on-disk cache when still valid.
+
+    Args:
+        workspaces_dir: Root directory containing workspace folders
+        cache_file: JSON cache location; True for the per-user cache (see default_cache_file),
+            None or False to disable the on-disk cache
+
+    Returns:
+        RepositoryModel for the current state of the tree
+
+    Raises:
+        FileNotFoundError: If the workspaces directory doesn't exist
+    """
+    workspaces_path = Path(workspaces_dir).resolve()
+    if not workspaces_path.is_dir():
+        raise FileNotFoundError(f"Workspaces directory not found: {workspaces_dir}")
+
+    entries = _walk_files(workspaces_path)
+    memo_key = str(workspaces_path)
+    memoized = _memo.get(memo_key)
+    if memoized is not None:
+        model, hashes = memoized
+        fingerprint, hashes = compute_fingerprint(workspaces_path, entries, hashes)
+        if model.fingerprint == fingerprint:
+            return model
+
+    if cache_file is True:
+        cache_path = default_cache_file(workspaces_path)
+    else:
+        cache_path = Path(cache_file) if cache_file else None
+    cached = _read_cache(cache_path, str(workspaces_path)) if cache_path else None
+    fingerprint, hashes = compute_fingerprint(workspaces_path, entries, cached[1] if cached else None)
+    if cached is not None and cached[0].fingerprint == fingerprint:
+        logger.debug(f"Loaded workspace model from cache {cache_path}")
+        model = cached[0]
+    else:
+        model = _build_from_entries(workspaces_path, entries, fingerprint)
+        if cache_path:
+            _write_cache(cache_path, model, hashes)
+
+    _memo[memo_key] = (model, hashes)
+    return model
+
+
+def _model_to_json(model: RepositoryModel, hashes: FileHashes) -> dict[str, Any]:
+    return {
+        "version": MODEL_CACHE_VERSION,
+        "workspaces_dir": model.workspaces_dir,
+        "fingerprint": model.fingerprint,
+        "hashes": hashes,
+        "workspaces": [
+            {
+                "folder": workspace.folder,
+                "config": workspace.config,
+                "rules": [
+                    {
+                        "find_value": rule.find_value,
+                        "is_regex": rule.is_regex,
+                        "item_types": rule.item_types,
+                        "file_paths": rule.file_paths,
+                        "source_file": rule.source_file,
+                        "replace_values": rule.replace_values,
+                    }
+                    for rule in workspace.rules
+                ],
+                "items": [asdict(item) for item in workspace.items],
+                "files": workspace.files,
+            }
+            for workspace in model.workspaces
+        ],
+    }
+
+
+def _model_from_json(raw: dict[str, Any]) -> tuple[RepositoryModel, FileHashes]:
+    workspaces = tuple(
+        WorkspaceModel(
+            folder=workspace["folder"],
+            config=workspace["config"],
+            rules=tuple(FindReplaceRule(**rule) for rule in workspace["rules"]),
+            items=tuple(ItemModel(**{**item, "files": tuple(item["files"])}) for item in workspace["items"]),
+            files=tuple(workspace["files"]),
+        )
+        for workspace in raw["workspaces"]
+    )
+    model = RepositoryModel(workspaces_dir=raw["workspaces_dir"], fingerprint=raw["fingerprint"], workspaces=workspaces)
+    hashes = {relative: (int(size), int(mtime), str(sha)) for relative, (size, mtime, sha) in raw["hashes"].items()}
+    return model, hashes
+
+
+def _read_cache(cache_path: Path, workspaces_dir: str) -> tuple[RepositoryModel, FileHashes] | None:
+    try:
+        raw = json.loads(cache_path.read_text(encoding="utf-8"))
+        if raw.get("version") != MODEL_CACHE_VERSION or raw.get("workspaces_dir") != workspaces_dir:
+            return None
+        return _model_from_json(raw)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, TypeError, KeyError, AttributeError) as exc:
+        logger.debug(f"Ignoring unreadable workspace model cache {cache_path}: {exc}")
+        return None
+
+
+def _write_cache(cache_path: Path, model: RepositoryModel, hashes: FileHashes) -> None:
+    try:
+        text = json.dumps(_model_to_json(model, hashes))
+    except (TypeError, ValueError) as exc:  # config.yml values JSON cannot hold (e.g. YAML dates)
+        logger.debug(f"Not caching the workspace model: {exc}")
+        return
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_suffix(cache_path.suffix + ".tmp")
+        tmp_path.write_text(text, encoding="utf-8")
+        os.replace(tmp_path, cache_path)
+    except OSError as exc:
+        logger.debug(f"Could not write workspace model cache {cache_path}: {exc}")
+
+
+def select_workspaces(
+    workspaces_dir: Path, model: RepositoryModel, workspace_filter: str | None
+) -> list[WorkspaceModel] | None:
+    """Return the workspaces named by ``--workspace`` (all without a filter).
+
+    Returns:
+        The matching workspaces, or None (after logging an error) if the filter matches none
+    """
+    workspaces = [w for w in model.workspaces if not workspace_filter or w.folder == workspace_filter]
+    if workspace_filter and not workspaces:
+        logger.error(f"ERROR: No workspace named '{workspace_filter}' found in {workspaces_dir}")
+        return None
+    return workspaces
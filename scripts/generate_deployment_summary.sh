@@ -7,6 +7,11 @@
 #   trigger_type: Deployment trigger (Automatic/Manual)
 #   workspaces_csv: (Optional) Comma-separated list of workspaces deployed
 #               If omitted, workspace count will be read from deployment-results.json
+#
+# Results are read from deployment-results.json (written at the end of the run).
+# If the run was interrupted before that (e.g. job timeout), the report is rebuilt
+# from the incremental deployment-results.jsonl stream; workspaces that were
+# discovered but never completed are listed as pending.
 
 set -e
 
@@ -21,6 +26,62 @@ if [ -z "$ENVIRONMENT" ] || [ -z "$TRIGGER_TYPE" ]; then
     exit 1
 fi
 
+RESULTS_FILE="deployment-results.json"
+STREAM_FILE="deployment-results.jsonl"
+PARTIAL_RESULTS=false
+
+# Rebuild the results JSON from the JSON-lines stream (unparseable lines, e.g. a
+# line cut off by the timeout, are skipped). Events are grouped by environment
+# (environment_started brackets each environment of a multi-environment run);
+# multi-environment runs get the same per-environment "environments" sections as
+# build_fanout_results_json.
+if [ ! -f "$RESULTS_FILE" ] && [ -s "$STREAM_FILE" ]; then
+    RESULTS_FILE=$(mktemp)
+    trap 'rm -f "$RESULTS_FILE"' EXIT
+    PARTIAL_RESULTS=true
+    jq -R -n '
+        [inputs | fromjson? // empty] as $events
+        | ($events | map(select(.event == "run_started")) | first | .environment // "") as $run_environment
+        | [foreach $events[] as $event ($run_environment;
+              if $event.event == "environment_started" then $event.environment else . end;
+              $event + {environment: ($event.environment // .)})] as $tagged
+        | ($events | map(select(.event == "environment_started") | .environment)) as $started
+        | (if ($started | length) > 0 then $started else [$run_environment] end) as $environments
+        | [$environments[] as $environment
+           | ($tagged | map(select(.environment == $environment))) as $scoped
+           | ($scoped | map(select(.event == "workspace_completed"))) as $done
+           | ($scoped | map(select(.event == "workspaces_discovered")) | last | .workspaces // []) as $planned
+           | ($done | map(.name)) as $done_names
+           | ($scoped | map(.elapsed)) as $elapsed
+           | {
+               environment: $environment,
+               duration: (
+                   $scoped | map(select(.event == "environment_completed")) | last | .duration
+                   // (($elapsed | max // 0) - ($elapsed | min // 0))
+               ),
+               total_workspaces: ([($planned | length), ($done | length)] | max),
+               successful_count: ($done | map(select(.status == "success")) | length),
+               failed_count: ($done | map(select(.status != "success")) | length),
+               workspaces: (
+                   ($done | map({name, full_name, status, error}))
+                   + [$planned[] | select(. as $name | $done_names | any(. == $name) | not)
+                      | {name: ., full_name: ., status: "pending", error: ""}]
+               )
+             }] as $sections
+        | {
+            environment: $run_environment,
+            duration: ($events | map(.elapsed) | max // 0),
+            total_workspaces: ($sections | map(.total_workspaces) | add),
+            successful_count: ($sections | map(.successful_count) | add),
+            failed_count: ($sections | map(.failed_count) | add),
+            run_error: ($events | map(select(.event == "run_failed")) | last | .error // ""),
+            gated_environments: ($events | map(select(.event == "environment_gated") | .environment)),
+            workspaces: [$sections[] as $section | $section.workspaces[] + {environment: $section.environment}]
+          }
+        | if ($started | length) > 0 then . + {environments: $sections} else . end
+        ' "$STREAM_FILE" > "$RESULTS_FILE"
+fi
+
 # Capitalize environment name for display
 ENV_DISPLAY=$(echo "$ENVIRONMENT" | sed 's/.*/\u&/')
 
@@ -30,11 +91,11 @@ echo "" >> $GITHUB_STEP_SUMMARY
 echo "- **Trigger Type**: $TRIGGER_TYPE" >> $GITHUB_STEP_SUMMARY
 
 # Read deployment results from JSON file if it exists
-if [ -f "deployment-results.json" ]; then
-    total_workspaces=$(jq -r '.total_workspaces' deployment-results.json)
-    successful_count=$(jq -r '.successful_count' deployment-results.json)
-    failed_count=$(jq -r '.failed_count' deployment-results.json)
-    duration=$(jq -r '.duration' deployment-results.json)
+if [ -f "$RESULTS_FILE" ]; then
+    total_workspaces=$(jq -r '.total_workspaces' "$RESULTS_FILE")
+    successful_count=$(jq -r '.successful_count' "$RESULTS_FILE")
+    failed_count=$(jq -r '.failed_count' "$RESULTS_FILE")
+    duration=$(jq -r '.duration' "$RESULTS_FILE")
 else
     # Fallback to counting from input
     if [ -n "$WORKSPACES_CSV" ]; then
@@ -52,6 +113,25 @@ echo "- **Environment**: $ENVIRONMENT" >> $GITHUB_STEP_SUMMARY
 echo "- **Total Workspaces**: $total_workspaces" >> $GITHUB_STEP_SUMMARY
 echo "- **Successful**: $successful_count" >> $GITHUB_STEP_SUMMARY
 echo "- **Failed**: $failed_count" >> $GITHUB_STEP_SUMMARY
+if [ -f "$RESULTS_FILE" ]; then
+    resumed_count=$(jq -r '.resumed_count // 0' "$RESULTS_FILE")
+    if [ "$resumed_count" -gt 0 ]; then
+        echo "- **Resumed**: $resumed_count workspace(s) already deployed by a previous attempt" >> $GITHUB_STEP_SUMMARY
+    fi
+    # Present in results merged from CI shards (python -m scripts.cli merge-results)
+    shards=$(jq -r '(.shards // []) | join(", ")' "$RESULTS_FILE")
+    if [ -n "$shards" ]; then
+        echo "- **Shards**: $shards" >> $GITHUB_STEP_SUMMARY
+    fi
+fi
+if [ "$PARTIAL_RESULTS" = true ]; then
+    pending_count=$((total_workspaces - successful_count - failed_count))
+    echo "- **Not completed**: $pending_count (partial results - run was interrupted)" >> $GITHUB_STEP_SUMMARY
+    run_error=$(jq -r '.run_error' "$RESULTS_FILE")
+    if [ -n "$run_error" ]; then
+        echo "- **Run error**: $run_error" >> $GITHUB_STEP_SUMMARY
+    fi
+fi
 
 # Format duration to 2 decimal places if it's a number
 if [[ "$duration" =~ ^[0-9]+\.?[0-9]*$ ]]; then
@@ -65,15 +145,13 @@ echo "- **Status**: ${JOB_STATUS}" >> $GITHUB_STEP_SUMMARY
 echo "- **Completed**: $(date -u '+%Y-%m-%d %H:%M:%S UTC')" >> $GITHUB_STEP_SUMMARY
 echo "" >> $GITHUB_STEP_SUMMARY
 
-# List workspaces with individual status from JSON
-if [ -f "deployment-results.json" ] && [ "$total_workspaces" -gt 0 ]; then
-    echo "#### Deployment Results:" >> $GITHUB_STEP_SUMMARY
-    echo "" >> $GITHUB_STEP_SUMMARY
-
-    # Read and display each workspace status
-    jq -r '.workspaces[] | "\(.status)|\(.full_name)|\(.error)"' deployment-results.json | while IFS='|' read -r status full_name error; do
+# Append one line per workspace (and its error) of the workspace array at jq path $1
+render_workspaces() {
+    jq -r "$1"'[] | "\(.status)|\(.full_name)|\(.error)"' "$RESULTS_FILE" | while IFS='|' read -r status full_name error; do
         if [ "$status" == "success" ]; then
             echo "- ✓ $full_name" >> $GITHUB_STEP_SUMMARY
+        elif [ "$status" == "pending" ]; then
+            echo "- … $full_name (not completed)" >> $GITHUB_STEP_SUMMARY
         else
             echo "- ✗ $full_name" >> $GITHUB_STEP_SUMMARY
             if [ -n "$error" ]; then
@@ -81,6 +159,26 @@ if [ -f "deployment-results.json" ] && [ "$total_workspaces" -gt 0 ]; then
             fi
         fi
     done
+}
+
+# List workspaces with individual status from JSON, per environment for multi-environment runs
+if [ -f "$RESULTS_FILE" ] && [ "$total_workspaces" -gt 0 ]; then
+    section_count=$(jq -r '(.environments // []) | length' "$RESULTS_FILE")
+    if [ "$section_count" -gt 0 ]; then
+        for index in $(seq 0 $((section_count - 1))); do
+            jq -r --argjson index "$index" '.environments[$index]
+                | "#### Deployment Results - \(.environment): \(.successful_count)/\(.total_workspaces) successful"' \
+                "$RESULTS_FILE" >> $GITHUB_STEP_SUMMARY
+            echo "" >> $GITHUB_STEP_SUMMARY
+            render_workspaces ".environments[$index].workspaces"
+            echo "" >> $GITHUB_STEP_SUMMARY
+        done
+        jq -r '(.gated_environments // [])[] | "- **Not deployed**: \(.) (promotion gate)"' "$RESULTS_FILE" >> $GITHUB_STEP_SUMMARY
+    else
+        echo "#### Deployment Results:" >> $GITHUB_STEP_SUMMARY
+        echo "" >> $GITHUB_STEP_SUMMARY
+        render_workspaces ".workspaces"
+    fi
 fi
 
 echo "Deployment summary generated successfully"
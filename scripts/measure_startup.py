@@ -0,0 +1,151 @@
+"""Measure CLI entry point import time with ``python -X importtime``.
+
+Each entry point module is imported in a fresh interpreter with
+``-X importtime``; the per-module lines written to stderr are parsed to get the
+cumulative import time of the entry point and the list of modules it pulled in.
+An entry point fails the check if it exceeds the startup budget or imports one
+of the heavy modules (fabric_cicd, azure.identity) at module import time.
+
+Usage:
+    python -m scripts.measure_startup
+    python -m scripts.measure_startup --budget_ms 200 --top 15 scripts.deploy_to_fabric
+"""
+
+import argparse
+import re
+import subprocess
+import sys
+from dataclasses import dataclass
+
+from .common.logger import get_logger
+from .fabric.config import (
+    EXIT_FAILURE,
+    EXIT_SUCCESS,
+    HEAVY_IMPORT_MODULES,
+    SEPARATOR_LONG,
+    STARTUP_ENTRY_POINTS,
+    STARTUP_IMPORT_BUDGET_MS,
+)
+
+logger = get_logger(__name__)
+
+# "import time:       302 |      76447 |     azure.identity"
+IMPORTTIME_LINE_RE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S.*)$")
+
+
+@dataclass(frozen=True)
+class ImportRecord:
+    """One ``-X importtime`` line."""
+
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+@dataclass(frozen=True)
+class ImportProfile:
+    """Parsed import profile for one entry point module."""
+
+    entry_point: str
+    records: tuple[ImportRecord, ...]
+
+    @property
+    def cumulative_ms(self) -> float:
+        """Cumulative import time of the entry point module in milliseconds."""
+        for record in self.records:
+            if record.module == self.entry_point:
+                return record.cumulative_us / 1000
+        return 0.0
+
+    @property
+    def modules(self) -> set[str]:
+        """Every module imported while importing the entry point."""
+        return {record.module for record in self.records}
+
+    def heavy_modules(self, heavy: tuple[str, ...] = HEAVY_IMPORT_MODULES) -> list[str]:
+        """Return the heavy modules (or their submodules) that were imported."""
+        return sorted(m for m in self.modules if any(m == h or m.startswith(h + ".") for h in heavy))
+
+    def slowest(self, count: int) -> list[ImportRecord]:
+        """Return the modules with the highest self time."""
+        return sorted(self.records, key=lambda r: r.self_us, reverse=True)[:count]
+
+
+def parse_importtime(stderr: str) -> list[ImportRecord]:
+    """Parse ``-X importtime`` stderr output into records (non-matching lines are ignored)."""
+    records: list[ImportRecord] = []
+    for line in stderr.splitlines():
+        match = IMPORTTIME_LINE_RE.match(line)
+        if match:
+            records.append(
+                ImportRecord(
+                    module=match.group(4).strip(),
+                    self_us=int(match.group(1)),
+                    cumulative_us=int(match.group(2)),
+                    depth=len(match.group(3)) // 2,
+                )
+            )
+    return records
+
+
+def measure_import(entry_point: str, runs: int = 3, python: str = sys.executable) -> ImportProfile:
+    """Import a module in fresh interpreters and return the fastest run's profile.
+
+    Raises:
+        RuntimeError: If the module cannot be imported
+    """
+    best: ImportProfile | None = None
+    for _ in range(max(runs, 1)):
+        completed = subprocess.run(
+            [python, "-X", "importtime", "-c", f"import {entry_point}"],
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        if completed.returncode != 0:
+            raise RuntimeError(f"Importing {entry_point} failed:\n{completed.stderr.strip()}")
+        profile = ImportProfile(entry_point=entry_point, records=tuple(parse_importtime(completed.stderr)))
+        if best is None or profile.cumulative_ms < best.cumulative_ms:
+            best = profile
+    assert best is not None
+    return best
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Measure entry point import times and enforce the startup budget."""
+    parser = argparse.ArgumentParser(description="Measure CLI entry point import time with -X importtime.")
+    parser.add_argument("entry_points", nargs="*", default=list(STARTUP_ENTRY_POINTS), help="Modules to import")
+    parser.add_argument("--budget_ms", type=float, default=STARTUP_IMPORT_BUDGET_MS, help="Import budget per module")
+    parser.add_argument("--runs", type=int, default=3, help="Fresh-interpreter runs per module (fastest wins)")
+    parser.add_argument("--top", type=int, default=5, help="Show this many slowest modules per entry point")
+    args = parser.parse_args(argv)
+
+    logger.info(SEPARATOR_LONG)
+    logger.info(f"Startup import budget: {args.budget_ms:.0f} ms per entry point")
+    logger.info(SEPARATOR_LONG)
+
+    failed = False
+    for entry_point in args.entry_points:
+        try:
+            profile = measure_import(entry_point, runs=args.runs)
+        except RuntimeError as e:
+            logger.error(f"[FAIL] {e!s}")
+            failed = True
+            continue
+
+        heavy = profile.heavy_modules()
+        over_budget = profile.cumulative_ms > args.budget_ms
+        status = "[FAIL]" if heavy or over_budget else "[OK]"
+        logger.info(f"{status} {entry_point}: {profile.cumulative_ms:.1f} ms ({len(profile.records)} modules)")
+        for record in profile.slowest(args.top):
+            logger.info(f"    {record.self_us / 1000:7.1f} ms  {record.module}")
+        if heavy:
+            logger.error(f"    Heavy modules imported at startup: {', '.join(heavy)}")
+        failed = failed or bool(heavy) or over_budget
+
+    return EXIT_FAILURE if failed else EXIT_SUCCESS
+
+
+if __name__ == "__main__":
+    sys.exit(main())
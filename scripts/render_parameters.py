@@ -0,0 +1,232 @@
+"""Render parameterized workspace item files locally for every environment.
+
+Applies the find_replace rules from each workspace's parameter.yml (including
+``extend`` templates) to every item file and writes one rendered tree per
+environment. No Fabric API calls are made and fabric-cicd is not imported.
+
+``$workspace.id`` and ``$items.<ItemType>.<ItemName>.id`` tokens in replace
+values are resolved from an optional ID map (YAML or JSON):
+
+    dev:
+      "Fabric BI End2End":
+        workspace_id: "11111111-1111-1111-1111-111111111111"
+        items:
+          Lakehouse:
+            lakehouse_bronze: "22222222-2222-2222-2222-222222222222"
+
+Tokens without an entry in the map are left in place and reported.
+
+Usage:
+    python -m scripts.render_parameters --workspaces_directory workspaces
+    python -m scripts.render_parameters --workspaces_directory workspaces \\
+        --environments dev,prod --id_map ids.yml --output_directory rendered
+"""
+
+import argparse
+import sys
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+from .common.logger import get_logger
+from .fabric.config import (
+    CONFIG_FILE,
+    EXIT_FAILURE,
+    EXIT_SUCCESS,
+    PARAMETER_FILE,
+    PROMOTION_ORDER,
+    RENDER_OUTPUT_DIRECTORY,
+    SEPARATOR_LONG,
+    SEPARATOR_SHORT,
+)
+from .fabric.environments import parse_environments
+from .fabric.parameters import item_type_from_path, load_rules
+from .fabric.rendering import EnvironmentIds, ReplacementEngine
+from .fabric.workspace_model import WorkspaceModel, load_workspace_model
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class RenderStats:
+    """Counters collected while rendering one workspace."""
+
+    workspace_folder: str
+    files: int = 0
+    bytes_scanned: int = 0
+    matches: int = 0
+    replacements: dict[str, int] = field(default_factory=dict)  # environment -> replaced spans
+    unresolved_tokens: dict[str, set[str]] = field(default_factory=dict)  # environment -> tokens
+
+
+def load_id_map(id_map_file: Path | None) -> dict[str, dict[str, EnvironmentIds]]:
+    """Load the environment -> workspace folder -> deployed IDs mapping.
+
+    Raises:
+        FileNotFoundError: If the ID map file doesn't exist
+        ValueError: If the ID map is not a mapping
+    """
+    if id_map_file is None:
+        return {}
+    if not id_map_file.exists():
+        raise FileNotFoundError(f"ID map not found: {id_map_file}")
+
+    raw: Any = yaml.safe_load(id_map_file.read_text(encoding="utf-8")) or {}
+    if not isinstance(raw, dict):
+        raise ValueError(f"ID map must be a mapping of environment -> workspace -> IDs: {id_map_file}")
+
+    return {
+        str(environment): {
+            str(workspace): EnvironmentIds.from_dict(ids) for workspace, ids in (workspaces or {}).items()
+        }
+        for environment, workspaces in raw.items()
+    }
+
+
+def iter_item_files(workspace_dir: Path, workspace: WorkspaceModel | None = None) -> Iterator[tuple[Path, Path, str]]:
+    """Yield ``(absolute path, path relative to workspace, item type)`` for every item file."""
+    if workspace is not None:
+        candidates = [workspace_dir / relative for relative in workspace.files]
+    else:
+        candidates = [path for path in sorted(workspace_dir.rglob("*")) if path.is_file()]
+    for file_path in candidates:
+        rel = file_path.relative_to(workspace_dir)
+        item_type = item_type_from_path(rel)
+        if item_type == "Unknown":
+            continue
+        yield file_path, rel, item_type
+
+
+def render_workspace(
+    workspace_folder: str,
+    workspaces_dir: Path,
+    output_dir: Path,
+    environments: list[str],
+    id_map: dict[str, dict[str, EnvironmentIds]],
+    workspace: WorkspaceModel | None = None,
+) -> RenderStats:
+    """Render every item file of one workspace for all requested environments.
+
+    Each file is read and matched once; the match list is then spliced per environment
+    and written to ``<output_dir>/<environment>/<workspace_folder>/<relative path>``.
+    """
+    workspace_dir = workspaces_dir / workspace_folder
+    rules = list(workspace.rules) if workspace is not None else load_rules(workspace_dir / PARAMETER_FILE)
+    engine = ReplacementEngine(rules)
+    stats = RenderStats(workspace_folder=workspace_folder)
+
+    replacements = {}
+    unresolved = {}
+    for environment in environments:
+        ids = id_map.get(environment, {}).get(workspace_folder, EnvironmentIds())
+        replacements[environment], unresolved[environment] = engine.replacements_for(environment, ids)
+        stats.unresolved_tokens[environment] = set()
+        stats.replacements[environment] = 0
+
+    for file_path, rel, item_type in iter_item_files(workspace_dir, workspace):
+        raw = file_path.read_bytes()
+        stats.files += 1
+        stats.bytes_scanned += len(raw)
+
+        try:
+            text = raw.decode("utf-8")
+        except UnicodeDecodeError:
+            text = None
+
+        # fabric-cicd never parameterizes .platform files
+        matches = engine.find_matches(text, item_type, rel) if text is not None and rel.name != ".platform" else []
+        stats.matches += len(matches)
+
+        for environment in environments:
+            target = output_dir / environment / workspace_folder / rel
+            target.parent.mkdir(parents=True, exist_ok=True)
+            if text is None or not matches:
+                target.write_bytes(raw)
+                continue
+            env_replacements = replacements[environment]
+            for match in matches:
+                if env_replacements[match.rule_index] is not None:
+                    stats.replacements[environment] += 1
+                stats.unresolved_tokens[environment].update(unresolved[environment].get(match.rule_index, []))
+            # newline="" keeps the original line endings untouched
+            with open(target, "w", encoding="utf-8", newline="") as f:
+                f.write(engine.apply(text, matches, env_replacements))
+
+    return stats
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Render parameterized item files for the requested environments."""
+    parser = argparse.ArgumentParser(
+        description="Apply parameter.yml find_replace rules locally and write rendered trees per environment."
+    )
+    parser.add_argument("--workspaces_directory", required=True, help="Path to the workspaces directory")
+    parser.add_argument(
+        "--output_directory",
+        default=RENDER_OUTPUT_DIRECTORY,
+        help=f"Directory for rendered trees (default: {RENDER_OUTPUT_DIRECTORY})",
+    )
+    parser.add_argument(
+        "--environments",
+        default=",".join(PROMOTION_ORDER),
+        help="Comma-separated environments to render (default: all)",
+    )
+    parser.add_argument("--id_map", default=None, help="YAML/JSON file with deployed workspace and item IDs")
+    parser.add_argument("--workspace_filter", default=None, help="Only render this workspace folder name")
+    args = parser.parse_args(argv)
+
+    workspaces_dir = Path(args.workspaces_directory).resolve()
+    if not workspaces_dir.is_dir():
+        logger.error(f"ERROR: workspaces directory not found: {workspaces_dir}")
+        return EXIT_FAILURE
+
+    try:
+        environments = parse_environments(args.environments)
+        id_map = load_id_map(Path(args.id_map) if args.id_map else None)
+    except (ValueError, FileNotFoundError, yaml.YAMLError) as e:
+        logger.error(f"ERROR: {e!s}")
+        return EXIT_FAILURE
+
+    model = load_workspace_model(workspaces_dir)
+    workspace_folders = model.folders
+    if args.workspace_filter:
+        workspace_folders = [w for w in workspace_folders if w == args.workspace_filter]
+    if not workspace_folders:
+        logger.error(f"ERROR: No workspaces with {CONFIG_FILE} found in {workspaces_dir}")
+        return EXIT_FAILURE
+
+    output_dir = Path(args.output_directory).resolve()
+
+    logger.info(SEPARATOR_LONG)
+    logger.info("Fabric CI/CD - Local Parameter Renderer")
+    logger.info(SEPARATOR_LONG)
+    logger.info(f"Environments: {', '.join(environments)}")
+    logger.info(f"Output directory: {output_dir}\n")
+
+    start = time.perf_counter()
+    for workspace_folder in workspace_folders:
+        stats = render_workspace(
+            workspace_folder, workspaces_dir, output_dir, environments, id_map, model.get(workspace_folder)
+        )
+        logger.info(SEPARATOR_SHORT)
+        logger.info(f"Workspace: {workspace_folder}")
+        logger.info(f"  Files rendered: {stats.files} ({stats.bytes_scanned} bytes, {stats.matches} match(es))")
+        for environment in environments:
+            logger.info(f"  {environment}: {stats.replacements[environment]} replacement(s)")
+            unresolved = stats.unresolved_tokens[environment]
+            if unresolved:
+                logger.warning(
+                    f"  [WARN] {environment}: unresolved token(s) left in place: {', '.join(sorted(unresolved))}"
+                )
+
+    logger.info(f"\n{SEPARATOR_LONG}")
+    logger.info(f"[OK] Rendered {len(workspace_folders)} workspace(s) in {time.perf_counter() - start:.3f}s")
+    return EXIT_SUCCESS
+
+
+if __name__ == "__main__":
+    sys.exit(main())
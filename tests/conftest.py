@@ -1,12 +1,44 @@
 
 """Pytest configuration and fixtures for dc-fabric-cicd tests."""
 
+import json
+import shutil
+from collections.abc import Callable
 from pathlib import Path
 from typing import Any
 from unittest.mock import MagicMock
 
 import pytest
 
+from scripts.cli import main as cli_main
+from scripts.common.logger import shutdown_logging
+
+REPOSITORY_WORKSPACES = Path(__file__).resolve().parent.parent / "workspaces"
+WORKSPACE = "Fabric BI End2End"  # the repository workspace the generate-* subcommands write to
+
+
+def _remove_maintenance(workspace_dir: Path) -> None:
+    shutil.rmtree(workspace_dir / "1_Bronze/maintenance/nb_maintain_bronze_tables.Notebook")
+    pipeline = workspace_dir / "1_Bronze/pl_ingest_bronze_data.DataPipeline/pipeline-content.json"
+    content = json.loads(pipeline.read_text())
+    activities = content["properties"]["activities"]
+    content["properties"]["activities"] = [a for a in activities if a["type"] != "TridentNotebook"]
+    pipeline.write_text(json.dumps(content, indent=2))
+
+
+def _remove_shortcuts(workspace_dir: Path) -> None:
+    for lakehouse in ("2_Silver/lakehouse_silver.Lakehouse", "3_Gold/lakehouse_gold.Lakehouse"):
+        (workspace_dir / lakehouse / "shortcuts.metadata.json").write_text("[]")
+
+
+# generate-* subcommand -> (removes its output from a copied workspace, options the committed output uses)
+GENERATORS: dict[str, tuple[Callable[[Path], None], list[str]]] = {
+    "generate-aggregates": (lambda workspace_dir: shutil.rmtree(workspace_dir / "3_Gold/aggregates"), []),
+    "generate-maintenance": (_remove_maintenance, ["--zorder", "dbo.fact_sale=InvoiceDateKey"]),
+    "generate-shortcuts": (_remove_shortcuts, []),
+    "generate-silver": (lambda workspace_dir: shutil.rmtree(workspace_dir / "2_Silver/transformations"), []),
+}
+
 
 @pytest.fixture
 def mock_azure_credential():
@@ -68,3 +100,43 @@ def mock_env_vars(monkeypatch):
     for key, value in env_vars.items():
         monkeypatch.setenv(key, value)
     return env_vars
+
+
+@pytest.fixture(autouse=True)
+def reset_logging_backend():
+    """Stop the queue logging backend if a test (or an entry point's main) started it."""
+    yield
+    shutdown_logging()
+
+
+@pytest.fixture
+def copy_workspaces(tmp_path) -> Callable[[str], Path]:
+    """Return a function copying the repository workspaces without one generator's output."""
+
+    def copy(command: str) -> Path:
+        target = tmp_path / "workspaces"
+        shutil.copytree(REPOSITORY_WORKSPACES, target)
+        remove_output, _ = GENERATORS[command]
+        remove_output(target / WORKSPACE)
+        return target
+
+    return copy
+
+
+@pytest.fixture(params=sorted(GENERATORS))
+def generator_command(request) -> str:
+    """Return each generate-* subcommand (override with parametrize for one generator)."""
+    return request.param
+
+
+@pytest.fixture
+def generated_workspaces(generator_command, copy_workspaces) -> Path:
+    """Regenerate one generator's output in a repository copy: --check fails before, passes after."""
+    workspaces_dir = copy_workspaces(generator_command)
+    _, options = GENERATORS[generator_command]
+    args = [generator_command, "--workspaces_directory", str(workspaces_dir), *options]
+
+    assert cli_main([*args, "--check"]) == 1
+    assert cli_main(args) == 0
+    assert cli_main([*args, "--check"]) == 0
+    return workspaces_dir
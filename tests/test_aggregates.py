@@ -0,0 +1,125 @@
+"""Tests for the gold aggregate notebook generator (fabric generate-aggregates)."""
+
+from pathlib import Path
+
+import pytest
+
+from scripts.cli import main as cli_main
+from scripts.fabric.aggregates import Measure, generate_aggregates, load_aggregates, parse_aggregates
+from scripts.fabric.config import AGGREGATE_SPEC_FILE
+from scripts.fabric.rendering import ReplacementEngine
+from scripts.fabric.workspace_model import load_workspace_model
+
+from .conftest import REPOSITORY_WORKSPACES, WORKSPACE
+
+AGGREGATES_DIR = "3_Gold/aggregates"
+DAILY_DIR = f"{AGGREGATES_DIR}/nb_refresh_agg_sales_by_day_city_stock_item.Notebook"
+MONTHLY_DIR = f"{AGGREGATES_DIR}/nb_refresh_agg_sales_by_month_city_stock_item.Notebook"
+MONTHLY = f"{MONTHLY_DIR}/notebook-content.py"
+GOLD_ID = "891b5122-7b7e-ac11-4b8a-52fbba67fe0f"
+DEFAULT_SPEC = REPOSITORY_WORKSPACES / WORKSPACE / AGGREGATE_SPEC_FILE
+
+
+@pytest.fixture
+def workspaces_dir(copy_workspaces):
+    """Copy the repository workspaces without the generated aggregate notebooks."""
+    return copy_workspaces("generate-aggregates")
+
+
+def generate(workspaces_dir: Path, specs=None) -> tuple[dict[str, str], list[str]]:
+    """Generate the aggregate notebooks of the copied workspace."""
+    (workspace,) = load_workspace_model(workspaces_dir).workspaces
+    specs = load_aggregates(DEFAULT_SPEC) if specs is None else specs
+    return generate_aggregates(workspace, "3_Gold", "lakehouse_gold", "lakehouse_silver", specs)
+
+
+class TestParseAggregates:
+    """Test suite for the declarative aggregate spec."""
+
+    def test_default_spec(self):
+        """Test that the default spec aggregates sales per day and per month by city and stock item."""
+        daily, monthly = load_aggregates(DEFAULT_SPEC)
+
+        assert (daily.grain, monthly.grain) == ("day", "month")
+        assert monthly.keys == ("CityKey", "StockItemKey")
+        assert Measure("Sales", "count", "*") in monthly.measures
+        assert monthly.notebook == "nb_refresh_agg_sales_by_month_city_stock_item"
+        assert monthly.parameters("lakehouse_silver")["source_table"] == "lakehouse_silver.dbo.fact_sale"
+
+    def test_invalid_specs(self):
+        """Test that unknown grains and functions, clashing columns and clashing notebooks are rejected."""
+        base = {"source": "dbo.fact_sale", "date_column": "InvoiceDateKey", "measures": {"Sales": "count(*)"}}
+
+        with pytest.raises(ValueError, match="grain must be one of day, month"):
+            parse_aggregates({"agg": {**base, "grain": "week"}})
+        with pytest.raises(ValueError, match="Profit must be one of"):
+            parse_aggregates({"agg": {**base, "measures": {"Profit": "median(Profit)"}}})
+        with pytest.raises(ValueError, match="only count accepts"):
+            parse_aggregates({"agg": {**base, "measures": {"Profit": "sum(*)"}}})
+        with pytest.raises(ValueError, match="CityKey appear more than once"):
+            parse_aggregates({"agg": {**base, "keys": ["CityKey"], "measures": {"CityKey": "max(CityKey)"}}})
+        with pytest.raises(ValueError, match="source"):
+            parse_aggregates({"agg": {**base, "source": "silver.dbo.fact_sale"}})
+        with pytest.raises(ValueError, match="nb_refresh_agg"):
+            parse_aggregates({"dbo.agg": base, "gold.agg": base})
+
+
+class TestGenerateAggregates:
+    """Test suite for the generated refresh notebooks."""
+
+    def test_notebooks_attach_to_gold_and_carry_the_spec(self, workspaces_dir):
+        """Test that each aggregate gets a gold notebook whose parameters describe it."""
+        files, stale = generate(workspaces_dir)
+
+        assert len(files) == 4
+        assert stale == []
+        notebook = files[MONTHLY]
+        assert f'# META       "default_lakehouse": "{GOLD_ID}",' in notebook
+        assert "grain = 'month'" in notebook
+        assert "keys = '[\"CityKey\", \"StockItemKey\"]'" in notebook
+        assert "full_refresh = False" in notebook
+        assert 'option("readChangeFeed", "true")' in notebook
+        assert 'option("replaceWhere", f"period IN ({listed})")' in notebook
+
+    def test_default_lakehouse_is_rewritten_by_the_gold_rule(self, workspaces_dir):
+        """Test that the gold default_lakehouse rule, and no literal rule, matches the generated header."""
+        files, _ = generate(workspaces_dir)
+        (workspace,) = load_workspace_model(workspaces_dir).workspaces
+        engine = ReplacementEngine(list(workspace.rules))
+
+        matches = engine.find_matches(files[MONTHLY], "Notebook", Path(MONTHLY))
+
+        replaced = {workspace.rules[m.rule_index].replace_values["_ALL_"] for m in matches}
+        assert replaced == {"$items.Lakehouse.lakehouse_gold.$id", "$workspace.$id"}
+
+    def test_spec_file_and_removed_aggregates(self, workspaces_dir, tmp_path):
+        """Test that a YAML spec drives the notebooks and notebooks no longer in it are reported."""
+        assert cli_main(["generate-aggregates", "--workspaces_directory", str(workspaces_dir)]) == 0
+        spec = tmp_path / "gold_aggregates.yml"
+        spec.write_text(
+            "agg_profit_by_day:\n"
+            "  source: dbo.fact_sale\n"
+            "  date_column: InvoiceDateKey\n"
+            "  grain: day\n"
+            "  measures: {Profit: SUM(Profit)}\n"
+        )
+
+        files, stale = generate(workspaces_dir, load_aggregates(spec))
+
+        assert f"{AGGREGATES_DIR}/nb_refresh_agg_profit_by_day.Notebook/notebook-content.py" in files
+        assert stale == [DAILY_DIR, MONTHLY_DIR]
+        (workspace,) = load_workspace_model(workspaces_dir).workspaces
+        with pytest.raises(KeyError, match="lakehouse_platinum"):
+            generate_aggregates(workspace, "3_Gold", "lakehouse_gold", "lakehouse_platinum", [])
+
+
+class TestGenerateAggregatesCommand:
+    """Test suite for the generate-aggregates subcommand."""
+
+    def test_workspace_without_spec_fails(self, workspaces_dir):
+        """Test that a workspace with the gold lakehouse but no spec file fails unless --spec is given."""
+        (workspaces_dir / WORKSPACE / AGGREGATE_SPEC_FILE).unlink()
+        args = ["generate-aggregates", "--workspaces_directory", str(workspaces_dir)]
+
+        assert cli_main(args) == 1
+        assert cli_main([*args, "--spec", str(DEFAULT_SPEC)]) == 0
@@ -0,0 +1,107 @@
+"""Tests for resumable deployments (scripts.fabric.checkpoint)."""
+
+import json
+from unittest.mock import patch
+
+from scripts.deploy_to_fabric import deploy_all_workspaces
+from scripts.fabric.checkpoint import DeploymentCheckpoint, checkpoint_path, resolve_commit_sha
+from scripts.fabric.reporting import build_deployment_results_json
+from scripts.fabric.types import DeploymentResult, DeploymentSummary
+
+SHA = "0123456789abcdef0123456789abcdef01234567"
+
+
+def open_checkpoint(tmp_path, resume, fingerprint="fp-1"):
+    return DeploymentCheckpoint.open("test", fingerprint, resume, commit_sha=SHA, directory=tmp_path)
+
+
+class TestDeploymentCheckpoint:
+    """Test suite for DeploymentCheckpoint."""
+
+    def test_resume_without_checkpoint_starts_fresh(self, tmp_path):
+        """Test that resuming with no checkpoint file starts a fresh run."""
+        checkpoint = open_checkpoint(tmp_path, resume=True)
+
+        assert checkpoint.resumed is False
+        assert checkpoint.completed == {}
+
+    def test_completed_workspaces_are_persisted_and_resumed(self, tmp_path):
+        """Test that completed workspaces survive into a resumed run."""
+        open_checkpoint(tmp_path, resume=False).mark_completed(DeploymentResult("WS1", "[T] WS1", True, duration=3.0))
+
+        checkpoint = open_checkpoint(tmp_path, resume=True)
+
+        assert checkpoint.resumed is True
+        assert checkpoint.is_completed("WS1")
+        assert not checkpoint.is_completed("WS2")
+        assert checkpoint.resumed_result("WS1") == DeploymentResult("WS1", "[T] WS1", True, resumed=True, attempts=0)
+        stored = json.loads(checkpoint_path(SHA, "test", tmp_path).read_text())
+        assert (stored["commit_sha"], stored["environment"]) == (SHA, "test")
+
+    def test_fresh_run_ignores_existing_checkpoint(self, tmp_path):
+        """Test that without resume earlier progress is not used."""
+        open_checkpoint(tmp_path, resume=False).mark_completed(DeploymentResult("WS1", "[T] WS1", True))
+
+        assert open_checkpoint(tmp_path, resume=False).is_completed("WS1") is False
+
+    def test_checkpoint_for_other_tree_is_ignored(self, tmp_path):
+        """Test that a checkpoint written for a different workspace fingerprint is ignored."""
+        open_checkpoint(tmp_path, resume=False).mark_completed(DeploymentResult("WS1", "[T] WS1", True))
+
+        checkpoint = open_checkpoint(tmp_path, resume=True, fingerprint="fp-2")
+
+        assert checkpoint.resumed is False
+        assert checkpoint.completed == {}
+
+    def test_commit_sha_from_github_env(self, monkeypatch):
+        """Test that GITHUB_SHA takes precedence over git."""
+        monkeypatch.setenv("GITHUB_SHA", SHA)
+
+        assert resolve_commit_sha() == SHA
+
+
+class TestResumedDeployment:
+    """Test suite for deploying with a checkpoint."""
+
+    @patch("scripts.deploy_to_fabric.deploy_workspace")
+    def test_completed_workspaces_are_skipped(self, mock_deploy, tmp_path, mock_azure_credential):
+        """Test that only workspaces missing from the checkpoint are deployed and recorded."""
+        open_checkpoint(tmp_path, resume=False).mark_completed(DeploymentResult("WS1", "[T] WS1", True))
+        checkpoint = open_checkpoint(tmp_path, resume=True)
+        mock_deploy.return_value = DeploymentResult("WS2", "[T] WS2", True)
+
+        results = deploy_all_workspaces(
+            ["WS1", "WS2"], "workspaces", "test", mock_azure_credential, checkpoint=checkpoint
+        )
+
+        assert mock_deploy.call_count == 1
+        assert mock_deploy.call_args.kwargs["workspace_folder"] == "WS2"
+        assert [(r.workspace_folder, r.resumed) for r in results] == [("WS1", True), ("WS2", False)]
+        assert open_checkpoint(tmp_path, resume=True).is_completed("WS2")
+
+    @patch("scripts.deploy_to_fabric.deploy_workspace")
+    def test_failed_workspace_is_not_checkpointed(self, mock_deploy, tmp_path, mock_azure_credential):
+        """Test that failed workspaces are retried by the next resumed run."""
+        mock_deploy.return_value = DeploymentResult("WS1", "WS1", False, "boom")
+
+        deploy_all_workspaces(
+            ["WS1"], "workspaces", "test", mock_azure_credential, checkpoint=open_checkpoint(tmp_path, resume=False)
+        )
+
+        assert open_checkpoint(tmp_path, resume=True).is_completed("WS1") is False
+
+    def test_summary_records_resumed_and_fresh_work(self):
+        """Test that the results JSON reports resumed vs fresh workspaces."""
+        summary = DeploymentSummary(
+            environment="test",
+            duration=10.0,
+            results=[DeploymentResult("WS1", "[T] WS1", True, resumed=True), DeploymentResult("WS2", "[T] WS2", True)],
+            resumed=True,
+        )
+
+        payload = build_deployment_results_json(summary)
+
+        assert (summary.resumed_count, summary.fresh_count) == (1, 1)
+        assert payload["resumed"] is True
+        assert payload["resumed_count"] == 1
+        assert [ws["resumed"] for ws in payload["workspaces"]] == [True, False]
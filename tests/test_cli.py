@@ -0,0 +1,115 @@
+"""Tests for the single-process fabric CLI (scripts.cli)."""
+
+from unittest.mock import patch
+
+import pytest
+
+from scripts.cli import build_parser, main, run_all, run_plan
+from scripts.fabric.workspace_model import build_workspace_model
+
+
+class TestBuildParser:
+    """Test suite for CLI argument parsing."""
+
+    @pytest.mark.parametrize("command", ["plan", "deploy", "all"])
+    def test_environment_required(self, command):
+        """Test that deploying subcommands require a valid environment."""
+        with pytest.raises(SystemExit):
+            build_parser().parse_args([command, "--workspaces_directory", "workspaces", "--environment", "staging"])
+
+    def test_scan_has_no_environment(self):
+        """Test that scan only needs the workspaces directory."""
+        args = build_parser().parse_args(["scan", "--workspaces_directory", "workspaces"])
+
+        assert args.command == "scan"
+        assert args.workspace_filter is None
+
+
+class TestRunAll:
+    """Test suite for the combined scan + deploy command."""
+
+    @patch("scripts.cli.run_deployment")
+    @patch("scripts.cli.run_scan", return_value=1)
+    @patch("scripts.cli.prepare_deployment")
+    def test_failed_gate_skips_deployment(self, mock_prepare, mock_scan, mock_deploy, temp_workspace_dir):
+        """Test that no deployment happens when the unmapped-ID gate fails."""
+        model = build_workspace_model(temp_workspace_dir)
+
+        exit_code = run_all(temp_workspace_dir, "dev", model)
+
+        assert exit_code == 1
+        mock_deploy.assert_not_called()
+
+    @patch("scripts.cli.run_deployment", return_value=0)
+    @patch("scripts.cli.run_scan", return_value=0)
+    @patch("scripts.cli.prepare_deployment")
+    def test_shares_model_and_credential(
+        self, mock_prepare, mock_scan, mock_deploy, temp_workspace_dir, mock_azure_credential
+    ):
+        """Test that the scan and deployment reuse one model and the prepared credential."""
+        mock_prepare.return_value = mock_azure_credential
+        model = build_workspace_model(temp_workspace_dir)
+
+        exit_code = run_all(temp_workspace_dir, "test", model)
+
+        assert exit_code == 0
+        assert mock_scan.call_args.kwargs["model"] is model
+        assert mock_deploy.call_args.kwargs["model"] is model
+        assert mock_deploy.call_args.kwargs["token_credential"] is mock_azure_credential
+
+    @patch("scripts.cli.run_deployment", return_value=1)
+    @patch("scripts.cli.run_scan", return_value=0)
+    @patch("scripts.cli.prepare_deployment", side_effect=ValueError("missing secrets"))
+    def test_credential_error_is_reported_by_deployment(
+        self, mock_prepare, mock_scan, mock_deploy, temp_workspace_dir
+    ):
+        """Test that a failed preparation falls back to run_deployment's own error reporting."""
+        model = build_workspace_model(temp_workspace_dir)
+
+        assert run_all(temp_workspace_dir, "dev", model) == 1
+        assert mock_deploy.call_args.kwargs["token_credential"] is None
+
+
+class TestRunPlan:
+    """Test suite for the plan command."""
+
+    def test_plan_renders_environment_tree(self, temp_workspace_dir, tmp_path):
+        """Test that plan writes the rendered tree when an output directory is given."""
+        model = build_workspace_model(temp_workspace_dir)
+        output_dir = tmp_path / "plan"
+
+        exit_code = run_plan(temp_workspace_dir, "prod", model, str(output_dir))
+
+        assert exit_code == 0
+        assert (output_dir / "prod" / "Test Workspace" / "sample.Lakehouse" / "lakehouse.metadata.json").exists()
+
+    def test_plan_fails_for_missing_environment_name(self, temp_workspace_dir):
+        """Test that plan fails when config.yml lacks the target environment."""
+        (temp_workspace_dir / "Test Workspace" / "config.yml").write_text("core:\n  workspace:\n    dev: '[D] Only'\n")
+        model = build_workspace_model(temp_workspace_dir)
+
+        assert run_plan(temp_workspace_dir, "prod", model) == 1
+
+
+class TestMain:
+    """Test suite for main()."""
+
+    def test_main_scan(self, temp_workspace_dir, monkeypatch):
+        """Test that the scan subcommand succeeds on a clean workspace."""
+        monkeypatch.chdir(temp_workspace_dir.parent)
+
+        assert main(["scan", "--workspaces_directory", str(temp_workspace_dir)]) == 0
+
+    def test_main_missing_directory(self, tmp_path):
+        """Test that a missing workspaces directory fails fast."""
+        assert main(["scan", "--workspaces_directory", str(tmp_path / "missing")]) == 1
+
+    @pytest.mark.parametrize(
+        "command", ["generate-maintenance", "generate-shortcuts", "generate-aggregates", "generate-silver"]
+    )
+    def test_generators_fail_without_a_matching_workspace(self, temp_workspace_dir, command):
+        """Test that generators fail for an unknown --workspace_filter and when no workspace has the lakehouse."""
+        args = [command, "--workspaces_directory", str(temp_workspace_dir), "--check"]
+
+        assert main([*args, "--workspace_filter", "Nope"]) == 1
+        assert main(args) == 1
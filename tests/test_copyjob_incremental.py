@@ -0,0 +1,116 @@
+"""Tests for incremental CopyJob conversion (fabric convert-copyjobs)."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from scripts.cli import main as cli_main
+from scripts.fabric.copyjob_incremental import (
+    IncrementalTable,
+    convert_copy_job,
+    load_incremental_config,
+    validate_schema,
+)
+from scripts.fabric.copyjob_lint import RULE_WRITE_BEHAVIOR, lint_table, parse_copy_job
+
+REPOSITORY_COPY_JOB = (
+    Path(__file__).resolve().parent.parent
+    / "workspaces/Fabric BI End2End/1_Bronze/ingestion/cp_import_fact_sale.CopyJob/copyjob-content.json"
+)
+FACT_SALE = IncrementalTable("LastEditedWhen", "Upsert", ("SaleKey",), ("InvoiceDateKey",))
+
+
+def fact_sale() -> dict:
+    """Return the repository's fact_sale copy job definition."""
+    return json.loads(REPOSITORY_COPY_JOB.read_text(encoding="utf-8"))
+
+
+class TestConvert:
+    """Test suite for converting a copy job definition."""
+
+    def test_upsert_with_partitions(self):
+        """Test that the watermark, Upsert keys and partitioning are set and the result lints clean of Append."""
+        original = fact_sale()
+
+        result = convert_copy_job("cp_import_fact_sale", "cp/copyjob-content.json", original, {"fact_sale": FACT_SALE})
+
+        destination = result.content["activities"][0]["properties"]["destination"]
+        assert result.errors == []
+        assert result.content["activities"][0]["properties"]["source"]["watermarkColumn"] == "LastEditedWhen"
+        assert destination["writeBehavior"] == "Upsert"
+        assert destination["upsertSettings"] == {"keys": ["SaleKey"]}
+        assert destination["partitionOption"] == "PartitionByKey"
+        assert destination["partitionNameList"] == ["InvoiceDateKey"]
+        assert original == fact_sale()  # input untouched
+        (table,) = parse_copy_job("cp_import_fact_sale", "cp/copyjob-content.json", result.content)
+        assert RULE_WRITE_BEHAVIOR not in {f.rule for f in lint_table(table, {})}
+
+    def test_conversion_is_idempotent_and_overwrite_drops_keys(self):
+        """Test that converting twice changes nothing and switching to Overwrite removes upsertSettings."""
+        first = convert_copy_job("cp", "p", fact_sale(), {"dbo.fact_sale": FACT_SALE})
+        again = convert_copy_job("cp", "p", first.content, {"dbo.fact_sale": FACT_SALE})
+        overwrite = convert_copy_job(
+            "cp", "p", first.content, {"dbo.fact_sale": IncrementalTable("LastEditedWhen", "Overwrite")}
+        )
+
+        assert again.changes == []
+        assert "dbo.fact_sale: removed destination.upsertSettings" in overwrite.changes
+        assert "upsertSettings" not in overwrite.content["activities"][0]["properties"]["destination"]
+
+    def test_unknown_table_is_an_error(self):
+        """Test that a configured table the copy job does not copy is reported."""
+        result = convert_copy_job("cp", "p", fact_sale(), {"fact_purchase": FACT_SALE})
+
+        assert result.errors == ["table 'fact_purchase' is not copied by cp"]
+
+
+class TestValidation:
+    """Test suite for the offline schema and config validation."""
+
+    def test_schema_violations(self):
+        """Test that the repository definition is valid and type, enum and required violations are reported."""
+        content = fact_sale()
+        assert validate_schema(content) == []
+
+        properties = content["activities"][0]["properties"]
+        properties["destination"]["writeBehavior"] = "Merge"
+        properties["parallelCopies"] = True
+        del content["properties"]["jobMode"]
+
+        assert validate_schema(content) == [
+            "$.properties: missing jobMode",
+            "$.activities[0].properties.destination.writeBehavior: 'Merge' is not one of Upsert, Overwrite, Append",
+            "$.activities[0].properties.parallelCopies: expected integer",
+        ]
+
+    def test_config_validation(self, tmp_path):
+        """Test that Upsert without keys and unknown write behaviors are rejected."""
+        config = tmp_path / "incremental.yml"
+        config.write_text("cp:\n  fact_sale: {watermark_column: LastEditedWhen, key_columns: [SaleKey]}\n")
+        assert load_incremental_config(config)["cp"]["fact_sale"].key_columns == ("SaleKey",)
+
+        config.write_text("cp_import_fact_sale:\n  fact_sale: {watermark_column: LastEditedWhen}\n")
+        with pytest.raises(ValueError, match="Upsert needs key_columns"):
+            load_incremental_config(config)
+        config.write_text("cp:\n  fact_sale: {watermark_column: x, write_behavior: Merge}\n")
+        with pytest.raises(ValueError, match="write_behavior must be one of"):
+            load_incremental_config(config)
+
+    def test_command_check_then_convert(self, tmp_path):
+        """Test that --check fails while a table is pending, conversion writes it, and --check then passes."""
+        workspace = tmp_path / "workspaces" / "Sales"
+        item = workspace / "cp_import_fact_sale.CopyJob"
+        item.mkdir(parents=True)
+        (workspace / "config.yml").write_text('core:\n  workspace:\n    dev: "[D] Sales"\n')
+        (item / ".platform").write_text('{"metadata": {"type": "CopyJob", "displayName": "cp_import_fact_sale"}}')
+        (item / "copyjob-content.json").write_text(REPOSITORY_COPY_JOB.read_text(encoding="utf-8"))
+        config = tmp_path / "incremental.yml"
+        config.write_text("cp_import_fact_sale:\n  fact_sale: {watermark_column: LastEditedWhen, key_columns: Id}\n")
+        args = ["convert-copyjobs", "--workspaces_directory", str(tmp_path / "workspaces"), "--config", str(config)]
+
+        assert cli_main([*args, "--check"]) == 1
+        assert cli_main(args) == 0
+        assert cli_main([*args, "--check"]) == 0
+        converted = json.loads((item / "copyjob-content.json").read_text())
+        assert converted["activities"][0]["properties"]["source"]["watermarkColumn"] == "LastEditedWhen"
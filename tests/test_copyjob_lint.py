@@ -0,0 +1,134 @@
+"""Tests for CopyJob throughput linting and tuning overlays (fabric lint-copyjobs)."""
+
+import json
+
+import pytest
+import yaml
+
+from scripts.cli import main as cli_main
+from scripts.fabric.copyjob_lint import (
+    RULE_PARALLELISM,
+    RULE_PARTITION_DISCOVERY,
+    RULE_STAGING,
+    RULE_V_ORDER,
+    RULE_WRITE_BEHAVIOR,
+    SEVERITY_INFO,
+    SEVERITY_WARNING,
+    lint_table,
+    load_table_sizes,
+    parse_copy_job,
+    tuning_overlays,
+)
+
+ACTIVITY_ID = "f612b973-28bc-40be-9953-6d3c935ca3a9"
+
+
+def copy_job(source_type: str = "Parquet", **table_properties) -> dict:
+    """Return copyjob-content.json content copying dbo.fact_sale like the bronze copy jobs."""
+    properties = {
+        "source": {
+            "datasetSettings": {"location": {"fileName": "dbo.fact_sale.parquet", "container": "star-schema"}},
+            "storeSettings": {"recursive": True, "enablePartitionDiscovery": False},
+        },
+        "destination": {
+            "writeBehavior": "Append",
+            "datasetSettings": {"schema": "dbo", "table": "fact_sale"},
+            "applyVOrder": False,
+        },
+        "enableStaging": False,
+        **table_properties,
+    }
+    return {
+        "properties": {"jobMode": "Batch", "source": {"type": source_type}},
+        "activities": [{"id": ACTIVITY_ID, "properties": properties}],
+    }
+
+
+def findings_of(content: dict, sizes: dict | None = None) -> dict[str, str]:
+    """Return rule -> severity for the single table of a copy job."""
+    (table,) = parse_copy_job("cp_import_fact_sale", "cp.CopyJob/copyjob-content.json", content)
+    return {f.rule: f.severity for f in lint_table(table, sizes or {})}
+
+
+class TestLintRules:
+    """Test suite for the per-table lint rules."""
+
+    def test_bronze_copy_job_without_sizes(self):
+        """Test that the bronze settings flag Append and recommend V-Order and parallelism."""
+        assert findings_of(copy_job()) == {
+            RULE_WRITE_BEHAVIOR: SEVERITY_WARNING,
+            RULE_V_ORDER: SEVERITY_INFO,
+            RULE_PARALLELISM: SEVERITY_INFO,
+        }
+
+    def test_size_makes_recommendations_warnings(self):
+        """Test that a table large in prod turns V-Order and parallelism into warnings, a small one clears them."""
+        large = findings_of(copy_job(), {"fact_sale": {"dev": 40.0, "test": 40.0, "prod": 52000.0}})
+        small = findings_of(copy_job(parallelCopies=4), {"dbo.fact_sale": {"_ALL_": 10.0}})
+
+        assert large[RULE_V_ORDER] == large[RULE_PARALLELISM] == SEVERITY_WARNING
+        assert RULE_PARALLELISM not in small
+        assert small[RULE_V_ORDER] == SEVERITY_INFO
+
+    def test_staging_partition_discovery_and_incremental(self):
+        """Test staging for warehouse sources, folder sources without discovery, and incremental Append."""
+        content = copy_job("SnowflakeTable")
+        source = content["activities"][0]["properties"]["source"]
+        source["datasetSettings"]["location"] = {"folderPath": "sales/year=2026"}
+        source["watermarkColumn"] = "LastEditedWhen"
+
+        findings = findings_of(content)
+
+        assert findings[RULE_STAGING] == findings[RULE_PARTITION_DISCOVERY] == SEVERITY_WARNING
+        assert RULE_WRITE_BEHAVIOR not in findings
+
+    def test_table_sizes_file_validation(self, tmp_path):
+        """Test that sizes load per environment or for all, and non-numbers are rejected."""
+        sizes = tmp_path / "sizes.yml"
+        sizes.write_text("dbo.fact_sale: {dev: 40, prod: 52000}\ndimension_city: 12\n")
+        assert load_table_sizes(sizes) == {
+            "dbo.fact_sale": {"dev": 40.0, "prod": 52000.0},
+            "dimension_city": {"_ALL_": 12.0},
+        }
+        sizes.write_text("fact_sale: big\n")
+        with pytest.raises(ValueError, match="must be a number of MB"):
+            load_table_sizes(sizes)
+
+
+class TestTuningOverlays:
+    """Test suite for the key_value_replace template."""
+
+    def test_overlays_per_environment(self):
+        """Test that V-Order and parallelism get dev/test/prod values and missing keys are marked."""
+        (table,) = parse_copy_job("cp_import_fact_sale", "cp.CopyJob/copyjob-content.json", copy_job())
+
+        overlays = {o.setting: o for o in tuning_overlays(table, {})}
+        small = [o.setting for o in tuning_overlays(table, {"fact_sale": {"_ALL_": 10.0}})]
+
+        v_order = overlays["applyVOrder"]
+        assert v_order.find_key == f'$.activities[?(@.id=="{ACTIVITY_ID}")].properties.destination.applyVOrder'
+        assert v_order.values == {"dev": False, "test": False, "prod": True}
+        assert v_order.present
+        assert overlays["parallelCopies"].values == {"dev": 4, "test": 8, "prod": 32}
+        assert not overlays["parallelCopies"].present
+        assert small == ["applyVOrder"]
+
+    def test_command_writes_template(self, tmp_path):
+        """Test that lint-copyjobs writes a key_value_replace template loadable as YAML."""
+        workspace = tmp_path / "workspaces" / "Sales"
+        item = workspace / "cp_import_fact_sale.CopyJob"
+        item.mkdir(parents=True)
+        (workspace / "config.yml").write_text('core:\n  workspace:\n    dev: "[D] Sales"\n')
+        platform = {"metadata": {"type": "CopyJob", "displayName": "cp_import_fact_sale"}}
+        (item / ".platform").write_text(json.dumps(platform))
+        (item / "copyjob-content.json").write_text(json.dumps(copy_job()))
+        output = tmp_path / "tuning"
+
+        args = ["lint-copyjobs", "--workspaces_directory", str(tmp_path / "workspaces")]
+        assert cli_main([*args, "--output_directory", str(output)]) == 0
+
+        template = (output / "Sales" / "cp_tuning_parameters.yml").read_text()
+        assert "#   cp_import_fact_sale dbo.fact_sale: parallelCopies\n" in template
+        entries = yaml.safe_load(template)["key_value_replace"]
+        assert [e["item_name"] for e in entries] == ["cp_import_fact_sale"] * 3
+        assert entries[0]["replace_value"]["prod"] is True
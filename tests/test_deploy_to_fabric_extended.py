@@ -352,3 +352,23 @@ class TestDeployWorkspaceIntegration:
 
         assert result.success is False
         assert "API connection error" in result.error_message
+
+    @patch("scripts.deploy_to_fabric.deploy_with_config")
+    def test_deploy_workspace_uses_model_config(self, mock_deploy, temp_workspace_dir, mock_azure_credential):
+        """Test deploy_workspace reads config from the workspace model instead of re-parsing config.yml."""
+        from scripts.deploy_to_fabric import deploy_workspace
+        from scripts.fabric.workspace_model import build_workspace_model
+
+        workspace = build_workspace_model(temp_workspace_dir).get("Test Workspace")
+        (temp_workspace_dir / "Test Workspace" / "config.yml").unlink()
+
+        result = deploy_workspace(
+            workspace_folder="Test Workspace",
+            workspaces_dir=str(temp_workspace_dir),
+            environment="prod",
+            token_credential=mock_azure_credential,
+            workspace=workspace,
+        )
+
+        assert result.success is True
+        assert result.workspace_name == "[P] Test Workspace"
@@ -0,0 +1,184 @@
+"""Tests for the deployment history store (scripts.fabric.history, scripts.deployment_history)."""
+
+import json
+import zipfile
+
+import pytest
+
+from scripts.deployment_history import main as history_main
+from scripts.fabric.history import (
+    RUN_SCOPE,
+    HistoryStore,
+    import_artifacts,
+    modified_z_score,
+    parse_stream,
+    phases_from_stream,
+    render_trend_table,
+    sparkline,
+)
+
+
+def make_results(duration: float, finished_at: str, sales: float = 30.0, failed: int = 0) -> dict:
+    """Build a deployment results payload with one workspace."""
+    return {
+        "environment": "dev",
+        "commit_sha": "abc123",
+        "finished_at": finished_at,
+        "duration": duration,
+        "total_workspaces": 1,
+        "successful_count": 1 - failed,
+        "failed_count": failed,
+        "workspaces": [
+            {
+                "name": "Sales",
+                "status": "failure" if failed else "success",
+                "duration": sales,
+                "attempts": 1,
+                "resumed": False,
+            }
+        ],
+    }
+
+
+def fill_baseline(store: HistoryStore, runs: int = 8) -> None:
+    """Record a stable baseline of runs with slightly varying durations."""
+    for i in range(runs):
+        store.record(make_results(60.0 + i % 3, f"2026-01-0{i + 1}T00:00:00+00:00", sales=30.0 + i % 2))
+
+
+class TestStatistics:
+    """Test suite for the z-score and sparkline helpers."""
+
+    def test_modified_z_score(self):
+        """Test that outliers score high and an identical baseline returns None."""
+        baseline = [10.0, 11.0, 10.0, 12.0, 11.0]
+
+        assert modified_z_score(11.0, baseline) == pytest.approx(0.0)
+        assert modified_z_score(30.0, baseline) > 10
+        assert modified_z_score(10.0, [10.0, 10.0]) is None
+        assert modified_z_score(10.0, []) is None
+
+    def test_modified_z_score_falls_back_to_mean_deviation(self):
+        """Test that a baseline with MAD == 0 still yields a score."""
+        assert modified_z_score(20.0, [10.0, 10.0, 10.0, 14.0]) > 0
+
+    def test_sparkline(self):
+        """Test that the sparkline scales between min and max."""
+        assert sparkline([1.0, 2.0, 3.0]) == "▁▅█"
+        assert sparkline([5.0, 5.0]) == "▁▁"
+        assert sparkline([]) == ""
+
+    def test_parse_stream_skips_truncated_lines(self):
+        """Test that phase timings are read from a partially written stream."""
+        text = (
+            '{"event": "phase_completed", "phase": "prepare", "duration": 2.5}\n'
+            '{"event": "workspace_completed", "name": "Sales"}\n'
+            '{"event": "phase_comp'
+        )
+
+        assert phases_from_stream(parse_stream(text)) == [(RUN_SCOPE, "prepare", 2.5)]
+
+
+class TestHistoryStore:
+    """Test suite for HistoryStore."""
+
+    def test_record_is_idempotent(self, tmp_path):
+        """Test that recording the same payload twice stores one run."""
+        results = make_results(60.0, "2026-01-01T00:00:00+00:00")
+        with HistoryStore(tmp_path / "history.db") as store:
+            assert store.record(results, [(RUN_SCOPE, "prepare", 3.0)]) is True
+            assert store.record(results) is False
+            assert store.run_count("dev") == 1
+            assert store.series("dev", 10) == {
+                (RUN_SCOPE, "prepare"): [3.0],
+                (RUN_SCOPE, "total"): [60.0],
+                ("Sales", "deploy"): [30.0],
+            }
+
+    def test_failed_runs_excluded_from_total_series(self):
+        """Test that a failed run does not contribute a run total or workspace deploy timing."""
+        with HistoryStore(":memory:") as store:
+            store.record(make_results(60.0, "2026-01-01T00:00:00+00:00"))
+            store.record(make_results(5.0, "2026-01-02T00:00:00+00:00", sales=5.0, failed=1))
+
+            series = store.series("dev", 10)
+
+        assert series[(RUN_SCOPE, "total")] == [60.0]
+        assert series[("Sales", "deploy")] == [30.0]
+
+    def test_analyze_flags_slowdown(self):
+        """Test that a large slowdown against the baseline is flagged as a regression."""
+        with HistoryStore(":memory:") as store:
+            fill_baseline(store)
+            store.record(make_results(61.0, "2026-01-20T00:00:00+00:00", sales=90.0))
+            reports = {(r.workspace, r.phase): r for r in store.analyze("dev", window=10)}
+
+        assert reports[("Sales", "deploy")].is_regression()
+        assert reports[("Sales", "deploy")].change_ratio == pytest.approx(90.0 / 30.5 - 1)
+        assert not reports[(RUN_SCOPE, "total")].is_regression()
+
+    def test_short_baseline_is_not_flagged(self):
+        """Test that series with fewer runs than min_baseline are never regressions."""
+        with HistoryStore(":memory:") as store:
+            fill_baseline(store, runs=3)
+            store.record(make_results(600.0, "2026-01-20T00:00:00+00:00"))
+            reports = store.analyze("dev")
+
+        assert not any(r.is_regression() for r in reports)
+        assert "collecting baseline" in render_trend_table(reports, "dev")
+
+
+class TestImportArtifacts:
+    """Test suite for import_artifacts."""
+
+    def test_import_file_directory_and_zip(self, tmp_path):
+        """Test importing a results file with its stream, a directory and a zip artifact."""
+        run_dir = tmp_path / "run1"
+        run_dir.mkdir()
+        (run_dir / "deployment-results.json").write_text(json.dumps(make_results(60.0, "2026-01-01T00:00:00Z")))
+        (run_dir / "deployment-results.jsonl").write_text(
+            '{"event": "phase_completed", "phase": "prepare", "duration": 4.0}\n'
+        )
+        archive_path = tmp_path / "artifacts" / "run2.zip"
+        archive_path.parent.mkdir()
+        with zipfile.ZipFile(archive_path, "w") as archive:
+            archive.writestr("deployment-results.json", json.dumps(make_results(62.0, "2026-01-02T00:00:00Z")))
+
+        with HistoryStore(":memory:") as store:
+            assert import_artifacts(store, [run_dir / "deployment-results.json"]) == (1, 0)
+            assert import_artifacts(store, [tmp_path]) == (1, 1)
+            series = store.series("dev", 10)
+
+        assert series[(RUN_SCOPE, "total")] == [60.0, 62.0]
+        assert series[(RUN_SCOPE, "prepare")] == [4.0]
+
+
+class TestMain:
+    """Test suite for the deployment_history entry point."""
+
+    def test_report_writes_step_summary_and_fails_on_regression(self, tmp_path, monkeypatch):
+        """Test that the trend table goes to GITHUB_STEP_SUMMARY and regressions fail the command."""
+        database = tmp_path / "history.db"
+        summary = tmp_path / "summary.md"
+        monkeypatch.setenv("GITHUB_STEP_SUMMARY", str(summary))
+        with HistoryStore(database) as store:
+            fill_baseline(store)
+        latest = tmp_path / "deployment-results.json"
+        latest.write_text(json.dumps(make_results(61.0, "2026-01-20T00:00:00+00:00", sales=90.0)))
+
+        assert history_main(["--database", str(database), "import", str(latest)]) == 0
+        assert history_main(["--database", str(database), "report", "--environment", "dev"]) == 0
+        assert (
+            history_main(["--database", str(database), "report", "--environment", "dev", "--fail_on_regression"])
+            == 1
+        )
+        text = summary.read_text(encoding="utf-8")
+        assert "### Deployment duration trends - dev" in text
+        assert "| Sales | deploy | 9 |" in text
+        assert "⚠️ slower" in text
+
+    def test_report_without_history(self, tmp_path, monkeypatch):
+        """Test that an empty history succeeds without writing a table."""
+        monkeypatch.delenv("GITHUB_STEP_SUMMARY", raising=False)
+
+        assert history_main(["--database", str(tmp_path / "history.db"), "report", "--environment", "prod"]) == 0
@@ -0,0 +1,21 @@
+"""Tests shared by the generate-* subcommands (maintenance, shortcuts, aggregates, silver)."""
+
+from scripts.check_unmapped_ids import run_scan
+from scripts.cli import main as cli_main
+
+from .conftest import GENERATORS, REPOSITORY_WORKSPACES
+
+
+class TestGeneratorCommands:
+    """Test suite for the check/generate round trip of every generator."""
+
+    def test_generate_then_check_and_scan(self, generated_workspaces):
+        """Test that the regenerated files pass --check and their GUIDs are covered by find_replace rules."""
+        assert run_scan(generated_workspaces) == 0
+
+    def test_repository_is_up_to_date(self, generator_command):
+        """Test that the committed files match the generator."""
+        _, options = GENERATORS[generator_command]
+        args = [generator_command, "--workspaces_directory", str(REPOSITORY_WORKSPACES), *options]
+
+        assert cli_main([*args, "--check"]) == 0
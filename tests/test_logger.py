@@ -1,9 +1,13 @@
 
 """Tests for scripts.common.logger logging configuration."""
 
+import json
 import logging
+from logging.handlers import QueueHandler
 
-from scripts.common.logger import get_logger, setup_logger
+import pytest
+
+from scripts.common.logger import configure_logging, get_logger, log_context, setup_logger, shutdown_logging
 
 
 class TestSetupLogger:
@@ -77,3 +81,75 @@ class TestGetLogger:
         logger = get_logger("test_get_logger_default")
 
         assert logger.level == logging.INFO
+
+
+class TestQueueBackend:
+    """Test suite for the QueueHandler/QueueListener logging backend."""
+
+    def test_plain_text_output_unchanged(self, capsys):
+        """Test that the queued backend renders the same plain-text lines to stdout."""
+        logger = get_logger("test_queue_plain")
+        configure_logging()
+
+        assert isinstance(logger.handlers[0], QueueHandler)
+        logger.info("\n[OK] done")
+        shutdown_logging()
+
+        assert capsys.readouterr().out == "\n[OK] done\n"
+
+    def test_json_lines_sink_carries_context(self, tmp_path):
+        """Test that JSON lines include workspace, environment and phase context."""
+        json_file = tmp_path / "logs" / "deploy.jsonl"
+        logger = get_logger("test_queue_json")
+        configure_logging(json_file)
+
+        with log_context(environment="dev", phase="deploy"):
+            with log_context(workspace="Sales"):
+                logger.warning("first")
+            logger.info("second %s", "line")
+        shutdown_logging()
+
+        lines = [json.loads(line) for line in json_file.read_text(encoding="utf-8").splitlines()]
+        assert [line["message"] for line in lines] == ["first", "second line"]
+        assert lines[0]["level"] == "WARNING"
+        assert (lines[0]["workspace"], lines[0]["environment"], lines[0]["phase"]) == ("Sales", "dev", "deploy")
+        assert "workspace" not in lines[1]
+
+    def test_json_lines_sink_keeps_exception_traceback(self, tmp_path):
+        """Test that a logged exception's traceback reaches the JSON line with the emitting thread's context."""
+        json_file = tmp_path / "deploy.jsonl"
+        logger = get_logger("test_queue_exception")
+        configure_logging(json_file)
+
+        with log_context(workspace="Sales"):
+            try:
+                raise RuntimeError("boom")
+            except RuntimeError:
+                logger.exception("[FAIL] deploy")
+        shutdown_logging()
+
+        (line,) = [json.loads(line) for line in json_file.read_text(encoding="utf-8").splitlines()]
+        assert line["message"].startswith("[FAIL] deploy\nTraceback")
+        assert line["message"].endswith("RuntimeError: boom")
+        assert line["workspace"] == "Sales"
+
+    def test_shutdown_restores_synchronous_handler(self):
+        """Test that loggers log directly again after the backend is stopped."""
+        logger = get_logger("test_queue_restore")
+        configure_logging()
+        shutdown_logging()
+
+        assert len(logger.handlers) == 1
+        assert not isinstance(logger.handlers[0], QueueHandler)
+
+    def test_new_logger_uses_queue_handler(self):
+        """Test that loggers created after configuration join the queue backend."""
+        configure_logging()
+
+        assert isinstance(get_logger("test_queue_late").handlers[0], QueueHandler)
+
+    def test_unknown_context_field_rejected(self):
+        """Test that log_context only accepts the known context fields."""
+        with pytest.raises(ValueError, match="Unknown log context"):
+            with log_context(region="eu"):
+                pass
@@ -0,0 +1,101 @@
+"""Tests for the lakehouse maintenance notebook generator (fabric generate-maintenance)."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from scripts.fabric.maintenance import (
+    MaintenancePlan,
+    generate_maintenance,
+    parse_zorder,
+    schedule_after_pipeline,
+)
+from scripts.fabric.notebooks import generated_logical_id
+from scripts.fabric.workspace_model import load_workspace_model
+
+from .conftest import WORKSPACE
+
+PIPELINE_FILE = "1_Bronze/pl_ingest_bronze_data.DataPipeline/pipeline-content.json"
+NOTEBOOK_DIR = "1_Bronze/maintenance/nb_maintain_bronze_tables.Notebook"
+BRONZE_DEV_ID = "6323ba06-e77d-4165-aac8-962913913992"
+
+
+@pytest.fixture
+def workspaces_dir(copy_workspaces):
+    """Copy the repository workspaces without the generated notebook and its activity."""
+    return copy_workspaces("generate-maintenance")
+
+
+def generate(workspaces_dir: Path, **options) -> tuple[MaintenancePlan, dict[str, str]]:
+    """Generate the bronze maintenance notebook for the copied workspace."""
+    (workspace,) = load_workspace_model(workspaces_dir).workspaces
+    names = ("1_Bronze", "lakehouse_bronze", "pl_ingest_bronze_data", "nb_maintain_bronze_tables")
+    return generate_maintenance(workspace, workspaces_dir, *names, **options)
+
+
+class TestGenerateMaintenance:
+    """Test suite for the generated notebook and pipeline activity."""
+
+    def test_tables_come_from_copy_job_destinations(self, workspaces_dir):
+        """Test that every bronze CopyJob table is maintained and the notebook attaches to the dev lakehouse."""
+        plan, files = generate(workspaces_dir, zorder={"dbo.fact_sale": ("InvoiceDateKey",)})
+
+        assert len(plan.tables) == 6
+        assert "dbo.fact_sale" in plan.tables
+        notebook = files[f"{NOTEBOOK_DIR}/notebook-content.py"]
+        assert f'# META       "default_lakehouse": "{BRONZE_DEV_ID}",' in notebook
+        assert "# PARAMETERS CELL ********************" in notebook
+        assert "zorder_columns = '{\"dbo.fact_sale\": [\"InvoiceDateKey\"]}'" in notebook
+        assert "vacuum_retention_hours = 168" in notebook
+
+    def test_activity_runs_after_all_copies(self, workspaces_dir):
+        """Test that the notebook activity depends on every copy and passes the plan as parameters."""
+        plan, files = generate(workspaces_dir, vorder=False)
+
+        activities = json.loads(files[PIPELINE_FILE])["properties"]["activities"]
+        (activity,) = [a for a in activities if a["type"] == "TridentNotebook"]
+        copies = [a["name"] for a in activities if a["type"] == "InvokeCopyJob"]
+        assert [d["activity"] for d in activity["dependsOn"]] == copies
+        assert activity["typeProperties"]["notebookId"] == generated_logical_id(WORKSPACE, NOTEBOOK_DIR)
+        assert activity["typeProperties"]["parameters"]["vorder"] == {"value": False, "type": "bool"}
+        assert activity["typeProperties"]["parameters"]["tables"]["value"] == ",".join(plan.tables)
+
+    def test_rescheduling_replaces_the_activity(self):
+        """Test that scheduling twice keeps one activity, still after the original sinks."""
+        content = {
+            "properties": {
+                "activities": [
+                    {"name": "Copy", "dependsOn": []},
+                    {"name": "Load", "dependsOn": [{"activity": "Copy", "dependencyConditions": ["Succeeded"]}]},
+                ]
+            }
+        }
+        plan = MaintenancePlan(("dbo.t",))
+
+        once = schedule_after_pipeline(content, "id", plan)
+        twice = schedule_after_pipeline(once, "id", plan)
+
+        assert twice == once
+        assert [d["activity"] for d in twice["properties"]["activities"][-1]["dependsOn"]] == ["Load"]
+
+    def test_invalid_options(self, workspaces_dir):
+        """Test that short retention, unknown Z-Order tables and malformed --zorder values are rejected."""
+        with pytest.raises(ValueError, match="at least 168 hours"):
+            generate(workspaces_dir, retention_hours=24)
+        with pytest.raises(ValueError, match="dbo.fact_purchase"):
+            generate(workspaces_dir, zorder={"dbo.fact_purchase": ("Id",)})
+        assert parse_zorder(["dbo.fact_sale=InvoiceDateKey, CustomerKey"]) == {
+            "dbo.fact_sale": ("InvoiceDateKey", "CustomerKey")
+        }
+        with pytest.raises(ValueError, match="table=column"):
+            parse_zorder(["dbo.fact_sale"])
+
+
+class TestGenerateMaintenanceCommand:
+    """Test suite for the generate-maintenance subcommand."""
+
+    @pytest.mark.parametrize("generator_command", ["generate-maintenance"])
+    def test_command_writes_notebook_item(self, generated_workspaces):
+        """Test that the command writes the notebook item with its .platform file."""
+        assert (generated_workspaces / WORKSPACE / NOTEBOOK_DIR / ".platform").is_file()
@@ -0,0 +1,140 @@
+"""Tests for the OpenMetrics/Pushgateway exporter (scripts.fabric.metrics)."""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+from scripts.export_metrics import main as export_metrics_main
+from scripts.fabric.metrics import export_metrics, push_to_gateway, render_metrics, write_textfile
+
+RESULTS = {
+    "environment": "test",
+    "finished_at": "2026-01-02T03:04:05+00:00",
+    "duration": 95.5,
+    "failed_count": 1,
+    "circuit_open": False,
+    "workspaces": [
+        {"name": "Sales", "status": "success", "duration": 42.0, "attempts": 2, "throttled": 1, "items": 7},
+        {"name": 'Quote"d', "status": "failure", "duration": 700.0, "attempts": 1, "throttled": 0, "items": 3},
+        {"name": "Done", "status": "success", "duration": 0.0, "attempts": 0, "resumed": True, "items": 4},
+    ],
+}
+
+
+class TestRenderMetrics:
+    """Test suite for render_metrics."""
+
+    def test_openmetrics_last_run_gauges(self):
+        """Test that per-run values are exported as last-run gauges in OpenMetrics format."""
+        lines = render_metrics(RESULTS).splitlines()
+        sales = '{environment="test",workspace="Sales"}'
+
+        assert lines[-1] == "# EOF"
+        assert "# TYPE fabric_workspace_last_run_success gauge" in lines
+        assert not [line for line in lines if line.startswith("# TYPE") and not line.endswith(" gauge")]
+        assert f"fabric_workspace_last_run_success{sales} 1" in lines
+        assert f"fabric_workspace_last_run_duration_seconds{sales} 42.0" in lines
+        assert f"fabric_workspace_last_run_retries{sales} 1" in lines
+        assert f"fabric_workspace_last_run_throttles{sales} 1" in lines
+        assert f"fabric_workspace_last_run_items_deployed{sales} 7" in lines
+        assert f"fabric_workspace_last_success_timestamp_seconds{sales} 1767323045.0" in lines
+        assert 'fabric_deployment_last_run_duration_seconds{environment="test"} 95.5' in lines
+
+    def test_failed_workspace_and_label_escaping(self):
+        """Test that failed workspaces deploy no items, get no success time and label values are escaped."""
+        text = render_metrics(RESULTS)
+
+        assert 'fabric_workspace_last_run_items_deployed{environment="test",workspace="Quote\\"d"} 0' in text
+        assert 'fabric_workspace_last_run_success{environment="test",workspace="Quote\\"d"} 0' in text
+        assert 'fabric_workspace_last_success_timestamp_seconds{environment="test",workspace="Quote' not in text
+        assert 'fabric_deployment_last_success_timestamp_seconds{environment="test"}' not in text
+
+    def test_resumed_workspace_has_no_duration(self):
+        """Test that workspaces skipped by --resume report no duration or success time for this run."""
+        text = render_metrics(RESULTS)
+
+        assert 'fabric_workspace_last_run_duration_seconds{environment="test",workspace="Done"}' not in text
+        assert 'fabric_workspace_last_success_timestamp_seconds{environment="test",workspace="Done"}' not in text
+        assert 'fabric_workspace_last_run_items_deployed{environment="test",workspace="Done"} 4' in text
+
+    def test_successful_run_exports_success_time(self):
+        """Test that a run without failures exports the environment's last success time."""
+        text = render_metrics({**RESULTS, "failed_count": 0})
+
+        assert 'fabric_deployment_last_success_timestamp_seconds{environment="test"} 1767323045.0' in text
+
+    def test_prometheus_text_format(self):
+        """Test that the 0.0.4 format has no EOF marker."""
+        text = render_metrics(RESULTS, openmetrics=False)
+
+        assert "# TYPE fabric_workspace_last_run_retries gauge" in text
+        assert "# EOF" not in text
+
+
+class TestSinks:
+    """Test suite for textfile and Pushgateway sinks."""
+
+    def test_write_textfile(self, tmp_path):
+        """Test that the textfile is written in full with no temp files left."""
+        target = tmp_path / "textfile" / "fabric.prom"
+
+        write_textfile(target, RESULTS)
+
+        assert target.read_text(encoding="utf-8") == render_metrics(RESULTS)
+        assert [p.name for p in target.parent.iterdir()] == ["fabric.prom"]
+
+    def test_push_to_gateway(self):
+        """Test that metrics are PUT to the job/environment grouping key."""
+        received = {}
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_PUT(self):
+                received["path"] = self.path
+                received["body"] = self.rfile.read(int(self.headers["Content-Length"])).decode()
+                self.send_response(200)
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        server = HTTPServer(("127.0.0.1", 0), Handler)
+        thread = threading.Thread(target=server.handle_request)
+        thread.start()
+        try:
+            push_to_gateway(f"http://127.0.0.1:{server.server_port}/", RESULTS)
+        finally:
+            thread.join(timeout=5)
+            server.server_close()
+
+        assert received["path"] == "/metrics/job/fabric_deploy/environment/test"
+        assert received["body"] == render_metrics(RESULTS, openmetrics=False)
+
+    def test_export_errors_are_not_raised(self, tmp_path):
+        """Test that sink failures only log a warning."""
+        blocker = tmp_path / "file"
+        blocker.write_text("")
+
+        export_metrics(RESULTS, str(blocker / "fabric.prom"), "http://127.0.0.1:9")
+
+
+class TestExportMetricsCli:
+    """Test suite for scripts.export_metrics."""
+
+    def test_prints_metrics(self, tmp_path, capsys):
+        """Test that metrics are printed when no sink is given."""
+        results_file = tmp_path / "deployment-results.json"
+        results_file.write_text(json.dumps(RESULTS))
+
+        assert export_metrics_main(["--results", str(results_file)]) == 0
+        assert capsys.readouterr().out.endswith("# EOF\n")
+
+    @pytest.mark.parametrize("content", [None, "{not json"])
+    def test_unreadable_results(self, tmp_path, content):
+        """Test that a missing or invalid results file fails."""
+        results_file = tmp_path / "deployment-results.json"
+        if content is not None:
+            results_file.write_text(content)
+
+        assert export_metrics_main(["--results", str(results_file)]) == 1
@@ -0,0 +1,118 @@
+"""Tests for multi-environment deployments (--environment test,prod)."""
+
+import json
+from unittest.mock import patch
+
+import pytest
+
+from scripts.cli import build_parser
+from scripts.deploy_to_fabric import run_deployment
+from scripts.fabric.config import GATE_NONE
+from scripts.fabric.history import HistoryStore, import_artifacts
+from scripts.fabric.metrics import render_metrics
+from scripts.fabric.reporting import build_fanout_results_json
+from scripts.fabric.types import DeploymentResult, DeploymentSummary
+from scripts.fabric.workspace_model import build_workspace_model
+
+
+def make_summary(environment: str, success: bool = True) -> DeploymentSummary:
+    """Build a one-workspace summary for an environment."""
+    prefix = environment[0].upper()
+    return DeploymentSummary(
+        environment=environment,
+        duration=12.5,
+        results=[DeploymentResult("Sales", f"[{prefix}] Sales", success, "" if success else "boom", duration=12.5)],
+        commit_sha="abc123",
+        finished_at=f"2026-01-01T00:00:0{len(environment)}+00:00",
+    )
+
+
+@pytest.fixture
+def run_dir(tmp_path, monkeypatch):
+    """Run in a temporary directory so result files do not land in the repository."""
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+class TestRunDeployment:
+    """Test suite for run_deployment with several environments."""
+
+    @patch("scripts.deploy_to_fabric.configure_runtime")
+    @patch("scripts.deploy_to_fabric.run_deployment_pipeline")
+    def test_gate_skips_later_environments_after_failure(
+        self, mock_pipeline, mock_runtime, run_dir, temp_workspace_dir, mock_azure_credential
+    ):
+        """Test that prod is not deployed when test had failures and the run fails."""
+        mock_pipeline.side_effect = lambda ws_dir, environment, *args: make_summary(environment, success=False)
+        model = build_workspace_model(temp_workspace_dir)
+
+        exit_code = run_deployment(
+            str(temp_workspace_dir), "prod,test", model=model, token_credential=mock_azure_credential
+        )
+
+        assert exit_code == 1
+        assert [c.args[1] for c in mock_pipeline.call_args_list] == ["test"]
+        assert all(c.args[3] is model and c.args[2] is mock_azure_credential for c in mock_pipeline.call_args_list)
+        results = json.loads((run_dir / "deployment-results.json").read_text())
+        assert results["environment"] == "test,prod"
+        assert results["gated_environments"] == ["prod"]
+        assert [section["environment"] for section in results["environments"]] == ["test"]
+        events = [json.loads(line) for line in (run_dir / "deployment-results.jsonl").read_text().splitlines()]
+        gated = [event for event in events if event["event"] == "environment_gated"]
+        assert [(event["environment"], event["blocked_by"]) for event in gated] == [("prod", "test")]
+
+    @patch("scripts.deploy_to_fabric.configure_runtime")
+    @patch("scripts.deploy_to_fabric.run_deployment_pipeline")
+    def test_no_gate_deploys_every_environment(
+        self, mock_pipeline, mock_runtime, run_dir, temp_workspace_dir, mock_azure_credential
+    ):
+        """Test that with --gate none every environment is deployed despite earlier failures."""
+        mock_pipeline.side_effect = lambda ws_dir, environment, *args: make_summary(environment, environment == "prod")
+
+        exit_code = run_deployment(
+            str(temp_workspace_dir), "test,prod", token_credential=mock_azure_credential, gate=GATE_NONE
+        )
+
+        assert exit_code == 1
+        assert [c.args[1] for c in mock_pipeline.call_args_list] == ["test", "prod"]
+        results = json.loads((run_dir / "deployment-results.json").read_text())
+        assert results["successful_count"] == 1
+        assert results["failed_count"] == 1
+        assert [(w["environment"], w["full_name"]) for w in results["workspaces"]] == [
+            ("test", "[T] Sales"),
+            ("prod", "[P] Sales"),
+        ]
+
+
+class TestFanoutResults:
+    """Test suite for consumers of multi-environment results payloads."""
+
+    def test_metrics_and_history_use_environment_sections(self, tmp_path):
+        """Test that metrics are labelled per environment and history stores one run per environment."""
+        payload = build_fanout_results_json(["test", "prod"], [make_summary("test"), make_summary("prod")], [])
+        results_file = tmp_path / "deployment-results.json"
+        results_file.write_text(json.dumps(payload))
+
+        text = render_metrics(payload)
+        assert 'fabric_deployment_last_run_duration_seconds{environment="test"} 12.5' in text
+        assert 'fabric_deployment_last_run_duration_seconds{environment="prod"} 12.5' in text
+        assert text.count("# TYPE fabric_deployment_last_run_duration_seconds gauge") == 1
+
+        with HistoryStore(":memory:") as store:
+            assert import_artifacts(store, [results_file]) == (2, 0)
+            assert store.run_count("test") == 1
+            assert store.run_count("prod") == 1
+
+
+class TestEnvironmentArgument:
+    """Test suite for the comma-separated --environment argument."""
+
+    def test_environment_list_is_normalised(self):
+        """Test that environments are validated and put in promotion order."""
+        parser = build_parser()
+        base_args = ["deploy", "--workspaces_directory", "ws", "--environment"]
+
+        assert parser.parse_args([*base_args, "PROD, test"]).environment == "test,prod"
+        assert parser.parse_args([*base_args, "dev"]).gate == "success"
+        with pytest.raises(SystemExit):
+            parser.parse_args([*base_args, "test,staging"])
@@ -0,0 +1,139 @@
+"""Tests for DataPipeline DAG analysis (fabric analyze-pipelines)."""
+
+import json
+
+import pytest
+
+from scripts.cli import main as cli_main
+from scripts.fabric.pipeline_analysis import (
+    DIAGRAM_DOT,
+    DIAGRAM_MERMAID,
+    analyze_pipeline,
+    load_durations,
+    parse_timeout,
+    render_diagram,
+)
+
+RELATIVE = "pl_daily.DataPipeline/pipeline-content.json"
+
+
+def activity(name: str, *depends_on: str, activity_type: str = "InvokeCopyJob", **policy) -> dict:
+    """Return a pipeline activity definition."""
+    return {
+        "name": name,
+        "type": activity_type,
+        "typeProperties": {},
+        "policy": {"timeout": "0.01:00:00", "retry": 2, **policy},
+        "dependsOn": [{"activity": d, "dependencyConditions": ["Succeeded"]} for d in depends_on],
+    }
+
+
+def pipeline(*activities: dict) -> dict:
+    """Return pipeline-content.json content."""
+    return {"properties": {"activities": list(activities)}}
+
+
+class TestSchedule:
+    """Test suite for stages, critical path and concurrency."""
+
+    def test_diamond_critical_path_and_slack(self):
+        """Test that the longest branch forms the critical path and the short branch has slack."""
+        content = pipeline(
+            activity("extract"),
+            activity("big", "extract"),
+            activity("small", "extract"),
+            activity("publish", "big", "small", activity_type="TridentNotebook"),
+        )
+        measured = {"pl_daily": {"extract": 60, "big": 600, "small": 120, "publish": 30}}
+
+        analysis = analyze_pipeline("Sales", RELATIVE, content, measured)
+
+        assert analysis.errors == []
+        assert analysis.stages == [["extract"], ["big", "small"], ["publish"]]
+        assert analysis.critical_path == ["extract", "big", "publish"]
+        assert analysis.makespan == 690
+        assert {a.name: a.slack for a in analysis.activities}["small"] == 480
+        assert analysis.peak_concurrency == 2
+
+    def test_container_takes_longest_branch(self):
+        """Test that a ForEach lasts as long as its inner activities and inner policies are checked."""
+        for_each = activity("each", activity_type="ForEach")
+        for_each["typeProperties"] = {"activities": [activity("copy", retry=0), activity("load", "copy")]}
+        measured = {"pl_daily": {"each/copy": 900, "each/load": 100}}
+
+        analysis = analyze_pipeline("Sales", RELATIVE, pipeline(for_each), measured)
+
+        assert analysis.makespan == 1000
+        assert [risk.activity for risk in analysis.risks] == ["each/copy"]
+
+    def test_invalid_graphs_are_errors(self):
+        """Test that unknown dependencies and cycles are reported instead of scheduled."""
+        unknown = analyze_pipeline("Sales", RELATIVE, pipeline(activity("a", "missing")))
+        cycle = analyze_pipeline("Sales", RELATIVE, pipeline(activity("a", "b"), activity("b", "a")))
+
+        assert unknown.errors == ["'a' depends on unknown activity 'missing'"]
+        assert cycle.errors == ["dependency cycle among: a, b"]
+
+
+class TestPolicyRisks:
+    """Test suite for risky policy detection."""
+
+    def test_flags_no_retry_huge_timeout_and_copy_fan_out(self):
+        """Test the risks of the bronze ingestion shape: six parallel 12-hour copies without retries."""
+        copies = [activity(f"Dim {n}", retry=0, timeout="0.12:00:00") for n in range(6)]
+        measured = {"pl_daily": {"Dim 0": 1500.0}}
+
+        analysis = analyze_pipeline("Sales", RELATIVE, pipeline(*copies), measured)
+        messages = [(risk.activity, risk.message) for risk in analysis.risks]
+
+        assert ("Dim 0", "no retries on a 25m copy: one transient failure fails the run") in messages
+        assert ("Dim 1", "timeout 12h is 144x the expected 5m: a hung run holds capacity for 12h") in messages
+        assert messages[-1] == ("", "6 copy activities run at once (more than 4) and contend for the same capacity")
+        assert analysis.peak_copies == 6
+
+    def test_parse_timeout_and_durations_file(self, tmp_path):
+        """Test timeout parsing and that historical duration lists use their median."""
+        durations = tmp_path / "durations.yml"
+        durations.write_text("pl_daily:\n  a: 95\n  b: [10, 30, 20]\n")
+
+        assert parse_timeout("0.12:00:00") == 43200
+        assert parse_timeout("7.00:00:00") == 604800
+        assert parse_timeout("@pipeline().parameters.timeout") is None
+        assert load_durations(durations) == {"pl_daily": {"a": 95.0, "b": 20.0}}
+        durations.write_text("pl_daily:\n  a: fast\n")
+        with pytest.raises(ValueError, match="must be a number"):
+            load_durations(durations)
+
+
+class TestDiagramsAndCommand:
+    """Test suite for diagram rendering and the analyze-pipelines command."""
+
+    def test_diagrams_highlight_critical_path(self):
+        """Test that Mermaid and DOT output contain every edge and mark the critical path."""
+        content = pipeline(activity("a"), activity("b", "a"))
+        content["properties"]["activities"][1]["dependsOn"][0]["dependencyConditions"] = ["Failed"]
+        analysis = analyze_pipeline("Sales", RELATIVE, content)
+
+        mermaid = render_diagram(analysis, DIAGRAM_MERMAID)
+        dot = render_diagram(analysis, DIAGRAM_DOT)
+
+        assert "    a0 -- Failed --> a1" in mermaid
+        assert "    class a0,a1 critical" in mermaid
+        assert '  a0 -> a1 [label="Failed"];' in dot
+        assert dot.count("color=red") == 2
+
+    def test_command_writes_diagrams_and_fails_on_cycles(self, tmp_path):
+        """Test that analyze-pipelines writes one diagram per pipeline and exits 1 for an invalid graph."""
+        workspace = tmp_path / "workspaces" / "Sales"
+        item = workspace / "pl_daily.DataPipeline"
+        item.mkdir(parents=True)
+        (workspace / "config.yml").write_text('core:\n  workspace:\n    dev: "[D] Sales"\n')
+        (item / ".platform").write_text('{"metadata": {"type": "DataPipeline", "displayName": "pl_daily"}}')
+        (item / "pipeline-content.json").write_text(json.dumps(pipeline(activity("a"), activity("b", "a"))))
+        args = ["analyze-pipelines", "--workspaces_directory", str(tmp_path / "workspaces")]
+
+        assert cli_main([*args, "--diagram", "dot", "--output_directory", str(tmp_path / "dags")]) == 0
+        assert (tmp_path / "dags" / "Sales" / "pl_daily.dot").read_text().startswith('digraph "pl_daily"')
+
+        (item / "pipeline-content.json").write_text(json.dumps(pipeline(activity("a", "b"), activity("b", "a"))))
+        assert cli_main(args) == 1
@@ -0,0 +1,135 @@
+"""Tests for pre-flight validation of item definitions (fabric preflight)."""
+
+import json
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from scripts.deploy_to_fabric import run_deployment
+from scripts.fabric.parameters import parameter_chain_errors
+from scripts.fabric.preflight import run_preflight
+from scripts.fabric.workspace_model import build_workspace_model
+
+COPY_JOB_ID = "e4c6cff6-aa4e-b36f-45e4-5f366a0867c1"
+PIPELINE_ID = "5340553b-543e-a29f-4fda-f6eb5e71b760"
+EXTERNAL_ID = "1a9a6472-9e9e-4424-a423-2173e5ee7550"
+REPOSITORY_WORKSPACES = Path(__file__).resolve().parent.parent / "workspaces"
+
+
+def write_item(workspace, path: str, item_type: str, logical_id: str | None, files: dict[str, str]) -> None:
+    """Create an item folder with a .platform and content files."""
+    item = workspace / path
+    item.mkdir(parents=True)
+    config = {"logicalId": logical_id} if logical_id else {}
+    platform = {"metadata": {"type": item_type, "displayName": item.name.rsplit(".", 1)[0]}, "config": config}
+    (item / ".platform").write_text(json.dumps(platform))
+    for name, content in files.items():
+        (item / name).write_text(content)
+
+
+def pipeline_content(*copy_job_ids: str) -> str:
+    """Return pipeline-content.json invoking the given copy jobs (one nested in a ForEach)."""
+    activities = [{"type": "InvokeCopyJob", "typeProperties": {"copyJobId": i}} for i in copy_job_ids]
+    for_each = {"type": "ForEach", "typeProperties": {"activities": activities}}
+    return json.dumps({"properties": {"activities": [for_each]}})
+
+
+@pytest.fixture
+def workspaces_dir(tmp_path):
+    """Create a valid workspace: a copy job and a pipeline invoking it."""
+    workspace = tmp_path / "workspaces" / "Sales"
+    workspace.mkdir(parents=True)
+    (workspace / "config.yml").write_text('core:\n  workspace:\n    dev: "[D] Sales"\n')
+    (workspace / "parameter.yml").write_text(
+        f'find_replace:\n  - find_value: "{EXTERNAL_ID}"\n    replace_value: x\n    item_type: DataPipeline\n'
+    )
+    write_item(workspace, "cp.CopyJob", "CopyJob", COPY_JOB_ID, {"copyjob-content.json": "{}"})
+    pipeline_files = {"pipeline-content.json": pipeline_content(COPY_JOB_ID)}
+    write_item(workspace, "pl.DataPipeline", "DataPipeline", PIPELINE_ID, pipeline_files)
+    return tmp_path / "workspaces"
+
+
+def issues_of(workspaces_dir, cache_file=None) -> list[tuple[str, str]]:
+    """Run pre-flight and return (file, message) pairs."""
+    report = run_preflight(workspaces_dir, build_workspace_model(workspaces_dir), cache_file=cache_file)
+    return [(issue.file, issue.message) for issue in report.issues]
+
+
+class TestPreflightChecks:
+    """Test suite for the individual pre-flight checks."""
+
+    def test_valid_workspace_and_repository_pass(self, workspaces_dir):
+        """Test that the fixture workspace and the repository's own workspaces have no issues."""
+        assert issues_of(workspaces_dir) == []
+        assert issues_of(REPOSITORY_WORKSPACES) == []
+
+    def test_malformed_json_and_platform_schema(self, workspaces_dir):
+        """Test that invalid JSON, a missing logicalId and duplicate logicalIds are reported."""
+        workspace = workspaces_dir / "Sales"
+        (workspace / "cp.CopyJob" / "copyjob-content.json").write_text('{"source": ')
+        write_item(workspace, "nb.Notebook", "Notebook", None, {})
+        write_item(workspace, "cp2.CopyJob", "CopyJob", COPY_JOB_ID, {})
+
+        issues = issues_of(workspaces_dir)
+
+        invalid_json = "invalid JSON: Expecting value: line 1 column 12 (char 11)"
+        assert ("cp.CopyJob/copyjob-content.json", invalid_json) in issues
+        assert ("nb.Notebook/.platform", "missing config.logicalId") in issues
+        assert ("cp2.CopyJob/.platform", f"logicalId {COPY_JOB_ID} is not unique in the workspace") in issues
+        assert len(issues) == 4
+
+    def test_pipeline_references(self, workspaces_dir):
+        """Test that unknown references are reported unless a find_replace rule parameterizes them."""
+        unknown = "99999999-9999-9999-9999-999999999999"
+        content = pipeline_content(COPY_JOB_ID, EXTERNAL_ID, unknown)
+        (workspaces_dir / "Sales" / "pl.DataPipeline" / "pipeline-content.json").write_text(content)
+
+        assert issues_of(workspaces_dir) == [
+            ("pl.DataPipeline/pipeline-content.json", f"copyJobId {unknown} is not a logicalId in this workspace")
+        ]
+
+    def test_parameter_chain(self, tmp_path):
+        """Test that missing extend targets, cycles and bad regexes are reported."""
+        (tmp_path / "parameter.yml").write_text("extend:\n  - a.yml\n  - missing.yml\n")
+        (tmp_path / "a.yml").write_text(
+            "extend: [parameter.yml]\nfind_replace:\n  - find_value: '(['\n    is_regex: 'true'\n"
+        )
+
+        errors = parameter_chain_errors(tmp_path / "parameter.yml")
+
+        assert errors[0].startswith("a.yml: regex '([' does not compile")
+        assert errors[1] == "extend cycle: parameter.yml -> a.yml -> parameter.yml"
+        assert errors[2].endswith("missing.yml not found (extended by parameter.yml)")
+
+
+class TestPreflightCacheAndGate:
+    """Test suite for the content-hash cache and the deployment gate."""
+
+    def test_results_are_cached_by_content(self, workspaces_dir, tmp_path):
+        """Test that unchanged files are served from the cache and changed ones are re-checked."""
+        cache_file = tmp_path / "preflight.json"
+        model = build_workspace_model(workspaces_dir)
+        assert run_preflight(workspaces_dir, model, cache_file=cache_file).cached == 0
+
+        assert run_preflight(workspaces_dir, model, cache_file=cache_file).cached == 4
+
+        (workspaces_dir / "Sales" / "cp.CopyJob" / "copyjob-content.json").write_text("{")
+        report = run_preflight(workspaces_dir, model, cache_file=cache_file)
+        assert report.cached == 3
+        assert len(report.issues) == 1
+
+    @patch("scripts.deploy_to_fabric.create_azure_credential")
+    @patch("scripts.deploy_to_fabric.configure_runtime")
+    def test_deployment_fails_before_any_api_call(
+        self, mock_runtime, mock_credential, workspaces_dir, tmp_path, monkeypatch
+    ):
+        """Test that run_deployment stops before fabric_cicd is configured when pre-flight fails."""
+        monkeypatch.chdir(tmp_path)
+        (workspaces_dir / "Sales" / "parameter.yml").write_text("extend: [missing.yml]\n")
+
+        assert run_deployment(str(workspaces_dir), "dev") == 1
+        mock_runtime.assert_not_called()
+        mock_credential.assert_not_called()
+        stream = (tmp_path / "deployment-results.jsonl").read_text().splitlines()
+        assert json.loads(stream[-1])["event"] == "run_failed"
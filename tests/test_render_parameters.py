@@ -0,0 +1,187 @@
+"""Tests for the local parameter rendering engine and render_parameters entry point."""
+
+from pathlib import Path
+
+import pytest
+
+from scripts.fabric.parameters import FindReplaceRule
+from scripts.fabric.rendering import AhoCorasick, EnvironmentIds, ReplacementEngine, resolve_tokens
+from scripts.render_parameters import load_id_map, main, parse_environments, render_workspace
+
+DEV_WORKSPACE_GUID = "00000000-0000-0000-0000-000000000000"
+DEV_LAKEHOUSE_GUID = "b892bcb4-b1d3-a9e0-4a9e-fac33bb0b654"
+NOTEBOOK_REGEX = r"\#\s*META\s+\"default_lakehouse\":\s*\"([0-9a-fA-F-]{36})\""
+
+
+@pytest.fixture
+def render_workspace_dir(tmp_path: Path) -> Path:
+    """Create a workspace with a CopyJob, a Notebook and literal + regex rules."""
+    workspace_dir = tmp_path / "workspaces" / "Render Workspace"
+    workspace_dir.mkdir(parents=True)
+    (workspace_dir / "config.yml").write_text("core:\n  workspace:\n    dev: '[D] Render'\n")
+    (workspace_dir / "parameter.yml").write_text(
+        f"""
+find_replace:
+  - find_value: "{DEV_WORKSPACE_GUID}"
+    replace_value:
+      _ALL_: "$workspace.id"
+    item_type: "CopyJob"
+  - find_value: "{DEV_LAKEHOUSE_GUID}"
+    replace_value:
+      dev: "{DEV_LAKEHOUSE_GUID}"
+      prod: "$items.Lakehouse.lakehouse_bronze.id"
+    item_type: "CopyJob"
+  - find_value: '{NOTEBOOK_REGEX}'
+    replace_value:
+      _ALL_: "$items.Lakehouse.lakehouse_bronze.$id"
+    is_regex: "true"
+    item_type: "Notebook"
+"""
+    )
+
+    copy_job = workspace_dir / "cp_import.CopyJob"
+    copy_job.mkdir()
+    (copy_job / "copyjob-content.json").write_text(
+        f'{{"workspaceId": "{DEV_WORKSPACE_GUID}", "artifactId": "{DEV_LAKEHOUSE_GUID}"}}'
+    )
+    (copy_job / ".platform").write_text(f'{{"config": {{"logicalId": "{DEV_LAKEHOUSE_GUID}"}}}}')
+
+    notebook = workspace_dir / "nb_transform.Notebook"
+    notebook.mkdir()
+    (notebook / "notebook-content.py").write_text(f'# META   "default_lakehouse": "{DEV_LAKEHOUSE_GUID}",\n')
+
+    return tmp_path / "workspaces"
+
+
+class TestAhoCorasick:
+    """Test suite for the literal multi-pattern matcher."""
+
+    def test_finds_all_occurrences(self):
+        """Test that every occurrence of every pattern is reported."""
+        automaton = AhoCorasick(["he", "she", "his", "hers"])
+        found = sorted((start, end, automaton.patterns[i]) for start, end, i in automaton.finditer("ushers"))
+
+        assert found == [(1, 4, "she"), (2, 4, "he"), (2, 6, "hers")]
+
+    def test_no_patterns(self):
+        """Test that an empty automaton never matches."""
+        assert list(AhoCorasick([]).finditer("anything")) == []
+
+
+class TestReplacementEngine:
+    """Test suite for ReplacementEngine matching and splicing."""
+
+    def test_regex_replaces_capture_group_only(self):
+        """Test that regex rules rewrite group 1 and keep the surrounding text."""
+        rule = FindReplaceRule(r'"id":\s*"(\w+)"', True, [], [], replace_values={"_ALL_": "NEW"})
+        engine = ReplacementEngine([rule])
+        text = '{"id": "abc", "other": "abc"}'
+
+        matches = engine.find_matches(text, "Notebook", Path("nb.Notebook/notebook-content.py"))
+        replacements, _ = engine.replacements_for("dev", EnvironmentIds())
+
+        assert engine.apply(text, matches, replacements) == '{"id": "NEW", "other": "abc"}'
+
+    def test_first_declared_rule_wins_on_same_span(self):
+        """Test that an earlier rule shadows a later rule matching the same text."""
+        first = FindReplaceRule("abc", False, [], [], replace_values={"_ALL_": "first"})
+        second = FindReplaceRule("abc", False, [], [], replace_values={"_ALL_": "second"})
+        engine = ReplacementEngine([first, second])
+
+        matches = engine.find_matches("x abc y", "CopyJob", Path("c.CopyJob/copyjob-content.json"))
+        replacements, _ = engine.replacements_for("dev", EnvironmentIds())
+
+        assert engine.apply("x abc y", matches, replacements) == "x first y"
+
+    def test_item_type_filter_is_respected(self):
+        """Test that rules scoped to another item type do not match."""
+        rule = FindReplaceRule("abc", False, ["Notebook"], [], replace_values={"_ALL_": "new"})
+        engine = ReplacementEngine([rule])
+
+        assert engine.find_matches("abc", "CopyJob", Path("c.CopyJob/copyjob-content.json")) == []
+
+
+class TestResolveTokens:
+    """Test suite for $workspace / $items token resolution."""
+
+    def test_resolves_known_tokens(self):
+        """Test that workspace and item tokens resolve from the ID map."""
+        ids = EnvironmentIds(workspace_id="ws-id", items={"Lakehouse": {"lakehouse_bronze": "lh-id"}})
+
+        value, unresolved = resolve_tokens("$workspace.$id/$items.Lakehouse.lakehouse_bronze.id", ids)
+
+        assert value == "ws-id/lh-id"
+        assert unresolved == []
+
+    def test_unknown_tokens_are_left_in_place(self):
+        """Test that tokens without IDs are reported and kept verbatim."""
+        value, unresolved = resolve_tokens("$items.Lakehouse.lakehouse_gold.$id", EnvironmentIds())
+
+        assert value == "$items.Lakehouse.lakehouse_gold.$id"
+        assert unresolved == ["$items.Lakehouse.lakehouse_gold.$id"]
+
+
+class TestRenderWorkspace:
+    """Test suite for render_workspace end-to-end behaviour."""
+
+    def test_renders_every_environment_in_one_pass(self, render_workspace_dir, tmp_path):
+        """Test that per-environment trees are written with the right values."""
+        output_dir = tmp_path / "rendered"
+        id_map = {
+            "prod": {
+                "Render Workspace": EnvironmentIds(
+                    workspace_id="prod-ws", items={"Lakehouse": {"lakehouse_bronze": "prod-lh"}}
+                )
+            }
+        }
+
+        stats = render_workspace("Render Workspace", render_workspace_dir, output_dir, ["dev", "prod"], id_map)
+
+        prod_copy_job = output_dir / "prod" / "Render Workspace" / "cp_import.CopyJob" / "copyjob-content.json"
+        dev_copy_job = output_dir / "dev" / "Render Workspace" / "cp_import.CopyJob" / "copyjob-content.json"
+        prod_notebook = output_dir / "prod" / "Render Workspace" / "nb_transform.Notebook" / "notebook-content.py"
+
+        assert prod_copy_job.read_text() == '{"workspaceId": "prod-ws", "artifactId": "prod-lh"}'
+        assert dev_copy_job.read_text() == f'{{"workspaceId": "$workspace.id", "artifactId": "{DEV_LAKEHOUSE_GUID}"}}'
+        assert '"default_lakehouse": "prod-lh"' in prod_notebook.read_text()
+        assert stats.files == 3
+        assert stats.unresolved_tokens["dev"] == {"$workspace.id", "$items.Lakehouse.lakehouse_bronze.$id"}
+        assert stats.unresolved_tokens["prod"] == set()
+
+    def test_platform_files_are_copied_verbatim(self, render_workspace_dir, tmp_path):
+        """Test that .platform logicalIds are never parameterized."""
+        output_dir = tmp_path / "rendered"
+
+        render_workspace("Render Workspace", render_workspace_dir, output_dir, ["prod"], {})
+
+        platform = output_dir / "prod" / "Render Workspace" / "cp_import.CopyJob" / ".platform"
+        assert DEV_LAKEHOUSE_GUID in platform.read_text()
+
+
+class TestRenderCli:
+    """Test suite for CLI helpers and main()."""
+
+    def test_parse_environments_in_promotion_order(self):
+        """Test that environments are returned in dev -> test -> prod order."""
+        assert parse_environments("prod, dev") == ["dev", "prod"]
+
+    def test_parse_environments_invalid(self):
+        """Test that unknown environments are rejected."""
+        with pytest.raises(ValueError, match="Invalid environment"):
+            parse_environments("dev,staging")
+
+    def test_load_id_map_missing_file(self, tmp_path):
+        """Test that a missing ID map raises FileNotFoundError."""
+        with pytest.raises(FileNotFoundError):
+            load_id_map(tmp_path / "missing.yml")
+
+    def test_main_writes_output(self, render_workspace_dir, tmp_path):
+        """Test that main() renders all workspaces and returns success."""
+        output_dir = tmp_path / "out"
+
+        exit_code = main(
+            ["--workspaces_directory", str(render_workspace_dir), "--output_directory", str(output_dir)]
+        )
+
+        assert exit_code == 0
+        assert (output_dir / "test" / "Render Workspace" / "nb_transform.Notebook" / "notebook-content.py").exists()
@@ -0,0 +1,149 @@
+"""Tests for the incremental deployment results stream and the summary script."""
+
+import json
+import os
+import shutil
+import subprocess
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from scripts.deploy_to_fabric import deploy_all_workspaces
+from scripts.fabric.reporting import write_json_atomic
+from scripts.fabric.results_stream import ResultsStream
+from scripts.fabric.types import DeploymentResult, DeploymentSummary
+
+SUMMARY_SCRIPT = Path(__file__).resolve().parent.parent / "scripts" / "generate_deployment_summary.sh"
+
+
+def read_events(path: Path) -> list[dict]:
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+class TestResultsStream:
+    """Test suite for ResultsStream."""
+
+    def test_events_are_appended_incrementally(self, tmp_path):
+        """Test that every event is on disk as soon as it is recorded."""
+        stream_file = tmp_path / "results.jsonl"
+        stream = ResultsStream(stream_file, "dev")
+        stream.workspaces_discovered(["WS1", "WS2"])
+
+        assert [e["event"] for e in read_events(stream_file)] == ["run_started", "workspaces_discovered"]
+
+        stream.workspace_completed(DeploymentResult("WS1", "[D] WS1", False, "boom", duration=1.5))
+        events = read_events(stream_file)
+
+        assert events[-1]["event"] == "workspace_completed"
+        assert (events[-1]["name"], events[-1]["status"], events[-1]["error"]) == ("WS1", "failure", "boom")
+        assert events[-1]["duration"] == 1.5
+
+    def test_new_run_truncates_previous_stream(self, tmp_path):
+        """Test that a new run does not mix events with the previous run."""
+        stream_file = tmp_path / "results.jsonl"
+        ResultsStream(stream_file, "dev").run_failed("old")
+
+        ResultsStream(stream_file, "test")
+
+        assert [e["event"] for e in read_events(stream_file)] == ["run_started"]
+
+    def test_unwritable_stream_does_not_raise(self, tmp_path):
+        """Test that write errors are swallowed so deployments continue."""
+        stream = ResultsStream(tmp_path / "missing-dir" / "results.jsonl", "dev")
+
+        stream.run_completed(DeploymentSummary("dev", 1.0, []))
+
+    @patch("scripts.deploy_to_fabric.deploy_workspace")
+    def test_deploy_all_workspaces_streams_each_result(self, mock_deploy, tmp_path, mock_azure_credential):
+        """Test that each workspace result is streamed when it completes."""
+        stream_file = tmp_path / "results.jsonl"
+        mock_deploy.side_effect = [
+            DeploymentResult("WS1", "[D] WS1", True),
+            DeploymentResult("WS2", "[D] WS2", False, "API error"),
+        ]
+
+        deploy_all_workspaces(
+            ["WS1", "WS2"], "workspaces", "dev", mock_azure_credential, results_stream=ResultsStream(stream_file, "dev")
+        )
+
+        completed = [e for e in read_events(stream_file) if e["event"] == "workspace_completed"]
+        assert [(e["name"], e["status"]) for e in completed] == [("WS1", "success"), ("WS2", "failure")]
+
+
+class TestWriteJsonAtomic:
+    """Test suite for write_json_atomic."""
+
+    def test_replaces_file_without_leftovers(self, tmp_path):
+        """Test that the target is replaced and no temp files remain."""
+        target = tmp_path / "deployment-results.json"
+        target.write_text("{}")
+
+        write_json_atomic(target, {"total_workspaces": 2})
+
+        assert json.loads(target.read_text()) == {"total_workspaces": 2}
+        assert [p.name for p in tmp_path.iterdir()] == ["deployment-results.json"]
+
+
+@pytest.mark.skipif(shutil.which("bash") is None or shutil.which("jq") is None, reason="requires bash and jq")
+class TestSummaryScript:
+    """Test suite for generate_deployment_summary.sh."""
+
+    def test_summary_from_interrupted_stream(self, tmp_path):
+        """Test that the summary is rebuilt from a partial stream with a truncated last line."""
+        stream = ResultsStream(tmp_path / "deployment-results.jsonl", "test")
+        stream.workspaces_discovered(["A", "B", "C"])
+        stream.workspace_completed(DeploymentResult("A", "[T] A", True))
+        stream.workspace_completed(DeploymentResult("B", "[T] B", False, "boom"))
+        with open(tmp_path / "deployment-results.jsonl", "a", encoding="utf-8") as f:
+            f.write('{"event": "workspace_comp')
+        summary_file = tmp_path / "summary.md"
+
+        completed = subprocess.run(
+            ["bash", str(SUMMARY_SCRIPT), "test", "Manual"],
+            cwd=tmp_path,
+            env={**os.environ, "GITHUB_STEP_SUMMARY": str(summary_file), "JOB_STATUS": "cancelled"},
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+
+        summary = summary_file.read_text(encoding="utf-8")
+        assert completed.returncode == 0, completed.stderr
+        assert "- **Total Workspaces**: 3" in summary
+        assert "- **Successful**: 1" in summary
+        assert "- **Failed**: 1" in summary
+        assert "- **Not completed**: 1" in summary
+        assert "- ✗ [T] B" in summary
+        assert "C (not completed)" in summary
+
+    def test_summary_from_interrupted_multi_environment_stream(self, tmp_path):
+        """Test that a partial multi-environment stream is summarized per environment."""
+        stream = ResultsStream(tmp_path / "deployment-results.jsonl", "test,prod")
+        stream.environment_started("test")
+        stream.workspaces_discovered(["A", "B"])
+        stream.workspace_completed(DeploymentResult("A", "[T] A", True))
+        stream.workspace_completed(DeploymentResult("B", "[T] B", True))
+        stream.environment_started("prod")
+        stream.workspaces_discovered(["A", "B"])
+        stream.workspace_completed(DeploymentResult("A", "[P] A", False, "boom"))
+        summary_file = tmp_path / "summary.md"
+
+        completed = subprocess.run(
+            ["bash", str(SUMMARY_SCRIPT), "test,prod", "Manual"],
+            cwd=tmp_path,
+            env={**os.environ, "GITHUB_STEP_SUMMARY": str(summary_file), "JOB_STATUS": "cancelled"},
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+
+        summary = summary_file.read_text(encoding="utf-8")
+        assert completed.returncode == 0, completed.stderr
+        assert "- **Total Workspaces**: 4" in summary
+        assert "- **Not completed**: 1" in summary
+        test_section, prod_section = summary.split("#### Deployment Results - ")[1:]
+        assert test_section.startswith("test: 2/2 successful")
+        assert prod_section.startswith("prod: 0/2 successful")
+        assert "- ✗ [P] A" in prod_section
+        assert "B (not completed)" in prod_section
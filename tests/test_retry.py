@@ -0,0 +1,210 @@
+"""Tests for the deployment retry policy and circuit breaker (scripts.fabric.retry)."""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from scripts.deploy_to_fabric import deploy_all_workspaces, deploy_workspace
+from scripts.fabric.reporting import build_deployment_results_json
+from scripts.fabric.retry import (
+    PERMANENT,
+    SKIPPED,
+    THROTTLED,
+    TRANSIENT,
+    CircuitOpenError,
+    RetryController,
+    RetryOutcome,
+    RetryPolicy,
+    classify_error,
+)
+from scripts.fabric.types import DeploymentSummary
+
+
+class ClientAuthenticationError(Exception):
+    """Stand-in with the class name of azure.core's ClientAuthenticationError."""
+
+
+class HttpError(Exception):
+    """Exception carrying an HTTP status code like azure.core's HttpResponseError."""
+
+    def __init__(self, status_code: int):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+def make_controller(**policy_overrides) -> RetryController:
+    return RetryController(RetryPolicy(**policy_overrides), sleep=MagicMock(), rng=lambda: 0.5)
+
+
+class TestClassifyError:
+    """Test suite for classify_error."""
+
+    @pytest.mark.parametrize(
+        "error, expected",
+        [
+            (HttpError(503), TRANSIENT),
+            (HttpError(429), THROTTLED),
+            (HttpError(404), PERMANENT),
+            (ConnectionError("reset by peer"), TRANSIENT),
+            (TimeoutError(), TRANSIENT),
+            (Exception("Unhandled error occurred calling POST on 'x'. 502 Bad Gateway"), TRANSIENT),
+            (Exception("Too Many Requests"), THROTTLED),
+            (ValueError("Environment 'prod' not found"), PERMANENT),
+            (FileNotFoundError("config.yml"), PERMANENT),
+            (Exception("Something unexpected"), PERMANENT),
+            (ClientAuthenticationError("AADSTS7000215: Invalid client secret provided"), PERMANENT),
+            (ClientAuthenticationError("AADSTS50196: The server terminated an operation"), THROTTLED),
+            (CircuitOpenError("Circuit breaker open"), SKIPPED),
+        ],
+    )
+    def test_classification(self, error, expected):
+        """Test that errors are classified by status code, type and message."""
+        assert classify_error(error) == expected
+
+    def test_wrapped_cause_is_inspected(self):
+        """Test that the cause of a generic wrapper exception is classified."""
+        try:
+            try:
+                raise ConnectionError("connection aborted")
+            except ConnectionError as e:
+                raise RuntimeError("Invoke failed") from e
+        except RuntimeError as wrapped:
+            assert classify_error(wrapped) == TRANSIENT
+
+    def test_auth_error_caused_by_network_is_transient(self):
+        """Test that an authentication error is transient only when its cause is."""
+        try:
+            try:
+                raise ConnectionError("connection reset")
+            except ConnectionError as e:
+                raise ClientAuthenticationError("Authentication failed") from e
+        except ClientAuthenticationError as wrapped:
+            assert classify_error(wrapped) == TRANSIENT
+
+
+class TestRetryPolicy:
+    """Test suite for RetryPolicy."""
+
+    def test_backoff_is_exponential_bounded_and_jittered(self):
+        """Test that backoff doubles per retry, stays within [ceiling/2, ceiling] and is capped."""
+        policy = RetryPolicy(base_delay=10.0, max_delay=30.0)
+
+        assert policy.backoff(1, rng=lambda: 0.0) == 5.0
+        assert policy.backoff(1, rng=lambda: 1.0) == 10.0
+        assert policy.backoff(2, rng=lambda: 1.0) == 20.0
+        assert policy.backoff(5, rng=lambda: 1.0) == 30.0
+
+    def test_from_env_overrides(self, monkeypatch):
+        """Test that environment variables override the defaults."""
+        monkeypatch.setenv("FABRIC_RETRY_MAX_ATTEMPTS", "5")
+        monkeypatch.setenv("FABRIC_RETRY_BUDGET", "0")
+
+        policy = RetryPolicy.from_env()
+
+        assert (policy.max_attempts, policy.run_budget) == (5, 0)
+
+    def test_from_env_rejects_invalid_values(self, monkeypatch):
+        """Test that invalid overrides raise ValueError."""
+        monkeypatch.setenv("FABRIC_RETRY_MAX_ATTEMPTS", "0")
+
+        with pytest.raises(ValueError, match="FABRIC_RETRY_MAX_ATTEMPTS"):
+            RetryPolicy.from_env()
+
+
+class TestRetryController:
+    """Test suite for RetryController."""
+
+    def test_transient_error_is_retried(self):
+        """Test that a transient failure is retried after a backoff sleep."""
+        controller = make_controller(max_attempts=3, base_delay=4.0)
+        operation = MagicMock(side_effect=[HttpError(502), "ok"])
+        outcome = RetryOutcome()
+
+        assert controller.call(operation, outcome) == "ok"
+        assert (outcome.attempts, outcome.error_kind) == (2, "")
+        controller._sleep.assert_called_once_with(3.0)
+        assert controller.consecutive_transient_failures == 0
+
+    def test_permanent_error_is_not_retried(self):
+        """Test that permanent errors fail on the first attempt."""
+        controller = make_controller()
+        outcome = RetryOutcome()
+
+        with pytest.raises(ValueError):
+            controller.call(MagicMock(side_effect=ValueError("bad parameter.yml")), outcome)
+
+        assert (outcome.attempts, outcome.error_kind) == (1, PERMANENT)
+        controller._sleep.assert_not_called()
+
+    def test_run_budget_limits_retries(self):
+        """Test that retries stop once the run budget is spent."""
+        controller = make_controller(max_attempts=5, run_budget=1, breaker_threshold=10)
+        outcome = RetryOutcome()
+
+        with pytest.raises(HttpError):
+            controller.call(MagicMock(side_effect=HttpError(429)), outcome)
+
+        assert (outcome.attempts, outcome.throttled, outcome.error_kind) == (2, 2, THROTTLED)
+        assert controller.budget_remaining == 0
+
+
+class TestCircuitBreaker:
+    """Test suite for the circuit breaker in deploy_all_workspaces."""
+
+    @patch("scripts.deploy_to_fabric.deploy_with_config", side_effect=ConnectionError("connection refused"))
+    def test_breaker_skips_remaining_workspaces(self, mock_deploy, temp_workspace_dir, mock_azure_credential):
+        """Test that consecutive workspaces failing transiently open the breaker and skip the rest."""
+        controller = make_controller(max_attempts=2, run_budget=10, breaker_threshold=2)
+
+        results = deploy_all_workspaces(
+            ["Test Workspace"] * 3,
+            str(temp_workspace_dir),
+            "dev",
+            mock_azure_credential,
+            retry=controller,
+        )
+
+        assert mock_deploy.call_count == 4
+        assert [(r.attempts, r.error_kind) for r in results] == [(2, TRANSIENT), (2, TRANSIENT), (0, SKIPPED)]
+        assert "circuit breaker" in results[2].error_message
+
+    def test_breaker_counts_workspaces_not_attempts(self):
+        """Test that retried attempts of one workspace count once and a permanent error resets the count."""
+        controller = make_controller(max_attempts=3, run_budget=10, breaker_threshold=2)
+
+        with pytest.raises(HttpError):
+            controller.call(MagicMock(side_effect=HttpError(503)), RetryOutcome())
+        assert (controller.consecutive_transient_failures, controller.is_open) == (1, False)
+
+        with pytest.raises(ValueError):
+            controller.call(MagicMock(side_effect=ValueError("bad parameter.yml")), RetryOutcome())
+        assert controller.consecutive_transient_failures == 0
+
+    @patch("scripts.deploy_to_fabric.deploy_with_config")
+    def test_breaker_opened_by_another_workspace_is_skipped(
+        self, mock_deploy, temp_workspace_dir, mock_azure_credential
+    ):
+        """Test that a CircuitOpenError raised inside the retry call is reported as SKIPPED, not PERMANENT."""
+        controller = make_controller(breaker_threshold=1)
+        controller.consecutive_transient_failures = 1
+
+        result = deploy_workspace(
+            "Test Workspace", str(temp_workspace_dir), "dev", mock_azure_credential, retry=controller
+        )
+
+        mock_deploy.assert_not_called()
+        assert (result.success, result.attempts, result.error_kind) == (False, 0, SKIPPED)
+
+    @patch("scripts.deploy_to_fabric.deploy_with_config")
+    def test_attempts_recorded_in_results_json(self, mock_deploy, temp_workspace_dir, mock_azure_credential):
+        """Test that attempts per workspace reach the results JSON."""
+        mock_deploy.side_effect = [HttpError(503), None]
+
+        result = deploy_workspace(
+            "Test Workspace", str(temp_workspace_dir), "dev", mock_azure_credential, retry=make_controller()
+        )
+        payload = build_deployment_results_json(DeploymentSummary("dev", 1.0, [result]))
+
+        assert result.success is True
+        assert payload["retry_count"] == 1
+        assert payload["workspaces"][0]["attempts"] == 2
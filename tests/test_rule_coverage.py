@@ -0,0 +1,123 @@
+"""Tests for the rule coverage matrix and find_replace consolidation (fabric rule-coverage)."""
+
+from pathlib import Path
+
+from scripts.cli import main as cli_main
+from scripts.fabric.parameters import FindReplaceRule, load_rules
+from scripts.fabric.rule_coverage import (
+    STATUS_ACTIVE,
+    STATUS_DEAD,
+    STATUS_PARTIAL,
+    STATUS_SHADOWED,
+    analyze_coverage,
+    changed_files,
+    consolidate_rules,
+    render_parameter_yaml,
+)
+
+WORKSPACE_ID = "00000000-0000-0000-0000-000000000000"
+LAKEHOUSE_ID = "b892bcb4-b1d3-a9e0-4a9e-fac33bb0b654"
+
+CORPUS = [
+    (
+        Path("cp.CopyJob/copyjob-content.json"),
+        "CopyJob",
+        f'{{"workspaceId": "{WORKSPACE_ID}", "id": "{LAKEHOUSE_ID}"}}',
+    ),
+    (Path("pl.DataPipeline/pipeline-content.json"), "DataPipeline", f'{{"workspaceId": "{WORKSPACE_ID}"}}'),
+    (Path("lh.Lakehouse/shortcuts.metadata.json"), "Lakehouse", f'[{{"workspaceId": "{WORKSPACE_ID}"}}]'),
+]
+
+
+def literal(find_value: str, item_type: str, replace_value: str = "$workspace.id") -> FindReplaceRule:
+    """Build a literal rule scoped to one item type."""
+    return FindReplaceRule(find_value, False, [item_type], [], "p.yml", {"_ALL_": replace_value})
+
+
+def per_type_duplicates() -> list[FindReplaceRule]:
+    """Return the cp/pl/lh template layout: the same two literals repeated per item type."""
+    rules = []
+    for item_type in ("CopyJob", "DataPipeline", "Lakehouse"):
+        rules.append(literal(WORKSPACE_ID, item_type))
+        rules.append(literal(LAKEHOUSE_ID, item_type, "$items.Lakehouse.lakehouse_bronze.id"))
+    return rules
+
+
+class TestCoverage:
+    """Test suite for analyze_coverage."""
+
+    def test_matrix_and_statuses(self):
+        """Test per-item-type counts and dead, shadowed and partly shadowed rules."""
+        workspace_regex = FindReplaceRule(r'"workspaceId": "([0-9a-f-]{36})"', True, ["CopyJob"], [], "p.yml")
+        rules = [
+            literal(WORKSPACE_ID, "DataPipeline"),
+            workspace_regex,
+            FindReplaceRule(WORKSPACE_ID, False, [], [], "p.yml"),
+            literal(WORKSPACE_ID, "CopyJob"),
+            literal("11111111-1111-1111-1111-111111111111", "CopyJob"),
+        ]
+
+        coverage = analyze_coverage(rules, CORPUS)
+
+        assert [entry.status for entry in coverage] == [
+            STATUS_ACTIVE,
+            STATUS_ACTIVE,
+            STATUS_PARTIAL,
+            STATUS_SHADOWED,
+            STATUS_DEAD,
+        ]
+        assert dict(coverage[1].applied_by_item_type) == {"CopyJob": 1}
+        assert dict(coverage[2].applied_by_item_type) == {"Lakehouse": 1}
+        assert coverage[2].shadowed_by == {0: 1, 1: 1}
+        assert coverage[3].shadowed_by == {1: 1}
+        assert coverage[0].label == "p.yml#1"
+
+
+class TestConsolidation:
+    """Test suite for consolidate_rules and the rule-coverage command."""
+
+    def test_merges_literal_duplicates_into_item_type_lists(self):
+        """Test that the per-type template layout collapses to one rule per find_value."""
+        rules = per_type_duplicates()
+
+        consolidated, sources = consolidate_rules(rules)
+
+        assert [rule.item_types for rule in consolidated] == [["CopyJob", "DataPipeline", "Lakehouse"]] * 2
+        assert sources == [[0, 2, 4], [1, 3, 5]]
+        assert changed_files(rules, consolidated, CORPUS) == []
+
+    def test_keeps_rules_apart_when_a_rule_in_between_claims_the_text(self):
+        """Test that a literal is not moved ahead of a regex that would otherwise win."""
+        regex = FindReplaceRule(r'"workspaceId": "([0-9a-f-]{36})"', True, [], [], "p.yml", {"_ALL_": "other"})
+        rules = [literal(WORKSPACE_ID, "CopyJob"), regex, literal(WORKSPACE_ID, "Lakehouse")]
+
+        consolidated, _ = consolidate_rules(rules)
+
+        assert len(consolidated) == 3
+        assert changed_files(rules, consolidated, CORPUS) == []
+
+    def test_rendered_yaml_round_trips(self, tmp_path):
+        """Test that the emitted parameter file loads back to the consolidated rules."""
+        consolidated, _ = consolidate_rules(per_type_duplicates())
+        parameter_file = tmp_path / "parameter.yml"
+        parameter_file.write_text(render_parameter_yaml(consolidated, "generated"))
+
+        loaded = load_rules(parameter_file)
+
+        assert [(r.find_value, r.item_types, r.replace_values) for r in loaded] == [
+            (r.find_value, r.item_types, r.replace_values) for r in consolidated
+        ]
+
+    def test_command_writes_consolidated_parameter_file(self, tmp_path, monkeypatch):
+        """Test that rule-coverage writes <output>/<workspace>/parameter.yml for the repository workspace."""
+        workspaces_dir = Path(__file__).resolve().parent.parent / "workspaces"
+        monkeypatch.chdir(tmp_path)
+
+        exit_code = cli_main(
+            ["rule-coverage", "--workspaces_directory", str(workspaces_dir), "--output_directory", "consolidated"]
+        )
+
+        (written,) = (tmp_path / "consolidated").glob("*/parameter.yml")
+        rules = load_rules(written)
+        assert exit_code == 0
+        assert len(rules) < len(load_rules(workspaces_dir / written.parent.name / "parameter.yml"))
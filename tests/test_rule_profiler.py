@@ -0,0 +1,102 @@
+"""Tests for find_replace rule profiling (fabric profile-rules)."""
+
+import time
+
+from scripts.cli import main as cli_main
+from scripts.fabric.parameters import FindReplaceRule
+from scripts.fabric.rule_profiler import adversarial_inputs, pattern_warnings, profile_workspace, worst_case
+from scripts.fabric.workspace_model import build_workspace_model
+
+META_RULE = r'\#\s*META\s+"default_lakehouse":\s*"([0-9a-fA-F]{8}-[0-9a-fA-F-]{27})"'
+
+
+def write_workspace(root, find_value: str, is_regex: bool) -> None:
+    """Create a workspace with two notebooks and one find_replace rule scoped to Bronze."""
+    workspace = root / "Sales"
+    for layer in ("1_Bronze", "2_Silver"):
+        item = workspace / layer / f"nb_{layer}.Notebook"
+        item.mkdir(parents=True)
+        (item / ".platform").write_text('{"metadata": {"type": "Notebook", "displayName": "nb"}}')
+        (item / "notebook-content.py").write_text(
+            '# META   "default_lakehouse": "6323ba06-e77d-4165-aac8-962913913992",\n'
+        )
+    (workspace / "config.yml").write_text('core:\n  workspace:\n    dev: "[D] Sales"\n')
+    (workspace / "parameter.yml").write_text(
+        "find_replace:\n"
+        f"  - find_value: '{find_value}'\n"
+        "    replace_value: x\n"
+        f'    is_regex: "{str(is_regex).lower()}"\n'
+        "    item_type: Notebook\n"
+        '    file_path: "**/1_Bronze/**"\n'
+    )
+
+
+class TestStaticChecks:
+    """Test suite for pattern_warnings and adversarial input generation."""
+
+    def test_flags_backtracking_shapes(self):
+        """Test that nested quantifiers and alternation in unbounded repeats are flagged."""
+        assert pattern_warnings(r"(a+)+$") == ["nested quantifier"]
+        assert pattern_warnings(r"(?:ab|a)*c") == ["alternation inside an unbounded quantifier"]
+        assert pattern_warnings(META_RULE) == []
+        assert pattern_warnings(r"(?:[0-9a-f]{4}-){3}") == []
+
+    def test_adversarial_inputs_use_pattern_characters(self):
+        """Test that near-miss inputs repeat the pattern's characters after its literal prefix."""
+        inputs = adversarial_inputs(r"#\s*META", 8)
+
+        assert "#" + " " * 8 + "\x00" in inputs
+        assert all(text.endswith("\x00") for text in inputs)
+
+
+class TestWorstCase:
+    """Test suite for timing adversarial inputs."""
+
+    def test_catastrophic_pattern_stops_at_budget(self):
+        """Test that an exponential pattern exceeds the budget without running away."""
+        started = time.perf_counter()
+
+        worst_ms, chars, _ = worst_case(FindReplaceRule(r"(a+)+$", True, [], []), budget_ms=5.0)
+
+        assert worst_ms > 5.0
+        assert chars < 64
+        assert time.perf_counter() - started < 5.0
+
+    def test_linear_pattern_stays_fast(self):
+        """Test that the notebook META rule is linear on every adversarial input."""
+        worst_ms, _, superlinear = worst_case(FindReplaceRule(META_RULE, True, [], []), budget_ms=50.0)
+
+        assert worst_ms < 50.0
+        assert not superlinear
+
+
+class TestProfileRules:
+    """Test suite for corpus profiling and the profile-rules command."""
+
+    def test_corpus_respects_rule_filters(self, tmp_path):
+        """Test that only files selected by item_type/file_path are searched and matches counted."""
+        write_workspace(tmp_path, META_RULE, is_regex=True)
+        model = build_workspace_model(tmp_path)
+
+        (profile,) = profile_workspace(model.get("Sales"), tmp_path, budget_ms=50.0)
+
+        assert profile.label == "parameter.yml#1"
+        assert (profile.files, profile.matches) == (2, 1)
+        assert profile.findings == profile.warnings == []
+
+    def test_command_fails_over_budget(self, tmp_path):
+        """Test that profile-rules exits 1 for a catastrophic regex and 0 for a literal rule."""
+        write_workspace(tmp_path / "bad", r"(\s*,?\s*)*x", is_regex=True)
+        write_workspace(tmp_path / "good", "6323ba06-e77d-4165-aac8-962913913992", is_regex=False)
+
+        assert cli_main(["profile-rules", "--workspaces_directory", str(tmp_path / "bad"), "--budget_ms", "5"]) == 1
+        assert cli_main(["profile-rules", "--workspaces_directory", str(tmp_path / "good")]) == 0
+
+    def test_command_fails_on_static_findings(self, tmp_path):
+        """Test that backtracking shapes and patterns that do not compile fail regardless of the budget."""
+        write_workspace(tmp_path / "alternation", r"(?:ab|a)*c", is_regex=True)
+        write_workspace(tmp_path / "broken", r"(unclosed", is_regex=True)
+
+        for case in ("alternation", "broken"):
+            args = ["profile-rules", "--workspaces_directory", str(tmp_path / case), "--budget_ms", "10000"]
+            assert cli_main(args) == 1
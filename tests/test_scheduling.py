@@ -0,0 +1,133 @@
+"""Tests for LPT workspace scheduling (scripts.fabric.scheduling) and the parallel deploy pool."""
+
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from scripts.cli import build_parser
+from scripts.common.logger import _context, log_context
+from scripts.deploy_to_fabric import deploy_all_workspaces, worker_limit
+from scripts.fabric.history import HistoryStore
+from scripts.fabric.scheduling import (
+    FROM_ESTIMATE,
+    FROM_HISTORY,
+    WorkspacePrediction,
+    estimate_seconds,
+    load_historical_durations,
+    lpt_order,
+    predict_durations,
+    simulate_makespan,
+)
+from scripts.fabric.types import DeploymentResult
+from scripts.fabric.workspace_model import build_workspace_model
+
+
+class TestPredictions:
+    """Test suite for duration predictions and LPT ordering."""
+
+    def test_estimate_from_items(self, temp_workspace_dir):
+        """Test that estimates grow with the item count of the workspace."""
+        (temp_workspace_dir / "Test Workspace" / "sample.Lakehouse" / ".platform").write_text(
+            '{"metadata": {"type": "Lakehouse", "displayName": "sample"}, "config": {"logicalId": "1"}}'
+        )
+        model = build_workspace_model(temp_workspace_dir)
+        workspace = model.get("Test Workspace")
+
+        assert estimate_seconds(workspace) > estimate_seconds(None)
+
+    def test_history_median_and_calibrated_estimates(self, temp_workspace_dir):
+        """Test that history wins and estimates are scaled by the actual/estimate ratio of known workspaces."""
+        model = build_workspace_model(temp_workspace_dir)
+        estimate = estimate_seconds(model.get("Test Workspace"))
+        history = {"Test Workspace": [estimate * 2, estimate * 3, estimate * 2]}
+
+        predictions = predict_durations(["Test Workspace", "Unknown"], model, history)
+
+        assert predictions[0] == WorkspacePrediction("Test Workspace", estimate * 2, FROM_HISTORY)
+        assert predictions[1] == WorkspacePrediction("Unknown", estimate_seconds(None) * 2, FROM_ESTIMATE)
+
+    def test_lpt_order_and_makespan(self):
+        """Test that longest-first ordering beats alphabetical order on two workers."""
+        predictions = [
+            WorkspacePrediction("A", 10.0, FROM_HISTORY),
+            WorkspacePrediction("B", 10.0, FROM_HISTORY),
+            WorkspacePrediction("C", 20.0, FROM_HISTORY),
+        ]
+
+        ordered = lpt_order(predictions)
+
+        assert [p.folder for p in ordered] == ["C", "A", "B"]
+        assert simulate_makespan((p.seconds for p in predictions), 2) == 30.0
+        assert simulate_makespan((p.seconds for p in ordered), 2) == 20.0
+        assert simulate_makespan([5.0, 5.0], 1) == 10.0
+
+    def test_load_historical_durations(self, tmp_path):
+        """Test reading deploy durations from the history store; a missing database yields none."""
+        database = tmp_path / "history.db"
+        assert load_historical_durations("dev", database) == {}
+
+        with HistoryStore(database) as store:
+            store.record(
+                {
+                    "environment": "dev",
+                    "finished_at": "2026-01-01T00:00:00+00:00",
+                    "duration": 50.0,
+                    "workspaces": [{"name": "Sales", "status": "success", "duration": 42.0}],
+                }
+            )
+
+        assert load_historical_durations("dev", database) == {"Sales": [42.0]}
+        assert load_historical_durations("prod", database) == {}
+
+
+class TestParallelDeploy:
+    """Test suite for deploy_all_workspaces with a worker pool."""
+
+    @patch("scripts.deploy_to_fabric.deploy_workspace")
+    def test_workers_run_concurrently_with_log_context(self, mock_deploy, mock_azure_credential):
+        """Test that workspaces deploy concurrently, keep their order and see the caller's log context."""
+        barrier = threading.Barrier(2, timeout=5)
+        seen_context = []
+
+        def deploy(workspace_folder, **kwargs):
+            seen_context.append(dict(_context.get()))
+            barrier.wait()  # both deploys must be in flight at the same time
+            time.sleep(0.01 if workspace_folder == "Long" else 0)
+            return DeploymentResult(workspace_folder, workspace_folder, True)
+
+        mock_deploy.side_effect = deploy
+
+        with log_context(environment="dev", phase="deploy"):
+            results = deploy_all_workspaces(
+                workspace_folders=["Long", "Short"],
+                workspaces_directory="/path/to/workspaces",
+                environment="dev",
+                token_credential=mock_azure_credential,
+                max_workers=2,
+            )
+
+        assert [r.workspace_folder for r in results] == ["Long", "Short"]
+        assert all(context["environment"] == "dev" for context in seen_context)
+        assert {context["workspace"] for context in seen_context} == {"Long", "Short"}
+
+    def test_process_wide_config_forces_sequential_deploys(self, temp_workspace_dir):
+        """Test that a config.yml with constants or features limits the deploy to one worker."""
+        model = build_workspace_model(temp_workspace_dir)
+        assert worker_limit(model, 4) == 4
+
+        config = temp_workspace_dir / "Test Workspace" / "config.yml"
+        config.write_text(config.read_text() + "features:\n  - enable_shortcut_publish\n")
+        model = build_workspace_model(temp_workspace_dir)
+        assert worker_limit(model, 4) == 1
+        assert worker_limit(model, 1) == 1
+
+    def test_max_workers_must_be_positive(self):
+        """Test that --max_workers rejects values below 1."""
+        parser = build_parser()
+        base_args = ["deploy", "--workspaces_directory", "ws", "--environment", "dev", "--max_workers"]
+
+        assert parser.parse_args([*base_args, "3"]).max_workers == 3
+        with pytest.raises(SystemExit):
+            parser.parse_args([*base_args, "0"])
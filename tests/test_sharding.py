@@ -0,0 +1,161 @@
+"""Tests for CI sharding (--shard i/N) and merging per-shard results."""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from scripts.cli import main as cli_main
+from scripts.deploy_to_fabric import run_deployment_pipeline, shard_spec
+from scripts.fabric.reporting import build_deployment_results_json, merge_results_payloads, missing_shards
+from scripts.fabric.scheduling import partition_workspaces
+from scripts.fabric.types import DeploymentResult, DeploymentSummary
+from scripts.fabric.workspace_model import build_workspace_model
+
+SUMMARY_SCRIPT = Path(__file__).resolve().parent.parent / "scripts" / "generate_deployment_summary.sh"
+
+
+def make_workspaces(root: Path, item_counts: dict[str, int]) -> Path:
+    """Create workspace folders with the given number of items each."""
+    for folder, count in item_counts.items():
+        workspace = root / folder
+        workspace.mkdir(parents=True)
+        (workspace / "config.yml").write_text(f'core:\n  workspace:\n    dev: "[D] {folder}"\n')
+        for i in range(count):
+            item = workspace / f"item{i}.Notebook"
+            item.mkdir()
+            platform = {"metadata": {"type": "Notebook", "displayName": f"item{i}"}, "config": {"logicalId": str(i)}}
+            (item / ".platform").write_text(json.dumps(platform))
+    return root
+
+
+def shard_payload(shard: str, results: list[DeploymentResult], duration: float = 10.0) -> dict:
+    """Build the results payload written by one shard."""
+    summary = DeploymentSummary(
+        environment="dev",
+        duration=duration,
+        results=results,
+        commit_sha="abc123",
+        finished_at=f"2026-01-01T00:00:0{shard[0]}+00:00",
+        shard=shard,
+    )
+    return build_deployment_results_json(summary)
+
+
+class TestPartition:
+    """Test suite for partition_workspaces and --shard parsing."""
+
+    def test_partition_is_balanced_and_complete(self, tmp_path):
+        """Test that every workspace lands in exactly one shard and large workspaces are spread out."""
+        model = build_workspace_model(make_workspaces(tmp_path, {"A": 6, "B": 5, "C": 1, "D": 1, "E": 0}))
+
+        shards = partition_workspaces(model.folders, model, 2)
+
+        assert sorted(folder for shard in shards for folder in shard) == ["A", "B", "C", "D", "E"]
+        assert shards == [["A", "D"], ["B", "C", "E"]]
+        assert partition_workspaces(model.folders, model, 2) == shards
+
+    def test_more_shards_than_workspaces(self, tmp_path):
+        """Test that surplus shards are empty instead of failing."""
+        model = build_workspace_model(make_workspaces(tmp_path, {"A": 1}))
+
+        assert partition_workspaces(model.folders, model, 3) == [["A"], [], []]
+
+    def test_shard_spec(self):
+        """Test parsing of i/N and rejection of out-of-range or malformed values."""
+        assert shard_spec("2/4") == (2, 4)
+        for value in ("0/2", "3/2", "x/2", "2"):
+            with pytest.raises(argparse.ArgumentTypeError):
+                shard_spec(value)
+
+    @patch("scripts.deploy_to_fabric.DeploymentCheckpoint")
+    @patch("scripts.deploy_to_fabric.deploy_all_workspaces", return_value=[])
+    def test_pipeline_deploys_only_its_shard(self, mock_deploy_all, mock_checkpoint, tmp_path, mock_azure_credential):
+        """Test that run_deployment_pipeline deploys the selected shard and records it in the summary."""
+        mock_checkpoint.open.return_value.is_completed.return_value = False
+        model = build_workspace_model(make_workspaces(tmp_path, {"A": 6, "B": 5, "C": 1, "D": 1, "E": 0}))
+
+        summary = run_deployment_pipeline(str(tmp_path), "dev", mock_azure_credential, model, shard=(2, 2))
+
+        assert sorted(mock_deploy_all.call_args.kwargs["workspace_folders"]) == ["B", "C", "E"]
+        assert summary.shard == "2/2"
+
+
+class TestMergeResults:
+    """Test suite for merging per-shard results."""
+
+    def test_merge_recomputes_counts(self):
+        """Test that shards are combined, counts recomputed and the slowest shard sets the duration."""
+        merged = merge_results_payloads(
+            [
+                shard_payload("2/2", [DeploymentResult("B", "[D] B", False, "boom", attempts=2)], duration=30.0),
+                shard_payload("1/2", [DeploymentResult("A", "[D] A", True), DeploymentResult("C", "[D] C", True)]),
+            ]
+        )
+
+        assert [w["name"] for w in merged["workspaces"]] == ["A", "B", "C"]
+        assert (merged["total_workspaces"], merged["successful_count"], merged["failed_count"]) == (3, 2, 1)
+        assert merged["duration"] == 30.0
+        assert merged["retry_count"] == 1
+        assert merged["shards"] == ["1/2", "2/2"]
+        assert missing_shards(merged) == []
+
+    def test_rerun_shard_replaces_earlier_result(self):
+        """Test that the later result of a workspace wins when a shard was re-run."""
+        first = shard_payload("1/2", [DeploymentResult("A", "[D] A", False, "boom")])
+        rerun = shard_payload("1/2", [DeploymentResult("A", "[D] A", True)])
+        rerun["finished_at"] = "2026-01-02T00:00:00+00:00"
+
+        merged = merge_results_payloads([rerun, first])
+
+        assert merged["successful_count"] == 1
+        assert missing_shards(merged) == ["2/2"]
+
+    def test_merge_results_command(self, tmp_path, monkeypatch):
+        """Test that merge-results finds shard files in artifact directories and fails on a missing shard."""
+        monkeypatch.chdir(tmp_path)
+        for shard, folder in (("1/3", "A"), ("3/3", "C")):
+            artifact = tmp_path / "artifacts" / f"deployment-results-dev-{shard[0]}"
+            artifact.mkdir(parents=True)
+            payload = shard_payload(shard, [DeploymentResult(folder, f"[D] {folder}", True)])
+            (artifact / "deployment-results.json").write_text(json.dumps(payload))
+
+        exit_code = cli_main(["merge-results", "artifacts", "--output", "merged.json"])
+
+        merged = json.loads((tmp_path / "merged.json").read_text())
+        assert exit_code == 1
+        assert merged["total_workspaces"] == 2
+        assert missing_shards(merged) == ["2/3"]
+
+    @pytest.mark.skipif(shutil.which("bash") is None or shutil.which("jq") is None, reason="requires bash and jq")
+    def test_summary_script_reads_merged_results(self, tmp_path):
+        """Test that generate_deployment_summary.sh renders a merged results file."""
+        merged = merge_results_payloads(
+            [
+                shard_payload("1/2", [DeploymentResult("A", "[D] A", True)]),
+                shard_payload("2/2", [DeploymentResult("B", "[D] B", False, "boom")]),
+            ]
+        )
+        (tmp_path / "deployment-results.json").write_text(json.dumps(merged))
+        summary_file = tmp_path / "summary.md"
+
+        completed = subprocess.run(
+            ["bash", str(SUMMARY_SCRIPT), "dev", "Automatic"],
+            cwd=tmp_path,
+            env={**os.environ, "GITHUB_STEP_SUMMARY": str(summary_file), "JOB_STATUS": "failure"},
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+
+        summary = summary_file.read_text(encoding="utf-8")
+        assert completed.returncode == 0, completed.stderr
+        assert "- **Total Workspaces**: 2" in summary
+        assert "- **Shards**: 1/2, 2/2" in summary
+        assert "- ✓ [D] A" in summary
+        assert "- ✗ [D] B" in summary
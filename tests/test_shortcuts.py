@@ -0,0 +1,124 @@
+"""Tests for OneLake shortcut generation (fabric generate-shortcuts)."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from scripts.cli import main as cli_main
+from scripts.fabric.config import SHORTCUT_TABLES
+from scripts.fabric.shortcuts import (
+    avoided_copies,
+    format_bytes,
+    parse_targets,
+    plan_shortcuts,
+    shortcut_definition,
+)
+from scripts.fabric.workspace_model import load_workspace_model
+
+from .conftest import REPOSITORY_WORKSPACES, WORKSPACE
+
+SILVER_SHORTCUTS = "2_Silver/lakehouse_silver.Lakehouse/shortcuts.metadata.json"
+GOLD_SHORTCUTS = "3_Gold/lakehouse_gold.Lakehouse/shortcuts.metadata.json"
+BRONZE_ID = "b892bcb4-b1d3-a9e0-4a9e-fac33bb0b654"
+
+
+@pytest.fixture
+def workspaces_dir(copy_workspaces):
+    """Copy the repository workspaces with empty silver and gold shortcut files."""
+    return copy_workspaces("generate-shortcuts")
+
+
+def plans_of(workspaces_dir: Path, targets=SHORTCUT_TABLES) -> dict:
+    """Return lakehouse -> shortcut plan for the copied workspace."""
+    (workspace,) = load_workspace_model(workspaces_dir).workspaces
+    return {plan.lakehouse: plan for plan in plan_shortcuts(workspace, workspaces_dir, "lakehouse_bronze", targets)}
+
+
+class TestPlanShortcuts:
+    """Test suite for planning shortcuts from the bronze inventory."""
+
+    def test_dimensions_are_exposed_in_silver_and_gold(self, workspaces_dir):
+        """Test that every bronze dimension gets a shortcut and the CopyJob fact table does not."""
+        plans = plans_of(workspaces_dir)
+
+        silver = plans["lakehouse_silver"]
+        assert silver.path == SILVER_SHORTCUTS
+        assert len(silver.tables) == 5
+        assert all(t.startswith("dbo.dimension_") for t in silver.tables)
+        assert plans["lakehouse_gold"].tables == silver.tables
+        assert json.loads(silver.text) == silver.content
+
+    def test_shortcut_definition(self):
+        """Test that a shortcut keeps schema and name and targets the placeholder workspace."""
+        assert shortcut_definition("dbo.dimension_city", BRONZE_ID) == {
+            "name": "dimension_city",
+            "path": "/Tables/dbo",
+            "target": {
+                "type": "OneLake",
+                "oneLake": {
+                    "path": "Tables/dbo/dimension_city",
+                    "itemId": BRONZE_ID,
+                    "workspaceId": "00000000-0000-0000-0000-000000000000",
+                    "artifactType": "Lakehouse",
+                },
+            },
+        }
+
+    def test_other_shortcuts_are_kept(self, workspaces_dir):
+        """Test that shortcuts not owned by the generator survive and win over a generated one of the same name."""
+        external = {"name": "weather", "path": "/Files", "target": {"type": "AdlsGen2", "adlsGen2": {}}}
+        hand_made = shortcut_definition("dbo.dimension_city", "11111111-1111-1111-1111-111111111111")
+        stale = shortcut_definition("dbo.dimension_old", BRONZE_ID)
+        unmatched = shortcut_definition("dbo.fact_sale", BRONZE_ID)
+        shortcuts = [external, hand_made, stale, unmatched]
+        (workspaces_dir / WORKSPACE / SILVER_SHORTCUTS).write_text(json.dumps(shortcuts))
+
+        silver = plans_of(workspaces_dir, {"lakehouse_silver": ["dbo.dimension_*"]})["lakehouse_silver"]
+
+        assert silver.content[:3] == [external, hand_made, unmatched]
+        assert "dbo.dimension_city" not in silver.tables
+        assert stale not in silver.content
+        with pytest.raises(KeyError, match="lakehouse_platinum"):
+            plans_of(workspaces_dir, {"lakehouse_platinum": ["*"]})
+
+    def test_baseline_gold_shortcuts_are_preserved(self, workspaces_dir):
+        """Test that generating on the hand-made gold file keeps fact_sale and every entry in place."""
+        baseline = json.loads((REPOSITORY_WORKSPACES / WORKSPACE / GOLD_SHORTCUTS).read_text())
+        (workspaces_dir / WORKSPACE / GOLD_SHORTCUTS).write_text(json.dumps(baseline))
+
+        gold = plans_of(workspaces_dir)["lakehouse_gold"]
+
+        assert gold.content == baseline
+        assert baseline[0]["name"] == "fact_sale"
+        assert "dbo.fact_sale" not in gold.tables
+
+    def test_avoided_copies_per_environment(self):
+        """Test that sizes add up per environment and unsized tables are listed."""
+        sizes = {"dimension_city": {"_ALL_": 12.0}, "dbo.dimension_date": {"prod": 500.0}}
+
+        dev, _, prod = avoided_copies(["dbo.dimension_city", "dbo.dimension_date"], sizes)
+
+        assert dev.bytes == 12 * 1024 * 1024
+        assert dev.unsized == ("dbo.dimension_date",)
+        assert prod.bytes == 512 * 1024 * 1024
+        assert prod.seconds == pytest.approx(512 / 50)
+        assert format_bytes(prod.bytes) == "512.0 MiB"
+        assert parse_targets(["lakehouse_gold=dbo.dim_*, dbo.fact_sale"]) == {
+            "lakehouse_gold": ("dbo.dim_*", "dbo.fact_sale")
+        }
+
+
+class TestGenerateShortcutsCommand:
+    """Test suite for the generate-shortcuts subcommand."""
+
+    @pytest.mark.parametrize("generator_command", ["generate-shortcuts"])
+    def test_shortcuts_target_bronze_and_sizes_are_reported(self, generated_workspaces, tmp_path):
+        """Test that generated gold shortcuts point at bronze and --table_sizes is accepted."""
+        sizes = tmp_path / "sizes.yml"
+        sizes.write_text("dimension_city: 12\n")
+        args = ["generate-shortcuts", "--workspaces_directory", str(generated_workspaces), "--table_sizes", str(sizes)]
+
+        gold = json.loads((generated_workspaces / WORKSPACE / GOLD_SHORTCUTS).read_text())
+        assert {s["target"]["oneLake"]["itemId"] for s in gold} == {BRONZE_ID}
+        assert cli_main([*args, "--check"]) == 0
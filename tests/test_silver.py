@@ -0,0 +1,119 @@
+"""Tests for the silver MERGE notebook generator (fabric generate-silver)."""
+
+from pathlib import Path
+
+import pytest
+
+from scripts.cli import main as cli_main
+from scripts.fabric.config import SILVER_SPEC_FILE
+from scripts.fabric.shortcuts import shortcut_tables
+from scripts.fabric.silver import SilverTable, generate_silver, load_silver_tables, parse_silver_tables
+from scripts.fabric.workspace_model import load_workspace_model
+
+from .conftest import REPOSITORY_WORKSPACES, WORKSPACE
+
+TRANSFORMATIONS_DIR = "2_Silver/transformations"
+FACT_SALE_DIR = f"{TRANSFORMATIONS_DIR}/nb_merge_fact_sale.Notebook"
+SILVER_DEV_ID = "4f3864da-233e-496b-8bc9-b951acdd2b17"
+DEFAULT_SPEC = REPOSITORY_WORKSPACES / WORKSPACE / SILVER_SPEC_FILE
+
+
+@pytest.fixture
+def workspaces_dir(copy_workspaces):
+    """Copy the repository workspaces without the generated silver notebooks."""
+    return copy_workspaces("generate-silver")
+
+
+def generate(workspaces_dir: Path, tables: list[SilverTable]) -> tuple[dict[str, str], list[str]]:
+    """Generate the silver notebooks of the copied workspace."""
+    (workspace,) = load_workspace_model(workspaces_dir).workspaces
+    return generate_silver(workspace, workspaces_dir, "2_Silver", "lakehouse_silver", "lakehouse_bronze", tables)
+
+
+class TestParseSilverTables:
+    """Test suite for the silver table spec."""
+
+    def test_default_spec(self):
+        """Test that the default spec upserts fact_sale by SaleKey, partitioned by invoice date."""
+        (fact_sale,) = load_silver_tables(DEFAULT_SPEC)
+
+        assert fact_sale == SilverTable("dbo.fact_sale", ("SaleKey",), (), "InvoiceDateKey")
+        assert fact_sale.notebook == "nb_merge_fact_sale"
+        assert fact_sale.parameters("lakehouse_bronze") == {
+            "source_table": "lakehouse_bronze.dbo.fact_sale",
+            "target_table": "dbo.fact_sale",
+            "key_columns": '["SaleKey"]',
+            "change_columns": "[]",
+            "partition_column": "InvoiceDateKey",
+            "order_column": "",
+            "full_refresh": False,
+        }
+
+    def test_invalid_specs(self):
+        """Test that missing keys, unqualified tables, overlapping columns and clashing notebooks are rejected."""
+        with pytest.raises(ValueError, match="key_columns is required"):
+            parse_silver_tables({"dbo.fact_sale": {"partition_column": "InvoiceDateKey"}})
+        with pytest.raises(ValueError, match="expected 'schema.table'"):
+            parse_silver_tables({"fact_sale": {"key_columns": "SaleKey"}})
+        with pytest.raises(ValueError, match="SaleKey cannot also be change columns"):
+            parse_silver_tables({"dbo.fact_sale": {"key_columns": "SaleKey", "change_columns": ["SaleKey"]}})
+        with pytest.raises(ValueError, match="partition_column"):
+            parse_silver_tables({"dbo.fact_sale": {"key_columns": "SaleKey", "partition_column": "Invoice Date"}})
+        with pytest.raises(ValueError, match="nb_merge_fact_sale"):
+            parse_silver_tables({"dbo.fact_sale": {"key_columns": "SaleKey"}, "sales.fact_sale": {"key_columns": "Id"}})
+
+
+class TestGenerateSilver:
+    """Test suite for the generated MERGE notebooks."""
+
+    def test_notebook_attaches_to_silver_and_merges(self, workspaces_dir):
+        """Test that the notebook attaches to the dev silver lakehouse and upserts changed rows with a pruned MERGE."""
+        files, stale = generate(workspaces_dir, load_silver_tables(DEFAULT_SPEC))
+
+        assert stale == []
+        notebook = files[f"{FACT_SALE_DIR}/notebook-content.py"]
+        assert f'# META       "default_lakehouse": "{SILVER_DEV_ID}",' in notebook
+        assert "partition_column = 'InvoiceDateKey'" in notebook
+        assert '"left_anti"' in notebook
+        assert 'in_partitions(f"target.{partition_column}", values)' in notebook
+        assert "whenMatchedUpdateAll().whenNotMatchedInsertAll()" in notebook
+        assert "'delta.enableChangeDataFeed' = 'true'" in notebook
+        assert notebook.index("ALTER TABLE {source_table}") < notebook.index("DESCRIBE HISTORY {source_table}")
+        assert "spec = [source_table, key_columns, change_columns, partition_column, order_column]" in notebook
+        assert 'DESCRIBE DETAIL {target_table}").first()["partitionColumns"]' in notebook
+
+    def test_shortcut_and_unknown_tables_are_rejected(self, workspaces_dir):
+        """Test that tables silver exposes as shortcuts or no CopyJob writes to bronze get no notebook."""
+        (workspace,) = load_workspace_model(workspaces_dir).workspaces
+        assert "dbo.dimension_city" in shortcut_tables(workspace, workspaces_dir, "lakehouse_silver")
+
+        with pytest.raises(ValueError, match="already exposed in lakehouse_silver as shortcuts: dbo.dimension_city"):
+            generate(workspaces_dir, parse_silver_tables({"dbo.dimension_city": {"key_columns": "CityKey"}}))
+        with pytest.raises(ValueError, match="not written by a CopyJob to lakehouse_bronze: dbo.fact_purchase"):
+            generate(workspaces_dir, parse_silver_tables({"dbo.fact_purchase": {"key_columns": "PurchaseKey"}}))
+
+    def test_spec_file_and_removed_tables(self, workspaces_dir, tmp_path):
+        """Test that a YAML spec drives the notebooks and notebooks no longer in it are reported."""
+        assert cli_main(["generate-silver", "--workspaces_directory", str(workspaces_dir)]) == 0
+        shortcuts = workspaces_dir / WORKSPACE / "2_Silver/lakehouse_silver.Lakehouse/shortcuts.metadata.json"
+        shortcuts.write_text("[]")
+        spec = tmp_path / "silver_tables.yml"
+        spec.write_text("dbo.dimension_city:\n  key_columns: [CityKey]\n  order_column: ValidFrom\n")
+
+        files, stale = generate(workspaces_dir, load_silver_tables(spec))
+
+        notebook = files[f"{TRANSFORMATIONS_DIR}/nb_merge_dimension_city.Notebook/notebook-content.py"]
+        assert "order_column = 'ValidFrom'" in notebook
+        assert stale == [FACT_SALE_DIR]
+
+
+class TestGenerateSilverCommand:
+    """Test suite for the generate-silver subcommand."""
+
+    def test_workspace_without_spec_fails(self, workspaces_dir):
+        """Test that a workspace with the silver lakehouse but no spec file fails unless --spec is given."""
+        (workspaces_dir / WORKSPACE / SILVER_SPEC_FILE).unlink()
+        args = ["generate-silver", "--workspaces_directory", str(workspaces_dir)]
+
+        assert cli_main(args) == 1
+        assert cli_main([*args, "--spec", str(DEFAULT_SPEC)]) == 0
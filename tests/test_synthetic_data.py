@@ -0,0 +1,132 @@
+"""Tests for the synthetic star-schema generator and local medallion benchmark (generate-data, benchmark)."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from scripts.cli import main as cli_main
+from scripts.fabric.synthetic_data import FACT_TABLE, STAR_SCHEMA, parse_rows, plan_chunks, source_file
+
+REPOSITORY_INGESTION = Path(__file__).resolve().parent.parent / "workspaces/Fabric BI End2End/1_Bronze/ingestion"
+SMALL_DIMENSIONS = {
+    "dimension_city": 50,
+    "dimension_customer": 20,
+    "dimension_date": 60,
+    "dimension_employee": 10,
+    "dimension_stock_item": 30,
+}
+
+
+@pytest.fixture
+def dataset(tmp_path):
+    """Generate 2,500 fact rows in chunks of 1,000 with small dimensions."""
+    pytest.importorskip("pyarrow")
+    from scripts.fabric.synthetic_data import generate_dataset
+
+    written = generate_dataset(tmp_path / "data", 2_500, 1_000, 7, SMALL_DIMENSIONS)
+    return tmp_path / "data", written
+
+
+class TestScale:
+    """Test suite for scale factors and chunking (no pyarrow needed)."""
+
+    def test_row_counts_and_chunks(self):
+        """Test that suffixed counts parse and chunks cover the table without exceeding the chunk size."""
+        assert parse_rows("1M") == 1_000_000
+        assert parse_rows("1b") == 1_000_000_000
+        assert parse_rows("2.5K") == 2_500
+        assert parse_rows("10_000") == 10_000
+        with pytest.raises(ValueError, match="row count"):
+            parse_rows("ten")
+
+        assert plan_chunks(2_500, 1_000) == [(0, 1_000), (1_000, 1_000), (2_000, 500)]
+        assert len(plan_chunks(1_000_000_000)) == 1_000
+        with pytest.raises(ValueError, match="between 1 and 1,000,000,000"):
+            plan_chunks(1_000_000_001)
+
+    def test_files_match_copy_job_sources(self):
+        """Test that every file the bronze CopyJobs read is generated under the same name."""
+        sources = {
+            activity["properties"]["source"]["datasetSettings"]["location"]["fileName"]
+            for path in REPOSITORY_INGESTION.glob("*.CopyJob/copyjob-content.json")
+            for activity in json.loads(path.read_text(encoding="utf-8"))["activities"]
+        }
+
+        assert sources == {source_file(table) for table in STAR_SCHEMA}
+
+
+class TestGenerateDataset:
+    """Test suite for the generated parquet files."""
+
+    def test_schemas_rows_and_row_groups(self, dataset):
+        """Test that each file has the star-schema types and the fact table one row group per chunk."""
+        import pyarrow.parquet as pq
+
+        from scripts.fabric.synthetic_data import arrow_schema
+
+        data_dir, written = dataset
+
+        assert written == {**SMALL_DIMENSIONS, FACT_TABLE: 2_500}
+        for table in STAR_SCHEMA:
+            parquet = pq.ParquetFile(data_dir / source_file(table))
+            assert parquet.schema_arrow.equals(arrow_schema(table))
+            assert parquet.metadata.num_rows == written[table]
+        assert pq.ParquetFile(data_dir / source_file(FACT_TABLE)).metadata.num_row_groups == 3
+        assert not list(data_dir.glob("*.partial"))
+
+    def test_keys_reference_dimensions_and_seed_is_deterministic(self, dataset, tmp_path):
+        """Test that fact keys exist in their dimensions, amounts add up, and the same seed gives the same data."""
+        import pyarrow.compute as pc
+        import pyarrow.parquet as pq
+
+        from scripts.fabric.synthetic_data import generate_dataset
+
+        data_dir, _ = dataset
+        facts = pq.read_table(data_dir / source_file(FACT_TABLE))
+        stock = pq.read_table(data_dir / source_file("dimension_stock_item"))
+
+        assert pc.max(facts["StockItemKey"]).as_py() <= SMALL_DIMENSIONS["dimension_stock_item"]
+        assert pc.min(facts["CityKey"]).as_py() >= 1
+        assert facts["SaleKey"].to_pylist() == list(range(1, 2_501))
+        first = facts.slice(0, 1).to_pylist()[0]
+        item = stock.slice(first["StockItemKey"] - 1, 1).to_pylist()[0]
+        assert first["Description"] == item["StockItem"]
+        assert first["TotalIncludingTax"] == first["TotalExcludingTax"] + first["TaxAmount"]
+
+        generate_dataset(tmp_path / "again", 2_500, 1_000, 7, SMALL_DIMENSIONS)
+        assert pq.read_table(tmp_path / "again" / source_file(FACT_TABLE)).equals(facts)
+
+
+class TestMedallionBenchmark:
+    """Test suite for the bronze -> silver -> gold benchmark."""
+
+    def test_stages_and_gold_totals(self, dataset):
+        """Test that all stages are measured and gold adds up to the generated facts."""
+        import pyarrow.compute as pc
+        import pyarrow.parquet as pq
+
+        from scripts.fabric.medallion_benchmark import benchmark_medallion
+
+        data_dir, written = dataset
+
+        result = benchmark_medallion(data_dir, batch_rows=1_000)
+
+        assert [s.stage for s in result.stages] == ["bronze", "silver", "gold"]
+        assert result.stages[0].rows_in == sum(written.values())
+        assert result.stages[1].rows_out == result.stages[2].rows_in == 2_500
+        assert all(s.rows_per_second > 0 for s in result.stages)
+        facts = pq.read_table(data_dir / source_file(FACT_TABLE))
+        assert pc.sum(result.gold["Sales"]).as_py() == 2_500
+        assert pc.sum(result.gold["Quantity"]).as_py() == pc.sum(facts["Quantity"]).as_py()
+        assert not [p for p in data_dir.iterdir() if p.name.startswith(".benchmark-")]
+
+    def test_commands_and_missing_data(self, tmp_path):
+        """Test that generate-data and benchmark run end to end and a missing directory fails."""
+        pytest.importorskip("pyarrow")
+        data_dir, output = tmp_path / "data", tmp_path / "benchmark-results.json"
+
+        assert cli_main(["generate-data", "--output_directory", str(data_dir), "--fact_rows", "2K"]) == 0
+        assert cli_main(["benchmark", "--data_directory", str(data_dir), "--output", str(output)]) == 0
+        assert [s["stage"] for s in json.loads(output.read_text())["stages"]] == ["bronze", "silver", "gold"]
+        assert cli_main(["benchmark", "--data_directory", str(tmp_path / "missing")]) == 1
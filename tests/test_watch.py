@@ -0,0 +1,120 @@
+"""Tests for the watch mode of the unmapped-ID scanner (check_unmapped_ids --watch)."""
+
+import shutil
+import sys
+from unittest.mock import patch
+
+import pytest
+
+from scripts.check_unmapped_ids import WatchSession, scan_workspace
+from scripts.fabric.watcher import InotifyWatcher, PollingWatcher
+
+GUID_A = "aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa"
+GUID_B = "bbbbbbbb-bbbb-bbbb-bbbb-bbbbbbbbbbbb"
+
+
+def notebook_content(lakehouse_id: str) -> str:
+    """Return a minimal notebook-content.py whose META block references a lakehouse."""
+    return f'# META {{\n# META   "default_lakehouse": "{lakehouse_id}",\n# META }}\n'
+
+
+@pytest.fixture
+def workspaces_dir(tmp_path):
+    """Create one workspace with a notebook referencing GUID_A and no rules."""
+    workspace = tmp_path / "workspaces" / "Sales"
+    notebook = workspace / "nb_load.Notebook"
+    notebook.mkdir(parents=True)
+    (workspace / "config.yml").write_text('core:\n  workspace:\n    dev: "[D] Sales"\n')
+    (workspace / "parameter.yml").write_text("find_replace: []\n")
+    (notebook / "notebook-content.py").write_text(notebook_content(GUID_A))
+    return tmp_path / "workspaces"
+
+
+class TestWatchSession:
+    """Test suite for incremental rescans in WatchSession."""
+
+    def test_initial_scan_matches_full_scan(self, workspaces_dir):
+        """Test that the in-memory scan finds the same GUIDs as scan_workspace."""
+        session = WatchSession(workspaces_dir)
+        session.scan_all()
+
+        assert session.findings == scan_workspace("Sales", workspaces_dir, workspaces_dir.parent)
+        assert [u.guid for u in session.findings] == [GUID_A]
+
+    def test_changed_file_reports_new_and_resolved(self, workspaces_dir):
+        """Test that editing a file reports the GUID it no longer contains and the one it gained."""
+        session = WatchSession(workspaces_dir)
+        session.scan_all()
+        notebook = workspaces_dir / "Sales" / "nb_load.Notebook" / "notebook-content.py"
+        notebook.write_text(notebook_content(GUID_B))
+
+        new, resolved = session.apply({notebook})
+
+        assert [u.guid for u in new] == [GUID_B]
+        assert [u.guid for u in resolved] == [GUID_A]
+
+    def test_rule_change_rechecks_cached_guids_without_reading_items(self, workspaces_dir):
+        """Test that a parameter template change re-checks coverage from the cache."""
+        session = WatchSession(workspaces_dir)
+        session.scan_all()
+        templates = workspaces_dir / "Sales" / "parameter_templates"
+        templates.mkdir()
+        (templates / "nb.yml").write_text(f'find_replace:\n  - find_value: "{GUID_A}"\n    replace_value: x\n')
+        (workspaces_dir / "Sales" / "parameter.yml").write_text("extend:\n  - parameter_templates/nb.yml\n")
+
+        with patch("scripts.check_unmapped_ids.extract_guids") as mock_extract:
+            new, resolved = session.apply({templates / "nb.yml", workspaces_dir / "Sales" / "parameter.yml"})
+
+        mock_extract.assert_not_called()
+        assert new == []
+        assert [u.guid for u in resolved] == [GUID_A]
+        assert session.findings == []
+
+    def test_removed_directory_and_new_workspace(self, workspaces_dir):
+        """Test that a deleted item folder resolves its findings and a new workspace is scanned."""
+        session = WatchSession(workspaces_dir)
+        session.scan_all()
+        shutil.rmtree(workspaces_dir / "Sales" / "nb_load.Notebook")
+        shutil.copytree(workspaces_dir / "Sales", workspaces_dir / "HR")
+        hr_notebook = workspaces_dir / "HR" / "nb_hr.Notebook"
+        hr_notebook.mkdir()
+        (hr_notebook / "notebook-content.py").write_text(notebook_content(GUID_B))
+
+        new, resolved = session.apply({workspaces_dir / "Sales" / "nb_load.Notebook", workspaces_dir / "HR"})
+
+        assert [(u.workspace_folder, u.guid) for u in new] == [("HR", GUID_B)]
+        assert [u.guid for u in resolved] == [GUID_A]
+
+
+class TestWatchers:
+    """Test suite for the filesystem change backends."""
+
+    def test_polling_watcher_reports_changed_files(self, workspaces_dir):
+        """Test that modified, created and deleted files are reported by the polling backend."""
+        notebook = workspaces_dir / "Sales" / "nb_load.Notebook" / "notebook-content.py"
+        watcher = PollingWatcher(workspaces_dir, interval=0.01)
+        notebook.write_text(notebook_content(GUID_B) + "# extra\n")
+        (workspaces_dir / "Sales" / "new.json").write_text("{}")
+        (workspaces_dir / "Sales" / "parameter.yml").unlink()
+
+        changed = watcher.wait(timeout=1.0)
+
+        assert changed == {
+            notebook,
+            workspaces_dir / "Sales" / "new.json",
+            workspaces_dir / "Sales" / "parameter.yml",
+        }
+        assert watcher.wait(timeout=0.05) == set()
+
+    @pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is Linux-only")
+    def test_inotify_watcher_follows_new_directories(self, workspaces_dir):
+        """Test that files in a newly created directory are reported with the directory."""
+        with InotifyWatcher(workspaces_dir) as watcher:
+            item = workspaces_dir / "Sales" / "nb_new.Notebook"
+            item.mkdir()
+            (item / "notebook-content.py").write_text(notebook_content(GUID_B))
+
+            changed = watcher.wait(timeout=1.0)
+
+        assert item in changed
+        assert item / "notebook-content.py" in changed
@@ -0,0 +1,139 @@
+"""Tests for scripts.fabric.workspace_model."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from scripts.check_unmapped_ids import scan_workspace
+from scripts.fabric import workspace_model
+from scripts.fabric.workspace_model import build_workspace_model, load_workspace_model
+
+
+@pytest.fixture
+def model_workspace_dir(temp_workspace_dir):
+    """Add a .platform file to the sample Lakehouse item of temp_workspace_dir."""
+    item_dir = temp_workspace_dir / "Test Workspace" / "sample.Lakehouse"
+    (item_dir / ".platform").write_text(
+        json.dumps(
+            {
+                "metadata": {"type": "Lakehouse", "displayName": "sample"},
+                "config": {"version": "2.0", "logicalId": "11111111-2222-3333-4444-555555555555"},
+            }
+        )
+    )
+    return temp_workspace_dir
+
+
+@pytest.fixture(autouse=True)
+def clear_memo():
+    """Isolate the in-process model memo between tests."""
+    workspace_model._memo.clear()
+    yield
+    workspace_model._memo.clear()
+
+
+class TestBuildWorkspaceModel:
+    """Test suite for build_workspace_model."""
+
+    def test_model_contains_workspace_items_and_rules(self, model_workspace_dir):
+        """Test that config, rules, items and file lists are captured."""
+        model = build_workspace_model(model_workspace_dir)
+        workspace = model.get("Test Workspace")
+
+        assert model.folders == ["Test Workspace"]
+        assert workspace.config["core"]["workspace"]["dev"] == "[D] Test Workspace"
+        assert [rule.find_value for rule in workspace.rules] == ["old-id"]
+        assert len(workspace.items) == 1
+        item = workspace.items[0]
+        assert (item.item_type, item.display_name, item.path) == ("Lakehouse", "sample", "sample.Lakehouse")
+        assert item.logical_id == "11111111-2222-3333-4444-555555555555"
+        assert "sample.Lakehouse/lakehouse.metadata.json" in item.files
+        assert workspace.item_for_file("sample.Lakehouse/lakehouse.metadata.json") == item
+
+    def test_missing_directory_raises(self, tmp_path):
+        """Test that a missing workspaces directory raises FileNotFoundError."""
+        with pytest.raises(FileNotFoundError, match="Workspaces directory not found"):
+            build_workspace_model(tmp_path / "missing")
+
+    def test_unknown_workspace_raises_key_error(self, model_workspace_dir):
+        """Test that looking up an unknown folder raises KeyError."""
+        with pytest.raises(KeyError):
+            build_workspace_model(model_workspace_dir).get("Nope")
+
+
+class TestLoadWorkspaceModel:
+    """Test suite for the cached loader."""
+
+    def test_cache_round_trip(self, model_workspace_dir, tmp_path):
+        """Test that a second process-level load is served from the JSON cache."""
+        cache_file = tmp_path / "cache" / "model.json"
+        first = load_workspace_model(model_workspace_dir, cache_file)
+        workspace_model._memo.clear()
+
+        second = load_workspace_model(model_workspace_dir, cache_file)
+
+        assert cache_file.exists()
+        assert second == first
+        assert second is not first
+
+    def test_unchanged_files_are_not_rehashed(self, model_workspace_dir, tmp_path, monkeypatch):
+        """Test that a warm load only stats files whose size and mtime match the cache."""
+        cache_file = tmp_path / "model.json"
+        first = load_workspace_model(model_workspace_dir, cache_file)
+        workspace_model._memo.clear()
+        read_bytes = Path.read_bytes
+        hashed = []
+        monkeypatch.setattr(Path, "read_bytes", lambda path: hashed.append(path) or read_bytes(path))
+
+        assert load_workspace_model(model_workspace_dir, cache_file) == first
+        assert hashed == []
+
+    def test_default_cache_is_per_user_and_disabled_in_ci(self, model_workspace_dir, tmp_path, monkeypatch):
+        """Test that the default cache lives under XDG_CACHE_HOME and is not used under GitHub Actions."""
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "xdg"))
+        monkeypatch.setenv("GITHUB_ACTIONS", "false")
+        cache_file = workspace_model.default_cache_file(model_workspace_dir.resolve())
+
+        load_workspace_model(model_workspace_dir)
+
+        assert cache_file is not None and cache_file.is_relative_to(tmp_path / "xdg")
+        assert cache_file.exists()
+        monkeypatch.setenv("GITHUB_ACTIONS", "true")
+        assert workspace_model.default_cache_file(model_workspace_dir.resolve()) is None
+
+    def test_memo_returns_same_instance(self, model_workspace_dir):
+        """Test that repeated loads in one process reuse the model."""
+        first = load_workspace_model(model_workspace_dir, cache_file=None)
+
+        assert load_workspace_model(model_workspace_dir, cache_file=None) is first
+
+    def test_parameter_change_invalidates_cache(self, model_workspace_dir, tmp_path):
+        """Test that editing parameter.yml produces a new fingerprint and rules."""
+        cache_file = tmp_path / "model.json"
+        first = load_workspace_model(model_workspace_dir, cache_file)
+
+        (model_workspace_dir / "Test Workspace" / "parameter.yml").write_text(
+            "find_replace:\n  - find_value: 'new-id'\n    replace_value:\n      _ALL_: 'x'\n"
+        )
+        second = load_workspace_model(model_workspace_dir, cache_file)
+
+        assert second.fingerprint != first.fingerprint
+        assert [rule.find_value for rule in second.get("Test Workspace").rules] == ["new-id"]
+
+
+class TestModelConsumers:
+    """Test that entry points produce identical results with and without the model."""
+
+    def test_scan_workspace_with_model_matches_filesystem_walk(self, model_workspace_dir):
+        """Test that the scanner finds the same unmapped GUIDs either way."""
+        item_dir = model_workspace_dir / "Test Workspace" / "sample.Lakehouse"
+        (item_dir / "shortcuts.metadata.json").write_text('[{"workspaceId": "aaaaaaaa-bbbb-cccc-dddd-eeeeeeeeeeee"}]')
+        model = build_workspace_model(model_workspace_dir)
+        repo_root = model_workspace_dir.parent
+
+        walked = scan_workspace("Test Workspace", model_workspace_dir, repo_root)
+        modelled = scan_workspace("Test Workspace", model_workspace_dir, repo_root, model.get("Test Workspace"))
+
+        assert walked == modelled
+        assert [u.guid for u in modelled] == ["aaaaaaaa-bbbb-cccc-dddd-eeeeeeeeeeee"]
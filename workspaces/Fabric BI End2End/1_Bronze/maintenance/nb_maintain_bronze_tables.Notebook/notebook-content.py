@@ -0,0 +1,54 @@
+# Fabric notebook source
+
+# METADATA ********************
+
+# META {
+# META   "kernel_info": {
+# META     "name": "synapse_pyspark"
+# META   },
+# META   "dependencies": {
+# META     "lakehouse": {
+# META       "default_lakehouse": "6323ba06-e77d-4165-aac8-962913913992",
+# META       "default_lakehouse_name": "lakehouse_bronze",
+# META       "default_lakehouse_workspace_id": "00000000-0000-0000-0000-000000000000"
+# META     }
+# META   }
+# META }
+
+# PARAMETERS CELL ********************
+
+tables = 'dbo.dimension_city,dbo.dimension_customer,dbo.dimension_date,dbo.dimension_employee,dbo.dimension_stock_item,dbo.fact_sale'
+zorder_columns = '{"dbo.fact_sale": ["InvoiceDateKey"]}'
+vorder = True
+vacuum_retention_hours = 168
+
+# METADATA ********************
+
+# META {
+# META   "language": "python",
+# META   "language_group": "synapse_pyspark"
+# META }
+
+# CELL ********************
+
+import json
+
+zorder = json.loads(zorder_columns)
+for table in [name.strip() for name in tables.split(",") if name.strip()]:
+    quoted = ".".join(f"`{part}`" for part in table.split("."))
+    optimize = f"OPTIMIZE {quoted}"
+    if zorder.get(table):
+        optimize += f" ZORDER BY ({', '.join(f'`{column}`' for column in zorder[table])})"
+    if vorder:
+        optimize += " VORDER"
+    vacuum = f"VACUUM {quoted} RETAIN {int(vacuum_retention_hours)} HOURS"
+    for statement in (optimize, vacuum):
+        print(statement)
+        spark.sql(statement)
+
+# METADATA ********************
+
+# META {
+# META   "language": "python",
+# META   "language_group": "synapse_pyspark"
+# META }
@@ -0,0 +1,161 @@
+# Fabric notebook source
+
+# METADATA ********************
+
+# META {
+# META   "kernel_info": {
+# META     "name": "synapse_pyspark"
+# META   },
+# META   "dependencies": {
+# META     "lakehouse": {
+# META       "default_lakehouse": "4f3864da-233e-496b-8bc9-b951acdd2b17",
+# META       "default_lakehouse_name": "lakehouse_silver",
+# META       "default_lakehouse_workspace_id": "00000000-0000-0000-0000-000000000000"
+# META     }
+# META   }
+# META }
+
+# PARAMETERS CELL ********************
+
+source_table = 'lakehouse_bronze.dbo.fact_sale'
+target_table = 'dbo.fact_sale'
+key_columns = '["SaleKey"]'
+change_columns = '[]'
+partition_column = 'InvoiceDateKey'
+order_column = ''
+full_refresh = False
+
+# METADATA ********************
+
+# META {
+# META   "language": "python",
+# META   "language_group": "synapse_pyspark"
+# META }
+
+# CELL ********************
+
+import hashlib
+import json
+from functools import reduce
+
+from delta.tables import DeltaTable
+from pyspark.sql import Window
+from pyspark.sql import functions as F
+from pyspark.sql.utils import AnalysisException
+
+VERSION_PROPERTY = "silver.source_version"
+DEFINITION_PROPERTY = "silver.definition"
+HASH_COLUMN = "_row_hash"
+FEED_COLUMNS = ("_change_type", "_commit_version", "_commit_timestamp")
+
+keys = json.loads(key_columns)
+spec = [source_table, key_columns, change_columns, partition_column, order_column]
+definition = hashlib.sha256(json.dumps(spec).encode()).hexdigest()[:16]
+
+
+def properties_of(table):
+    return {row["key"]: row["value"] for row in spark.sql(f"SHOW TBLPROPERTIES {table}").collect()}
+
+
+def all_of(conditions):
+    return reduce(lambda left, right: left & right, conditions)
+
+
+def in_partitions(column, values):
+    # Literal partition values let Delta prune files and partitions
+    present = [value for value in values if value is not None]
+    condition = F.col(column).isin(present)
+    return condition | F.col(column).isNull() if len(present) < len(values) else condition
+
+
+# The CopyJobs writing bronze do not enable the change data feed: enable it here, before reading the
+# version, so the feed covers every bronze commit after this refresh
+feed_enabled = properties_of(source_table).get("delta.enableChangeDataFeed", "false").lower() == "true"
+if not feed_enabled:
+    spark.sql(f"ALTER TABLE {source_table} SET TBLPROPERTIES ('delta.enableChangeDataFeed' = 'true')")
+    print(f"Enabled the change data feed on {source_table}")
+
+version = spark.sql(f"DESCRIBE HISTORY {source_table} LIMIT 1").first()["version"]
+exists = spark.catalog.tableExists(target_table)
+target = properties_of(target_table) if exists else {}
+if exists:
+    partitioning = list(spark.sql(f"DESCRIBE DETAIL {target_table}").first()["partitionColumns"])
+    if partitioning != ([partition_column] if partition_column else []):
+        raise ValueError(
+            f"{target_table} is partitioned by {partitioning or 'nothing'} but partition_column is "
+            f"{partition_column or 'empty'}: drop {target_table} to rebuild it with the new partitioning"
+        )
+
+incoming = None  # bronze rows to upsert; None reads the whole snapshot
+if not exists or full_refresh or VERSION_PROPERTY not in target or target.get(DEFINITION_PROPERTY) != definition:
+    print(f"Reading all of {source_table}: first run, changed definition or full_refresh")
+elif not feed_enabled:
+    print(f"Reading all of {source_table}: change data feed enabled on this run")
+elif int(target[VERSION_PROPERTY]) >= version:
+    incoming = spark.table(source_table).limit(0)
+else:
+    try:
+        incoming = (
+            spark.read.option("readChangeFeed", "true")
+            .option("startingVersion", int(target[VERSION_PROPERTY]) + 1)
+            .option("endingVersion", version)
+            .table(source_table)
+            .where(F.col("_change_type").isin("insert", "update_postimage"))
+        )
+    except AnalysisException as error:  # versions vacuumed, or the table was recreated without the feed
+        print(f"Reading all of {source_table}: {error}")
+if incoming is None:
+    incoming = spark.sql(f"SELECT * FROM {source_table} VERSION AS OF {version}")
+
+columns = [c for c in incoming.columns if c not in FEED_COLUMNS]
+compared = json.loads(change_columns) or [c for c in columns if c not in keys]
+order = [F.col("_commit_version").desc()] if "_commit_version" in incoming.columns else []
+order += [F.col(order_column).desc()] if order_column else []
+latest = Window.partitionBy(*keys).orderBy(*order, F.col(HASH_COLUMN).desc())
+rows = (
+    incoming.withColumn(HASH_COLUMN, F.sha2(F.to_json(F.struct(*compared)), 256))
+    .withColumn("_latest", F.row_number().over(latest))
+    .where("_latest = 1")
+    .select(*columns, HASH_COLUMN)
+)
+
+if not exists:
+    writer = rows.write.format("delta")
+    (writer.partitionBy(partition_column) if partition_column else writer).saveAsTable(target_table)
+    print(f"Created {target_table} from {source_table} version {version}")
+else:
+    silver = DeltaTable.forName(spark, target_table)
+    current = silver.toDF()
+    if partition_column:
+        touched = [row[0] for row in rows.select(partition_column).distinct().collect()]
+        current = current.where(in_partitions(partition_column, touched))
+    # Unchanged rows (same key and hash) never reach the MERGE
+    changed = rows.join(current.select(*keys, HASH_COLUMN), [*keys, HASH_COLUMN], "left_anti").persist()
+    condition = all_of([F.col(f"target.{key}") == F.col(f"source.{key}") for key in keys])
+    if partition_column:
+        values = [row[0] for row in changed.select(partition_column).distinct().collect()]
+        condition = condition & in_partitions(f"target.{partition_column}", values)
+    if changed.take(1):
+        merge = silver.alias("target").merge(changed.alias("source"), condition)
+        merge.whenMatchedUpdateAll().whenNotMatchedInsertAll().execute()
+        metrics = silver.history(1).first()["operationMetrics"]
+        print(
+            f"Merged {source_table} version {version} into {target_table}: "
+            f"{metrics.get('numTargetRowsUpdated')} updated, {metrics.get('numTargetRowsInserted')} inserted"
+        )
+    else:
+        print(f"{target_table} is up to date with {source_table} version {version}")
+    changed.unpersist()
+
+if target.get(VERSION_PROPERTY) != str(version) or target.get(DEFINITION_PROPERTY) != definition:
+    spark.sql(
+        f"ALTER TABLE {target_table} SET TBLPROPERTIES ('delta.enableChangeDataFeed' = 'true', "
+        f"'{VERSION_PROPERTY}' = '{version}', '{DEFINITION_PROPERTY}' = '{definition}')"
+    )
+
+# METADATA ********************
+
+# META {
+# META   "language": "python",
+# META   "language_group": "synapse_pyspark"
+# META }
@@ -0,0 +1,124 @@
+# Fabric notebook source
+
+# METADATA ********************
+
+# META {
+# META   "kernel_info": {
+# META     "name": "synapse_pyspark"
+# META   },
+# META   "dependencies": {
+# META     "lakehouse": {
+# META       "default_lakehouse": "891b5122-7b7e-ac11-4b8a-52fbba67fe0f",
+# META       "default_lakehouse_name": "lakehouse_gold",
+# META       "default_lakehouse_workspace_id": "00000000-0000-0000-0000-000000000000"
+# META     }
+# META   }
+# META }
+
+# PARAMETERS CELL ********************
+
+source_table = 'lakehouse_silver.dbo.fact_sale'
+target_table = 'agg_sales_by_month_city_stock_item'
+date_column = 'InvoiceDateKey'
+grain = 'month'
+keys = '["CityKey", "StockItemKey"]'
+measures = '{"Quantity": ["sum", "Quantity"], "TotalExcludingTax": ["sum", "TotalExcludingTax"], "TaxAmount": ["sum", "TaxAmount"], "Profit": ["sum", "Profit"], "Sales": ["count", "*"]}'
+full_refresh = False
+
+# METADATA ********************
+
+# META {
+# META   "language": "python",
+# META   "language_group": "synapse_pyspark"
+# META }
+
+# CELL ********************
+
+import hashlib
+import json
+from datetime import timedelta
+from functools import reduce
+
+from pyspark.sql import functions as F
+from pyspark.sql.utils import AnalysisException
+
+VERSION_PROPERTY = "gold.aggregate.source_version"
+DEFINITION_PROPERTY = "gold.aggregate.definition"
+
+group_keys = json.loads(keys)
+aggregations = [
+    (F.count(F.lit(1)) if column == "*" else getattr(F, function)(F.col(column))).alias(name)
+    for name, (function, column) in json.loads(measures).items()
+]
+definition = hashlib.sha256(json.dumps([source_table, date_column, grain, keys, measures]).encode()).hexdigest()[:16]
+
+
+def aggregate(frame):
+    day = [F.to_date(F.col(date_column)).alias(date_column)] if grain == "day" else []
+    frame = frame.where(F.col(date_column).isNotNull())
+    frame = frame.withColumn("period", F.trunc(F.col(date_column), "month"))
+    return frame.groupBy("period", *day, *group_keys).agg(*aggregations)
+
+
+def in_months(months):
+    # Ranges on the date column itself, so file statistics skip unchanged data
+    def month(start):
+        end = (start.replace(day=28) + timedelta(days=4)).replace(day=1)
+        return (F.col(date_column) >= F.lit(start)) & (F.col(date_column) < F.lit(end))
+
+    return reduce(lambda left, right: left | right, [month(start) for start in months])
+
+
+def properties_of(table):
+    return {row["key"]: row["value"] for row in spark.sql(f"SHOW TBLPROPERTIES {table}").collect()}
+
+
+version = spark.sql(f"DESCRIBE HISTORY {source_table} LIMIT 1").first()["version"]
+source = spark.sql(f"SELECT * FROM {source_table} VERSION AS OF {version}")
+target = properties_of(target_table) if spark.catalog.tableExists(target_table) else {}
+
+months = None  # changed months; None rebuilds the whole table
+if full_refresh or VERSION_PROPERTY not in target or target.get(DEFINITION_PROPERTY) != definition:
+    print(f"Full refresh of {target_table}: first run, changed definition or full_refresh")
+elif properties_of(source_table).get("delta.enableChangeDataFeed", "false").lower() != "true":
+    print(f"Full refresh of {target_table}: change data feed is not enabled on {source_table}")
+elif int(target[VERSION_PROPERTY]) >= version:
+    months = []
+else:
+    try:
+        changes = (
+            spark.read.option("readChangeFeed", "true")
+            .option("startingVersion", int(target[VERSION_PROPERTY]) + 1)
+            .option("endingVersion", version)
+            .table(source_table)
+        )
+        changed = changes.select(F.trunc(F.col(date_column), "month").alias("period")).dropna().distinct()
+        months = sorted(row["period"] for row in changed.collect())
+    except AnalysisException as error:  # versions vacuumed, or the feed was enabled after the last refresh
+        print(f"Full refresh of {target_table}: {error}")
+
+if months is None:
+    (
+        aggregate(source).write.format("delta").mode("overwrite")
+        .option("overwriteSchema", "true").partitionBy("period").saveAsTable(target_table)
+    )
+elif months:
+    listed = ", ".join(f"DATE'{start.isoformat()}'" for start in months)
+    (
+        aggregate(source.where(in_months(months))).write.format("delta").mode("overwrite")
+        .option("replaceWhere", f"period IN ({listed})").saveAsTable(target_table)
+    )
+if months is None or months:
+    spark.sql(
+        f"ALTER TABLE {target_table} SET TBLPROPERTIES "
+        f"('{VERSION_PROPERTY}' = '{version}', '{DEFINITION_PROPERTY}' = '{definition}')"
+    )
+refreshed = "all months" if months is None else f"{len(months)} changed month(s)"
+print(f"{target_table}: {refreshed} refreshed from {source_table} version {version}")
+
+# METADATA ********************
+
+# META {
+# META   "language": "python",
+# META   "language_group": "synapse_pyspark"
+# META }